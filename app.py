@@ -2,17 +2,33 @@
 
 from __future__ import annotations
 
+import argparse
 import tkinter as tk
+from typing import Sequence
 
+from calculator.profiling import add_profile_arguments, session_from_args
 from ui.main_window import MainWindow
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
     """Launch the graphical calculator interface."""
 
-    root = tk.Tk()
-    MainWindow(root)
-    root.mainloop()
+    parser = argparse.ArgumentParser(description="Scientific calculator")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    session = session_from_args(args)
+    if session is not None:
+        session.start()
+
+    try:
+        root = tk.Tk()
+        MainWindow(root)
+        root.mainloop()
+    finally:
+        if session is not None:
+            for path in session.stop():
+                print(f"Profile written to {path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+"""Compare batch evaluation of scientific functions by column and by row."""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import struct
+import sys
+import time
+from typing import Sequence
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from calculator.context import CalculatorContext  # noqa: E402
+from calculator.dispatcher import FunctionDispatcher  # noqa: E402
+from calculator.engine import CalculatorEngine  # noqa: E402
+
+EXPRESSIONS = (
+    "sin(x)",
+    "cos(x) + tan(x)",
+    "exp(-x) * sqrt(x)",
+    "log(x) + ln(x)",
+    "sin(x)*exp(-x/10) + sqrt(1 + x**2)",
+)
+
+
+def row_dispatcher() -> FunctionDispatcher:
+    """Return a dispatcher that evaluates every function one row at a time."""
+
+    dispatcher = FunctionDispatcher()
+    for name in dispatcher.names():
+        dispatcher.spec(name).column_handler = None
+    return dispatcher
+
+
+def best_time(engine: CalculatorEngine, expression: str, columns: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.evaluate_batch(expression, columns, round_results=False)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bits(values: Sequence[float]) -> bytes:
+    return struct.pack(f"<{len(values)}d", *values)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--degrees", action="store_true", help="Use degree mode")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    columns = {"x": [rng.uniform(0.01, 50.0) for _ in range(args.rows)]}
+    context = CalculatorContext(angle_unit="degree" if args.degrees else "radian")
+    by_column = CalculatorEngine(context=context)
+    by_row = CalculatorEngine(dispatcher=row_dispatcher(), context=context)
+
+    print(f"{'expression':<38}{'rows/s by row':>16}{'rows/s by column':>18}{'speedup':>9}  same")
+    for expression in EXPRESSIONS:
+        row_time = best_time(by_row, expression, columns, args.repeat)
+        column_time = best_time(by_column, expression, columns, args.repeat)
+        identical = bits(by_row.evaluate_batch(expression, columns, round_results=False)) == bits(
+            by_column.evaluate_batch(expression, columns, round_results=False)
+        )
+        print(
+            f"{expression:<38}{args.rows / row_time:>16,.0f}{args.rows / column_time:>18,.0f}"
+            f"{row_time / column_time:>8.1f}x  {'yes' if identical else 'NO'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Report memory per cached expression for ASTs versus compiled bytecode."""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import pathlib
+import pickle
+import random
+import sys
+from typing import Sequence
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from calculator.bytecode import ast_nbytes  # noqa: E402
+from calculator.engine import CalculatorEngine  # noqa: E402
+
+_FUNCTIONS = ("sin", "cos", "tan", "exp", "sqrt", "ln")
+
+
+def random_expression(rng: random.Random, depth: int) -> str:
+    """Return a random valid expression of roughly ``depth`` levels."""
+
+    if depth <= 0:
+        return rng.choice(["pi", "e", str(rng.randint(1, 99)), f"{rng.random():.4f}"])
+    choice = rng.random()
+    if choice < 0.3:
+        name = rng.choice(_FUNCTIONS)
+        return f"{name}({random_expression(rng, depth - 1)})"
+    operator = rng.choice(["+", "-", "*", "/"])
+    return f"({random_expression(rng, depth - 1)} {operator} {random_expression(rng, depth - 1)})"
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000, help="Expressions to generate")
+    parser.add_argument("--depth", type=int, default=5, help="Nesting depth")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    engine = CalculatorEngine()
+    expressions = [random_expression(rng, args.depth) for _ in range(args.count)]
+
+    ast_bytes = 0
+    program_bytes = 0
+    ast_pickle = 0
+    program_pickle = 0
+    for expression in expressions:
+        tree = ast.parse(expression, mode="eval")
+        program = engine.compile(expression)
+        ast_bytes += ast_nbytes(tree)
+        program_bytes += program.nbytes
+        ast_pickle += len(pickle.dumps(tree))
+        program_pickle += len(pickle.dumps(program))
+
+    count = len(expressions)
+    print(f"expressions: {count} (depth {args.depth})")
+    print(f"{'':<12}{'AST':>12}{'bytecode':>12}{'ratio':>8}")
+    print(
+        f"{'memory/expr':<12}{ast_bytes / count:>12.0f}{program_bytes / count:>12.0f}"
+        f"{ast_bytes / program_bytes:>8.1f}"
+    )
+    print(
+        f"{'pickle/expr':<12}{ast_pickle / count:>12.0f}{program_pickle / count:>12.0f}"
+        f"{ast_pickle / program_pickle:>8.1f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
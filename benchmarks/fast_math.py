@@ -0,0 +1,115 @@
+"""Report accuracy and throughput of the approximate batch mode against the exact path."""
+
+from __future__ import annotations
+
+import argparse
+import math
+import pathlib
+import random
+import sys
+import time
+from typing import Callable, Sequence
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from calculator.context import CalculatorContext  # noqa: E402
+from calculator.engine import CalculatorEngine  # noqa: E402
+from calculator.scientific import approximate  # noqa: E402
+
+EXPRESSIONS = (
+    "sin(x)",
+    "cos(x) + tan(x)",
+    "exp(-x) * sqrt(x)",
+    "log(x) + ln(x)",
+    "sin(x)*exp(-x/10) + sqrt(1 + x**2)",
+)
+
+
+def accuracy_samples(rng: random.Random, count: int) -> dict[str, list[float]]:
+    """Return arguments for each function, including multiples of pi/2 and tiny angles."""
+
+    angles = [rng.uniform(-10.0, 10.0) for _ in range(count)]
+    angles += [rng.uniform(-(2.0**20), 2.0**20) for _ in range(count)]
+    angles += [rng.randrange(-(2**20), 2**20) * math.pi / 2 for _ in range(count)]
+    angles += [10 ** rng.uniform(-300, 0) for _ in range(count)]
+    positive = [10 ** rng.uniform(-300, 300) for _ in range(2 * count)]
+    return {
+        "sin": angles,
+        "cos": angles,
+        "tan": angles,
+        "exp": [rng.uniform(-700.0, 700.0) for _ in range(2 * count)],
+        "log": positive,
+        "sqrt": positive,
+    }
+
+
+def max_relative_error(approx: Sequence[float], exact: Sequence[float]) -> float:
+    return max((abs(a - e) / abs(e) for a, e in zip(approx, exact) if e != 0), default=0.0)
+
+
+def best_time(engine: CalculatorEngine, expression: str, columns: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.evaluate_batch(expression, columns, round_results=False)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--samples", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--degrees", action="store_true", help="Use degree mode")
+    args = parser.parse_args(argv)
+
+    if approximate.np is None:
+        print("NumPy is not installed; the approximate mode uses the exact path.")
+        return 1
+
+    rng = random.Random(0)
+    kernels: dict[str, tuple[Callable, Callable[[float], float]]] = {
+        "sin": (approximate.sine, math.sin),
+        "cos": (approximate.cosine, math.cos),
+        "tan": (approximate.tangent, math.tan),
+        "exp": (approximate.exponential, math.exp),
+        "log": (approximate.logarithm, math.log),
+        "sqrt": (approximate.square_root, math.sqrt),
+    }
+    print(f"{'function':<10}{'max relative error':>20}{'bound':>10}  within")
+    for name, values in accuracy_samples(rng, args.samples).items():
+        kernel, exact = kernels[name]
+        error = max_relative_error(
+            approximate.evaluate(kernel, values), [exact(value) for value in values]
+        )
+        bound = approximate.MAX_RELATIVE_ERROR[name]
+        print(f"{name:<10}{error:>20.3e}{bound:>10.0e}  {'yes' if error <= bound else 'NO'}")
+    print()
+
+    columns = {"x": [rng.uniform(0.01, 50.0) for _ in range(args.rows)]}
+    angle_unit = "degree" if args.degrees else "radian"
+    exact_engine = CalculatorEngine(context=CalculatorContext(angle_unit=angle_unit))
+    fast_engine = CalculatorEngine(
+        context=CalculatorContext(angle_unit=angle_unit, approximate=True)
+    )
+    print(
+        f"{'expression':<38}{'rows/s exact':>14}{'rows/s approx':>15}{'speedup':>9}"
+        f"{'error':>11}"
+    )
+    for expression in EXPRESSIONS:
+        exact_time = best_time(exact_engine, expression, columns, args.repeat)
+        fast_time = best_time(fast_engine, expression, columns, args.repeat)
+        error = max_relative_error(
+            fast_engine.evaluate_batch(expression, columns, round_results=False),
+            exact_engine.evaluate_batch(expression, columns, round_results=False),
+        )
+        print(
+            f"{expression:<38}{args.rows / exact_time:>14,.0f}{args.rows / fast_time:>15,.0f}"
+            f"{exact_time / fast_time:>8.1f}x{error:>11.1e}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""Tail latency of small requests queued behind a few huge polynomials.
+
+Requests arrive at a fixed rate into one FIFO queue served by one thread, as
+in a simple service; a small share of them differentiate a large polynomial.
+Small-request latency is measured from arrival to completion, first with the
+server running every request itself and then with a ``LaneScheduler`` that
+runs small requests inline and sends heavy ones to worker processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Callable, Sequence
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from calculator.calculus import operations as calculus_ops  # noqa: E402
+from calculator.engine import CalculatorEngine  # noqa: E402
+from calculator.loadtest import percentile  # noqa: E402
+from calculator.scheduler import LaneScheduler  # noqa: E402
+
+SMALL = ("1 + 2 * 3", "sin(0.5) + cos(0.25)", "sqrt(2) * ln(10)", "(4 - 1) / 7 + 2 ** 8")
+
+
+def heavy_polynomial(terms: int) -> str:
+    return " + ".join(f"{index}*x**{index}" for index in range(terms))
+
+
+def workload(requests: int, heavy_share: float, polynomial: str) -> list[tuple[str, str]]:
+    rng = random.Random(0)
+    return [
+        ("differentiate", polynomial) if rng.random() < heavy_share
+        else ("evaluate", rng.choice(SMALL))
+        for _ in range(requests)
+    ]
+
+
+def serve(
+    handle: Callable[[str, str], None],
+    items: Sequence[tuple[str, str]],
+    rate: float,
+) -> list[float]:
+    """Feed ``items`` at ``rate`` per second; return small-request latencies."""
+
+    inbox: queue.SimpleQueue = queue.SimpleQueue()
+    latencies: list[float] = []
+
+    def server() -> None:
+        while True:
+            item = inbox.get()
+            if item is None:
+                return
+            arrived, kind, expression = item
+            handle(kind, expression)
+            if kind == "evaluate":
+                latencies.append(time.perf_counter() - arrived)
+
+    thread = threading.Thread(target=server)
+    thread.start()
+    start = time.perf_counter()
+    for index, (kind, expression) in enumerate(items):
+        due = start + index / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        inbox.put((due, kind, expression))
+    inbox.put(None)
+    thread.join()
+    return latencies
+
+
+def report(label: str, latencies: Sequence[float]) -> None:
+    p50, p99, p999 = (percentile(latencies, q) * 1000 for q in (50, 99, 99.9))
+    print(f"{label:<20}p50 {p50:9.3f} ms   p99 {p99:9.3f} ms   p99.9 {p999:9.3f} ms")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--rate", type=float, default=2000.0, help="Requests per second")
+    parser.add_argument("--heavy-share", type=float, default=0.002)
+    parser.add_argument("--terms", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    items = workload(args.requests, args.heavy_share, heavy_polynomial(args.terms))
+    engine = CalculatorEngine()
+    print(f"{sum(kind != 'evaluate' for kind, _ in items)} heavy of {len(items)} requests")
+
+    def inline(kind: str, expression: str) -> None:
+        if kind == "evaluate":
+            engine.evaluate(expression)
+        else:
+            calculus_ops.differentiate(expression)
+
+    report("single queue", serve(inline, items, args.rate))
+    with LaneScheduler(engine) as scheduler:
+        report("fast/heavy lanes", serve(scheduler.submit, items, args.rate))
+        for stats in scheduler.stats().values():
+            print("  " + stats.format())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,50 @@
+"""Show that polynomial parsing scales linearly with the number of terms."""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import time
+from typing import Sequence
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from calculator.calculus import operations as calculus_ops  # noqa: E402
+
+
+def build_polynomial(terms: int, distinct_powers: int, seed: int = 0) -> str:
+    """Return a left-nested sum of ``terms`` monomials."""
+
+    rng = random.Random(seed)
+    parts = []
+    for index in range(terms):
+        coefficient = rng.randint(1, 99)
+        power = rng.randrange(distinct_powers)
+        sign = "-" if index and rng.random() < 0.5 else "+"
+        monomial = f"{coefficient}*x**{power}" if power else str(coefficient)
+        parts.append(f" {sign} {monomial}" if index else monomial)
+    return "".join(parts)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-terms", type=int, default=1_000_000)
+    parser.add_argument("--distinct-powers", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    print(f"{'terms':>10}{'seconds':>10}{'µs/term':>10}")
+    terms = 1000
+    while terms <= args.max_terms:
+        expression = build_polynomial(terms, args.distinct_powers)
+        start = time.perf_counter()
+        calculus_ops.differentiate(expression, "x")
+        elapsed = time.perf_counter() - start
+        print(f"{terms:>10}{elapsed:>10.3f}{elapsed / terms * 1e6:>10.2f}")
+        terms *= 10
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
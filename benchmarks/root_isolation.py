@@ -0,0 +1,131 @@
+"""Root isolation by interval branch and bound versus dense sampling.
+
+Branch and bound evaluates each function once per box with
+``CalculatorEngine.evaluate_interval``. A box is discarded when its enclosure
+excludes zero and is halved otherwise, until boxes are narrower than the
+tolerance. Adjacent surviving boxes are merged into root enclosures, which
+are counted as verified when the function changes sign across them and is
+bounded on them.
+
+Dense sampling evaluates a uniform grid in one batch and reports sign
+changes. It misses pairs of roots closer than the grid spacing and reports
+poles as roots.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import pathlib
+import sys
+import time
+from typing import Sequence
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from calculator.engine import CalculatorEngine  # noqa: E402
+from calculator.exceptions import InvalidExpressionError  # noqa: E402
+from calculator.interval import Interval  # noqa: E402
+
+CASES = (
+    ("sin(x) - x/10", -12.0, 12.0),
+    ("(x - 1.00001)**2 - 1e-14", -3.0, 3.0),
+    ("tan(x) - 1", -5.0, 5.0),
+    ("exp(-x) * cos(3*x) - 0.01", 0.0, 6.0),
+)
+
+
+def branch_and_bound(
+    engine: CalculatorEngine, expression: str, lower: float, upper: float, tolerance: float
+) -> tuple[list[Interval], int]:
+    """Return the boxes that may hold a root and the number of evaluations."""
+
+    boxes: list[Interval] = []
+    stack = [Interval(lower, upper)]
+    evaluations = 0
+    while stack:
+        box = stack.pop()
+        evaluations += 1
+        try:
+            enclosure = engine.evaluate_interval(expression, {"x": box})
+        except (InvalidExpressionError, ZeroDivisionError):
+            continue  # undefined on the whole box
+        if 0.0 not in enclosure:
+            continue
+        if box.width <= tolerance:
+            boxes.append(box)
+            continue
+        left, right = box.split()
+        stack.extend((right, left))
+    return boxes, evaluations
+
+
+def merge(boxes: Sequence[Interval]) -> list[Interval]:
+    merged: list[Interval] = []
+    for box in sorted(boxes, key=lambda item: item.lower):
+        if merged and box.lower <= merged[-1].upper:
+            merged[-1] = Interval(merged[-1].lower, max(merged[-1].upper, box.upper))
+        else:
+            merged.append(box)
+    return merged
+
+
+def is_verified(engine: CalculatorEngine, expression: str, box: Interval) -> bool:
+    """Return whether ``box`` provably contains a root of a continuous function."""
+
+    enclosure = engine.evaluate_interval(expression, {"x": box})
+    if enclosure.partial or math.isinf(enclosure.lower) or math.isinf(enclosure.upper):
+        return False
+    ends = engine.evaluate_batch(expression, {"x": [box.lower, box.upper]}, round_results=False)
+    return ends[0] == 0 or ends[1] == 0 or (ends[0] < 0) != (ends[1] < 0)
+
+
+def sample(
+    engine: CalculatorEngine, expression: str, lower: float, upper: float, samples: int
+) -> list[float]:
+    """Return the midpoints of grid cells where the sampled values change sign."""
+
+    step = (upper - lower) / (samples - 1)
+    grid = [lower + index * step for index in range(samples)]
+    values = engine.evaluate_batch(expression, {"x": grid}, round_results=False)
+    return [
+        (grid[index] + grid[index + 1]) / 2
+        for index in range(samples - 1)
+        if values[index] == 0 or (values[index] < 0) != (values[index + 1] < 0)
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    parser.add_argument("--samples", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    engine = CalculatorEngine()
+    for expression, lower, upper in CASES:
+        print(f"{expression} on [{lower:g}, {upper:g}]")
+
+        start = time.perf_counter()
+        boxes, evaluations = branch_and_bound(engine, expression, lower, upper, args.tolerance)
+        elapsed = time.perf_counter() - start
+        clusters = merge(boxes)
+        verified = [box for box in clusters if is_verified(engine, expression, box)]
+        found = ", ".join(f"{box.midpoint:.10g}" for box in verified)
+        print(
+            f"  branch and bound  {evaluations:8d} evaluations {elapsed * 1000:9.1f} ms   "
+            f"{len(verified)} verified, {len(clusters) - len(verified)} unresolved: {found}"
+        )
+
+        start = time.perf_counter()
+        changes = sample(engine, expression, lower, upper, args.samples)
+        elapsed = time.perf_counter() - start
+        found = ", ".join(f"{value:.10g}" for value in changes)
+        print(
+            f"  dense sampling    {args.samples:8d} evaluations {elapsed * 1000:9.1f} ms   "
+            f"{len(changes)} sign changes: {found}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""Measure how expression throughput scales with threads sharing one engine.
+
+On free-threaded CPython builds (``python3.13t`` and later) throughput should
+grow with the thread count; on the regular GIL build the numbers show that
+sharing an engine costs nothing compared with a single thread.
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import pathlib
+import sys
+import time
+from typing import Sequence
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from calculator.context import CalculatorContext  # noqa: E402
+from calculator.engine import CalculatorEngine  # noqa: E402
+
+_EXPRESSIONS = (
+    "sin(pi/6) + cos(pi/3) * tan(pi/4)",
+    "log(1000, 10) + ln(e**2) - sqrt(144)",
+    "pow(2, 10) / (3 + 4 * 5) - exp(1.5)",
+    "(1 + 2) * (3 + 4) * (5 + 6) / 7",
+)
+
+
+def _worker(engine: CalculatorEngine, context: CalculatorContext, iterations: int) -> int:
+    programs = [engine.compile(expression) for expression in _EXPRESSIONS]
+    for _ in range(iterations):
+        for program in programs:
+            engine.evaluate_compiled(program, context)
+    return iterations * len(programs)
+
+
+def measure(threads: int, iterations: int) -> float:
+    """Return evaluations per second for ``threads`` workers sharing an engine."""
+
+    engine = CalculatorEngine()
+    contexts = [
+        CalculatorContext(angle_unit="degree" if index % 2 else "radian")
+        for index in range(threads)
+    ]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(_worker, engine, context, iterations) for context in contexts]
+        total = sum(future.result() for future in futures)
+    return total / (time.perf_counter() - start)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-threads", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=5000, help="Iterations per thread")
+    args = parser.parse_args(argv)
+
+    gil_check = getattr(sys, "_is_gil_enabled", None)
+    gil_enabled = gil_check() if gil_check is not None else True
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled else 'disabled'}")
+    print(f"{'threads':>8}{'evals/s':>14}{'speed-up':>10}")
+
+    baseline = None
+    threads = 1
+    while threads <= args.max_threads:
+        rate = measure(threads, args.iterations)
+        baseline = baseline or rate
+        print(f"{threads:>8}{rate:>14.0f}{rate / baseline:>10.2f}")
+        threads *= 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,3 @@
+"""Streaming aggregate functions over large numeric data sources."""
+
+__all__ = ["datasets", "operations"]
@@ -0,0 +1,166 @@
+"""Numeric data sources consumed by the aggregate functions.
+
+Every source yields its values in bounded chunks through
+:meth:`DataSource.iter_chunks`, so aggregates run in a single streaming pass
+and never need the whole data set in memory. Binary files are memory-mapped
+and chunked without copying; CSV files are parsed row by row.
+"""
+
+from __future__ import annotations
+
+from array import array
+import csv
+import mmap
+import os
+from typing import Iterable, Iterator, Protocol, Sequence
+
+try:  # pragma: no cover - exercised only when NumPy is installed
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class DataSource(Protocol):
+    """Iterable collection of floats that can be streamed in chunks."""
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Sequence[float]]:
+        """Yield the values in chunks of at most ``chunk_size`` items."""
+
+
+class InlineData:
+    """Values supplied directly in an expression, e.g. ``mean([1, 2, 3])``."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: Iterable[float]) -> None:
+        self.values = array("d", values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Sequence[float]]:
+        values = self.values
+        for start in range(0, len(values), chunk_size):
+            yield values[start : start + chunk_size]
+
+
+class BinaryDataset:
+    """Memory-mapped file of native-endian ``float64`` (or ``float32``) values."""
+
+    def __init__(self, path: str | os.PathLike[str], *, typecode: str = "d") -> None:
+        if typecode not in {"d", "f"}:
+            raise ValueError("typecode must be 'd' (float64) or 'f' (float32).")
+        self.path = os.fspath(path)
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.path) // self.itemsize
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Sequence[float]]:
+        count = len(self)
+        if count == 0:
+            return
+        with open(self.path, "rb") as handle:
+            mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if np is not None:
+                dtype = np.float64 if self.typecode == "d" else np.float32
+                for start in range(0, count, chunk_size):
+                    stop = min(start + chunk_size, count)
+                    yield np.frombuffer(
+                        mapping,
+                        dtype=dtype,
+                        count=stop - start,
+                        offset=start * self.itemsize,
+                    )
+                return
+
+            view = memoryview(mapping)[: count * self.itemsize].cast(self.typecode)
+            try:
+                for start in range(0, count, chunk_size):
+                    chunk = view[start : start + chunk_size]
+                    yield chunk
+                    chunk.release()
+            finally:
+                view.release()
+        finally:
+            try:
+                mapping.close()
+            except BufferError:  # pragma: no cover - a caller kept a chunk alive
+                pass
+
+    @staticmethod
+    def write(
+        path: str | os.PathLike[str],
+        values: Iterable[float],
+        *,
+        typecode: str = "d",
+    ) -> None:
+        """Write ``values`` to ``path`` in the format read by this class."""
+
+        with open(path, "wb") as handle:
+            buffer = array(typecode)
+            for value in values:
+                buffer.append(value)
+                if len(buffer) >= DEFAULT_CHUNK_SIZE:
+                    buffer.tofile(handle)
+                    buffer = array(typecode)
+            buffer.tofile(handle)
+
+
+class CsvDataset:
+    """One numeric column of a CSV file, streamed row by row.
+
+    ``column`` is either a header name or a zero-based column index. Blank
+    cells are skipped; any other non-numeric cell raises :class:`ValueError`.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        column: str | int = 0,
+        *,
+        delimiter: str = ",",
+        has_header: bool = True,
+    ) -> None:
+        if isinstance(column, str) and not has_header:
+            raise ValueError("Column names require a header row.")
+        self.path = os.fspath(path)
+        self.column = column
+        self.delimiter = delimiter
+        self.has_header = has_header
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Sequence[float]]:
+        with open(self.path, newline="", encoding="utf-8") as handle:
+            reader = csv.reader(handle, delimiter=self.delimiter)
+            index = self._column_index(reader)
+            chunk = array("d")
+            for line_number, row in enumerate(reader, start=2 if self.has_header else 1):
+                if index >= len(row) or not row[index].strip():
+                    continue
+                try:
+                    chunk.append(float(row[index]))
+                except ValueError as exc:
+                    raise ValueError(
+                        f"Non-numeric value {row[index]!r} on line {line_number} of "
+                        f"'{self.path}'."
+                    ) from exc
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = array("d")
+            if chunk:
+                yield chunk
+
+    def _column_index(self, reader: Iterator[list[str]]) -> int:
+        if not self.has_header:
+            return int(self.column)
+        header = next(reader, [])
+        if isinstance(self.column, int):
+            return self.column
+        try:
+            return [name.strip() for name in header].index(self.column)
+        except ValueError as exc:
+            raise ValueError(f"Column '{self.column}' not found in '{self.path}'.") from exc
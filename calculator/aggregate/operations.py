@@ -0,0 +1,195 @@
+"""Single-pass aggregate functions over :mod:`calculator.aggregate.datasets`.
+
+Moments are computed per chunk (with NumPy reductions when NumPy is
+installed) and merged with the parallel form of Welford's algorithm, so the
+mean and standard deviation stay accurate for very long inputs. Sums use a
+compensated accumulator across chunks.
+"""
+
+from __future__ import annotations
+
+from array import array
+import math
+from typing import Callable, Sequence
+
+from calculator.aggregate.datasets import DataSource, np
+from calculator.context import CalculatorContext
+
+AggregateHandler = Callable[[DataSource, Sequence[float], CalculatorContext], float]
+
+
+class RunningStats:
+    """Streaming count, sum, mean, variance, minimum and maximum."""
+
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum", "_total", "_compensation")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._total = 0.0
+        self._compensation = 0.0
+
+    @property
+    def total(self) -> float:
+        """Return the compensated sum of every value seen so far."""
+
+        return self._total + self._compensation
+
+    @property
+    def variance(self) -> float:
+        """Return the sample variance."""
+
+        if self.count < 2:
+            raise ValueError("Variance requires at least two values.")
+        return self.m2 / (self.count - 1)
+
+    def update(self, chunk: Sequence[float]) -> None:
+        """Merge the moments of ``chunk`` into the running totals."""
+
+        count = len(chunk)
+        if count == 0:
+            return
+
+        if np is not None:
+            values = np.asarray(chunk, dtype=np.float64)
+            chunk_total = float(values.sum())
+            chunk_mean = chunk_total / count
+            deviations = values - chunk_mean
+            chunk_m2 = float(np.dot(deviations, deviations))
+            chunk_min = float(values.min())
+            chunk_max = float(values.max())
+        else:
+            chunk_total = math.fsum(chunk)
+            chunk_mean = chunk_total / count
+            chunk_m2 = math.fsum((value - chunk_mean) ** 2 for value in chunk)
+            chunk_min = min(chunk)
+            chunk_max = max(chunk)
+
+        self._add_total(chunk_total)
+        merged = self.count + count
+        delta = chunk_mean - self.mean
+        self.mean += delta * count / merged
+        self.m2 += chunk_m2 + delta * delta * self.count * count / merged
+        self.count = merged
+        self.minimum = min(self.minimum, chunk_min)
+        self.maximum = max(self.maximum, chunk_max)
+
+    def _add_total(self, value: float) -> None:
+        # Neumaier compensated summation keeps the rounding error of every
+        # chunk total instead of discarding it.
+        total = self._total + value
+        if abs(self._total) >= abs(value):
+            self._compensation += (self._total - total) + value
+        else:
+            self._compensation += (value - total) + self._total
+        self._total = total
+
+
+def collect_stats(source: DataSource) -> RunningStats:
+    """Stream ``source`` once and return its :class:`RunningStats`."""
+
+    stats = RunningStats()
+    for chunk in source.iter_chunks():
+        stats.update(chunk)
+    return stats
+
+
+def _require_values(name: str, stats: RunningStats, minimum: int = 1) -> None:
+    if stats.count < minimum:
+        raise ValueError(f"{name} requires at least {minimum} value(s).")
+
+
+def total(source: DataSource) -> float:
+    """Return the sum of the values in ``source``."""
+
+    return collect_stats(source).total
+
+
+def mean(source: DataSource) -> float:
+    """Return the arithmetic mean of the values in ``source``."""
+
+    stats = collect_stats(source)
+    _require_values("mean", stats)
+    return stats.mean
+
+
+def stdev(source: DataSource) -> float:
+    """Return the sample standard deviation of the values in ``source``."""
+
+    stats = collect_stats(source)
+    _require_values("stdev", stats, 2)
+    return math.sqrt(stats.variance)
+
+
+def minimum(source: DataSource) -> float:
+    """Return the smallest value in ``source``."""
+
+    stats = collect_stats(source)
+    _require_values("min", stats)
+    return stats.minimum
+
+
+def maximum(source: DataSource) -> float:
+    """Return the largest value in ``source``."""
+
+    stats = collect_stats(source)
+    _require_values("max", stats)
+    return stats.maximum
+
+
+def percentile(source: DataSource, q: float) -> float:
+    """Return the ``q``-th percentile of ``source`` using linear interpolation.
+
+    Unlike the other aggregates an exact percentile needs every value, so the
+    data is buffered once into a compact ``array('d')`` (8 bytes per value)
+    rather than a list of Python floats.
+    """
+
+    if not 0 <= q <= 100:
+        raise ValueError("Percentile must be between 0 and 100.")
+
+    values = array("d")
+    for chunk in source.iter_chunks():
+        values.extend(chunk)
+    if not values:
+        raise ValueError("percentile requires at least 1 value(s).")
+
+    if np is not None:
+        return float(np.percentile(np.frombuffer(values, dtype=np.float64), q))
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = position - lower
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+
+def _wrap(func: Callable[[DataSource], float]) -> AggregateHandler:
+    def handler(source: DataSource, _args: Sequence[float], _: CalculatorContext) -> float:
+        return func(source)
+
+    return handler
+
+
+def _percentile_handler(
+    source: DataSource, args: Sequence[float], _: CalculatorContext
+) -> float:
+    (q,) = args
+    return percentile(source, q)
+
+
+def default_aggregates() -> dict[str, tuple[AggregateHandler, int]]:
+    """Return the built-in aggregates with their number of extra arguments."""
+
+    return {
+        "sum": (_wrap(total), 0),
+        "mean": (_wrap(mean), 0),
+        "stdev": (_wrap(stdev), 0),
+        "min": (_wrap(minimum), 0),
+        "max": (_wrap(maximum), 0),
+        "percentile": (_percentile_handler, 1),
+    }
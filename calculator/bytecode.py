@@ -0,0 +1,512 @@
+"""Compact postfix bytecode for validated calculator expressions.
+
+Parsed :class:`ast.Expression` trees are large object graphs. The compiler in
+this module lowers a tree accepted by :class:`~calculator.engine.CalculatorEngine`
+into a flat postfix program made of three compact parts:
+
+* ``code`` – one opcode per instruction stored in an ``array('B')``.
+* ``operands`` – the instruction operands stored in a parallel ``array('I')``.
+* ``constants`` – numeric literals stored in an ``array('d')``.
+
+Function calls refer to *slots* holding the function name and arity. Slots are
+resolved against a :class:`~calculator.dispatcher.FunctionDispatcher` at
+execution time so the same program can run with different dispatchers.
+
+Conditionals compile to jumps whose operand is the index of the target
+instruction, so branches that are not taken are skipped exactly as
+:meth:`~calculator.engine.CalculatorEngine.evaluate` skips them. ``OP_RAISE``
+raises :class:`~calculator.exceptions.InvalidExpressionError` with the message
+held in the name of its slot.
+"""
+
+from __future__ import annotations
+
+import ast
+from array import array
+import math
+import struct
+import sys
+from typing import Mapping
+
+from calculator.basic import operations as basic_ops
+from calculator.conditional import COMPARISONS, is_piecewise, split_piecewise
+from calculator.context import CalculatorContext
+from calculator.dispatcher import FunctionDispatcher
+from calculator.exceptions import InvalidExpressionError
+from calculator.summation import bound_call
+
+OP_CONST = 0
+OP_NEG = 1
+OP_ADD = 2
+OP_SUB = 3
+OP_MUL = 4
+OP_DIV = 5
+OP_POW = 6
+OP_CALL = 7
+OP_COMPARE = 8
+OP_COMPARE_KEEP = 9  # keeps the right operand below the result for a chain
+OP_JUMP = 10
+OP_JUMP_IF_FALSE = 11
+OP_JUMP_IF_TRUE = 12
+OP_NOT = 13
+OP_POP = 14
+OP_RAISE = 15
+
+_BINARY_OPCODES: dict[type[ast.operator], int] = {
+    ast.Add: OP_ADD,
+    ast.Sub: OP_SUB,
+    ast.Mult: OP_MUL,
+    ast.Div: OP_DIV,
+    ast.Pow: OP_POW,
+}
+
+_COMPARE_KINDS: dict[type[ast.cmpop], int] = {
+    kind: index for index, kind in enumerate(COMPARISONS)
+}
+_COMPARE_FUNCTIONS = tuple(COMPARISONS.values())
+
+_MAGIC = b"CEXP"
+_VERSION = 2
+_READABLE_VERSIONS = (1, 2)  # version 1 programs use a subset of the opcodes
+_HEADER = struct.Struct("<4sBIII")
+_SLOT_HEADER = struct.Struct("<HH")
+
+
+class CompiledExpression:
+    """Flat postfix program produced by :func:`compile_expression`."""
+
+    __slots__ = ("code", "operands", "constants", "slots")
+
+    def __init__(
+        self,
+        code: array,
+        operands: array,
+        constants: array,
+        slots: tuple[tuple[str, int], ...],
+    ) -> None:
+        self.code = code
+        self.operands = operands
+        self.constants = constants
+        self.slots = slots
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompiledExpression):
+            return NotImplemented
+        return (
+            self.code == other.code
+            and self.operands == other.operands
+            and self.constants == other.constants
+            and self.slots == other.slots
+        )
+
+    def __reduce__(self) -> tuple[object, tuple[bytes]]:
+        return (CompiledExpression.from_bytes, (self.to_bytes(),))
+
+    @property
+    def nbytes(self) -> int:
+        """Return the approximate memory footprint of the program in bytes."""
+
+        total = sys.getsizeof(self)
+        total += sys.getsizeof(self.code)
+        total += sys.getsizeof(self.operands)
+        total += sys.getsizeof(self.constants)
+        total += sys.getsizeof(self.slots)
+        for slot in self.slots:
+            total += sys.getsizeof(slot) + sys.getsizeof(slot[0])
+        return total
+
+    def execute(self, dispatcher: FunctionDispatcher, context: CalculatorContext) -> float:
+        """Run the program and return the unrounded result.
+
+        Errors are raised exactly as :meth:`CalculatorEngine._eval` raises them;
+        callers are responsible for the final finiteness check and rounding.
+        """
+
+        code = self.code
+        operands = self.operands
+        constants = self.constants
+        slots = self.slots
+        stack: list[float] = []
+        push = stack.append
+        pop = stack.pop
+
+        # Iterating with ``zip`` is much faster than indexing, so a taken jump
+        # restarts the iteration at its target instead.
+        steps = zip(code, operands)
+        while True:
+            target = -1
+            for opcode, operand in steps:
+                if opcode == OP_CONST:
+                    push(constants[operand])
+                elif opcode == OP_ADD:
+                    rhs = pop()
+                    stack[-1] = basic_ops.add(stack[-1], rhs)
+                elif opcode == OP_SUB:
+                    rhs = pop()
+                    stack[-1] = basic_ops.subtract(stack[-1], rhs)
+                elif opcode == OP_MUL:
+                    rhs = pop()
+                    stack[-1] = basic_ops.multiply(stack[-1], rhs)
+                elif opcode == OP_DIV:
+                    rhs = pop()
+                    stack[-1] = basic_ops.divide(stack[-1], rhs)
+                elif opcode == OP_POW:
+                    rhs = pop()
+                    stack[-1] = basic_ops.power(stack[-1], rhs)
+                elif opcode == OP_NEG:
+                    stack[-1] = -stack[-1]
+                elif opcode == OP_CALL:
+                    name, arity = slots[operand]
+                    if arity:
+                        args = stack[-arity:]
+                        del stack[-arity:]
+                    else:
+                        args = []
+                    push(dispatcher.evaluate(name, args, context))
+                elif opcode == OP_COMPARE:
+                    rhs = pop()
+                    stack[-1] = 1.0 if _COMPARE_FUNCTIONS[operand](stack[-1], rhs) else 0.0
+                elif opcode == OP_COMPARE_KEEP:
+                    lhs, rhs = stack[-2], stack[-1]
+                    stack[-2] = rhs
+                    stack[-1] = 1.0 if _COMPARE_FUNCTIONS[operand](lhs, rhs) else 0.0
+                elif opcode == OP_JUMP:
+                    target = operand
+                    break
+                elif opcode == OP_JUMP_IF_FALSE:
+                    if pop() == 0:
+                        target = operand
+                        break
+                elif opcode == OP_JUMP_IF_TRUE:
+                    if pop() != 0:
+                        target = operand
+                        break
+                elif opcode == OP_NOT:
+                    stack[-1] = 1.0 if stack[-1] == 0 else 0.0
+                elif opcode == OP_POP:
+                    pop()
+                elif opcode == OP_RAISE:
+                    raise InvalidExpressionError(slots[operand][0])
+                else:
+                    raise InvalidExpressionError(f"Invalid opcode {opcode}.")
+            if target < 0:
+                return stack[-1]
+            steps = zip(code[target:], operands[target:])
+
+    # ------------------------------------------------------------------
+    # Serialization helpers
+    # ------------------------------------------------------------------
+    def to_bytes(self) -> bytes:
+        """Serialize the program into a portable little-endian byte string."""
+
+        operands = array("I", self.operands)
+        constants = array("d", self.constants)
+        if sys.byteorder == "big":
+            operands.byteswap()
+            constants.byteswap()
+
+        parts = [
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                len(self.code),
+                len(constants),
+                len(self.slots),
+            ),
+            self.code.tobytes(),
+            operands.tobytes(),
+            constants.tobytes(),
+        ]
+        for name, arity in self.slots:
+            encoded = name.encode("utf-8")
+            parts.append(_SLOT_HEADER.pack(len(encoded), arity))
+            parts.append(encoded)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompiledExpression":
+        """Rebuild a program serialized with :meth:`to_bytes`."""
+
+        try:
+            magic, version, code_length, constant_count, slot_count = _HEADER.unpack_from(
+                data, 0
+            )
+        except struct.error as exc:
+            raise InvalidExpressionError("Truncated bytecode header.") from exc
+        if magic != _MAGIC or version not in _READABLE_VERSIONS:
+            raise InvalidExpressionError("Unrecognised bytecode format.")
+
+        offset = _HEADER.size
+        code = array("B")
+        operands = array("I")
+        constants = array("d")
+        try:
+            code.frombytes(data[offset : offset + code_length])
+            offset += code_length
+            operand_bytes = code_length * operands.itemsize
+            operands.frombytes(data[offset : offset + operand_bytes])
+            offset += operand_bytes
+            constant_bytes = constant_count * constants.itemsize
+            constants.frombytes(data[offset : offset + constant_bytes])
+            offset += constant_bytes
+
+            slots: list[tuple[str, int]] = []
+            for _ in range(slot_count):
+                name_length, arity = _SLOT_HEADER.unpack_from(data, offset)
+                offset += _SLOT_HEADER.size
+                name = data[offset : offset + name_length].decode("utf-8")
+                offset += name_length
+                slots.append((name, arity))
+        except (struct.error, ValueError) as exc:
+            raise InvalidExpressionError("Truncated bytecode payload.") from exc
+
+        if (
+            len(code) != code_length
+            or len(operands) != code_length
+            or len(constants) != constant_count
+        ):
+            raise InvalidExpressionError("Truncated bytecode payload.")
+
+        if sys.byteorder == "big":
+            operands.byteswap()
+            constants.byteswap()
+
+        return cls(code, operands, constants, tuple(slots))
+
+
+def compile_expression(tree: ast.AST, constants: Mapping[str, float]) -> CompiledExpression:
+    """Lower ``tree`` into a :class:`CompiledExpression`.
+
+    The accepted grammar matches :meth:`CalculatorEngine._eval`. Unknown
+    identifiers and unsupported syntax compile to ``OP_RAISE`` in place, so
+    they fail when execution reaches them, after any error the reference
+    would raise first and not at all in an untaken branch. Only list literals
+    and bound-variable ``sum``/``prod``, which have no bytecode, are rejected
+    while compiling. ``constants`` maps the identifiers that may appear in the
+    expression to their values.
+    """
+
+    compiler = _Compiler(constants)
+    compiler.visit(tree)
+    return CompiledExpression(
+        compiler.code,
+        compiler.operands,
+        compiler.constants,
+        tuple(compiler.slots),
+    )
+
+
+class _Compiler:
+    def __init__(self, names: Mapping[str, float]) -> None:
+        self.names = names
+        self.code = array("B")
+        self.operands = array("I")
+        self.constants = array("d")
+        self.slots: list[tuple[str, int]] = []
+        self._constant_index: dict[tuple[float, float], int] = {}
+        self._slot_index: dict[tuple[str, int], int] = {}
+
+    def emit(self, opcode: int, operand: int = 0) -> None:
+        self.code.append(opcode)
+        self.operands.append(operand)
+
+    def emit_constant(self, value: float) -> None:
+        # ``0.0`` and ``-0.0`` compare equal but must stay distinct.
+        key = (value, math.copysign(1.0, value))
+        index = self._constant_index.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self._constant_index[key] = index
+        self.emit(OP_CONST, index)
+
+    def emit_call(self, name: str, arity: int) -> None:
+        if arity > 0xFFFF:
+            raise InvalidExpressionError("Too many function arguments.")
+        self.emit(OP_CALL, self.slot(name, arity))
+
+    def emit_error(self, message: str) -> None:
+        # Messages are never identifiers, so they cannot share a function's slot.
+        self.emit(OP_RAISE, self.slot(message, 0))
+
+    def emit_jump(self, opcode: int) -> int:
+        """Emit a jump with a placeholder target and return its position."""
+
+        self.emit(opcode)
+        return len(self.code) - 1
+
+    def land(self, *jumps: int) -> None:
+        """Point ``jumps`` at the next instruction."""
+
+        for jump in jumps:
+            self.operands[jump] = len(self.code)
+
+    def slot(self, name: str, arity: int) -> int:
+        key = (name, arity)
+        index = self._slot_index.get(key)
+        if index is None:
+            index = len(self.slots)
+            self.slots.append(key)
+            self._slot_index[key] = index
+        return index
+
+    def visit(self, node: ast.AST) -> None:
+        if isinstance(node, ast.Expression):
+            self.visit(node.body)
+            return
+
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, (int, float)):
+                self.emit_constant(float(node.value))
+            else:
+                self.emit_error("Unsupported constant type.")
+            return
+
+        if isinstance(node, ast.Name):
+            if node.id in self.names:
+                self.emit_constant(float(self.names[node.id]))
+            else:
+                self.emit_error(f"Unknown identifier '{node.id}'.")
+            return
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            self.visit(node.operand)
+            self.emit(OP_NEG)
+            return
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+            self.visit(node.operand)
+            return
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            self.visit(node.operand)
+            self.emit(OP_NOT)
+            return
+
+        if isinstance(node, ast.IfExp):
+            self.visit_cases([(node.test, node.body)], node.orelse)
+            return
+
+        if isinstance(node, ast.Compare):
+            self.visit_compare(node)
+            return
+
+        if isinstance(node, ast.BoolOp):
+            # ``and`` stops at the first false operand, ``or`` at the first true one.
+            stop = isinstance(node.op, ast.Or)
+            opcode = OP_JUMP_IF_TRUE if stop else OP_JUMP_IF_FALSE
+            stops = []
+            for operand in node.values:
+                self.visit(operand)
+                stops.append(self.emit_jump(opcode))
+            self.emit_constant(float(not stop))
+            done = self.emit_jump(OP_JUMP)
+            self.land(*stops)
+            self.emit_constant(float(stop))
+            self.land(done)
+            return
+
+        if isinstance(node, ast.BinOp):
+            # Both operands run before an unsupported operator is reported.
+            self.visit(node.left)
+            self.visit(node.right)
+            opcode = _BINARY_OPCODES.get(type(node.op))
+            if opcode is None:
+                self.emit_error("Unsupported binary operation.")
+            else:
+                self.emit(opcode)
+            return
+
+        if isinstance(node, ast.List):
+            raise InvalidExpressionError(
+                "Vector and matrix literals cannot be compiled; use evaluate instead."
+            )
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name):
+                self.emit_error("Unsupported function call.")
+                return
+            if is_piecewise(node):
+                try:
+                    pairs, default = split_piecewise(node.args)
+                except ValueError as exc:
+                    self.emit_error(str(exc))
+                    return
+                self.visit_cases(pairs, default)
+                return
+            if bound_call(node, self.names) is not None:
+                raise InvalidExpressionError(
+                    "Bound-variable sum and prod cannot be compiled; use evaluate instead."
+                )
+            for arg in node.args:
+                self.visit(arg)
+            self.emit_call(node.func.id, len(node.args))
+            return
+
+        self.emit_error("Unsupported expression component.")
+
+    def visit_cases(
+        self,
+        pairs: list[tuple[ast.expr, ast.expr]],
+        default: ast.expr | None,
+    ) -> None:
+        done = []
+        for condition, value in pairs:
+            self.visit(condition)
+            skip = self.emit_jump(OP_JUMP_IF_FALSE)
+            self.visit(value)
+            done.append(self.emit_jump(OP_JUMP))
+            self.land(skip)
+        if default is None:
+            self.emit_error("No piecewise condition is true.")
+        else:
+            self.visit(default)
+        self.land(*done)
+
+    def visit_compare(self, node: ast.Compare) -> None:
+        # A chain keeps each inner operand as the left side of the next link
+        # and stops at the first false link without evaluating the rest.
+        self.visit(node.left)
+        failed = []
+        last = len(node.ops) - 1
+        for index, (op, comparator) in enumerate(zip(node.ops, node.comparators)):
+            self.visit(comparator)
+            kind = _COMPARE_KINDS.get(type(op))
+            if kind is None:
+                # Earlier links that fail still jump past the error below.
+                self.emit_error("Unsupported comparison.")
+                break
+            if index == last:
+                self.emit(OP_COMPARE, kind)
+            else:
+                self.emit(OP_COMPARE_KEEP, kind)
+                failed.append(self.emit_jump(OP_JUMP_IF_FALSE))
+        if failed:
+            done = self.emit_jump(OP_JUMP)
+            self.land(*failed)
+            self.emit(OP_POP)
+            self.emit_constant(0.0)
+            self.land(done)
+
+
+def ast_nbytes(node: ast.AST) -> int:
+    """Return the approximate memory footprint of an AST in bytes."""
+
+    total = 0
+    pending: list[object] = [node]
+    seen: set[int] = set()
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, ast.AST):
+            total += sys.getsizeof(item.__dict__)
+            pending.extend(item.__dict__.values())
+        elif isinstance(item, list):
+            pending.extend(item)
+    return total
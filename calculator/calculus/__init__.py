@@ -1,3 +1,3 @@
-"""Symbolic calculus helpers for the calculator."""
+"""Symbolic and numerical calculus helpers for the calculator."""
 
-__all__ = ["operations"]
+__all__ = ["operations", "numeric", "autodiff", "taylor", "roots"]
@@ -0,0 +1,486 @@
+"""Automatic differentiation of general engine expressions.
+
+Forward mode propagates dual numbers (value and tangent) through the
+expression and yields the exact derivative with respect to one variable.
+Reverse mode records every operation on a tape and back-propagates adjoints,
+producing the full gradient of a multi-variable expression in a single pass.
+
+Function values are computed through the engine's
+:class:`~calculator.dispatcher.FunctionDispatcher`, so they match
+:meth:`CalculatorEngine.evaluate` exactly; derivative rules cover every
+built-in scalar function including degree-mode trigonometry, and the
+aggregates over inline values such as ``mean([x, y, 2])``. ``min`` and
+``max`` use the subgradient of the argument they select and ``percentile``
+the slope between the two values it interpolates, so ties give one valid
+choice among several. Aggregates over a registered dataset are constants,
+apart from the ``q`` of ``percentile``; ``sum`` and ``prod`` over a bound
+variable have no rule.
+"""
+
+from __future__ import annotations
+
+import ast
+import math
+from typing import Callable, Mapping, Protocol, Sequence, TypeVar
+
+from calculator.aggregate.datasets import InlineData
+from calculator.basic import operations as basic_ops
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError, OperationNotSupportedError
+from calculator.summation import bound_call
+
+Partials = tuple[float, ...]
+# A rule receives the argument values, the function value and the context and
+# returns the partial derivative with respect to each argument.
+DerivativeRule = Callable[[Sequence[float], float, CalculatorContext], Partials]
+# An aggregate rule receives the values, the extra arguments and the aggregate
+# value and returns the partials for each value followed by each extra argument.
+AggregateRule = Callable[[Sequence[float], Sequence[float], float], Partials]
+
+T = TypeVar("T")
+
+
+def _angle_scale(context: CalculatorContext) -> float:
+    return context.convert_angle(1.0)
+
+
+def _sin_rule(args: Sequence[float], _: float, context: CalculatorContext) -> Partials:
+    return (math.cos(context.convert_angle(args[0])) * _angle_scale(context),)
+
+
+def _cos_rule(args: Sequence[float], _: float, context: CalculatorContext) -> Partials:
+    return (-math.sin(context.convert_angle(args[0])) * _angle_scale(context),)
+
+
+def _tan_rule(args: Sequence[float], value: float, context: CalculatorContext) -> Partials:
+    return ((1.0 + value * value) * _angle_scale(context),)
+
+
+def _log_rule(args: Sequence[float], value: float, _: CalculatorContext) -> Partials:
+    if len(args) == 1:
+        return (1.0 / (args[0] * math.log(10.0)),)
+    x, base = args
+    log_base = math.log(base)
+    return (1.0 / (x * log_base), -value / (base * log_base))
+
+
+def _ln_rule(args: Sequence[float], _: float, __: CalculatorContext) -> Partials:
+    return (1.0 / args[0],)
+
+
+def _exp_rule(_: Sequence[float], value: float, __: CalculatorContext) -> Partials:
+    return (value,)
+
+
+def _sqrt_rule(_: Sequence[float], value: float, __: CalculatorContext) -> Partials:
+    if value == 0:
+        return (math.nan,)
+    return (0.5 / value,)
+
+
+def _pow_partials(base: float, exponent: float, value: float) -> Partials:
+    if exponent == 0:
+        d_base = 0.0
+    elif base == 0 and exponent < 1:
+        d_base = math.nan
+    else:
+        d_base = exponent * math.pow(base, exponent - 1)
+    if base > 0:
+        d_exponent = value * math.log(base)
+    elif base == 0 and exponent > 0:
+        d_exponent = 0.0
+    else:
+        d_exponent = math.nan
+    return (d_base, d_exponent)
+
+
+def _pow_rule(args: Sequence[float], value: float, _: CalculatorContext) -> Partials:
+    return _pow_partials(args[0], args[1], value)
+
+
+DERIVATIVE_RULES: dict[str, DerivativeRule] = {
+    "sin": _sin_rule,
+    "cos": _cos_rule,
+    "tan": _tan_rule,
+    "log": _log_rule,
+    "ln": _ln_rule,
+    "exp": _exp_rule,
+    "sqrt": _sqrt_rule,
+    "pow": _pow_rule,
+}
+
+
+def _sum_rule(values: Sequence[float], _: Sequence[float], __: float) -> Partials:
+    return (1.0,) * len(values)
+
+
+def _mean_rule(values: Sequence[float], _: Sequence[float], __: float) -> Partials:
+    return (1.0 / len(values),) * len(values)
+
+
+def _stdev_rule(values: Sequence[float], _: Sequence[float], value: float) -> Partials:
+    if value == 0:
+        return (math.nan,) * len(values)
+    centre = math.fsum(values) / len(values)
+    scale = 1.0 / ((len(values) - 1) * value)
+    return tuple((item - centre) * scale for item in values)
+
+
+def _selected_rule(values: Sequence[float], _: Sequence[float], value: float) -> Partials:
+    # The subgradient of min/max follows the first argument equal to the result.
+    partials = [0.0] * len(values)
+    partials[values.index(value)] = 1.0
+    return tuple(partials)
+
+
+def _percentile_rule(values: Sequence[float], extra: Sequence[float], _: float) -> Partials:
+    (q,) = extra
+    order = sorted(range(len(values)), key=values.__getitem__)
+    position = (len(values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    fraction = position - lower
+    partials = [0.0] * len(values)
+    partials[order[lower]] += 1.0 - fraction
+    partials[order[upper]] += fraction
+    spread = values[order[upper]] - values[order[lower]]
+    return (*partials, spread * (len(values) - 1) / 100)
+
+
+AGGREGATE_RULES: dict[str, AggregateRule] = {
+    "sum": _sum_rule,
+    "mean": _mean_rule,
+    "stdev": _stdev_rule,
+    "min": _selected_rule,
+    "max": _selected_rule,
+    "percentile": _percentile_rule,
+}
+
+
+def _binary(op: ast.operator, left: float, right: float) -> tuple[float, Partials]:
+    if isinstance(op, ast.Add):
+        return basic_ops.add(left, right), (1.0, 1.0)
+    if isinstance(op, ast.Sub):
+        return basic_ops.subtract(left, right), (1.0, -1.0)
+    if isinstance(op, ast.Mult):
+        return basic_ops.multiply(left, right), (right, left)
+    if isinstance(op, ast.Div):
+        value = basic_ops.divide(left, right)
+        return value, (1.0 / right, -value / right)
+    if isinstance(op, ast.Pow):
+        value = basic_ops.power(left, right)
+        return value, _pow_partials(left, right, value)
+    raise InvalidExpressionError("Unsupported binary operation.")
+
+
+class _Algebra(Protocol[T]):
+    """Operations a differentiation mode must provide to :func:`_walk`."""
+
+    def constant(self, value: float) -> T:
+        """Return the item for a constant."""
+
+    def variable(self, name: str) -> T:
+        """Return the item for the input ``name``."""
+
+    def value(self, item: T) -> float:
+        """Return the value carried by ``item``."""
+
+    def combine(self, value: float, partials: Partials, args: Sequence[T]) -> T:
+        """Return the result of a function of ``args`` with these partials."""
+
+
+class _Dual:
+    __slots__ = ("value", "tangent")
+
+    def __init__(self, value: float, tangent: float) -> None:
+        self.value = value
+        self.tangent = tangent
+
+
+class _Forward:
+    def __init__(self, point: Mapping[str, float], variable: str) -> None:
+        self.point = point
+        self.wrt = variable
+
+    def constant(self, value: float) -> _Dual:
+        return _Dual(value, 0.0)
+
+    def variable(self, name: str) -> _Dual:
+        return _Dual(self.point[name], 1.0 if name == self.wrt else 0.0)
+
+    def value(self, item: _Dual) -> float:
+        return item.value
+
+    def combine(self, value: float, partials: Partials, args: Sequence[_Dual]) -> _Dual:
+        tangent = 0.0
+        for partial, arg in zip(partials, args):
+            # Skipping inactive arguments keeps undefined partials (for
+            # example d/dy of x**y at x < 0) from poisoning the result.
+            if arg.tangent != 0.0:
+                tangent += partial * arg.tangent
+        return _Dual(value, tangent)
+
+
+class _Tape:
+    """Reverse-mode tape; items are node indices and ``-1`` marks constants."""
+
+    def __init__(self, point: Mapping[str, float]) -> None:
+        self.point = point
+        self.values: list[float] = []
+        self.parents: list[tuple[tuple[int, float], ...]] = []
+        self.constants: list[float] = []
+        self.inputs: dict[str, int] = {}
+
+    def _record(self, value: float, parents: tuple[tuple[int, float], ...]) -> int:
+        self.values.append(value)
+        self.parents.append(parents)
+        return len(self.values) - 1
+
+    def constant(self, value: float) -> int:
+        self.constants.append(value)
+        return -len(self.constants)
+
+    def variable(self, name: str) -> int:
+        if name not in self.inputs:
+            self.inputs[name] = self._record(self.point[name], ())
+        return self.inputs[name]
+
+    def value(self, item: int) -> float:
+        if item < 0:
+            return self.constants[-item - 1]
+        return self.values[item]
+
+    def combine(self, value: float, partials: Partials, args: Sequence[int]) -> int:
+        parents = tuple((arg, partial) for arg, partial in zip(args, partials) if arg >= 0)
+        if not parents:
+            return self.constant(value)
+        return self._record(value, parents)
+
+    def backward(self, output: int) -> list[float]:
+        adjoints = [0.0] * len(self.values)
+        if output < 0:
+            return adjoints
+        adjoints[output] = 1.0
+        for index in range(output, -1, -1):
+            adjoint = adjoints[index]
+            if adjoint == 0.0:
+                continue
+            for parent, partial in self.parents[index]:
+                adjoints[parent] += adjoint * partial
+        return adjoints
+
+
+def _walk(
+    node: ast.AST,
+    algebra: _Algebra[T],
+    point: Mapping[str, float],
+    engine: CalculatorEngine,
+    context: CalculatorContext,
+) -> T:
+    if isinstance(node, ast.Expression):
+        return _walk(node.body, algebra, point, engine, context)
+
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, (int, float)):
+            return algebra.constant(float(node.value))
+        raise InvalidExpressionError("Unsupported constant type.")
+
+    if isinstance(node, ast.Name):
+        if node.id in point:
+            return algebra.variable(node.id)
+        if node.id in engine.constants:
+            return algebra.constant(float(engine.constants[node.id]))
+        raise InvalidExpressionError(f"Unknown identifier '{node.id}'.")
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        operand = _walk(node.operand, algebra, point, engine, context)
+        return algebra.combine(-algebra.value(operand), (-1.0,), (operand,))
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+        return _walk(node.operand, algebra, point, engine, context)
+
+    if isinstance(node, ast.BinOp):
+        left = _walk(node.left, algebra, point, engine, context)
+        right = _walk(node.right, algebra, point, engine, context)
+        value, partials = _binary(node.op, algebra.value(left), algebra.value(right))
+        return algebra.combine(value, partials, (left, right))
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name):
+            raise InvalidExpressionError("Unsupported function call.")
+        name = node.func.id.lower()
+        if bound_call(node, point, engine.constants) is not None:
+            raise OperationNotSupportedError(
+                f"No derivative rule for {name}() over a bound variable."
+            )
+        if engine.dispatcher.is_aggregate(name):
+            return _aggregate(node, name, algebra, point, engine, context)
+        args = [_walk(arg, algebra, point, engine, context) for arg in node.args]
+        values = [algebra.value(arg) for arg in args]
+        value = engine.dispatcher.evaluate(name, values, context)
+        rule = DERIVATIVE_RULES.get(name)
+        if rule is None:
+            raise OperationNotSupportedError(f"No derivative rule for function '{name}'.")
+        return algebra.combine(value, rule(values, value, context), args)
+
+    raise InvalidExpressionError("Unsupported expression component.")
+
+
+def _aggregate(
+    node: ast.Call,
+    name: str,
+    algebra: _Algebra[T],
+    point: Mapping[str, float],
+    engine: CalculatorEngine,
+    context: CalculatorContext,
+) -> T:
+    # Arguments are split as in CalculatorEngine: a list literal or dataset
+    # first holds the values and the rest are extra arguments; otherwise
+    # every argument is a value.
+    value_nodes: Sequence[ast.expr] = node.args
+    extra_nodes: Sequence[ast.expr] = ()
+    dataset = None
+    if node.args:
+        first = node.args[0]
+        if isinstance(first, ast.List):
+            value_nodes, extra_nodes = first.elts, node.args[1:]
+        elif isinstance(first, ast.Name) and first.id in engine.datasets:
+            dataset = engine.datasets[first.id]
+            value_nodes, extra_nodes = (), node.args[1:]
+    items = [_walk(arg, algebra, point, engine, context) for arg in value_nodes]
+    extras = [_walk(arg, algebra, point, engine, context) for arg in extra_nodes]
+    values = [algebra.value(item) for item in items]
+    extra = [algebra.value(item) for item in extras]
+    source = InlineData(values) if dataset is None else dataset
+    value = engine.dispatcher.evaluate_aggregate(name, source, extra, context)
+    rule = AGGREGATE_RULES.get(name)
+    if rule is None:
+        raise OperationNotSupportedError(f"No derivative rule for function '{name}'.")
+    if dataset is not None:
+        # Dataset values are constants; only the extra arguments can vary.
+        if not extras:
+            return algebra.constant(value)
+        values = [item for chunk in dataset.iter_chunks() for item in chunk]
+        partials = rule(values, extra, value)[len(values) :]
+        return algebra.combine(value, partials, extras)
+    return algebra.combine(value, rule(values, extra, value), [*items, *extras])
+
+
+def _prepare(
+    engine: CalculatorEngine | None,
+    context: CalculatorContext | None,
+    names: Sequence[str],
+) -> tuple[CalculatorEngine, CalculatorContext]:
+    engine = engine or CalculatorEngine()
+    for name in names:
+        if not name.isidentifier() or name in engine.constants:
+            raise ValueError(f"Invalid variable name '{name}'.")
+    return engine, context or engine.context
+
+
+def _checked(compute: Callable[[], T]) -> T:
+    try:
+        return compute()
+    except (InvalidExpressionError, ZeroDivisionError, OperationNotSupportedError):
+        raise
+    except ValueError as exc:
+        raise InvalidExpressionError(str(exc)) from exc
+
+
+def _require_finite(values: Sequence[float]) -> None:
+    if not all(math.isfinite(value) for value in values):
+        raise ZeroDivisionError("Derivative is undefined at this point.")
+
+
+def derivative(
+    expression: str,
+    variable: str,
+    at: float,
+    *,
+    variables: Mapping[str, float] | None = None,
+    engine: CalculatorEngine | None = None,
+    context: CalculatorContext | None = None,
+) -> float:
+    """Return ``d expression / d variable`` evaluated at ``variable = at``.
+
+    ``variables`` binds any other identifiers used by the expression. The
+    derivative is computed exactly in forward mode, without finite differences.
+    """
+
+    return derivatives(
+        expression,
+        variable,
+        [at],
+        variables=variables,
+        engine=engine,
+        context=context,
+    )[0]
+
+
+def derivatives(
+    expression: str,
+    variable: str,
+    points: Sequence[float],
+    *,
+    variables: Mapping[str, float] | None = None,
+    engine: CalculatorEngine | None = None,
+    context: CalculatorContext | None = None,
+) -> list[float]:
+    """Return the forward-mode derivative at every value in ``points``."""
+
+    bound = dict(variables or {})
+    engine, context = _prepare(engine, context, [variable, *bound])
+    tree = engine.parse(expression)
+
+    results: list[float] = []
+    for at in points:
+        point = {**bound, variable: float(at)}
+        dual = _checked(lambda: _walk(tree, _Forward(point, variable), point, engine, context))
+        results.append(dual.tangent)
+    _require_finite(results)
+    return results
+
+
+def gradient(
+    expression: str,
+    point: Mapping[str, float],
+    *,
+    engine: CalculatorEngine | None = None,
+    context: CalculatorContext | None = None,
+) -> dict[str, float]:
+    """Return the gradient of ``expression`` at ``point`` in one reverse pass.
+
+    ``point`` maps every variable to its value; the result maps each of them
+    to the corresponding partial derivative.
+    """
+
+    return gradients(expression, [point], engine=engine, context=context)[0]
+
+
+def gradients(
+    expression: str,
+    points: Sequence[Mapping[str, float]],
+    *,
+    engine: CalculatorEngine | None = None,
+    context: CalculatorContext | None = None,
+) -> list[dict[str, float]]:
+    """Return the reverse-mode gradient at every mapping in ``points``."""
+
+    names = sorted({name for point in points for name in point})
+    engine, context = _prepare(engine, context, names)
+    tree = engine.parse(expression)
+
+    results: list[dict[str, float]] = []
+    for raw_point in points:
+        point = {name: float(value) for name, value in raw_point.items()}
+        tape = _Tape(point)
+        output = _checked(lambda: _walk(tree, tape, point, engine, context))
+        adjoints = tape.backward(output)
+        grad = {
+            name: adjoints[tape.inputs[name]] if name in tape.inputs else 0.0
+            for name in point
+        }
+        _require_finite(list(grad.values()))
+        results.append(grad)
+    return results
@@ -1,36 +1,220 @@
-"""Symbolic calculus helpers for polynomial expressions."""
+"""Symbolic calculus helpers for polynomial expressions.
+
+:func:`differentiate` and :func:`integrate` handle polynomials in a single
+variable; :func:`differentiate_result` and :func:`integrate_result` return a
+:class:`PolynomialResult` whose text can be streamed in chunks instead.
+:class:`Polynomial` stores polynomials in several variables sparsely
+and provides partial derivatives, gradients, integration with respect to one
+variable and evaluation at many points.
+"""
 
 from __future__ import annotations
 
 import ast
 from collections import defaultdict
+from dataclasses import dataclass
+from fractions import Fraction
+import itertools
+import math
+import operator
+import re
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Sequence, TextIO
+
+try:  # pragma: no cover - exercised only when NumPy is installed
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+
+def differentiate(expression: str, variable: str = "x", order: int = 1) -> str:
+    """Return the ``order``-th derivative of a polynomial expression."""
+
+    return str(differentiate_result(expression, variable, order))
+
+
+def integrate(expression: str, variable: str = "x", order: int = 1) -> str:
+    """Return the ``order``-th indefinite integral of a polynomial expression."""
 
+    return str(integrate_result(expression, variable, order))
 
-def differentiate(expression: str, variable: str = "x") -> str:
-    """Return the derivative of a polynomial expression."""
+
+def derivatives(expression: str, variable: str = "x", n: int | None = None) -> Iterator[str]:
+    """Yield the first ``n`` derivatives of a polynomial expression.
+
+    The expression is parsed once and every order is computed directly from
+    its coefficients, so each step costs time proportional to the number of
+    terms whatever the order. Without ``n`` the derivatives are yielded until
+    the last non-zero one.
+    """
 
     polynomial = _parse_polynomial(expression, variable)
-    derivative: dict[int, float] = {}
+    count = max(polynomial) if n is None else _check_order(n)
+    return (
+        _format_polynomial(_derivative_terms(polynomial, order), variable)
+        for order in range(1, count + 1)
+    )
 
-    for power, coefficient in polynomial.items():
-        if power == 0:
-            continue
-        derivative[power - 1] = derivative.get(power - 1, 0.0) + coefficient * power
 
-    return _format_polynomial(derivative, variable)
+def antiderivatives(expression: str, variable: str = "x", n: int | None = None) -> Iterator[str]:
+    """Yield the first ``n`` repeated indefinite integrals of a polynomial.
+
+    Like :func:`derivatives` the expression is parsed once. Without ``n`` the
+    generator is unbounded.
+    """
+
+    polynomial = _parse_polynomial(expression, variable)
+    orders = itertools.count(1) if n is None else range(1, _check_order(n) + 1)
+    return (
+        _format_polynomial(_antiderivative_terms(polynomial, order), variable)
+        for order in orders
+    )
+
 
+def differentiate_result(
+    expression: str, variable: str = "x", order: int = 1
+) -> PolynomialResult:
+    """Like :func:`differentiate` but return a :class:`PolynomialResult`."""
+
+    polynomial = _parse_polynomial(expression, variable)
+    return PolynomialResult.from_terms(
+        _derivative_terms(polynomial, _check_order(order)), variable
+    )
 
-def integrate(expression: str, variable: str = "x") -> str:
-    """Return the indefinite integral of a polynomial expression."""
+
+def integrate_result(expression: str, variable: str = "x", order: int = 1) -> PolynomialResult:
+    """Like :func:`integrate` but return a :class:`PolynomialResult`."""
 
     polynomial = _parse_polynomial(expression, variable)
-    integral: dict[int, float] = {}
+    return PolynomialResult.from_terms(
+        _antiderivative_terms(polynomial, _check_order(order)), variable
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class PolynomialResult:
+    """A single-variable polynomial result that is formatted on demand.
+
+    ``terms`` holds ``(power, coefficient)`` pairs with non-zero coefficients,
+    highest power first. ``str(result)`` matches :func:`differentiate` and
+    :func:`integrate`; :meth:`chunks` and :meth:`write` produce the same text
+    piece by piece in linear time, so results with hundreds of thousands of
+    terms can be paged or saved without building one huge string.
+    """
+
+    variable: str
+    terms: tuple[tuple[int, float], ...]
+
+    @classmethod
+    def from_terms(cls, terms: Mapping[int, float], variable: str) -> PolynomialResult:
+        """Build a result from a ``power -> coefficient`` mapping."""
+
+        ordered = sorted(((power, coeff) for power, coeff in terms.items() if coeff), reverse=True)
+        return cls(variable, tuple(ordered))
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __str__(self) -> str:
+        return "".join(self.chunks()) or "0"
+
+    @property
+    def degree(self) -> int:
+        """Return the highest power, or ``0`` for a constant result."""
+
+        return self.terms[0][0] if self.terms else 0
+
+    def chunks(
+        self, start: int = 0, stop: int | None = None, size: int = 1000
+    ) -> Iterator[str]:
+        """Yield the text of terms ``start`` to ``stop`` in pieces of ``size`` terms.
 
-    for power, coefficient in polynomial.items():
-        new_power = power + 1
-        integral[new_power] = integral.get(new_power, 0.0) + coefficient / new_power
+        Every term after the first of the polynomial carries its ``" + "`` or
+        ``" - "`` separator, so joining the chunks of consecutive ranges gives
+        the full text. A zero polynomial yields nothing.
+        """
 
-    return _format_polynomial(integral, variable)
+        if size < 1:
+            raise ValueError("Chunk size must be positive.")
+        stop = len(self.terms) if stop is None else min(stop, len(self.terms))
+        variable = self.variable
+        for begin in range(max(start, 0), stop, size):
+            pieces = []
+            for index in range(begin, min(begin + size, stop)):
+                power, coeff = self.terms[index]
+                term = _format_term(power, coeff, variable)
+                if index == 0:
+                    pieces.append(term)
+                elif term.startswith("-"):
+                    pieces.append(f" - {term[1:]}")
+                else:
+                    pieces.append(f" + {term}")
+            yield "".join(pieces)
+
+    def write(self, stream: TextIO, size: int = 1000) -> int:
+        """Write the full text to ``stream`` and return the number of characters."""
+
+        written = 0
+        for chunk in self.chunks(size=size):
+            written += stream.write(chunk)
+        if not self.terms:
+            written += stream.write("0")
+        return written
+
+    def summary(self, leading: int = 4) -> str:
+        """Return the degree, the term count and the first ``leading`` terms."""
+
+        count = len(self.terms)
+        noun = "term" if count == 1 else "terms"
+        text = "".join(self.chunks(stop=leading)) or "0"
+        if count > leading:
+            text += " + …"
+        return f"Degree {self.degree}, {count} {noun}: {text}"
+
+
+def _check_order(order: int) -> int:
+    if isinstance(order, bool) or not isinstance(order, int) or order < 0:
+        raise ValueError("Order must be a non-negative integer.")
+    return order
+
+
+def _derivative_terms(polynomial: dict[int, float], order: int) -> dict[int, float]:
+    # d^k/dx^k x**p = p!/(p-k)! x**(p-k), the falling factorial ``perm(p, k)``.
+    return {
+        power - order: _scale(coeff, math.perm(power, order), 1)
+        for power, coeff in polynomial.items()
+        if power >= order
+    }
+
+
+def _antiderivative_terms(polynomial: dict[int, float], order: int) -> dict[int, float]:
+    return {
+        power + order: _scale(coeff, 1, math.perm(power + order, order))
+        for power, coeff in polynomial.items()
+    }
+
+
+_RANGE_ERROR = "Coefficients exceed the floating-point range."
+
+
+def _scale(coeff: float, numerator: int, denominator: int) -> float:
+    """Return ``coeff * numerator / denominator`` for falling factorials.
+
+    Factorials of high powers do not fit in a float, so the exact product is
+    rounded instead. Coefficients outside the float range raise ``ValueError``,
+    including non-zero ones that would underflow to zero and vanish.
+    """
+
+    try:
+        result = coeff * numerator / denominator
+    except OverflowError:
+        try:
+            result = float(Fraction(coeff) * numerator / denominator)
+        except (OverflowError, ValueError):
+            result = math.inf
+    if not math.isfinite(result) or (result == 0 and coeff != 0):
+        raise ValueError(_RANGE_ERROR)
+    return result
 
 
 def _parse_polynomial(expression: str, variable: str) -> dict[int, float]:
@@ -40,12 +224,12 @@ def _parse_polynomial(expression: str, variable: str) -> dict[int, float]:
     if not variable.isidentifier():
         raise ValueError("Variable name must be a valid identifier.")
 
+    result: dict[int, float] = defaultdict(float)
     try:
-        parsed = ast.parse(expression, mode="eval")
-    except SyntaxError as exc:
-        raise ValueError(f"Unable to parse expression '{expression}'.") from exc
+        _PolynomialScanner(expression, variable).parse_into(result)
+    except _ScannerFallback:
+        result = _collect_from_ast(expression, variable)
 
-    result = _collect_terms(parsed.body, variable)
     cleaned = {power: coeff for power, coeff in result.items() if coeff != 0}
 
     if not cleaned:
@@ -54,63 +238,288 @@ def _parse_polynomial(expression: str, variable: str) -> dict[int, float]:
     return cleaned
 
 
-def _collect_terms(node: ast.AST, variable: str) -> dict[int, float]:
-    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-        return {0: float(node.value)}
-
-    if isinstance(node, ast.Name):
-        if node.id != variable:
-            raise ValueError(f"Unsupported variable '{node.id}'.")
-        return {1: 1.0}
-
-    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
-        terms = _collect_terms(node.operand, variable)
-        return {power: -coeff for power, coeff in terms.items()}
-
-    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
-        return _collect_terms(node.operand, variable)
-
-    if isinstance(node, ast.BinOp):
-        if isinstance(node.op, (ast.Add, ast.Sub)):
-            left = _collect_terms(node.left, variable)
-            right = _collect_terms(node.right, variable)
-            if isinstance(node.op, ast.Sub):
-                right = {power: -coeff for power, coeff in right.items()}
-            return _merge_terms(left, right)
-
-        if isinstance(node.op, ast.Mult):
-            left = _collect_terms(node.left, variable)
-            right = _collect_terms(node.right, variable)
-            if _is_constant(left):
-                return {power: _get_constant(left) * coeff for power, coeff in right.items()}
-            if _is_constant(right):
-                return {power: _get_constant(right) * coeff for power, coeff in left.items()}
-            raise ValueError("Polynomial multiplication must involve a constant factor.")
-
-        if isinstance(node.op, ast.Pow):
-            base = node.left
-            exponent = node.right
-            if not isinstance(base, ast.Name) or base.id != variable:
-                raise ValueError("Only powers of the differentiation variable are supported.")
-            if not isinstance(exponent, ast.Constant) or not isinstance(
-                exponent.value, (int, float)
-            ):
-                raise ValueError("Polynomial exponents must be numeric constants.")
-            power = int(exponent.value)
-            if exponent.value != power or power < 0:
-                raise ValueError("Polynomial exponents must be non-negative integers.")
-            return {power: 1.0}
+# ----------------------------------------------------------------------
+# Linear-time scanner for the common polynomial grammar
+# ----------------------------------------------------------------------
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_][A-Za-z0-9_]*)"
+    r"|(?P<op>\*\*|[-+*()])"
+    r")"
+)
+_TRAILING_SPACE = re.compile(r"\s*")
+_MAX_EXACT_DIGITS = 300
 
-    raise ValueError("Unsupported expression for polynomial calculus operations.")
 
+class _ScannerFallback(Exception):
+    """Raised when input falls outside the scanner grammar.
 
-def _merge_terms(left: dict[int, float], right: dict[int, float]) -> dict[int, float]:
-    result: dict[int, float] = defaultdict(float)
-    for power, coeff in left.items():
-        result[power] += coeff
-    for power, coeff in right.items():
-        result[power] += coeff
-    return dict(result)
+    The caller then uses the AST-based collector, which accepts the same
+    language and produces the established error messages.
+    """
+
+
+class _PolynomialScanner:
+    """Single-pass recursive-descent parser that accumulates terms directly.
+
+    Sums are parsed with a loop rather than recursion, so a polynomial with
+    millions of terms is processed in linear time with memory proportional to
+    the number of distinct powers. Only parenthesised groups recurse and are
+    held in memory until their enclosing term is collected.
+    """
+
+    def __init__(self, expression: str, variable: str) -> None:
+        if expression[:1].isspace():
+            raise _ScannerFallback  # Python rejects leading indentation.
+        self.text = expression
+        self.variable = variable
+        self.position = 0
+        self.kind: str | None = None
+        self.value = ""
+        self.advance()
+
+    def advance(self) -> None:
+        match = _TOKEN.match(self.text, self.position)
+        if match is None or match.end() == self.position:
+            end = _TRAILING_SPACE.match(self.text, self.position).end()  # type: ignore[union-attr]
+            if end != len(self.text):
+                raise _ScannerFallback
+            self.kind = None
+            self.position = end
+            return
+        self.kind = match.lastgroup
+        self.value = match.group(match.lastgroup)  # type: ignore[arg-type]
+        self.position = match.end()
+        if self.kind == "number":
+            # ``2x``, ``1j``, ``0x1f`` or ``1.2.3`` need Python's own parser.
+            following = self.text[self.position : self.position + 1]
+            if following.isalnum() or following in {"_", "."}:
+                raise _ScannerFallback
+
+    def number(self) -> float:
+        text = self.value
+        # Leading zeros are a syntax error and huge literals may overflow in
+        # ways only the AST path reports faithfully.
+        leading_zero = len(text) > 1 and text[0] == "0" and text[1].isdigit()
+        if len(text) > _MAX_EXACT_DIGITS or leading_zero:
+            raise _ScannerFallback
+        value = float(text)
+        if not math.isfinite(value):
+            raise _ScannerFallback
+        self.advance()
+        return value
+
+    def parse_into(self, acc: dict[int, float]) -> None:
+        self.parse_sum(1.0, acc)
+        if self.kind is not None:
+            raise _ScannerFallback
+
+    def parse_sum(self, scale: float, acc: dict[int, float]) -> None:
+        _collect_product(self.parse_term(), scale, acc)
+        while self.kind == "op" and self.value in {"+", "-"}:
+            sign = -1.0 if self.value == "-" else 1.0
+            self.advance()
+            _collect_product(self.parse_term(), scale * sign, acc)
+
+    def parse_term(self) -> list[_Factor]:
+        factors = [self.parse_factor()]
+        while self.kind == "op" and self.value == "*":
+            self.advance()
+            factors.append(self.parse_factor())
+        return factors
+
+    def parse_factor(self) -> _Factor:
+        sign = 1.0
+        while self.kind == "op" and self.value in {"+", "-"}:
+            if self.value == "-":
+                sign = -sign
+            self.advance()
+
+        if self.kind == "number":
+            value = self.number()
+            if self.kind == "op" and self.value == "**":
+                raise _ScannerFallback
+            return (_NUMBER, value, sign)
+
+        if self.kind == "name":
+            if self.value != self.variable:
+                raise _ScannerFallback
+            self.advance()
+            if self.kind == "op" and self.value == "**":
+                self.advance()
+                if self.kind != "number":
+                    raise _ScannerFallback
+                exponent = self.number()
+                power = int(exponent)
+                if exponent != power:
+                    raise _ScannerFallback
+                if self.kind == "op" and self.value == "**":
+                    raise _ScannerFallback
+                return (_POWER, power, sign)
+            return (_POWER, 1, sign)
+
+        if self.kind == "op" and self.value == "(":
+            self.advance()
+            terms = [(1.0, self.parse_term())]
+            while self.kind == "op" and self.value in {"+", "-"}:
+                term_sign = -1.0 if self.value == "-" else 1.0
+                self.advance()
+                terms.append((term_sign, self.parse_term()))
+            if not (self.kind == "op" and self.value == ")"):
+                raise _ScannerFallback
+            self.advance()
+            if self.kind == "op" and self.value == "**":
+                raise _ScannerFallback
+            return (_GROUP, terms, sign)
+
+        raise _ScannerFallback
+
+
+# A parsed factor is ``(kind, payload, sign)``: a number and its value, a power
+# of the variable and its exponent, or a parenthesised group and its
+# ``(sign, factors)`` terms. The helpers below add them to an accumulator with
+# exactly the floating-point operations ``_collect_terms`` performs on the
+# equivalent syntax tree, so both paths produce bit-identical coefficients.
+_NUMBER = 0
+_POWER = 1
+_GROUP = 2
+_Factor = tuple[int, Any, float]
+
+
+def _collect_factor(factor: _Factor, scale: float, acc: dict[int, float]) -> None:
+    kind, payload, sign = factor
+    scale *= sign
+    if kind == _NUMBER:
+        acc[0] += scale * payload
+    elif kind == _POWER:
+        acc[payload] += scale
+    else:
+        for term_sign, factors in payload:
+            _collect_product(factors, scale * term_sign, acc)
+
+
+def _collect_product(factors: list[_Factor], scale: float, acc: dict[int, float]) -> None:
+    """Add ``scale`` times the left-associative product ``factors`` to ``acc``."""
+
+    if len(factors) == 1:
+        _collect_factor(factors[0], scale, acc)
+        return
+    if len(factors) == 2 and factors[0][0] == _NUMBER:
+        # Fast path for ``c*x**n``; ``0.0 +`` mirrors the accumulator update.
+        _, value, sign = factors[0]
+        _collect_factor(factors[1], scale * (0.0 + sign * value), acc)
+        return
+
+    left: dict[int, float] = defaultdict(float)
+    _collect_factor(factors[0], 1.0, left)
+    for index in range(1, len(factors)):
+        last = index == len(factors) - 1
+        target: dict[int, float] = acc if last else defaultdict(float)
+        factor_scale = scale if last else 1.0
+        if _is_constant(left):
+            _collect_factor(factors[index], factor_scale * _get_constant(left), target)
+        else:
+            right: dict[int, float] = defaultdict(float)
+            _collect_factor(factors[index], 1.0, right)
+            if not _is_constant(right):
+                raise _ScannerFallback
+            multiplier = factor_scale * _get_constant(right)
+            for power, coeff in left.items():
+                target[power] += multiplier * coeff
+        left = target
+
+
+# ----------------------------------------------------------------------
+# AST-based collector for everything else
+# ----------------------------------------------------------------------
+def _collect_from_ast(expression: str, variable: str) -> dict[int, float]:
+    try:
+        parsed = ast.parse(expression, mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"Unable to parse expression '{expression}'.") from exc
+    except RecursionError as exc:
+        raise ValueError("Expression is too deeply nested to parse.") from exc
+
+    acc: dict[int, float] = defaultdict(float)
+    _collect_terms(parsed.body, variable, 1.0, acc)
+    return acc
+
+
+def _collect_terms(
+    node: ast.AST,
+    variable: str,
+    scale: float,
+    acc: dict[int, float],
+) -> None:
+    """Add ``scale`` times the polynomial ``node`` into ``acc``.
+
+    Sums and unary signs are walked with an explicit stack, propagating the
+    sign and constant factor downward instead of building and merging a
+    dictionary per node.
+    """
+
+    pending = [(node, scale)]
+    while pending:
+        node, scale = pending.pop()
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            acc[0] += scale * float(node.value)
+            continue
+
+        if isinstance(node, ast.Name):
+            if node.id != variable:
+                raise ValueError(f"Unsupported variable '{node.id}'.")
+            acc[1] += scale
+            continue
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            pending.append((node.operand, -scale))
+            continue
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+            pending.append((node.operand, scale))
+            continue
+
+        if isinstance(node, ast.BinOp):
+            if isinstance(node.op, (ast.Add, ast.Sub)):
+                right_scale = -scale if isinstance(node.op, ast.Sub) else scale
+                # Pushed in reverse so terms are accumulated left to right.
+                pending.append((node.right, right_scale))
+                pending.append((node.left, scale))
+                continue
+
+            if isinstance(node.op, ast.Mult):
+                left: dict[int, float] = defaultdict(float)
+                _collect_terms(node.left, variable, 1.0, left)
+                if _is_constant(left):
+                    pending.append((node.right, scale * _get_constant(left)))
+                    continue
+                right: dict[int, float] = defaultdict(float)
+                _collect_terms(node.right, variable, 1.0, right)
+                if _is_constant(right):
+                    factor = scale * _get_constant(right)
+                    for power, coeff in left.items():
+                        acc[power] += factor * coeff
+                    continue
+                raise ValueError("Polynomial multiplication must involve a constant factor.")
+
+            if isinstance(node.op, ast.Pow):
+                base = node.left
+                exponent = node.right
+                if not isinstance(base, ast.Name) or base.id != variable:
+                    raise ValueError("Only powers of the differentiation variable are supported.")
+                if not isinstance(exponent, ast.Constant) or not isinstance(
+                    exponent.value, (int, float)
+                ):
+                    raise ValueError("Polynomial exponents must be numeric constants.")
+                power = int(exponent.value)
+                if exponent.value != power or power < 0:
+                    raise ValueError("Polynomial exponents must be non-negative integers.")
+                acc[power] += scale
+                continue
+
+        raise ValueError("Unsupported expression for polynomial calculus operations.")
 
 
 def _is_constant(terms: dict[int, float]) -> bool:
@@ -122,51 +531,562 @@ def _get_constant(terms: dict[int, float]) -> float:
 
 
 def _format_polynomial(terms: dict[int, float], variable: str) -> str:
-    if not terms:
-        return "0"
+    return str(PolynomialResult.from_terms(terms, variable))
+
+
+def _format_term(power: int, coeff: float, variable: str) -> str:
+    coeff_str = _format_number(coeff)
+    if power == 0:
+        return coeff_str
+    base = variable if power == 1 else f"{variable}**{power}"
+    if coeff == 1:
+        return base
+    if coeff == -1:
+        return f"-{base}"
+    return f"{coeff_str}*{base}"
+
+
+def _format_number(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return str(value)
+
+
+# ----------------------------------------------------------------------
+# Sparse multivariate polynomials
+# ----------------------------------------------------------------------
+Monomial = tuple[int, ...]
 
-    parts: list[str] = []
-    for power in sorted(terms.keys(), reverse=True):
-        coeff = terms[power]
-        if coeff == 0:
-            continue
 
-        coeff_str = _format_number(coeff)
+@dataclass(frozen=True, slots=True)
+class Polynomial:
+    """Sparse polynomial in several variables.
 
-        if power == 0:
-            term = coeff_str
-        elif power == 1:
-            if coeff == 1:
-                term = variable
-            elif coeff == -1:
-                term = f"-{variable}"
+    ``terms`` maps exponent tuples, aligned with ``variables``, to non-zero
+    coefficients; ``3*x**2*y + y**3`` over ``("x", "y")`` is
+    ``{(2, 1): 3.0, (0, 3): 1.0}``. Only monomials that are present are
+    stored, so operations cost time proportional to the number of terms rather
+    than to the degree in each variable. ``terms`` is copied into a read-only
+    mapping, so polynomials are immutable and hashable.
+    """
+
+    variables: tuple[str, ...]
+    terms: Mapping[Monomial, float]
+
+    def __post_init__(self) -> None:
+        terms = dict(self.terms)
+        if not all(math.isfinite(coeff) for coeff in terms.values()):
+            raise ValueError(_RANGE_ERROR)
+        object.__setattr__(self, "terms", MappingProxyType(terms))
+
+    def __hash__(self) -> int:
+        return hash((self.variables, frozenset(self.terms.items())))
+
+    def __reduce__(self) -> tuple[object, tuple[tuple[str, ...], dict[Monomial, float]]]:
+        return (Polynomial, (self.variables, dict(self.terms)))
+
+    @classmethod
+    def parse(cls, expression: str, variables: Sequence[str] | None = None) -> Polynomial:
+        """Parse ``expression`` as a polynomial in ``variables``.
+
+        Without ``variables`` every identifier in the expression is a variable,
+        in alphabetical order. Unlike :func:`differentiate`, products of
+        non-constant factors and non-negative integer powers of sums are
+        expanded.
+        """
+
+        if not expression.strip():
+            raise ValueError("Expression must not be empty.")
+        if variables is not None:
+            variables = tuple(variables)
+            for name in variables:
+                if not name.isidentifier():
+                    raise ValueError("Variable name must be a valid identifier.")
+            if len(set(variables)) != len(variables):
+                raise ValueError("Variable names must be unique.")
+
+        try:
+            scanner = _MultivariateScanner(expression, variables)
+            terms = scanner.parse()
+            variables = scanner.variables
+        except _ScannerFallback:
+            variables, terms = _collect_multivariate_from_ast(expression, variables)
+
+        return cls(variables, {monomial: coeff for monomial, coeff in terms.items() if coeff})
+
+    def __str__(self) -> str:
+        return _format_multivariate(self.terms, self.variables)
+
+    @property
+    def degree(self) -> int:
+        """Return the total degree, or ``0`` for a constant polynomial."""
+
+        return max((sum(monomial) for monomial in self.terms), default=0)
+
+    def with_variable(self, variable: str) -> Polynomial:
+        """Return the same polynomial with ``variable`` added if it is missing."""
+
+        if variable in self.variables:
+            return self
+        if not variable.isidentifier():
+            raise ValueError("Variable name must be a valid identifier.")
+        variables = tuple(sorted((*self.variables, variable)))
+        position = variables.index(variable)
+        terms = {
+            (*monomial[:position], 0, *monomial[position:]): coeff
+            for monomial, coeff in self.terms.items()
+        }
+        return Polynomial(variables, terms)
+
+    def partial(self, variable: str) -> Polynomial:
+        """Return the partial derivative with respect to ``variable``."""
+
+        if variable not in self.variables:
+            return Polynomial(self.variables, {})
+        position = self.variables.index(variable)
+        terms: dict[Monomial, float] = {}
+        for monomial, coeff in self.terms.items():
+            power = monomial[position]
+            if power == 0:
+                continue
+            # Lowering one exponent maps distinct monomials to distinct ones.
+            lowered = (*monomial[:position], power - 1, *monomial[position + 1 :])
+            terms[lowered] = coeff * power
+        return Polynomial(self.variables, terms)
+
+    def gradient(self) -> tuple[Polynomial, ...]:
+        """Return the partial derivatives in the order of :attr:`variables`."""
+
+        return tuple(self.partial(variable) for variable in self.variables)
+
+    def integrate(self, variable: str) -> Polynomial:
+        """Return the antiderivative with respect to ``variable``.
+
+        The constant of integration, which may depend on the other variables,
+        is taken to be zero.
+        """
+
+        polynomial = self.with_variable(variable)
+        position = polynomial.variables.index(variable)
+        terms: dict[Monomial, float] = {}
+        for monomial, coeff in polynomial.terms.items():
+            power = monomial[position] + 1
+            raised = (*monomial[:position], power, *monomial[position + 1 :])
+            terms[raised] = coeff / power
+        return Polynomial(polynomial.variables, terms)
+
+    def evaluate(self, points: Mapping[str, Sequence[float]]) -> list[float]:
+        """Evaluate the polynomial at many points at once.
+
+        ``points`` maps every variable to a column of coordinates, as the
+        ``columns`` argument of :meth:`CalculatorEngine.evaluate_batch` does.
+        The terms are evaluated with a nested Horner scheme, one variable per
+        level, and every step processes a whole column; NumPy arrays are used
+        when NumPy is installed.
+        """
+
+        missing = [name for name in self.variables if name not in points]
+        if missing:
+            raise ValueError(f"Missing values for variable '{missing[0]}'.")
+        sizes = {len(values) for values in points.values()}
+        if len(sizes) > 1:
+            raise ValueError("All variables must have the same number of points.")
+        size = sizes.pop() if sizes else 1
+
+        columns: list[Any] = [
+            np.asarray(points[name], dtype=np.float64) if np is not None else list(points[name])
+            for name in self.variables
+        ]
+        if not self.terms or size == 0:
+            return [0.0] * size
+
+        ordered = sorted(self.terms.items(), reverse=True)
+        value = _HornerEvaluator(columns).evaluate(ordered, 0)
+        if isinstance(value, float):
+            return [value] * size
+        return value.tolist() if np is not None else value
+
+
+def partial_derivative(
+    expression: str, variable: str = "x", variables: Sequence[str] | None = None
+) -> str:
+    """Return the partial derivative of a multivariate polynomial expression."""
+
+    return str(Polynomial.parse(expression, variables).partial(variable))
+
+
+def gradient(expression: str, variables: Sequence[str] | None = None) -> dict[str, str]:
+    """Return the partial derivatives of a polynomial keyed by variable."""
+
+    polynomial = Polynomial.parse(expression, variables)
+    return {
+        variable: str(partial)
+        for variable, partial in zip(polynomial.variables, polynomial.gradient())
+    }
+
+
+def integrate_partial(
+    expression: str, variable: str = "x", variables: Sequence[str] | None = None
+) -> str:
+    """Return the antiderivative of a multivariate polynomial in one variable."""
+
+    return str(Polynomial.parse(expression, variables).integrate(variable))
+
+
+def evaluate_polynomial(
+    expression: str,
+    points: Mapping[str, Sequence[float]],
+    variables: Sequence[str] | None = None,
+) -> list[float]:
+    """Evaluate a polynomial expression at every point of ``points``."""
+
+    return Polynomial.parse(expression, variables).evaluate(points)
+
+
+_Terms = dict[Monomial, float]
+
+
+class _MultivariateScanner:
+    """Recursive-descent parser producing sparse terms in a single pass.
+
+    Sums are parsed iteratively, so polynomials with tens of thousands of
+    terms are handled without the recursion limits of :func:`ast.parse`.
+    Anything unusual raises :class:`_ScannerFallback` and the AST collector,
+    which accepts the same language, takes over and reports errors.
+    """
+
+    def __init__(self, expression: str, variables: tuple[str, ...] | None) -> None:
+        self.tokens = _tokenize(expression)
+        if variables is None:
+            variables = tuple(sorted({value for kind, value in self.tokens if kind == "name"}))
+        self.variables = variables
+        self.index = {name: position for position, name in enumerate(variables)}
+        self.position = 0
+
+    def peek(self) -> tuple[str, str] | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def accept(self, *operators: str) -> str | None:
+        token = self.peek()
+        if token is not None and token[0] == "op" and token[1] in operators:
+            self.position += 1
+            return token[1]
+        return None
+
+    def parse(self) -> _Terms:
+        terms = self.parse_sum()
+        if self.peek() is not None:
+            raise _ScannerFallback
+        return terms
+
+    def parse_sum(self) -> _Terms:
+        acc: _Terms = defaultdict(float)
+        sign = 1.0
+        while True:
+            coeff, monomial, product = self.parse_term()
+            if product is None:
+                acc[monomial] += sign * coeff
             else:
-                term = f"{coeff_str}*{variable}"
+                scale = sign * coeff
+                for other, value in product.items():
+                    acc[_add_exponents(other, monomial)] += scale * value
+            operator_ = self.accept("+", "-")
+            if operator_ is None:
+                return acc
+            sign = -1.0 if operator_ == "-" else 1.0
+
+    def parse_term(self) -> tuple[float, Monomial, _Terms | None]:
+        # A term is kept as ``coeff * monomial * product`` so the common case
+        # of numbers and variable powers never builds intermediate dicts.
+        coeff = 1.0
+        exponents = [0] * len(self.variables)
+        product: _Terms | None = None
+        while True:
+            sign, factor = self.parse_factor()
+            coeff *= sign
+            if isinstance(factor, float):
+                coeff *= factor
+            elif isinstance(factor, tuple):
+                position, power = factor
+                exponents[position] += power
+            else:
+                product = factor if product is None else _multiply_terms(product, factor)
+            if self.accept("*") is None:
+                return coeff, tuple(exponents), product
+
+    def parse_factor(self) -> tuple[float, float | tuple[int, int] | _Terms]:
+        sign = 1.0
+        while (operator_ := self.accept("+", "-")) is not None:
+            if operator_ == "-":
+                sign = -sign
+
+        token = self.peek()
+        if token is None:
+            raise _ScannerFallback
+        kind, value = token
+        self.position += 1
+        factor: float | tuple[int, int] | _Terms
+        if kind == "number":
+            factor = float(value)
+        elif kind == "name":
+            if value not in self.index:
+                raise _ScannerFallback
+            factor = (self.index[value], 1)
+        elif value == "(":
+            factor = self.parse_sum()
+            if self.accept(")") is None:
+                raise _ScannerFallback
         else:
-            base = f"{variable}**{power}"
-            if coeff == 1:
-                term = base
-            elif coeff == -1:
-                term = f"-{base}"
+            raise _ScannerFallback
+
+        if self.accept("**") is None:
+            return sign, factor
+        token = self.peek()
+        if token is None or token[0] != "number":
+            raise _ScannerFallback
+        self.position += 1
+        exponent = float(token[1])
+        power = int(exponent)
+        if exponent != power or self.accept("**") is not None:
+            raise _ScannerFallback
+        if isinstance(factor, float):
+            try:
+                value = factor**power
+            except OverflowError:
+                value = math.inf
+            if not math.isfinite(value):
+                raise ValueError(_RANGE_ERROR)
+            return sign, value
+        if isinstance(factor, tuple):
+            return sign, (factor[0], factor[1] * power)
+        return sign, _power_terms(factor, power, len(self.variables))
+
+
+def _tokenize(expression: str) -> list[tuple[str, str]]:
+    if expression[:1].isspace():
+        raise _ScannerFallback  # Python rejects leading indentation.
+    tokens: list[tuple[str, str]] = []
+    position = 0
+    while True:
+        match = _TOKEN.match(expression, position)
+        if match is None or match.end() == position:
+            end = _TRAILING_SPACE.match(expression, position).end()  # type: ignore[union-attr]
+            if end != len(expression):
+                raise _ScannerFallback
+            return tokens
+        kind = match.lastgroup
+        value = match.group(kind)  # type: ignore[arg-type]
+        position = match.end()
+        if kind == "number":
+            following = expression[position : position + 1]
+            leading_zero = len(value) > 1 and value[0] == "0" and value[1].isdigit()
+            if (
+                following.isalnum()
+                or following in {"_", "."}
+                or leading_zero
+                or len(value) > _MAX_EXACT_DIGITS
+                or not math.isfinite(float(value))
+            ):
+                raise _ScannerFallback
+        tokens.append((kind, value))  # type: ignore[arg-type]
+
+
+def _collect_multivariate_from_ast(
+    expression: str, variables: tuple[str, ...] | None
+) -> tuple[tuple[str, ...], _Terms]:
+    try:
+        parsed = ast.parse(expression, mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"Unable to parse expression '{expression}'.") from exc
+    except RecursionError as exc:
+        raise ValueError("Expression is too deeply nested to parse.") from exc
+
+    if variables is None:
+        names = {node.id for node in ast.walk(parsed) if isinstance(node, ast.Name)}
+        variables = tuple(sorted(names))
+    index = {name: position for position, name in enumerate(variables)}
+    return variables, _collect_multivariate(parsed.body, index)
+
+
+def _collect_multivariate(node: ast.AST, index: Mapping[str, int]) -> _Terms:
+    """Expand the polynomial ``node`` into sparse terms over ``index``."""
+
+    size = len(index)
+    acc: _Terms = defaultdict(float)
+    pending = [(node, 1.0)]
+    while pending:
+        node, scale = pending.pop()
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            acc[(0,) * size] += scale * float(node.value)
+            continue
+
+        if isinstance(node, ast.Name):
+            if node.id not in index:
+                raise ValueError(f"Unsupported variable '{node.id}'.")
+            monomial = [0] * size
+            monomial[index[node.id]] = 1
+            acc[tuple(monomial)] += scale
+            continue
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            pending.append((node.operand, -scale if isinstance(node.op, ast.USub) else scale))
+            continue
+
+        if isinstance(node, ast.BinOp):
+            if isinstance(node.op, (ast.Add, ast.Sub)):
+                right_scale = -scale if isinstance(node.op, ast.Sub) else scale
+                pending.append((node.right, right_scale))
+                pending.append((node.left, scale))
+                continue
+
+            if isinstance(node.op, ast.Mult):
+                product = _multiply_terms(
+                    _collect_multivariate(node.left, index),
+                    _collect_multivariate(node.right, index),
+                )
+                for monomial, coeff in product.items():
+                    acc[monomial] += scale * coeff
+                continue
+
+            if isinstance(node.op, ast.Pow):
+                exponent = node.right
+                if not isinstance(exponent, ast.Constant) or not isinstance(
+                    exponent.value, (int, float)
+                ):
+                    raise ValueError("Polynomial exponents must be numeric constants.")
+                power = int(exponent.value)
+                if exponent.value != power or power < 0:
+                    raise ValueError("Polynomial exponents must be non-negative integers.")
+                base = _collect_multivariate(node.left, index)
+                for monomial, coeff in _power_terms(base, power, size).items():
+                    acc[monomial] += scale * coeff
+                continue
+
+        raise ValueError("Unsupported expression for polynomial calculus operations.")
+
+    return acc
+
+
+def _add_exponents(left: Monomial, right: Monomial) -> Monomial:
+    return tuple(map(operator.add, left, right))
+
+
+def _multiply_terms(left: _Terms, right: _Terms) -> _Terms:
+    if len(left) < len(right):
+        left, right = right, left
+    result: _Terms = defaultdict(float)
+    for right_monomial, right_coeff in right.items():
+        for left_monomial, left_coeff in left.items():
+            result[_add_exponents(left_monomial, right_monomial)] += left_coeff * right_coeff
+    return result
+
+
+def _power_terms(base: _Terms, power: int, size: int) -> _Terms:
+    result: _Terms = {(0,) * size: 1.0}
+    for _ in range(power):
+        result = _multiply_terms(result, base)
+    return result
+
+
+class _HornerEvaluator:
+    """Column-wise nested Horner evaluation of sorted sparse terms.
+
+    At each level the terms are grouped by the exponent of one variable and
+    ``c_n x^n + ... + c_m x^m`` is computed as ``((c_n x^(n-k) + c_k) ...)x^m``,
+    where every coefficient is the evaluation of the next level. Columns are
+    NumPy arrays or plain lists; scalars stand in for constant columns.
+    """
+
+    def __init__(self, columns: list[Any]) -> None:
+        self.columns = columns
+        self.powers: dict[tuple[int, int], Any] = {}
+
+    def evaluate(self, terms: list[tuple[Monomial, float]], depth: int) -> Any:
+        if depth == len(self.columns):
+            return terms[0][1]
+
+        result: Any = None
+        previous = 0
+        for power, group in itertools.groupby(terms, key=lambda term: term[0][depth]):
+            value = self.evaluate(list(group), depth + 1)
+            if result is None:
+                result = value
+            else:
+                scaled = _multiply_values(result, self.power(depth, previous - power))
+                result = _add_values(scaled, value)
+            previous = power
+        if previous:
+            result = _multiply_values(result, self.power(depth, previous))
+        return result
+
+    def power(self, depth: int, exponent: int) -> Any:
+        key = (depth, exponent)
+        value = self.powers.get(key)
+        if value is None:
+            if exponent == 1:
+                value = self.columns[depth]
             else:
-                term = f"{coeff_str}*{base}"
+                # Squaring with multiplications only, so lists and NumPy arrays
+                # round identically (vectorised ``pow`` need not).
+                half = exponent // 2
+                value = _multiply_values(
+                    self.power(depth, half), self.power(depth, exponent - half)
+                )
+            self.powers[key] = value
+        return value
+
+
+def _add_values(left: Any, right: Any) -> Any:
+    if isinstance(left, list) or isinstance(right, list):
+        return _elementwise(operator.add, left, right)
+    return left + right
+
+
+def _multiply_values(left: Any, right: Any) -> Any:
+    if isinstance(left, list) or isinstance(right, list):
+        return _elementwise(operator.mul, left, right)
+    return left * right
+
+
+def _elementwise(function: Any, left: Any, right: Any) -> list[float]:
+    if not isinstance(left, list):
+        return [function(left, item) for item in right]
+    if not isinstance(right, list):
+        return [function(item, right) for item in left]
+    return list(map(function, left, right))
 
+
+def _format_multivariate(terms: Mapping[Monomial, float], variables: Sequence[str]) -> str:
+    # Graded order: higher total degree first, then lexicographically, which
+    # for one variable matches ``_format_polynomial``.
+    ordered = sorted(terms, key=lambda monomial: (sum(monomial), monomial), reverse=True)
+    parts: list[str] = []
+    for monomial in ordered:
+        coeff = terms[monomial]
+        if coeff == 0:
+            continue
+        factors = [
+            name if power == 1 else f"{name}**{power}"
+            for name, power in zip(variables, monomial)
+            if power
+        ]
+        if not factors:
+            term = _format_number(coeff)
+        elif coeff == 1:
+            term = "*".join(factors)
+        elif coeff == -1:
+            term = "-" + "*".join(factors)
+        else:
+            term = "*".join([_format_number(coeff), *factors])
         parts.append(term)
 
     if not parts:
         return "0"
 
-    formatted = parts[0]
+    pieces = [parts[0]]
     for term in parts[1:]:
-        if term.startswith("-"):
-            formatted += f" - {term[1:]}"
-        else:
-            formatted += f" + {term}"
-
-    return formatted
-
-
-def _format_number(value: float) -> str:
-    if value == int(value):
-        return str(int(value))
-    return str(value)
+        pieces.append(f" - {term[1:]}" if term.startswith("-") else f" + {term}")
+    return "".join(pieces)
@@ -0,0 +1,327 @@
+"""Roots of polynomials in one variable with rigorous error bounds.
+
+Polynomials of moderate degree are solved as the eigenvalues of their
+companion matrix when NumPy is installed. High-degree polynomials, batches of
+many polynomials and installations without NumPy use the Aberth–Ehrlich
+iteration, which refines all roots of a polynomial simultaneously and is
+vectorized over roots and over polynomials of the same degree. Companion
+eigenvalues get a few Aberth steps as well, which polishes them.
+
+Every :class:`Root` carries the radius of a disk around it that is
+guaranteed to contain a zero of the polynomial. The radius is the smallest of
+three classical bounds: the Gerschgorin-type inclusion for simultaneous root
+iterations, ``n * |p(z) / p'(z)|`` and ``(|p(z)| / |a_n|) ** (1 / n)``. All
+three include the rounding error of evaluating ``p``, so the radius stays
+valid, though larger, for clustered and multiple roots.
+"""
+
+from __future__ import annotations
+
+import cmath
+from dataclasses import dataclass
+import math
+import sys
+from typing import Mapping, Sequence, Union
+
+from calculator.calculus.operations import Polynomial, _derivative_terms
+from calculator.exceptions import OperationNotSupportedError
+
+try:  # pragma: no cover - exercised only when NumPy is installed
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+Coefficients = Union[Mapping[int, float], Sequence[float]]
+
+COMPANION_MAX_DEGREE = 64
+MAX_ITERATIONS = 200
+_EPSILON = sys.float_info.epsilon
+# Bounds the memory of the pairwise differences to about 64 MiB.
+_PAIRWISE_BLOCK = 1 << 22
+
+
+@dataclass(frozen=True, slots=True)
+class Root:
+    """A root approximation and the radius of a disk around it holding a zero."""
+
+    value: complex
+    error: float
+
+    def __str__(self) -> str:
+        if self.is_real:
+            return f"{self.value.real:.12g} ± {self.error:.1e}"
+        return f"{self.value.real:.12g}{self.value.imag:+.12g}i ± {self.error:.1e}"
+
+    @property
+    def is_real(self) -> bool:
+        """Whether the error disk reaches the real axis.
+
+        For real coefficients an isolated disk that does is guaranteed to hold
+        a real root, because non-real roots come in conjugate pairs.
+        """
+
+        return abs(self.value.imag) <= self.error
+
+
+def roots(expression: str, variable: str = "x", *, method: str = "auto") -> list[Root]:
+    """Return every root of a polynomial expression, repeated by multiplicity.
+
+    ``method`` is ``"companion"``, ``"aberth"`` or ``"auto"``, which uses
+    companion matrices up to :data:`COMPANION_MAX_DEGREE` when NumPy is
+    available. Roots are sorted by real part, then imaginary part.
+    """
+
+    return polynomial_roots(_parse(expression, variable), method=method)
+
+
+def real_roots(expression: str, variable: str = "x") -> list[float]:
+    """Return the real roots of a polynomial expression in increasing order."""
+
+    return [root.value.real for root in roots(expression, variable) if root.is_real]
+
+
+def critical_points(expression: str, variable: str = "x") -> list[float]:
+    """Return the real roots of the derivative of a polynomial expression."""
+
+    derivative = _derivative_terms(_parse(expression, variable), 1)
+    if not derivative:
+        return []
+    return [root.value.real for root in polynomial_roots(derivative) if root.is_real]
+
+
+def polynomial_roots(coefficients: Coefficients, *, method: str = "auto") -> list[Root]:
+    """Return the roots of the polynomial ``sum(c[k] * x**k)``.
+
+    ``coefficients`` maps powers to coefficients or lists them from the
+    constant term up.
+    """
+
+    return batch_roots([coefficients], method=method)[0]
+
+
+def batch_roots(
+    polynomials: Sequence[str | Coefficients],
+    variable: str = "x",
+    *,
+    method: str = "auto",
+) -> list[list[Root]]:
+    """Return the roots of every polynomial in ``polynomials``.
+
+    Entries are expressions in ``variable`` or coefficient mappings or
+    sequences as for :func:`polynomial_roots`. Polynomials of the same degree
+    are iterated together, so thousands of small polynomials cost little more
+    than a few large ones.
+    """
+
+    if method not in ("auto", "companion", "aberth"):
+        raise ValueError("method must be 'auto', 'companion' or 'aberth'.")
+    if method == "companion" and np is None:
+        raise OperationNotSupportedError("Companion matrix roots require NumPy.")
+
+    results: list[list[Root]] = [[] for _ in polynomials]
+    groups: dict[int, list[tuple[int, list[float]]]] = {}
+    for index, polynomial in enumerate(polynomials):
+        descending, zeros = _normalize(polynomial, variable)
+        results[index] = [Root(0j, 0.0)] * zeros
+        if len(descending) > 1:
+            groups.setdefault(len(descending) - 1, []).append((index, descending))
+
+    for degree, members in groups.items():
+        indices = [index for index, _ in members]
+        rows = [coefficients for _, coefficients in members]
+        if np is None:
+            solved = [_aberth_python(row) for row in rows]
+        else:
+            use_companion = method == "companion" or (
+                method == "auto" and degree <= COMPANION_MAX_DEGREE and len(rows) == 1
+            )
+            solved = _solve_numpy(rows, use_companion)
+        for index, found in zip(indices, solved):
+            results[index].extend(found)
+
+    for found in results:
+        found.sort(key=lambda root: (root.value.real, root.value.imag))
+    return results
+
+
+def _parse(expression: str, variable: str) -> dict[int, float]:
+    # Unlike the single-variable parser, this one expands products and
+    # powers of sums such as (x - 1)**2.
+    polynomial = Polynomial.parse(expression, (variable,))
+    return {power: coeff for (power,), coeff in polynomial.terms.items()}
+
+
+def _normalize(polynomial: str | Coefficients, variable: str) -> tuple[list[float], int]:
+    """Return descending coefficients without zero roots, and the zero count."""
+
+    if isinstance(polynomial, str):
+        terms: Mapping[int, float] = _parse(polynomial, variable)
+    elif isinstance(polynomial, Mapping):
+        terms = polynomial
+    else:
+        terms = dict(enumerate(polynomial))
+    terms = {int(power): float(coeff) for power, coeff in terms.items() if coeff}
+    if any(power < 0 for power in terms):
+        raise ValueError("Powers must be non-negative integers.")
+    if not terms:
+        raise ValueError("Every value is a root of the zero polynomial.")
+    if not all(math.isfinite(coeff) for coeff in terms.values()):
+        raise ValueError("Coefficients must be finite.")
+    lowest = min(terms)
+    degree = max(terms) - lowest
+    return [terms.get(power + lowest, 0.0) for power in range(degree, -1, -1)], lowest
+
+
+# ----------------------------------------------------------------------
+# NumPy implementation, vectorized over polynomials of one degree
+# ----------------------------------------------------------------------
+def _solve_numpy(rows: list[list[float]], use_companion: bool) -> list[list[Root]]:
+    coefficients = np.array(rows, dtype=float)
+    coefficients /= coefficients[:, :1]
+    degree = coefficients.shape[1] - 1
+    if use_companion:
+        companion = np.zeros((len(rows), degree, degree))
+        companion[:, 0, :] = -coefficients[:, 1:]
+        companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1.0
+        z = np.linalg.eigvals(companion).astype(complex)
+    else:
+        z = _initial_guesses(coefficients)
+    z = _aberth_numpy(coefficients, z)
+    radii = _inclusion_radii_numpy(coefficients, z)
+    return [
+        [Root(complex(value), float(radius)) for value, radius in zip(values, bounds)]
+        for values, bounds in zip(z, radii)
+    ]
+
+
+def _initial_guesses(coefficients: np.ndarray) -> np.ndarray:
+    # Points on a circle whose radius is the geometric mean of the root
+    # moduli, rotated off the real axis to break the symmetry.
+    degree = coefficients.shape[1] - 1
+    radius = np.abs(coefficients[:, -1]) ** (1.0 / degree)
+    angles = 2 * np.pi * np.arange(degree) / degree + 0.4
+    return radius[:, None] * np.exp(1j * angles)[None, :]
+
+
+def _horner_numpy(coefficients: np.ndarray, z: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    value = np.ones_like(z)
+    derivative = np.zeros_like(z)
+    for index in range(1, coefficients.shape[1]):
+        derivative = derivative * z + value
+        value = value * z + coefficients[:, index : index + 1]
+    return value, derivative
+
+
+def _pairwise(z: np.ndarray, function: str) -> np.ndarray:
+    """Return ``sum(1 / (z_k - z_j))`` or ``prod(z_k - z_j)`` over ``j != k``."""
+
+    count, degree = z.shape
+    block = max(1, _PAIRWISE_BLOCK // max(1, degree * degree))
+    result = np.empty_like(z)
+    diagonal = np.arange(degree)
+    for start in range(0, count, block):
+        part = z[start : start + block]
+        differences = part[:, :, None] - part[:, None, :]
+        if function == "reciprocal_sum":
+            differences[:, diagonal, diagonal] = np.inf
+            result[start : start + block] = (1.0 / differences).sum(axis=2)
+        else:
+            differences[:, diagonal, diagonal] = 1.0
+            result[start : start + block] = differences.prod(axis=2)
+    return result
+
+
+def _aberth_numpy(coefficients: np.ndarray, z: np.ndarray) -> np.ndarray:
+    degree = coefficients.shape[1] - 1
+    magnitudes = np.abs(coefficients)
+    z = z.copy()
+    active = np.arange(len(z))
+    with np.errstate(all="ignore"):
+        for _ in range(MAX_ITERATIONS):
+            if not active.size:
+                break
+            rows = coefficients[active]
+            current = z[active]
+            value, derivative = _horner_numpy(rows, current)
+            newton = value / derivative
+            step = newton / (1.0 - newton * _pairwise(current, "reciprocal_sum"))
+            # A root is final once its step or its residual is at rounding
+            # level; iterating further only moves it around in the noise.
+            noise, _ = _horner_numpy(magnitudes[active], np.abs(current))
+            done = (np.abs(value) <= 4 * degree * _EPSILON * noise) | (
+                np.abs(step) <= 4 * _EPSILON * np.abs(current)
+            )
+            done |= ~np.isfinite(step)
+            z[active] = np.where(done, current, current - step)
+            active = active[~done.all(axis=1)]
+    return z
+
+
+def _inclusion_radii_numpy(coefficients: np.ndarray, z: np.ndarray) -> np.ndarray:
+    degree = coefficients.shape[1] - 1
+    value, derivative = _horner_numpy(coefficients, z)
+    magnitude, _ = _horner_numpy(np.abs(coefficients), np.abs(z))
+    # Running bound on the rounding error of Horner's scheme.
+    residual = np.abs(value) + 2 * degree * _EPSILON * magnitude
+    with np.errstate(all="ignore"):
+        radii = np.minimum(
+            degree * residual / np.abs(_pairwise(z, "product")),
+            np.minimum(degree * residual / np.abs(derivative), residual ** (1.0 / degree)),
+        )
+    return np.where(np.isnan(radii), np.inf, radii)
+
+
+# ----------------------------------------------------------------------
+# Pure Python fallback
+# ----------------------------------------------------------------------
+def _horner_python(coefficients: Sequence[float], z: complex) -> tuple[complex, complex]:
+    value = 1.0 + 0j
+    derivative = 0j
+    for coeff in coefficients[1:]:
+        derivative = derivative * z + value
+        value = value * z + coeff
+    return value, derivative
+
+
+def _aberth_python(row: Sequence[float]) -> list[Root]:
+    leading = row[0]
+    coefficients = [coeff / leading for coeff in row]
+    degree = len(coefficients) - 1
+    radius = abs(coefficients[-1]) ** (1.0 / degree)
+    z = [radius * cmath.exp(1j * (2 * math.pi * k / degree + 0.4)) for k in range(degree)]
+    magnitudes = [abs(coeff) for coeff in coefficients]
+    done = [False] * degree
+    for _ in range(MAX_ITERATIONS):
+        if all(done):
+            break
+        for k in range(degree):
+            if done[k]:
+                continue
+            value, derivative = _horner_python(coefficients, z[k])
+            noise, _ = _horner_python(magnitudes, complex(abs(z[k])))
+            if abs(value) <= 4 * degree * _EPSILON * noise.real:
+                done[k] = True
+                continue
+            repulsion = sum(1 / (z[k] - z[j]) for j in range(degree) if j != k)
+            try:
+                newton = value / derivative
+                step = newton / (1 - newton * repulsion)
+            except ZeroDivisionError:
+                done[k] = True
+                continue
+            z[k] -= step
+            done[k] = abs(step) <= 4 * _EPSILON * abs(z[k])
+
+    found = []
+    for k in range(degree):
+        value, derivative = _horner_python(coefficients, z[k])
+        magnitude, _ = _horner_python(magnitudes, complex(abs(z[k])))
+        residual = abs(value) + 2 * degree * _EPSILON * magnitude.real
+        product = math.prod(abs(z[k] - z[j]) for j in range(degree) if j != k)
+        radius = residual ** (1.0 / degree)
+        if product:
+            radius = min(radius, degree * residual / product)
+        if derivative:
+            radius = min(radius, degree * residual / abs(derivative))
+        found.append(Root(z[k], radius))
+    return found
@@ -0,0 +1,315 @@
+"""Truncated Taylor series of general engine expressions.
+
+:func:`taylor` walks the expression once, representing every intermediate
+value as the list of its first ``order + 1`` Taylor coefficients around the
+expansion point. Products and quotients are Cauchy products, and ``exp``,
+``ln``/``log``, ``sin``/``cos``/``tan``, ``sqrt`` and powers use the classical
+power-series recurrences, so an expansion costs O(order²) operations per
+node instead of the exponential growth of repeated symbolic differentiation.
+
+The constant term of every function is computed through the engine's
+:class:`~calculator.dispatcher.FunctionDispatcher`, so it matches
+:meth:`CalculatorEngine.evaluate` and domain errors are reported the same
+way. The resulting :class:`TaylorSeries` evaluates cheaply at many points and
+converts to a :class:`~calculator.calculus.operations.Polynomial` whose string
+form :func:`~calculator.calculus.operations.differentiate` and
+:func:`~calculator.calculus.operations.integrate` accept.
+"""
+
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass
+import math
+from typing import Callable, Mapping, Sequence
+
+from calculator.basic import operations as basic_ops
+from calculator.calculus.operations import Polynomial
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError, OperationNotSupportedError
+
+Series = list[float]
+
+
+@dataclass(frozen=True, slots=True)
+class TaylorSeries:
+    """Coefficients of ``sum(c[k] * (variable - center)**k)``."""
+
+    variable: str
+    center: float
+    coefficients: tuple[float, ...]
+
+    def __str__(self) -> str:
+        return str(self.polynomial())
+
+    @property
+    def order(self) -> int:
+        return len(self.coefficients) - 1
+
+    def __call__(self, value: float) -> float:
+        return self.evaluate([value])[0]
+
+    def evaluate(self, points: Sequence[float]) -> list[float]:
+        """Evaluate the truncated series at every value in ``points``.
+
+        Horner's scheme is applied in the shifted variable, which is both
+        cheaper and more accurate near the center than the expanded form.
+        """
+
+        center = self.center
+        coefficients = self.coefficients[::-1]
+        results: list[float] = []
+        for point in points:
+            offset = point - center
+            total = 0.0
+            for coeff in coefficients:
+                total = total * offset + coeff
+            results.append(total)
+        return results
+
+    def polynomial(self) -> Polynomial:
+        """Return the series expanded in powers of :attr:`variable`.
+
+        The expansion is a Taylor shift computed with synthetic division, one
+        O(order) pass per coefficient. For centers far from zero the expanded
+        coefficients may cancel; :meth:`evaluate` avoids that.
+        """
+
+        expanded = list(self.coefficients)
+        # Horner's rule applied repeatedly turns coefficients of (x - c)**k
+        # into coefficients of x**k.
+        for start in range(len(expanded) - 1):
+            for index in range(len(expanded) - 2, start - 1, -1):
+                expanded[index] -= self.center * expanded[index + 1]
+        terms = {(power,): coeff for power, coeff in enumerate(expanded) if coeff}
+        return Polynomial((self.variable,), terms)
+
+
+def taylor(
+    expression: str,
+    variable: str = "x",
+    center: float = 0.0,
+    order: int = 5,
+    *,
+    variables: Mapping[str, float] | None = None,
+    engine: CalculatorEngine | None = None,
+    context: CalculatorContext | None = None,
+) -> TaylorSeries:
+    """Return the Taylor series of ``expression`` truncated after ``order``.
+
+    ``variables`` binds any other identifiers used by the expression to fixed
+    values. A :class:`ZeroDivisionError` is raised when the expression is not
+    analytic at ``center`` (for example ``sqrt(x)`` at ``0``).
+    """
+
+    if isinstance(order, bool) or not isinstance(order, int) or order < 0:
+        raise ValueError("Order must be a non-negative integer.")
+    engine = engine or CalculatorEngine()
+    bound = {name: float(value) for name, value in (variables or {}).items()}
+    for name in (variable, *bound):
+        if not name.isidentifier() or name in engine.constants:
+            raise ValueError(f"Invalid variable name '{name}'.")
+    if variable in bound:
+        raise ValueError(f"Variable '{variable}' must not also be bound.")
+
+    context = context or engine.context
+    walker = _SeriesWalker(order, variable, float(center), bound, engine, context)
+    try:
+        coefficients = walker.visit(engine.parse(expression))
+    except (InvalidExpressionError, ZeroDivisionError, OperationNotSupportedError):
+        raise
+    except ValueError as exc:
+        raise InvalidExpressionError(str(exc)) from exc
+
+    if not all(math.isfinite(coeff) for coeff in coefficients):
+        raise ZeroDivisionError("Taylor series is undefined at this point.")
+    return TaylorSeries(variable, float(center), tuple(coefficients))
+
+
+class _SeriesWalker:
+    def __init__(
+        self,
+        order: int,
+        variable: str,
+        center: float,
+        bound: Mapping[str, float],
+        engine: CalculatorEngine,
+        context: CalculatorContext,
+    ) -> None:
+        self.size = order + 1
+        self.variable = variable
+        self.center = center
+        self.bound = bound
+        self.engine = engine
+        self.context = context
+        self.functions: dict[str, Callable[[list[Series]], Series]] = {
+            "sin": lambda args: self.sin_cos(args[0])[0],
+            "cos": lambda args: self.sin_cos(args[0])[1],
+            "tan": lambda args: self.tan(args[0]),
+            "exp": lambda args: self.exp(args[0]),
+            "ln": lambda args: self.ln(args[0]),
+            "log": self.log,
+            "sqrt": lambda args: self.sqrt(args[0]),
+            "pow": lambda args: self.power(args[0], args[1]),
+        }
+
+    def constant(self, value: float) -> Series:
+        return [value] + [0.0] * (self.size - 1)
+
+    def visit(self, node: ast.AST) -> Series:
+        if isinstance(node, ast.Expression):
+            return self.visit(node.body)
+
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, (int, float)):
+                return self.constant(float(node.value))
+            raise InvalidExpressionError("Unsupported constant type.")
+
+        if isinstance(node, ast.Name):
+            if node.id == self.variable:
+                series = self.constant(self.center)
+                if self.size > 1:
+                    series[1] = 1.0
+                return series
+            if node.id in self.bound:
+                return self.constant(self.bound[node.id])
+            if node.id in self.engine.constants:
+                return self.constant(float(self.engine.constants[node.id]))
+            raise InvalidExpressionError(f"Unknown identifier '{node.id}'.")
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return [-coeff for coeff in self.visit(node.operand)]
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+            return self.visit(node.operand)
+
+        if isinstance(node, ast.BinOp):
+            left = self.visit(node.left)
+            right = self.visit(node.right)
+            if isinstance(node.op, ast.Add):
+                return [basic_ops.add(a, b) for a, b in zip(left, right)]
+            if isinstance(node.op, ast.Sub):
+                return [basic_ops.subtract(a, b) for a, b in zip(left, right)]
+            if isinstance(node.op, ast.Mult):
+                return self.multiply(left, right)
+            if isinstance(node.op, ast.Div):
+                return self.divide(left, right)
+            if isinstance(node.op, ast.Pow):
+                return self.power(left, right)
+            raise InvalidExpressionError("Unsupported binary operation.")
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name):
+                raise InvalidExpressionError("Unsupported function call.")
+            name = node.func.id.lower()
+            args = [self.visit(arg) for arg in node.args]
+            # Validates the name, the arity and the domain at the center.
+            value = self.engine.dispatcher.evaluate(name, [arg[0] for arg in args], self.context)
+            rule = self.functions.get(name)
+            if rule is None:
+                raise OperationNotSupportedError(f"No Taylor series rule for function '{name}'.")
+            series = rule(args)
+            series[0] = value
+            return series
+
+        raise InvalidExpressionError("Unsupported expression component.")
+
+    # ------------------------------------------------------------------
+    # Series arithmetic
+    # ------------------------------------------------------------------
+    def multiply(self, a: Series, b: Series) -> Series:
+        return [sum(a[j] * b[k - j] for j in range(k + 1)) for k in range(self.size)]
+
+    def divide(self, a: Series, b: Series) -> Series:
+        # q = a / b  <=>  q_k = (a_k - sum_{j=1..k} b_j q_{k-j}) / b_0
+        q = [basic_ops.divide(a[0], b[0])]
+        for k in range(1, self.size):
+            q.append((a[k] - sum(b[j] * q[k - j] for j in range(1, k + 1))) / b[0])
+        return q
+
+    def exp(self, a: Series) -> Series:
+        # e' = a' e  =>  k e_k = sum_{j=1..k} j a_j e_{k-j}
+        e = [math.exp(a[0])]
+        for k in range(1, self.size):
+            e.append(sum(j * a[j] * e[k - j] for j in range(1, k + 1)) / k)
+        return e
+
+    def ln(self, a: Series) -> Series:
+        # a l' = a'  =>  l_k = (a_k - sum_{j=1..k-1} j l_j a_{k-j} / k) / a_0
+        if a[0] <= 0:
+            raise ValueError("Logarithm is only defined for positive values.")
+        result = [math.log(a[0])]
+        for k in range(1, self.size):
+            total = sum(j * result[j] * a[k - j] for j in range(1, k))
+            result.append((a[k] - total / k) / a[0])
+        return result
+
+    def log(self, args: list[Series]) -> Series:
+        numerator = self.ln(args[0])
+        if len(args) == 1:
+            return [coeff / math.log(10.0) for coeff in numerator]
+        return self.divide(numerator, self.ln(args[1]))
+
+    def sin_cos(self, a: Series) -> tuple[Series, Series]:
+        # s' = a' c and c' = -a' s, computed together.
+        scale = self.context.convert_angle(1.0)
+        a = [self.context.convert_angle(a[0])] + [coeff * scale for coeff in a[1:]]
+        s = [math.sin(a[0])]
+        c = [math.cos(a[0])]
+        for k in range(1, self.size):
+            s.append(sum(j * a[j] * c[k - j] for j in range(1, k + 1)) / k)
+            c.append(-sum(j * a[j] * s[k - j] for j in range(1, k + 1)) / k)
+        return s, c
+
+    def tan(self, a: Series) -> Series:
+        sine, cosine = self.sin_cos(a)
+        return self.divide(sine, cosine)
+
+    def sqrt(self, a: Series) -> Series:
+        # r**2 = a  =>  r_k = (a_k - sum_{j=1..k-1} r_j r_{k-j}) / (2 r_0)
+        if a[0] < 0:
+            raise ValueError("Square root is only defined for non-negative values.")
+        root = [math.sqrt(a[0])]
+        if self.size > 1 and root[0] == 0:
+            return self._not_analytic(a)
+        for k in range(1, self.size):
+            total = sum(root[j] * root[k - j] for j in range(1, k))
+            root.append((a[k] - total) / (2 * root[0]))
+        return root
+
+    def power(self, a: Series, b: Series) -> Series:
+        if any(b[1:]):
+            # a**b = exp(b ln a) when the exponent varies.
+            return self.exp(self.multiply(b, self.ln(a)))
+
+        exponent = b[0]
+        first = basic_ops.power(a[0], exponent)
+        if exponent == int(exponent) and 0 <= exponent <= 64:
+            result = self.constant(1.0)
+            base = a
+            count = int(exponent)
+            while count:
+                if count & 1:
+                    result = self.multiply(result, base)
+                count >>= 1
+                if count:
+                    base = self.multiply(base, base)
+            result[0] = first
+            return result
+        if a[0] == 0:
+            return self._not_analytic(a)
+
+        # Miller's recurrence for p = a**exponent:
+        # k a_0 p_k = sum_{j=1..k} ((exponent + 1) j - k) a_j p_{k-j}
+        p = [first]
+        for k in range(1, self.size):
+            total = sum(((exponent + 1) * j - k) * a[j] * p[k - j] for j in range(1, k + 1))
+            p.append(total / (k * a[0]))
+        return p
+
+    def _not_analytic(self, a: Series) -> Series:
+        if any(a[1:]):
+            raise ZeroDivisionError("Taylor series is undefined at this point.")
+        # A constant zero argument stays constant.
+        return self.constant(0.0)
@@ -156,14 +156,10 @@ def _format_polynomial(terms: dict[int, float], variable: str) -> str:
     if not parts:
         return "0"
 
-    formatted = parts[0]
+    pieces = [parts[0]]
     for term in parts[1:]:
-        if term.startswith("-"):
-            formatted += f" - {term[1:]}"
-        else:
-            formatted += f" + {term}"
-
-    return formatted
+        pieces.append(f" - {term[1:]}" if term.startswith("-") else f" + {term}")
+    return "".join(pieces)
 
 
 def _format_number(value: float) -> str:
@@ -0,0 +1,234 @@
+"""Thin client for the resident calculator daemon.
+
+The client imports only the standard library pieces it needs, so calling it
+from a shell loop costs little more than interpreter start-up::
+
+    python -m calculator.client "2 * sin(30)" --degrees
+    printf '1+1\\nsqrt(2)\\n' | python -m calculator.client
+    python -m calculator.client --diff x "x**3 + 2*x"
+
+When no daemon is listening the client starts one (see
+:mod:`calculator.daemon`), which stays resident until it has been idle for a
+while.
+
+Requests and replies are single lines of tab-separated fields:
+
+* ``eval EXPRESSION`` evaluates an expression,
+* ``diff VARIABLE ORDER POLYNOMIAL`` and ``integrate VARIABLE ORDER
+  POLYNOMIAL`` run the polynomial calculus helpers,
+* ``set angle_unit|precision VALUE`` changes the context of the connection,
+* ``ping`` and ``shutdown`` check or stop the daemon.
+
+Replies are ``ok RESULT`` or ``error TYPE MESSAGE``.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import sys
+import time
+
+from calculator.exceptions import (
+    CalculatorError,
+    InvalidExpressionError,
+    OperationNotSupportedError,
+)
+
+# ``typing`` alone costs several milliseconds to import.
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import Sequence
+
+START_TIMEOUT = 10.0
+
+_ERRORS: dict[str, type[Exception]] = {
+    "InvalidExpressionError": InvalidExpressionError,
+    "OperationNotSupportedError": OperationNotSupportedError,
+    "ZeroDivisionError": ZeroDivisionError,
+    "ValueError": ValueError,
+    "OverflowError": OverflowError,
+}
+
+
+def default_socket_path() -> str:
+    """Return the per-user socket path shared by the client and the daemon."""
+
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+    if directory and os.path.isdir(directory):
+        return os.path.join(directory, "calculator.sock")
+    return os.path.join("/tmp", f"calculator-{os.getuid()}.sock")
+
+
+class DaemonClient:
+    """One connection to the daemon; its context lasts as long as the connection.
+
+    With ``autostart`` a daemon is launched when nothing listens on ``path``.
+    Errors reported by the daemon are raised as the matching exception type.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        *,
+        autostart: bool = True,
+        idle_timeout: float | None = None,
+    ) -> None:
+        self.path = path or default_socket_path()
+        try:
+            self.sock = self._connect()
+        except OSError:
+            if not autostart:
+                raise
+            self.sock = self._start(idle_timeout)
+        self.reader = self.sock.makefile("r", encoding="utf-8", newline="\n")
+
+    def __enter__(self) -> DaemonClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.reader.close()
+        self.sock.close()
+
+    def request(self, *fields: str) -> str:
+        """Send one request and return the text of an ``ok`` reply."""
+
+        line = "\t".join(" ".join(field.split()) for field in fields) + "\n"
+        self.sock.sendall(line.encode("utf-8"))
+        reply = self.reader.readline()
+        if not reply:
+            raise ConnectionError("The calculator daemon closed the connection.")
+        status, _, rest = reply.rstrip("\n").partition("\t")
+        if status == "ok":
+            return rest
+        kind, _, message = rest.partition("\t")
+        raise _ERRORS.get(kind, CalculatorError)(message)
+
+    def evaluate(self, expression: str) -> str:
+        return self.request("eval", expression)
+
+    def set(self, option: str, value: object) -> None:
+        self.request("set", option, str(value))
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _start(self, idle_timeout: float | None) -> socket.socket:
+        import subprocess
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, (root, env.get("PYTHONPATH"))))
+        command = [sys.executable, "-m", "calculator.daemon", "--socket", self.path]
+        if idle_timeout is not None:
+            command += ["--idle-timeout", str(idle_timeout)]
+        subprocess.Popen(
+            command,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + START_TIMEOUT
+        while True:
+            try:
+                return self._connect()
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.01)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = list(sys.argv[1:] if argv is None else argv)
+    usage = (
+        "usage: python -m calculator.client [--socket PATH] [--degrees] "
+        "[--precision N] [--diff VAR | --integrate VAR] [--order N] [--no-start] "
+        "[--stop] [EXPRESSION ...]"
+    )
+    # argparse alone costs more to import than the rest of the client.
+    path = None
+    options: list[tuple[str, str]] = []
+    operation = None
+    variable = "x"
+    order = "1"
+    autostart = True
+    expressions: list[str] = []
+    try:
+        while args:
+            arg = args.pop(0)
+            if arg in ("-h", "--help"):
+                print(usage)
+                return 0
+            if arg == "--socket":
+                path = args.pop(0)
+            elif arg == "--degrees":
+                options.append(("angle_unit", "degree"))
+            elif arg == "--precision":
+                options.append(("precision", args.pop(0)))
+            elif arg in ("--diff", "--integrate"):
+                operation = "diff" if arg == "--diff" else "integrate"
+                variable = args.pop(0)
+            elif arg == "--order":
+                order = args.pop(0)
+            elif arg == "--no-start":
+                autostart = False
+            elif arg == "--stop":
+                operation = "shutdown"
+            elif arg == "--":
+                expressions.extend(args)
+                args = []
+            else:
+                expressions.append(arg)
+    except IndexError:
+        print(usage, file=sys.stderr)
+        return 2
+
+    try:
+        client = DaemonClient(path, autostart=autostart and operation != "shutdown")
+    except OSError as exc:
+        print(f"error: cannot reach the calculator daemon: {exc}", file=sys.stderr)
+        return 1
+
+    status = 0
+    with client:
+        try:
+            if operation == "shutdown":
+                client.request("shutdown")
+                return 0
+            try:
+                for option, value in options:
+                    client.set(option, value)
+            except ValueError as exc:
+                print(f"error: {exc}", file=sys.stderr)
+                return 2
+            lines = expressions or (line.strip() for line in sys.stdin)
+            for expression in lines:
+                if not expression:
+                    continue
+                try:
+                    if operation is None:
+                        print(client.evaluate(expression))
+                    else:
+                        print(client.request(operation, variable, order, expression))
+                except (CalculatorError, ArithmeticError, ValueError) as exc:
+                    print(f"error: {exc}", file=sys.stderr)
+                    status = 1
+        except ConnectionError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+"""Shared pieces of conditional expressions.
+
+The engine accepts ``a if condition else b``, comparisons (chained as in
+Python), ``and``/``or``/``not`` and ``piecewise(cond1, value1, cond2, value2,
+..., default)``. Conditions are true when non-zero; comparisons and boolean
+operators return ``1.0`` or ``0.0``. Evaluation is lazy: branches that are
+not selected are never evaluated, so ``sqrt(x) if x >= 0 else 0`` is defined
+for every ``x``.
+"""
+
+from __future__ import annotations
+
+import ast
+import operator
+from typing import Callable, Sequence
+
+from calculator.exceptions import InvalidExpressionError
+
+PIECEWISE = "piecewise"
+
+COMPARISONS: dict[type[ast.cmpop], Callable[[float, float], bool]] = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+def is_piecewise(node: ast.Call) -> bool:
+    return isinstance(node.func, ast.Name) and node.func.id.lower() == PIECEWISE
+
+
+def comparison(op: ast.cmpop) -> Callable[[float, float], bool]:
+    """Return the function for the comparison operator ``op``."""
+
+    function = COMPARISONS.get(type(op))
+    if function is None:
+        raise InvalidExpressionError("Unsupported comparison.")
+    return function
+
+
+def split_piecewise(
+    args: Sequence[ast.expr],
+) -> tuple[list[tuple[ast.expr, ast.expr]], ast.expr | None]:
+    """Return the ``(condition, value)`` pairs and the default of a piecewise call."""
+
+    if len(args) < 2:
+        raise ValueError("piecewise expects at least one condition and value.")
+    pairs = [(args[index], args[index + 1]) for index in range(0, len(args) - 1, 2)]
+    default = args[-1] if len(args) % 2 else None
+    return pairs, default
@@ -8,12 +8,25 @@ import math
 _VALID_ANGLE_UNITS = {"radian", "degree"}
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class CalculatorContext:
-    """Hold runtime options for expression evaluation."""
+    """Hold runtime options for expression evaluation.
+
+    Contexts are immutable and hashable so a single instance can be shared
+    between threads and used as a cache key. Use :func:`dataclasses.replace`
+    to derive a context with different options.
+
+    ``approximate`` lets batch evaluation compute ``sin``, ``cos``, ``tan``,
+    ``exp``, ``log``, ``ln`` and ``sqrt`` with the vectorized kernels of
+    :mod:`calculator.scientific.approximate`, trading the bit-identical
+    results of the exact path for throughput. Each result stays within the
+    kernel's documented relative error and errors are raised as usual.
+    Scalar evaluation is always exact.
+    """
 
     angle_unit: str = "radian"
     precision: int = 8
+    approximate: bool = False
 
     def __post_init__(self) -> None:
         if self.angle_unit not in _VALID_ANGLE_UNITS:
@@ -0,0 +1,380 @@
+"""Apply one formula to every row of a CSV file.
+
+Columns are bound to the formula's variables by header name, the file is read
+in fixed-size chunks and each chunk is evaluated with
+:meth:`CalculatorEngine.evaluate_batch`, so memory stays constant however
+large the input is. Run it from the command line with::
+
+    python -m calculator.csvformula prices.csv out.csv "price * exp(-rate * t)"
+
+Rows that fail (unparsable numbers, domain errors, division by zero) get an
+empty result and are listed with their error in an optional side file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import csv
+from dataclasses import dataclass
+import os
+import sys
+import time
+from typing import Any, Mapping, Sequence
+
+from calculator.conditional import is_piecewise
+from calculator.context import CalculatorContext
+from calculator.dispatcher import _check_arity
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import (
+    CalculatorError,
+    InvalidExpressionError,
+    OperationNotSupportedError,
+)
+from calculator.profiling import add_profile_arguments, session_from_args
+from calculator.summation import bound_call
+
+DEFAULT_CHUNK_SIZE = 8192
+# A failing batch is halved this many times before the rows of the slices
+# that still fail are evaluated one by one.
+_BISECT_LEVELS = 2
+
+
+@dataclass(frozen=True, slots=True)
+class FormulaReport:
+    """Summary of one :func:`apply_formula` run."""
+
+    rows: int
+    errors: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def formula_variables(engine: CalculatorEngine, expression: str) -> list[str]:
+    """Return the variable names used by ``expression`` in order of appearance.
+
+    The index of a ``sum`` or ``prod`` over a bound variable, such as ``k`` in
+    ``sum(k**2, k, 1, n)``, is not a variable where the body uses it.
+    """
+
+    tree = engine.parse(expression)
+    names = [node for node in ast.walk(tree) if isinstance(node, ast.Name)]
+    excluded = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    defined = {node.id for node in names}
+    for node in ast.walk(tree):
+        call = bound_call(node, defined) if isinstance(node, ast.Call) else None
+        if call is not None:
+            excluded.add(id(node.args[1]))
+            excluded.update(
+                id(name)
+                for name in ast.walk(call.body)
+                if isinstance(name, ast.Name) and name.id == call.index
+            )
+    nodes = sorted(
+        (
+            node
+            for node in names
+            if id(node) not in excluded and node.id not in engine.constants
+        ),
+        key=lambda node: (node.lineno, node.col_offset),
+    )
+    return list(dict.fromkeys(node.id for node in nodes))
+
+
+def _check_calls(engine: CalculatorEngine, expression: str, variables: Sequence[str]) -> None:
+    for node in ast.walk(engine.parse(expression)):
+        if not isinstance(node, ast.Call) or is_piecewise(node):
+            continue
+        if not isinstance(node.func, ast.Name):
+            raise InvalidExpressionError("Unsupported function call.")
+        if bound_call(node, variables, engine.constants) is not None:
+            continue
+        spec = engine.dispatcher.spec(node.func.id)
+        if spec.arity is not None and not spec.aggregate:
+            try:
+                _check_arity(spec.name, spec.arity, node.args)
+            except ValueError as exc:
+                raise InvalidExpressionError(str(exc)) from exc
+
+
+def apply_formula(
+    input_path: str | os.PathLike[str],
+    output_path: str | os.PathLike[str],
+    expression: str,
+    *,
+    result_column: str = "result",
+    errors_path: str | os.PathLike[str] | None = None,
+    columns: Mapping[str, str] | None = None,
+    delimiter: str = ",",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    round_results: bool = True,
+    engine: CalculatorEngine | None = None,
+    context: CalculatorContext | None = None,
+) -> FormulaReport:
+    """Evaluate ``expression`` for every row of ``input_path``.
+
+    The output repeats each input row followed by ``result_column``. Each
+    variable of the formula is read from the column with the same header
+    unless ``columns`` maps it to another header. Rows that fail are written
+    with an empty result and, when ``errors_path`` is given, recorded there as
+    ``row,error`` where ``row`` counts data rows from 1. Errors that every row
+    would raise, such as an unknown function or a wrong number of arguments,
+    are raised once before any row is read.
+    """
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+    engine = engine or CalculatorEngine()
+    context = context or engine.context
+    variables = formula_variables(engine, expression)
+    _check_calls(engine, expression, variables)
+    mapping = {name: name for name in variables}
+    mapping.update(columns or {})
+
+    started = time.perf_counter()
+    rows = 0
+    errors = 0
+    with open(input_path, newline="", encoding="utf-8-sig") as source, open(
+        output_path, "w", newline="", encoding="utf-8"
+    ) as target:
+        reader = csv.reader(source, delimiter=delimiter)
+        writer = csv.writer(target, delimiter=delimiter)
+        error_file = (
+            open(errors_path, "w", newline="", encoding="utf-8") if errors_path else None
+        )
+        try:
+            error_writer = csv.writer(error_file) if error_file else None
+            if error_writer:
+                error_writer.writerow(["row", "error"])
+
+            header = next(reader, None)
+            if header is None:
+                raise ValueError("Input file is empty.")
+            positions = {}
+            for variable in variables:
+                column = mapping[variable]
+                if column not in header:
+                    raise ValueError(f"Column '{column}' for variable '{variable}' not found.")
+                positions[variable] = header.index(column)
+            writer.writerow([*header, result_column])
+
+            batch = _ChunkEvaluator(engine, expression, context, positions, round_results)
+            chunk: list[list[str]] = []
+            for row in reader:
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    errors += batch.flush(chunk, rows, writer, error_writer)
+                    rows += len(chunk)
+                    chunk = []
+            if chunk:
+                errors += batch.flush(chunk, rows, writer, error_writer)
+                rows += len(chunk)
+        finally:
+            if error_file:
+                error_file.close()
+
+    return FormulaReport(rows, errors, time.perf_counter() - started)
+
+
+class _ChunkEvaluator:
+    def __init__(
+        self,
+        engine: CalculatorEngine,
+        expression: str,
+        context: CalculatorContext,
+        positions: Mapping[str, int],
+        round_results: bool,
+    ) -> None:
+        self.engine = engine
+        self.expression = expression
+        self.context = context
+        self.positions = positions
+        self.round_results = round_results
+        self.vectorized = True
+
+    def flush(
+        self,
+        chunk: list[list[str]],
+        offset: int,
+        writer: Any,
+        error_writer: Any,
+    ) -> int:
+        """Evaluate and write ``chunk``; return the number of failed rows."""
+
+        results: list[object] = [None] * len(chunk)
+        columns: dict[str, list[float]] = {name: [] for name in self.positions}
+        valid: list[int] = []
+        for index, row in enumerate(chunk):
+            try:
+                values = [
+                    (name, float(row[position])) for name, position in self.positions.items()
+                ]
+            except (IndexError, ValueError):
+                results[index] = ValueError("Missing or non-numeric input value.")
+                continue
+            for name, value in values:
+                columns[name].append(value)
+            valid.append(index)
+
+        if valid:
+            self._evaluate(valid, columns, 0, len(valid), results)
+
+        failures = 0
+        for index, (row, result) in enumerate(zip(chunk, results)):
+            if isinstance(result, Exception):
+                failures += 1
+                writer.writerow([*row, ""])
+                if error_writer:
+                    message = str(result) or type(result).__name__
+                    error_writer.writerow([offset + index + 1, message])
+            else:
+                writer.writerow([*row, repr(result)])
+        return failures
+
+    def _evaluate(
+        self,
+        rows: list[int],
+        columns: Mapping[str, list[float]],
+        start: int,
+        stop: int,
+        results: list[object],
+    ) -> None:
+        # Evaluate the slice as one batch; when some row fails, bisect a few
+        # times and then evaluate the rows of the slices that still fail one
+        # by one, which bounds the cost of chunks where many rows fail.
+        pending = [(start, stop, 0)]
+        while pending:
+            low, high, level = pending.pop()
+            if not self.vectorized:
+                self._evaluate_rows(rows, columns, low, high, results)
+                continue
+            sliced = {name: values[low:high] for name, values in columns.items()}
+            try:
+                values = self.engine.evaluate_batch(
+                    self.expression,
+                    sliced,
+                    self.context,
+                    round_results=self.round_results,
+                )
+            except OperationNotSupportedError:
+                raise
+            except Exception:  # noqa: BLE001 - attributed to rows below
+                if high - low > 1 and level < _BISECT_LEVELS:
+                    middle = (low + high) // 2
+                    pending.append((middle, high, level + 1))
+                    pending.append((low, middle, level + 1))
+                elif not self._evaluate_rows(rows, columns, low, high, results):
+                    # No row fails on its own, so the formula uses something
+                    # only the scalar evaluator supports, such as an
+                    # aggregate; stop batching.
+                    self.vectorized = False
+                continue
+            if not columns:
+                values = values * (high - low)
+            for position, value in zip(range(low, high), values):
+                results[rows[position]] = value
+
+    def _evaluate_rows(
+        self,
+        rows: list[int],
+        columns: Mapping[str, list[float]],
+        low: int,
+        high: int,
+        results: list[object],
+    ) -> int:
+        """Evaluate rows ``low`` to ``high`` one by one; return how many failed."""
+
+        failures = 0
+        for position in range(low, high):
+            result = self._evaluate_row(columns, position)
+            failures += isinstance(result, Exception)
+            results[rows[position]] = result
+        return failures
+
+    def _evaluate_row(self, columns: Mapping[str, list[float]], position: int) -> object:
+        variables = {name: values[position] for name, values in columns.items()}
+        try:
+            return self.engine.evaluate(self.expression, self.context, variables=variables)
+        except Exception as exc:  # noqa: BLE001 - reported per row
+            # Only the message is reported. Tracebacks would keep every frame
+            # alive until the chunk is written and slow the garbage collector.
+            exc.__cause__ = exc.__context__ = None
+            return exc.with_traceback(None)
+
+
+def _parse_mapping(text: str) -> tuple[str, str]:
+    variable, separator, column = text.partition("=")
+    if not separator or not variable:
+        raise argparse.ArgumentTypeError(f"Expected VARIABLE=COLUMN, got '{text}'.")
+    return variable, column
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m calculator.csvformula",
+        description="Append the value of a formula over each CSV row as a new column.",
+    )
+    parser.add_argument("input", help="Input CSV file with a header row")
+    parser.add_argument("output", help="Output CSV file")
+    parser.add_argument("formula", help="Expression whose variables are column names")
+    parser.add_argument("--column", default="result", help="Name of the result column")
+    parser.add_argument("--errors", metavar="PATH", help="Write failing rows to PATH")
+    parser.add_argument(
+        "--map",
+        dest="mapping",
+        action="append",
+        type=_parse_mapping,
+        default=[],
+        metavar="VARIABLE=COLUMN",
+        help="Read VARIABLE from a differently named column",
+    )
+    parser.add_argument("--delimiter", default=",")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--angle-unit", choices=("radian", "degree"), default="radian")
+    parser.add_argument("--precision", type=int, default=8)
+    parser.add_argument("--raw", action="store_true", help="Do not round results")
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Use the fast approximate scientific functions (see CalculatorContext)",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    session = session_from_args(args)
+    if session is not None:
+        session.start()
+    try:
+        report = apply_formula(
+            args.input,
+            args.output,
+            args.formula,
+            result_column=args.column,
+            errors_path=args.errors,
+            columns=dict(args.mapping),
+            delimiter=args.delimiter,
+            chunk_size=args.chunk_size,
+            round_results=not args.raw,
+            context=CalculatorContext(args.angle_unit, args.precision, args.approximate),
+        )
+    except (OSError, ValueError, CalculatorError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if session is not None:
+            for path in session.stop():
+                print(f"Profile written to {path}", file=sys.stderr)
+
+    print(
+        f"{report.rows} rows, {report.errors} errors in {report.seconds:.2f} s "
+        f"({report.rows_per_second:.0f} rows/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,223 @@
+"""Resident calculator daemon listening on a Unix domain socket.
+
+The daemon keeps a warm :class:`~calculator.engine.CalculatorEngine` and the
+calculus helpers imported, so a request costs a round trip instead of an
+interpreter start-up plus package import. Start it explicitly with::
+
+    python -m calculator.daemon --idle-timeout 600
+
+or let :mod:`calculator.client` start it on first use. Every connection has
+its own :class:`~calculator.context.CalculatorContext`, initially the engine's
+default, changed with ``set`` requests. The daemon exits after
+``idle_timeout`` seconds without connections or requests. The line protocol
+is described in :mod:`calculator.client`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Sequence
+
+from calculator.calculus import operations as calculus_ops
+from calculator.calculus import taylor as _taylor  # noqa: F401 - kept warm
+from calculator.client import default_socket_path
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+
+DEFAULT_IDLE_TIMEOUT = 900.0
+
+
+def format_result(result: object) -> str:
+    """Return ``result`` as one line of text."""
+
+    if hasattr(result, "tolist"):
+        result = result.tolist()
+    return str(result)
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    server: CalculatorDaemon
+
+    def handle(self) -> None:
+        server = self.server
+        context = server.engine.context
+        server.connection_opened()
+        try:
+            for raw in self.rfile:
+                server.touch()
+                fields = raw.decode("utf-8").rstrip("\r\n").split("\t")
+                command = fields[0]
+                if command == "shutdown":
+                    self.wfile.write(b"ok\t\n")
+                    threading.Thread(target=server.shutdown, daemon=True).start()
+                    return
+                try:
+                    if command == "set":
+                        context = self._set(context, fields[1:])
+                        reply = ""
+                    else:
+                        reply = self._run(command, fields[1:], context)
+                except Exception as exc:
+                    # Any failure is reported on this connection, which keeps
+                    # its context and stays open for the next request.
+                    kind = type(exc).__name__
+                    if isinstance(exc, IndexError):
+                        kind, exc = "ValueError", ValueError("Malformed request.")
+                    message = " ".join(str(exc).split())
+                    self.wfile.write(f"error\t{kind}\t{message}\n".encode("utf-8"))
+                else:
+                    self.wfile.write(f"ok\t{reply}\n".encode("utf-8"))
+        except OSError:
+            return
+        finally:
+            server.connection_closed()
+
+    def _set(self, context: CalculatorContext, fields: list[str]) -> CalculatorContext:
+        option, value = fields
+        if option == "angle_unit":
+            return dataclasses.replace(context, angle_unit=value)
+        if option == "precision":
+            return dataclasses.replace(context, precision=int(value))
+        raise ValueError(f"Unknown option '{option}'.")
+
+    def _run(self, command: str, fields: list[str], context: CalculatorContext) -> str:
+        engine = self.server.engine
+        if command == "eval":
+            (expression,) = fields
+            return format_result(engine.evaluate(expression, context))
+        if command in ("diff", "integrate"):
+            variable, order, expression = fields
+            operation = calculus_ops.differentiate if command == "diff" else calculus_ops.integrate
+            return operation(expression, variable, order=int(order))
+        if command == "ping":
+            return "pong"
+        raise ValueError(f"Unknown command '{command}'.")
+
+
+class CalculatorDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve calculator requests on the Unix socket at ``path``.
+
+    Each connection runs in its own thread and shares :attr:`engine`. The
+    socket is only accessible to the current user.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: str | None = None,
+        *,
+        idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT,
+        engine: CalculatorEngine | None = None,
+    ) -> None:
+        self.path = path or default_socket_path()
+        self.idle_timeout = idle_timeout
+        self.engine = engine or CalculatorEngine()
+        self._lock = threading.Lock()
+        self._connections = 0
+        self._last_activity = time.monotonic()
+        _remove_stale_socket(self.path)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(self.path, _DaemonHandler)
+        finally:
+            os.umask(old_umask)
+        # Warm the parser and the dispatcher before the first request arrives.
+        self.engine.evaluate("sin(1) + sqrt(2) * ln(3) / 4")
+
+    def touch(self) -> None:
+        self._last_activity = time.monotonic()
+
+    def connection_opened(self) -> None:
+        with self._lock:
+            self._connections += 1
+            self.touch()
+
+    def connection_closed(self) -> None:
+        with self._lock:
+            self._connections -= 1
+            self.touch()
+
+    def idle_for(self) -> float:
+        """Seconds since the last request, or ``0.0`` while a client is connected."""
+
+        with self._lock:
+            if self._connections:
+                return 0.0
+            return time.monotonic() - self._last_activity
+
+    def serve(self) -> None:
+        """Serve until shut down or idle for :attr:`idle_timeout` seconds."""
+
+        if self.idle_timeout is not None:
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+        try:
+            self.serve_forever(poll_interval=0.2)
+        finally:
+            self.server_close()
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _watch_idle(self) -> None:
+        assert self.idle_timeout is not None
+        interval = min(1.0, self.idle_timeout / 4)
+        while True:
+            time.sleep(interval)
+            if self.idle_for() >= self.idle_timeout:
+                self.shutdown()
+                return
+
+
+def _remove_stale_socket(path: str) -> None:
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"A calculator daemon is already listening on {path}.")
+    finally:
+        probe.close()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m calculator.daemon",
+        description="Keep a warm calculator engine resident on a Unix socket.",
+    )
+    parser.add_argument("--socket", default=default_socket_path(), help="Socket path")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help="Exit after this many idle seconds (0 disables)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        daemon = CalculatorDaemon(args.socket, idle_timeout=args.idle_timeout or None)
+    except OSError as exc:
+        print(f"error: {exc}")
+        return 1
+    try:
+        daemon.serve()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
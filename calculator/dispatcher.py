@@ -2,34 +2,161 @@
 
 from __future__ import annotations
 
-from typing import Callable, Mapping, MutableMapping, Sequence
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from itertools import repeat
+import math
+import threading
+from typing import Callable, Hashable, Iterable, Mapping, MutableMapping, Sequence
 
+from calculator.aggregate import operations as aggregate_ops
+from calculator.aggregate.datasets import DataSource, InlineData
 from calculator.basic import operations as basic_ops
 from calculator.context import CalculatorContext
+from calculator import interval as interval_ops
 from calculator.exceptions import OperationNotSupportedError
+from calculator.interval import Interval
+from calculator.linalg import operations as linalg_ops
+from calculator.scientific import approximate as approx_ops
 from calculator.scientific import operations as sci_ops
 
 Handler = Callable[[Sequence[float], CalculatorContext], float]
+# Receives the first argument as a column of values and the others as scalars.
+ColumnHandler = Callable[[list[float], Sequence[float], CalculatorContext], list[float]]
+IntervalHandler = Callable[[Sequence[Interval], CalculatorContext], Interval]
+Arity = tuple[int, int | None]
 
+_RADIANS = math.pi / 180
 
-def _default_handlers() -> MutableMapping[str, Handler]:
-    """Return the set of built-in function handlers."""
 
-    def _require_exact(name: str, args: Sequence[float], expected: int) -> list[float]:
-        if len(args) != expected:
-            raise ValueError(f"{name} expects {expected} argument(s).")
-        return list(args)
+@dataclass(slots=True)
+class FunctionStats:
+    """Call statistics collected for a registered function."""
 
-    def make_angle_function(func: Callable[[float], float], name: str) -> Handler:
+    calls: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_evictions: int = 0
+    cache_size: int = 0
+
+
+class _MemoCache:
+    """Bounded least-recently-used cache for pure function results."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> float | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: float) -> bool:
+        """Store ``value`` and return ``True`` when an entry was evicted."""
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                return True
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+@dataclass(slots=True)
+class FunctionSpec:
+    """Metadata describing a registered function handler.
+
+    ``arity`` is a ``(minimum, maximum)`` pair where ``maximum`` may be
+    ``None`` for variadic functions, or ``None`` when the handler validates its
+    own arguments. ``pure`` handlers always return the same result for the same
+    arguments (and context when ``context_dependent`` is set), which makes them
+    eligible for memoization through ``cache_size``.
+
+    ``aggregate`` handlers receive a
+    :class:`~calculator.aggregate.datasets.DataSource` followed by extra scalar
+    arguments, and their ``arity`` counts only those extra arguments. Only
+    handlers flagged with ``accepts_arrays`` may receive vector or matrix values.
+
+    ``column_handler`` optionally evaluates the function for a whole column of
+    first arguments in one call during batch evaluation. It must return exactly
+    what ``handler`` returns row by row and raise the same errors; when the
+    context is ``approximate`` the results may instead differ within the error
+    bounds of :mod:`calculator.scientific.approximate`.
+
+    ``interval_handler`` is the function's interval extension: given intervals
+    for the arguments it returns an :class:`~calculator.interval.Interval`
+    enclosing every value ``handler`` can return for points inside them.
+    """
+
+    name: str
+    handler: Handler
+    arity: Arity | None = None
+    pure: bool = False
+    context_dependent: bool = True
+    expensive: bool = False
+    aggregate: bool = False
+    accepts_arrays: bool = False
+    cache_size: int = 0
+    column_handler: ColumnHandler | None = None
+    interval_handler: IntervalHandler | None = None
+    stats: FunctionStats = field(default_factory=FunctionStats)
+    cache: _MemoCache | None = field(default=None, repr=False)
+
+
+def _normalize_arity(arity: int | Arity | None) -> Arity | None:
+    if arity is None:
+        return None
+    if isinstance(arity, int):
+        minimum, maximum = arity, arity
+    else:
+        minimum, maximum = arity
+    if minimum < 0 or (maximum is not None and maximum < minimum):
+        raise ValueError("arity must be a non-negative count or a valid range.")
+    return (minimum, maximum)
+
+
+def _check_arity(name: str, arity: Arity, args: Sequence[float]) -> None:
+    minimum, maximum = arity
+    count = len(args)
+    if minimum <= count and (maximum is None or count <= maximum):
+        return
+    if minimum == maximum:
+        raise ValueError(f"{name} expects {minimum} argument(s).")
+    if maximum is None:
+        raise ValueError(f"{name} expects at least {minimum} argument(s).")
+    raise ValueError(f"{name} expects {minimum} to {maximum} arguments.")
+
+
+def _cache_key(args: Sequence[float]) -> tuple[tuple[float, float], ...]:
+    # ``0.0`` and ``-0.0`` compare equal but can give different results.
+    return tuple((value, math.copysign(1.0, value)) for value in args)
+
+
+def _default_handlers() -> MutableMapping[str, FunctionSpec]:
+    """Return the set of built-in function specifications."""
+
+    def make_angle_function(func: Callable[[float], float]) -> Handler:
         def handler(args: Sequence[float], context: CalculatorContext) -> float:
-            (value,) = _require_exact(name, args, 1)
+            (value,) = args
             return func(context.convert_angle(value))
 
         return handler
 
-    def make_unary(func: Callable[[float], float], name: str) -> Handler:
+    def make_unary(func: Callable[[float], float]) -> Handler:
         def handler(args: Sequence[float], _: CalculatorContext) -> float:
-            (value,) = _require_exact(name, args, 1)
+            (value,) = args
             return func(value)
 
         return handler
@@ -38,55 +165,456 @@ def _default_handlers() -> MutableMapping[str, Handler]:
         if len(args) == 1:
             (value,) = args
             base = 10.0
-        elif len(args) == 2:
-            value, base = args
         else:
-            raise ValueError("log expects one or two arguments.")
+            value, base = args
         return sci_ops.logarithm(value, base)
 
     def natural_log_handler(args: Sequence[float], context: CalculatorContext) -> float:
-        (value,) = _require_exact("ln", args, 1)
+        (value,) = args
         return sci_ops.logarithm(value, base=sci_ops.EULER_NUMBER)
 
     def power_handler(args: Sequence[float], context: CalculatorContext) -> float:
-        base, exponent = _require_exact("pow", args, 2)
+        base, exponent = args
         return basic_ops.power(base, exponent)
 
-    return {
-        "sin": make_angle_function(lambda value: sci_ops.sine(value), "sin"),
-        "cos": make_angle_function(lambda value: sci_ops.cosine(value), "cos"),
-        "tan": make_angle_function(lambda value: sci_ops.tangent(value), "tan"),
-        "log": logarithm_handler,
-        "ln": natural_log_handler,
-        "exp": make_unary(sci_ops.exponential, "exp"),
-        "sqrt": make_unary(sci_ops.square_root, "sqrt"),
-        "pow": power_handler,
+    # Column handlers call the same ``math`` functions as the scientific
+    # operations through C-level ``map`` loops, validating each column once.
+    # In approximate mode they try the vectorized kernel first; when it gives
+    # up, the exact loop produces the results or raises the usual error.
+    def make_angle_column(
+        func: Callable[[float], float], kernel: Callable[[approx_ops.Array], approx_ops.Array]
+    ) -> ColumnHandler:
+        def handler(
+            values: list[float], _: Sequence[float], context: CalculatorContext
+        ) -> list[float]:
+            degrees = context.angle_unit == "degree"
+            if context.approximate:
+                angle = (lambda array: kernel(array * _RADIANS)) if degrees else kernel
+                results = approx_ops.evaluate(angle, values)
+                if results is not None:
+                    return results
+            if degrees:
+                return list(map(func, map(math.radians, values)))
+            return list(map(func, values))
+
+        return handler
+
+    def exponential_column(
+        values: list[float], _: Sequence[float], context: CalculatorContext
+    ) -> list[float]:
+        if context.approximate:
+            results = approx_ops.evaluate(approx_ops.exponential, values)
+            if results is not None:
+                return results
+        return list(map(math.exp, values))
+
+    def square_root_column(
+        values: list[float], _: Sequence[float], context: CalculatorContext
+    ) -> list[float]:
+        if context.approximate:
+            results = approx_ops.evaluate(approx_ops.square_root, values)
+            if results is not None:
+                return results
+        if any(map((0.0).__gt__, values)):
+            raise ValueError("Square root is only defined for non-negative values.")
+        return list(map(math.sqrt, values))
+
+    def make_logarithm_column(default_base: float) -> ColumnHandler:
+        def handler(
+            values: list[float], rest: Sequence[float], context: CalculatorContext
+        ) -> list[float]:
+            base = rest[0] if rest else default_base
+            if base <= 0 or base == 1:
+                # Row by row, so the first row decides which error is raised.
+                return [sci_ops.logarithm(value, base) for value in values]
+            if context.approximate:
+                scale = math.log(base)
+                results = approx_ops.evaluate(
+                    lambda array: approx_ops.logarithm(array) / scale, values
+                )
+                if results is not None:
+                    return results
+            if any(map((0.0).__ge__, values)):
+                raise ValueError("Logarithm is only defined for positive values.")
+            return list(map(math.log, values, repeat(base)))
+
+        return handler
+
+    def builtin(
+        name: str,
+        handler: Handler,
+        arity: Arity,
+        *,
+        context_dependent: bool = False,
+        column_handler: ColumnHandler | None = None,
+        interval_handler: IntervalHandler | None = None,
+    ) -> FunctionSpec:
+        return FunctionSpec(
+            name=name,
+            handler=handler,
+            arity=arity,
+            pure=True,
+            context_dependent=context_dependent,
+            column_handler=column_handler,
+            interval_handler=interval_handler,
+        )
+
+    specs = [
+        builtin(
+            "sin",
+            make_angle_function(sci_ops.sine),
+            (1, 1),
+            context_dependent=True,
+            column_handler=make_angle_column(math.sin, approx_ops.sine),
+            interval_handler=interval_ops.sine,
+        ),
+        builtin(
+            "cos",
+            make_angle_function(sci_ops.cosine),
+            (1, 1),
+            context_dependent=True,
+            column_handler=make_angle_column(math.cos, approx_ops.cosine),
+            interval_handler=interval_ops.cosine,
+        ),
+        builtin(
+            "tan",
+            make_angle_function(sci_ops.tangent),
+            (1, 1),
+            context_dependent=True,
+            column_handler=make_angle_column(math.tan, approx_ops.tangent),
+            interval_handler=interval_ops.tangent,
+        ),
+        builtin(
+            "log",
+            logarithm_handler,
+            (1, 2),
+            column_handler=make_logarithm_column(10.0),
+            interval_handler=interval_ops.logarithm,
+        ),
+        builtin(
+            "ln",
+            natural_log_handler,
+            (1, 1),
+            column_handler=make_logarithm_column(sci_ops.EULER_NUMBER),
+            interval_handler=interval_ops.natural_log,
+        ),
+        builtin(
+            "exp",
+            make_unary(sci_ops.exponential),
+            (1, 1),
+            column_handler=exponential_column,
+            interval_handler=interval_ops.exponential,
+        ),
+        builtin(
+            "sqrt",
+            make_unary(sci_ops.square_root),
+            (1, 1),
+            column_handler=square_root_column,
+            interval_handler=interval_ops.square_root,
+        ),
+        builtin("pow", power_handler, (2, 2), interval_handler=interval_ops.power_function),
+    ]
+    for name, (handler, arity) in linalg_ops.default_handlers().items():
+        specs.append(
+            FunctionSpec(
+                name=name,
+                handler=handler,
+                arity=arity,
+                pure=True,
+                context_dependent=False,
+                accepts_arrays=True,
+            )
+        )
+    interval_aggregates: dict[str, IntervalHandler] = {
+        "sum": interval_ops.total,
+        "mean": interval_ops.mean,
+        "min": interval_ops.minimum,
+        "max": interval_ops.maximum,
+        "stdev": interval_ops.stdev,
+        "percentile": interval_ops.percentile,
     }
+    for name, (handler, extra) in aggregate_ops.default_aggregates().items():
+        specs.append(
+            FunctionSpec(
+                name=name,
+                handler=handler,  # type: ignore[arg-type]
+                arity=(extra, extra),
+                pure=True,
+                context_dependent=False,
+                aggregate=True,
+                interval_handler=interval_aggregates.get(name),
+            )
+        )
+    return {spec.name: spec for spec in specs}
 
 
 class FunctionDispatcher:
-    """Dispatch named functions to their handlers."""
+    """Dispatch named functions to their handlers.
+
+    Evaluation only reads the registry, so one dispatcher can serve many
+    threads concurrently. Memo caches take a short lock; the plain call
+    counters are updated without locking and are best-effort when the same
+    function is called from several threads at once.
+    """
 
     def __init__(self, handlers: Mapping[str, Handler] | None = None) -> None:
-        self._handlers: MutableMapping[str, Handler] = _default_handlers()
+        self._handlers: MutableMapping[str, FunctionSpec] = _default_handlers()
         if handlers:
             for name, handler in handlers.items():
                 self.register(name, handler)
 
-    def register(self, name: str, handler: Handler) -> None:
-        """Register ``handler`` under ``name``."""
+    def register(
+        self,
+        name: str,
+        handler: Handler,
+        *,
+        arity: int | Arity | None = None,
+        pure: bool = False,
+        context_dependent: bool = True,
+        expensive: bool = False,
+        accepts_arrays: bool = False,
+        cache_size: int = 0,
+        interval_handler: IntervalHandler | None = None,
+    ) -> None:
+        """Register ``handler`` under ``name``.
+
+        ``arity`` is validated before the handler runs. Pure handlers may
+        request a bounded per-function memo cache of ``cache_size`` entries;
+        results are keyed by the arguments and, for ``context_dependent``
+        handlers, by the evaluation context. Handlers that accept vector or
+        matrix arguments must set ``accepts_arrays`` and cannot be memoized.
+        Functions without an ``interval_handler`` cannot be used in interval
+        evaluation.
+        """
 
-        self._handlers[name.lower()] = handler
+        if cache_size < 0:
+            raise ValueError("cache_size must not be negative.")
+        if cache_size and not pure:
+            raise ValueError("Only pure functions can be memoized.")
+        if cache_size and accepts_arrays:
+            raise ValueError("Functions accepting arrays cannot be memoized.")
+
+        key = name.lower()
+        self._handlers[key] = FunctionSpec(
+            name=key,
+            handler=handler,
+            arity=_normalize_arity(arity),
+            pure=pure,
+            context_dependent=context_dependent,
+            expensive=expensive,
+            accepts_arrays=accepts_arrays,
+            cache_size=cache_size,
+            cache=_MemoCache(cache_size) if cache_size else None,
+            interval_handler=interval_handler,
+        )
+
+    def register_aggregate(
+        self,
+        name: str,
+        handler: aggregate_ops.AggregateHandler,
+        *,
+        extra_arity: int = 0,
+        expensive: bool = True,
+    ) -> None:
+        """Register an aggregate ``handler`` under ``name``.
+
+        Aggregates are called as ``name(data, *extra)`` where ``data`` is a list
+        literal or a named dataset; ``extra_arity`` is the number of additional
+        scalar arguments. Called with scalars only, as in ``max(1, 2, 3)``, every
+        argument becomes part of the data.
+        """
+
+        key = name.lower()
+        self._handlers[key] = FunctionSpec(
+            name=key,
+            handler=handler,  # type: ignore[arg-type]
+            arity=_normalize_arity(extra_arity),
+            pure=True,
+            context_dependent=False,
+            expensive=expensive,
+            aggregate=True,
+        )
 
     def unregister(self, name: str) -> None:
         """Remove the handler registered for ``name``."""
 
         self._handlers.pop(name.lower(), None)
 
+    def spec(self, name: str) -> FunctionSpec:
+        """Return the :class:`FunctionSpec` registered for ``name``."""
+
+        key = name.lower()
+        if key not in self._handlers:
+            raise OperationNotSupportedError(f"Unsupported function '{name}'.")
+        return self._handlers[key]
+
+    def is_aggregate(self, name: str) -> bool:
+        """Return whether ``name`` is registered as an aggregate function."""
+
+        spec = self._handlers.get(name.lower())
+        return spec is not None and spec.aggregate
+
+    def names(self) -> list[str]:
+        """Return the names of all registered functions."""
+
+        return sorted(self._handlers)
+
+    def stats(self) -> dict[str, FunctionStats]:
+        """Return a snapshot of the call statistics for every function."""
+
+        snapshot: dict[str, FunctionStats] = {}
+        for name, spec in self._handlers.items():
+            cache_size = len(spec.cache) if spec.cache is not None else 0
+            snapshot[name] = replace(spec.stats, cache_size=cache_size)
+        return snapshot
+
+    def reset_stats(self) -> None:
+        """Reset call statistics and clear every memo cache."""
+
+        for spec in self._handlers.values():
+            spec.stats = FunctionStats()
+            if spec.cache is not None:
+                spec.cache.clear()
+
     def evaluate(self, name: str, args: Sequence[float], context: CalculatorContext) -> float:
         """Evaluate the function ``name`` with ``args`` and ``context``."""
 
         key = name.lower()
-        if key not in self._handlers:
+        spec = self._handlers.get(key)
+        if spec is None:
             raise OperationNotSupportedError(f"Unsupported function '{name}'.")
-        return self._handlers[key](args, context)
+        if spec.aggregate:
+            return self.evaluate_aggregate(name, InlineData(args), (), context)
+        if spec.arity is not None:
+            _check_arity(spec.name, spec.arity, args)
+        if not spec.accepts_arrays and linalg_ops.contains_array(args):
+            raise ValueError(f"{spec.name} does not accept vector or matrix arguments.")
+
+        stats = spec.stats
+        stats.calls += 1
+        cache = spec.cache
+        if cache is None:
+            return spec.handler(args, context)
+
+        cache_key: Hashable = _cache_key(args)
+        if spec.context_dependent:
+            cache_key = (cache_key, context)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            stats.cache_hits += 1
+            return cached
+
+        stats.cache_misses += 1
+        result = spec.handler(args, context)
+        if cache.put(cache_key, result):
+            stats.cache_evictions += 1
+        return result
+
+    def evaluate_many(
+        self,
+        name: str,
+        rows: Iterable[Sequence[float]],
+        context: CalculatorContext,
+    ) -> list[float]:
+        """Evaluate ``name`` once per argument tuple in ``rows``.
+
+        The function is looked up once for the whole batch; memoized functions
+        still consult their cache for every row.
+        """
+
+        key = name.lower()
+        spec = self._handlers.get(key)
+        if spec is None:
+            raise OperationNotSupportedError(f"Unsupported function '{name}'.")
+        if spec.aggregate or spec.cache is not None:
+            return [self.evaluate(name, row, context) for row in rows]
+
+        handler = spec.handler
+        results: list[float] = []
+        append = results.append
+        for row in rows:
+            if spec.arity is not None:
+                _check_arity(spec.name, spec.arity, row)
+            append(handler(row, context))
+        spec.stats.calls += len(results)
+        return results
+
+    def evaluate_columns(
+        self,
+        name: str,
+        args: Sequence[float | list[float]],
+        size: int,
+        context: CalculatorContext,
+    ) -> list[float]:
+        """Evaluate ``name`` element-wise where some ``args`` are columns.
+
+        Every column holds ``size`` values and scalar arguments are repeated.
+        Functions with a ``column_handler`` receive the whole column in one call
+        when only their first argument varies; otherwise this is
+        :meth:`evaluate_many` over the rows.
+        """
+
+        spec = self._handlers.get(name.lower())
+        first = args[0] if args else None
+        if (
+            spec is not None
+            and spec.column_handler is not None
+            and spec.cache is None
+            and isinstance(first, list)
+            and not any(isinstance(arg, list) for arg in args[1:])
+        ):
+            if spec.arity is not None:
+                _check_arity(spec.name, spec.arity, args)
+            results = spec.column_handler(first, args[1:], context)  # type: ignore[arg-type]
+            spec.stats.calls += size
+            return results
+
+        rows = zip(*(arg if isinstance(arg, list) else [arg] * size for arg in args))
+        return self.evaluate_many(name, rows, context)
+
+    def evaluate_interval(
+        self,
+        name: str,
+        args: Sequence[Interval],
+        context: CalculatorContext,
+        extra: Sequence[Interval] = (),
+    ) -> Interval:
+        """Evaluate the interval extension of ``name`` for interval ``args``.
+
+        Aggregates receive their inline values as ``args`` and their extra
+        arguments, such as the ``q`` of ``percentile``, as ``extra``; the
+        handler is called with the values followed by the extra arguments.
+        """
+
+        spec = self._handlers.get(name.lower())
+        if spec is None:
+            raise OperationNotSupportedError(f"Unsupported function '{name}'.")
+        if spec.interval_handler is None:
+            raise OperationNotSupportedError(
+                f"Function '{spec.name}' does not support interval evaluation."
+            )
+        if spec.aggregate:
+            if spec.arity is not None:
+                _check_arity(spec.name, spec.arity, extra)
+            args = [*args, *extra]
+        elif spec.arity is not None:
+            _check_arity(spec.name, spec.arity, args)
+        spec.stats.calls += 1
+        return spec.interval_handler(args, context)
+
+    def evaluate_aggregate(
+        self,
+        name: str,
+        source: DataSource,
+        args: Sequence[float],
+        context: CalculatorContext,
+    ) -> float:
+        """Evaluate the aggregate ``name`` over ``source`` with extra ``args``."""
+
+        spec = self._handlers.get(name.lower())
+        if spec is None or not spec.aggregate:
+            raise OperationNotSupportedError(f"Unsupported aggregate function '{name}'.")
+        if spec.arity is not None:
+            _check_arity(spec.name, spec.arity, args)
+        spec.stats.calls += 1
+        return spec.handler(source, args, context)  # type: ignore[call-arg, arg-type]
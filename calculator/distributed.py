@@ -0,0 +1,632 @@
+"""Distributed batch evaluation over TCP.
+
+Workers are long-running processes that each keep a warm
+:class:`~calculator.engine.CalculatorEngine` and answer batch requests::
+
+    python -m calculator.distributed worker --host 0.0.0.0 --port 7300
+
+A :class:`Coordinator` splits the rows of a batch into shards, sends every
+shard to the live worker with the fewest shards in flight, re-sends the shards
+of workers that disconnect or stop answering, and reassembles the results in
+row order. The result of :meth:`Coordinator.evaluate_batch` matches
+:meth:`CalculatorEngine.evaluate_batch` for the same input.
+
+Messages are length-prefixed binary frames; columns and results travel as
+little-endian float64 arrays, so nothing is pickled. :class:`LocalWorkers`
+starts worker processes on this machine for tests and experiments.
+"""
+
+from __future__ import annotations
+
+import argparse
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+import selectors
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import time
+from typing import Mapping, Sequence
+
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError, OperationNotSupportedError
+
+DEFAULT_PORT = 7300
+DEFAULT_SHARD_SIZE = 8192
+
+_LENGTH = struct.Struct("<I")
+_REQUEST = struct.Struct("<QBBIIHI")  # shard, round, degrees, precision, rows, columns, expr
+_RESPONSE = struct.Struct("<QBI")  # shard, status, payload length
+_NAME = struct.Struct("<H")
+_MAX_FRAME = 1 << 30
+
+_OK = 0
+_ERRORS: tuple[type[Exception], ...] = (
+    InvalidExpressionError,
+    ZeroDivisionError,
+    OperationNotSupportedError,
+    ValueError,
+    OverflowError,
+)
+_OTHER = 255  # any other exception, sent back as RuntimeError("Type: message")
+
+
+@dataclass(frozen=True, slots=True)
+class ShardRequest:
+    """One shard of a batch as sent to a worker."""
+
+    shard: int
+    expression: str
+    columns: Mapping[str, Sequence[float]]
+    rows: int
+    context: CalculatorContext
+    round_results: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class ShardResponse:
+    """Results of a shard, or the error that made it fail."""
+
+    shard: int
+    results: Sequence[float] = ()
+    error: Exception | None = None
+
+
+def _float_bytes(values: Sequence[float]) -> bytes:
+    data = array("d", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _floats(data: bytes | memoryview) -> array:
+    values = array("d")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def encode_request(request: ShardRequest) -> bytes:
+    """Serialize ``request`` into a frame payload."""
+
+    expression = request.expression.encode("utf-8")
+    parts = [
+        _REQUEST.pack(
+            request.shard,
+            request.round_results,
+            request.context.angle_unit == "degree",
+            request.context.precision,
+            request.rows,
+            len(request.columns),
+            len(expression),
+        ),
+        expression,
+    ]
+    for name, values in request.columns.items():
+        encoded = name.encode("utf-8")
+        parts.append(_NAME.pack(len(encoded)))
+        parts.append(encoded)
+        parts.append(_float_bytes(values))
+    return b"".join(parts)
+
+
+def decode_request(payload: bytes) -> ShardRequest:
+    """Rebuild a :class:`ShardRequest` from :func:`encode_request` output."""
+
+    view = memoryview(payload)
+    shard, round_results, degrees, precision, rows, count, length = _REQUEST.unpack_from(view)
+    offset = _REQUEST.size
+    expression = bytes(view[offset : offset + length]).decode("utf-8")
+    offset += length
+    columns: dict[str, array] = {}
+    for _ in range(count):
+        (name_length,) = _NAME.unpack_from(view, offset)
+        offset += _NAME.size
+        name = bytes(view[offset : offset + name_length]).decode("utf-8")
+        offset += name_length
+        columns[name] = _floats(view[offset : offset + 8 * rows])
+        offset += 8 * rows
+    if offset != len(payload):
+        raise ValueError("Malformed shard request.")
+    context = CalculatorContext("degree" if degrees else "radian", precision)
+    return ShardRequest(shard, expression, columns, rows, context, bool(round_results))
+
+
+def encode_response(response: ShardResponse) -> bytes:
+    """Serialize ``response`` into a frame payload."""
+
+    if response.error is None:
+        body = _float_bytes(response.results)
+        status = _OK
+    else:
+        status = next(
+            (
+                index + 1
+                for index, kind in enumerate(_ERRORS)
+                if isinstance(response.error, kind)
+            ),
+            _OTHER,
+        )
+        message = str(response.error)
+        if status == _OTHER:
+            message = f"{type(response.error).__name__}: {message}"
+        body = message.encode("utf-8")
+    return _RESPONSE.pack(response.shard, status, len(body)) + body
+
+
+def decode_response(payload: bytes) -> ShardResponse:
+    """Rebuild a :class:`ShardResponse` from :func:`encode_response` output."""
+
+    shard, status, length = _RESPONSE.unpack_from(payload)
+    body = memoryview(payload)[_RESPONSE.size : _RESPONSE.size + length]
+    if status == _OK:
+        return ShardResponse(shard, _floats(body).tolist())
+    message = bytes(body).decode("utf-8")
+    error = RuntimeError(message) if status == _OTHER else _ERRORS[status - 1](message)
+    return ShardResponse(shard, error=error)
+
+
+def frame(payload: bytes) -> bytes:
+    """Prefix ``payload`` with its length."""
+
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def _read_exactly(stream: socket.socket, size: int) -> bytes | None:
+    chunks = []
+    while size:
+        chunk = stream.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+# ----------------------------------------------------------------------
+# Worker
+# ----------------------------------------------------------------------
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    server: WorkerServer
+
+    def handle(self) -> None:
+        try:
+            self._serve()
+        except OSError:
+            # The coordinator went away; it re-sends whatever was unanswered.
+            return
+
+    def _serve(self) -> None:
+        engine = self.server.engine
+        connection: socket.socket = self.request
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        while True:
+            header = _read_exactly(connection, _LENGTH.size)
+            if header is None:
+                return
+            (length,) = _LENGTH.unpack(header)
+            if length > _MAX_FRAME:
+                return
+            payload = _read_exactly(connection, length)
+            if payload is None:
+                return
+            request = decode_request(payload)
+            try:
+                results = engine.evaluate_batch(
+                    request.expression,
+                    request.columns,
+                    request.context,
+                    round_results=request.round_results,
+                )
+                response = ShardResponse(request.shard, results)
+            except Exception as exc:
+                # Every failure of the expression goes back to the coordinator;
+                # only a lost connection makes it re-send the shard elsewhere.
+                response = ShardResponse(request.shard, error=exc)
+            connection.sendall(frame(encode_response(response)))
+
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    """TCP server answering shard requests with a shared warm engine.
+
+    Each connection is served by its own thread and handles its requests in
+    order, so a coordinator may pipeline several shards on one connection.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", DEFAULT_PORT),
+        engine: CalculatorEngine | None = None,
+    ) -> None:
+        self.engine = engine or CalculatorEngine()
+        super().__init__(address, _WorkerHandler)
+
+
+# ----------------------------------------------------------------------
+# Coordinator
+# ----------------------------------------------------------------------
+@dataclass(slots=True)
+class _Connection:
+    address: tuple[str, int]
+    sock: socket.socket | None = None
+    in_flight: deque[int] = field(default_factory=deque)
+    buffer: bytearray = field(default_factory=bytearray)
+    outgoing: deque[memoryview] = field(default_factory=deque)
+    last_activity: float = 0.0
+    completed: int = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.sock is not None
+
+
+@dataclass(frozen=True, slots=True)
+class WorkerStatus:
+    """Snapshot of one worker as seen by the coordinator."""
+
+    address: tuple[str, int]
+    alive: bool
+    completed: int
+
+
+def parse_address(text: str) -> tuple[str, int]:
+    """Parse ``HOST:PORT`` (or just ``PORT``) into an address tuple."""
+
+    host, separator, port = text.rpartition(":")
+    if not separator:
+        host = "127.0.0.1"
+    return host or "127.0.0.1", int(port)
+
+
+class Coordinator:
+    """Shard batches across workers and reassemble the ordered results.
+
+    ``window`` bounds the number of shards in flight on one connection; new
+    shards go to the live worker with the shortest queue. A worker that
+    closes its connection or sends nothing for ``timeout`` seconds while it
+    has work is marked dead and its shards are queued again, up to
+    ``max_attempts`` sends per shard. Dead workers are reconnected at the
+    start of the next batch.
+    """
+
+    def __init__(
+        self,
+        workers: Sequence[str | tuple[str, int]],
+        *,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        window: int = 2,
+        timeout: float = 30.0,
+        max_attempts: int = 3,
+    ) -> None:
+        if not workers:
+            raise ValueError("At least one worker address is required.")
+        if shard_size <= 0 or window <= 0 or max_attempts <= 0:
+            raise ValueError("shard_size, window and max_attempts must be positive.")
+        self.connections = [
+            _Connection(parse_address(worker) if isinstance(worker, str) else tuple(worker))
+            for worker in workers
+        ]
+        self.shard_size = shard_size
+        self.window = window
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.retries = 0
+
+    def __enter__(self) -> Coordinator:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for connection in self.connections:
+            self._drop(connection)
+
+    def status(self) -> list[WorkerStatus]:
+        return [
+            WorkerStatus(connection.address, connection.alive, connection.completed)
+            for connection in self.connections
+        ]
+
+    def evaluate_batch(
+        self,
+        expression: str,
+        variables: Mapping[str, Sequence[float]],
+        context: CalculatorContext | None = None,
+        *,
+        round_results: bool = True,
+    ) -> list[float]:
+        """Evaluate ``expression`` for every row of ``variables`` on the workers.
+
+        When any shard fails the error of the first failing shard is raised,
+        as a single engine would fail the whole batch.
+        """
+
+        context = context or CalculatorContext()
+        columns = {name: list(map(float, values)) for name, values in variables.items()}
+        sizes = {len(column) for column in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("All variable columns must have the same length.")
+        size = sizes.pop() if sizes else 1
+
+        payloads = []
+        for shard, start in enumerate(range(0, max(size, 1), self.shard_size)):
+            stop = min(start + self.shard_size, size)
+            request = ShardRequest(
+                shard,
+                expression,
+                {name: column[start:stop] for name, column in columns.items()},
+                stop - start if columns else 1,
+                context,
+                round_results,
+            )
+            payloads.append(frame(encode_request(request)))
+
+        responses = self._run(payloads)
+        failures = [response for response in responses if response.error is not None]
+        if failures:
+            raise failures[0].error  # type: ignore[misc]
+        results: list[float] = []
+        for response in responses:
+            results.extend(response.results)
+        if not columns:
+            return results * size
+        return results
+
+    # ------------------------------------------------------------------
+    def _run(self, payloads: list[bytes]) -> list[ShardResponse]:
+        for connection in self.connections:
+            if not connection.alive:
+                self._connect(connection)
+
+        pending = deque(range(len(payloads)))
+        attempts = [0] * len(payloads)
+        responses: list[ShardResponse | None] = [None] * len(payloads)
+        remaining = len(payloads)
+        selector = selectors.DefaultSelector()
+        for connection in self.connections:
+            if connection.sock is not None:
+                selector.register(connection.sock, selectors.EVENT_READ, connection)
+
+        try:
+            while remaining:
+                self._dispatch(pending, payloads, attempts, selector)
+                live = [connection for connection in self.connections if connection.alive]
+                if not live:
+                    raise ConnectionError("No live workers are available.")
+
+                for key, events in selector.select(timeout=min(self.timeout, 0.5)):
+                    connection = key.data
+                    if events & selectors.EVENT_WRITE and connection.alive:
+                        self._flush(connection, selector, pending)
+                    if events & selectors.EVENT_READ and connection.alive:
+                        for response in self._receive(connection, selector, pending):
+                            if responses[response.shard] is None:
+                                responses[response.shard] = response
+                                remaining -= 1
+
+                now = time.monotonic()
+                for connection in live:
+                    if connection.in_flight and now - connection.last_activity > self.timeout:
+                        self._fail(connection, selector, pending)
+        finally:
+            selector.close()
+        return responses  # type: ignore[return-value]
+
+    def _dispatch(
+        self,
+        pending: deque[int],
+        payloads: list[bytes],
+        attempts: list[int],
+        selector: selectors.BaseSelector,
+    ) -> None:
+        while pending:
+            candidates = [
+                connection
+                for connection in self.connections
+                if connection.alive and len(connection.in_flight) < self.window
+            ]
+            if not candidates:
+                return
+            connection = min(candidates, key=lambda item: len(item.in_flight))
+            shard = pending[0]
+            if attempts[shard] >= self.max_attempts:
+                raise ConnectionError(f"Shard {shard} failed on {attempts[shard]} attempts.")
+            pending.popleft()
+            attempts[shard] += 1
+            if not connection.in_flight:
+                connection.last_activity = time.monotonic()
+            connection.in_flight.append(shard)
+            # Sends never block: a worker answers its shards in order, so
+            # blocking on the next request while its previous reply waits
+            # unread would deadlock both sides.
+            connection.outgoing.append(memoryview(payloads[shard]))
+            self._flush(connection, selector, pending)
+
+    def _flush(
+        self,
+        connection: _Connection,
+        selector: selectors.BaseSelector,
+        pending: deque[int],
+    ) -> None:
+        """Send what the socket accepts now and watch it for the rest."""
+
+        outgoing = connection.outgoing
+        try:
+            while outgoing:
+                sent = connection.sock.send(outgoing[0])  # type: ignore[union-attr]
+                connection.last_activity = time.monotonic()
+                if sent < len(outgoing[0]):
+                    outgoing[0] = outgoing[0][sent:]
+                    break
+                outgoing.popleft()
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._fail(connection, selector, pending)
+            return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if outgoing else 0)
+        selector.modify(connection.sock, events, connection)
+
+    def _receive(
+        self,
+        connection: _Connection,
+        selector: selectors.BaseSelector,
+        pending: deque[int],
+    ) -> list[ShardResponse]:
+        try:
+            chunk = connection.sock.recv(1 << 20)  # type: ignore[union-attr]
+        except BlockingIOError:
+            return []
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self._fail(connection, selector, pending)
+            return []
+        connection.last_activity = time.monotonic()
+        buffer = connection.buffer
+        buffer.extend(chunk)
+        responses = []
+        while len(buffer) >= _LENGTH.size:
+            (length,) = _LENGTH.unpack_from(buffer)
+            if len(buffer) < _LENGTH.size + length:
+                break
+            payload = bytes(buffer[_LENGTH.size : _LENGTH.size + length])
+            del buffer[: _LENGTH.size + length]
+            response = decode_response(payload)
+            if response.shard in connection.in_flight:
+                connection.in_flight.remove(response.shard)
+            connection.completed += 1
+            responses.append(response)
+        return responses
+
+    def _fail(
+        self,
+        connection: _Connection,
+        selector: selectors.BaseSelector,
+        pending: deque[int],
+    ) -> None:
+        if connection.sock is not None:
+            try:
+                selector.unregister(connection.sock)
+            except (KeyError, ValueError):
+                pass
+        self.retries += len(connection.in_flight)
+        # Retried shards go first so results are not held back by them.
+        pending.extendleft(reversed(connection.in_flight))
+        self._drop(connection)
+
+    def _connect(self, connection: _Connection) -> None:
+        try:
+            sock = socket.create_connection(connection.address, timeout=self.timeout)
+        except OSError:
+            return
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        connection.sock = sock
+
+    def _drop(self, connection: _Connection) -> None:
+        if connection.sock is not None:
+            connection.sock.close()
+        connection.sock = None
+        connection.in_flight.clear()
+        connection.buffer.clear()
+        connection.outgoing.clear()
+
+
+# ----------------------------------------------------------------------
+# Local worker processes
+# ----------------------------------------------------------------------
+class LocalWorkers:
+    """Start ``count`` worker processes on this machine.
+
+    Each worker binds an ephemeral port on ``host`` and reports it on its
+    first output line; :attr:`addresses` lists them in start order.
+    """
+
+    def __init__(self, count: int, host: str = "127.0.0.1") -> None:
+        self.processes: list[subprocess.Popen[str]] = []
+        self.addresses: list[tuple[str, int]] = []
+        try:
+            for _ in range(count):
+                process = subprocess.Popen(
+                    [
+                        sys.executable,
+                        "-m",
+                        "calculator.distributed",
+                        "worker",
+                        "--host",
+                        host,
+                        "--port",
+                        "0",
+                    ],
+                    stdout=subprocess.PIPE,
+                    text=True,
+                )
+                self.processes.append(process)
+            for process in self.processes:
+                line = process.stdout.readline()  # type: ignore[union-attr]
+                if not line.startswith("listening on "):
+                    raise RuntimeError("Worker process failed to start.")
+                self.addresses.append(parse_address(line.split()[-1]))
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> LocalWorkers:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def kill(self, index: int) -> None:
+        """Terminate one worker abruptly, as a crash would."""
+
+        self.processes[index].kill()
+        self.processes[index].wait()
+
+    def close(self) -> None:
+        for process in self.processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            if process.stdout is not None:
+                process.stdout.close()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m calculator.distributed",
+        description="Run a batch evaluation worker.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker = commands.add_parser("worker", help="Serve shard requests over TCP")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    args = parser.parse_args(argv)
+
+    with WorkerServer((args.host, args.port)) as server:
+        host, port = server.server_address[:2]
+        print(f"listening on {host}:{port}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
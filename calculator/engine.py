@@ -3,42 +3,238 @@
 from __future__ import annotations
 
 import ast
+import functools
 import math
+from types import MappingProxyType
+from typing import Callable, Mapping, Sequence
 
+from calculator.aggregate.datasets import DataSource, InlineData
 from calculator.basic import operations as basic_ops
+from calculator.bytecode import CompiledExpression, compile_expression
+from calculator.conditional import comparison, is_piecewise, split_piecewise
 from calculator.context import CalculatorContext
 from calculator.dispatcher import FunctionDispatcher
+from calculator import interval as interval_ops
 from calculator.exceptions import InvalidExpressionError
+from calculator.interval import Interval
+from calculator.linalg import operations as linalg_ops
+from calculator.summation import BoundCall, bound_call, evaluate_bound
+from calculator.vectorized import evaluate_columns
 
 _ALLOWED_CONSTANTS = {"pi": math.pi, "e": math.e}
+_CONSTANTS_VIEW: Mapping[str, float] = MappingProxyType(_ALLOWED_CONSTANTS)
+_NO_VARIABLES: Mapping[str, float] = MappingProxyType({})
+
+
+_ARRAY_OPERATIONS = {
+    ast.Add: linalg_ops.add,
+    ast.Sub: linalg_ops.subtract,
+    ast.Mult: linalg_ops.multiply,
+    ast.Div: linalg_ops.divide,
+    ast.Pow: linalg_ops.power,
+}
+
+_INTERVAL_OPERATIONS = {
+    ast.Add: interval_ops.add,
+    ast.Sub: interval_ops.subtract,
+    ast.Mult: interval_ops.multiply,
+    ast.Div: interval_ops.divide,
+    ast.Pow: interval_ops.power,
+}
+# ``math.pi`` and ``math.e`` are rounded, so the constants are enclosed by
+# their neighbouring floats.
+_CONSTANT_INTERVALS = {
+    name: Interval(math.nextafter(value, -math.inf), math.nextafter(value, math.inf))
+    for name, value in _ALLOWED_CONSTANTS.items()
+}
 
 
 class CalculatorEngine:
-    """Evaluate mathematical expressions in a controlled environment."""
+    """Evaluate mathematical expressions in a controlled environment.
+
+    The engine keeps no per-evaluation state: every method accepts an optional
+    immutable :class:`CalculatorContext` that overrides :attr:`context` for that
+    call only, so one engine can be shared safely between threads.
+    """
 
     def __init__(
         self,
         context: CalculatorContext | None = None,
         dispatcher: FunctionDispatcher | None = None,
+        datasets: Mapping[str, DataSource] | None = None,
     ) -> None:
         self.context = context or CalculatorContext()
         self.dispatcher = dispatcher or FunctionDispatcher()
+        self.datasets: dict[str, DataSource] = {}
+        for name, source in (datasets or {}).items():
+            self.register_dataset(name, source)
+
+    def register_dataset(self, name: str, source: DataSource) -> None:
+        """Make ``source`` available to aggregate functions as ``name``.
+
+        For example, after registering a :class:`~calculator.aggregate.datasets.CsvDataset`
+        as ``prices`` the expression ``mean(prices) * 1.2`` streams the file.
+        """
+
+        if not name.isidentifier() or name in _ALLOWED_CONSTANTS:
+            raise ValueError(f"Invalid dataset name '{name}'.")
+        self.datasets[name] = source
+
+    def evaluate(
+        self,
+        expression: str,
+        context: CalculatorContext | None = None,
+        *,
+        variables: Mapping[str, float] | None = None,
+    ) -> float:
+        """Evaluate ``expression`` and return the resulting float.
+
+        ``context`` applies to this call only and defaults to :attr:`context`.
+        ``variables`` binds additional identifiers such as ``x`` to values.
+        Expressions containing vector or matrix literals such as
+        ``det([[1, 2], [3, 4]])`` or ``[1, 2] * 3`` evaluate to a float or a
+        NumPy array when NumPy is installed.
+        """
+
+        context = context or self.context
+        parsed = self.parse(expression)
+        if variables:
+            self._check_variable_names(variables)
+            bound = {name: float(value) for name, value in variables.items()}
+        else:
+            bound = _NO_VARIABLES
+        return self._finish(lambda: self._eval(parsed, context, bound), context)
+
+    def evaluate_batch(
+        self,
+        expression: str,
+        variables: Mapping[str, Sequence[float]],
+        context: CalculatorContext | None = None,
+        *,
+        round_results: bool = True,
+    ) -> list[float]:
+        """Evaluate ``expression`` once for every row of ``variables``.
+
+        ``variables`` maps each variable name to a sequence of values; all
+        sequences must have the same length. The expression is parsed and
+        walked once for the whole batch and every result is bit-identical to
+        calling :meth:`evaluate` with the corresponding row. If any row fails the
+        whole batch raises. Pass ``round_results=False`` to skip rounding to the
+        context precision, e.g. when the values feed a numerical algorithm.
+        """
+
+        context = context or self.context
+        parsed = self.parse(expression)
+        self._check_variable_names(variables)
+        columns = {
+            name: [float(value) for value in values] for name, values in variables.items()
+        }
+        sizes = {len(column) for column in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("All variable columns must have the same length.")
+        size = sizes.pop() if sizes else 1
+
+        try:
+            results = evaluate_columns(
+                parsed, columns, size, self.dispatcher, _ALLOWED_CONSTANTS, context
+            )
+        except InvalidExpressionError:
+            raise
+        except ZeroDivisionError:
+            raise
+        except ValueError as exc:
+            raise InvalidExpressionError(str(exc)) from exc
+
+        if not all(map(math.isfinite, results)):
+            raise ZeroDivisionError("Expression evaluates to an undefined value.")
 
-    def evaluate(self, expression: str) -> float:
-        """Evaluate ``expression`` and return the resulting float."""
+        if not round_results:
+            return results
+        return [context.round(value) for value in results]
+
+    def evaluate_interval(
+        self,
+        expression: str,
+        variables: Mapping[str, Interval | float | Sequence[float]] | None = None,
+        context: CalculatorContext | None = None,
+    ) -> Interval:
+        """Return an :class:`Interval` enclosing ``expression`` over ``variables``.
+
+        Each variable is bound to an :class:`Interval`, a ``(lower, upper)``
+        pair or a single float. The result contains the value of the expression
+        at every point of those ranges where it is defined, so a region can be
+        discarded when the enclosure excludes zero, for example, without
+        sampling it. The bounds are rounded outwards and not to the context
+        precision; they may be infinite, e.g. across a pole of ``tan``.
+        """
+
+        context = context or self.context
+        parsed = self.parse(expression)
+        bound: dict[str, Interval] = {}
+        if variables:
+            self._check_variable_names(variables)
+            bound = {name: interval_ops.as_interval(value) for name, value in variables.items()}
+        try:
+            return self._eval_interval(parsed, context, bound)
+        except InvalidExpressionError:
+            raise
+        except ZeroDivisionError:
+            raise
+        except ValueError as exc:
+            raise InvalidExpressionError(str(exc)) from exc
+
+    def compile(self, expression: str) -> CompiledExpression:
+        """Validate ``expression`` and lower it into a postfix program.
+
+        The returned :class:`~calculator.bytecode.CompiledExpression` is much
+        smaller than the parsed AST, can be serialized with ``to_bytes`` or
+        pickled, and is executed with :meth:`evaluate_compiled`. List literals
+        and bound-variable ``sum``/``prod`` cannot be compiled and raise
+        :class:`InvalidExpressionError`.
+        """
+
+        return compile_expression(self.parse(expression), _ALLOWED_CONSTANTS)
+
+    def evaluate_compiled(
+        self,
+        program: CompiledExpression,
+        context: CalculatorContext | None = None,
+    ) -> float:
+        """Execute ``program`` and return the resulting float.
+
+        The result and any raised exception match :meth:`evaluate` for the
+        source expression: unknown identifiers and unsupported syntax are
+        reported when execution reaches them, not by :meth:`compile`.
+        """
+
+        context = context or self.context
+        return self._finish(lambda: program.execute(self.dispatcher, context), context)
+
+    @property
+    def constants(self) -> Mapping[str, float]:
+        """Return the named constants available in expressions."""
+
+        return _CONSTANTS_VIEW
+
+    def parse(self, expression: str) -> ast.Expression:
+        """Return the syntax tree of ``expression``.
+
+        Trees are cached and shared between callers, so they must not be
+        mutated.
+        """
 
         if not expression or not expression.strip():
             raise InvalidExpressionError("Expression must not be empty.")
+        return _parse_expression(expression)
 
-        try:
-            parsed = ast.parse(expression, mode="eval")
-        except SyntaxError as exc:
-            raise InvalidExpressionError(
-                f"Unable to parse expression '{expression}'."
-            ) from exc
+    def _check_variable_names(self, variables: Mapping[str, object]) -> None:
+        for name in variables:
+            if not name.isidentifier() or name in _ALLOWED_CONSTANTS:
+                raise ValueError(f"Invalid variable name '{name}'.")
 
+    def _finish(self, compute: Callable[[], float], context: CalculatorContext) -> float:
         try:
-            result = self._eval(parsed)
+            result = compute()
         except InvalidExpressionError:
             raise
         except ZeroDivisionError:
@@ -46,17 +242,25 @@ class CalculatorEngine:
         except ValueError as exc:
             raise InvalidExpressionError(str(exc)) from exc
 
+        if linalg_ops.is_array(result):
+            return linalg_ops.finish(result, context)
+
         if not math.isfinite(result):
             raise ZeroDivisionError("Expression evaluates to an undefined value.")
 
-        return self.context.round(result)
+        return context.round(result)
 
     # ------------------------------------------------------------------
     # AST traversal helpers
     # ------------------------------------------------------------------
-    def _eval(self, node: ast.AST) -> float:
+    def _eval(
+        self,
+        node: ast.AST,
+        context: CalculatorContext,
+        variables: Mapping[str, float],
+    ) -> float:
         if isinstance(node, ast.Expression):
-            return self._eval(node.body)
+            return self._eval(node.body, context, variables)
 
         if isinstance(node, ast.Constant):
             if isinstance(node.value, (int, float)):
@@ -64,19 +268,27 @@ class CalculatorEngine:
             raise InvalidExpressionError("Unsupported constant type.")
 
         if isinstance(node, ast.Name):
+            if node.id in variables:
+                return variables[node.id]
             if node.id in _ALLOWED_CONSTANTS:
                 return float(_ALLOWED_CONSTANTS[node.id])
             raise InvalidExpressionError(f"Unknown identifier '{node.id}'.")
 
         if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
-            return -self._eval(node.operand)
+            return -self._eval(node.operand, context, variables)
 
         if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
-            return self._eval(node.operand)
+            return self._eval(node.operand, context, variables)
 
         if isinstance(node, ast.BinOp):
-            left = self._eval(node.left)
-            right = self._eval(node.right)
+            left = self._eval(node.left, context, variables)
+            right = self._eval(node.right, context, variables)
+
+            if linalg_ops.is_array(left) or linalg_ops.is_array(right):
+                operation = _ARRAY_OPERATIONS.get(type(node.op))
+                if operation is None:
+                    raise InvalidExpressionError("Unsupported binary operation.")
+                return operation(left, right)
 
             if isinstance(node.op, ast.Add):
                 return basic_ops.add(left, right)
@@ -91,11 +303,272 @@ class CalculatorEngine:
 
             raise InvalidExpressionError("Unsupported binary operation.")
 
+        if isinstance(node, ast.List):
+            elements = [self._eval(item, context, variables) for item in node.elts]
+            return linalg_ops.from_elements(elements)
+
+        if isinstance(node, ast.IfExp):
+            if self._eval_condition(node.test, context, variables):
+                return self._eval(node.body, context, variables)
+            return self._eval(node.orelse, context, variables)
+
+        if isinstance(node, ast.Compare):
+            left = self._eval(node.left, context, variables)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._eval(comparator, context, variables)
+                if linalg_ops.is_array(left) or linalg_ops.is_array(right):
+                    raise InvalidExpressionError("Comparisons need scalar operands.")
+                if not comparison(op)(left, right):
+                    return 0.0
+                left = right
+            return 1.0
+
+        if isinstance(node, ast.BoolOp):
+            # ``and`` stops at the first false operand, ``or`` at the first true one.
+            stop = isinstance(node.op, ast.Or)
+            for operand in node.values:
+                if self._eval_condition(operand, context, variables) == stop:
+                    return float(stop)
+            return float(not stop)
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return float(not self._eval_condition(node.operand, context, variables))
+
         if isinstance(node, ast.Call):
             if not isinstance(node.func, ast.Name):
                 raise InvalidExpressionError("Unsupported function call.")
             name = node.func.id
-            args = [self._eval(arg) for arg in node.args]
-            return self.dispatcher.evaluate(name, args, self.context)
+            if is_piecewise(node):
+                pairs, default = split_piecewise(node.args)
+                for condition, value in pairs:
+                    if self._eval_condition(condition, context, variables):
+                        return self._eval(value, context, variables)
+                if default is None:
+                    raise InvalidExpressionError("No piecewise condition is true.")
+                return self._eval(default, context, variables)
+            bound = bound_call(node, variables, _ALLOWED_CONSTANTS)
+            if bound is not None:
+                return self._eval_bound(bound, context, variables)
+            if self.dispatcher.is_aggregate(name):
+                return self._eval_aggregate(name, node.args, context, variables)
+            args = [self._eval(arg, context, variables) for arg in node.args]
+            return self.dispatcher.evaluate(name, args, context)
 
         raise InvalidExpressionError("Unsupported expression component.")
+
+    def _eval_condition(
+        self,
+        node: ast.AST,
+        context: CalculatorContext,
+        variables: Mapping[str, float],
+    ) -> bool:
+        value = self._eval(node, context, variables)
+        if linalg_ops.is_array(value):
+            raise InvalidExpressionError("Conditions must be scalars.")
+        return value != 0
+
+    def _eval_bound(
+        self,
+        call: BoundCall,
+        context: CalculatorContext,
+        variables: Mapping[str, float],
+    ) -> float:
+        names = {**_ALLOWED_CONSTANTS, **variables}
+        by_row = any(
+            isinstance(item, ast.List)
+            or isinstance(item, ast.Call)
+            and isinstance(item.func, ast.Name)
+            and self.dispatcher.is_aggregate(item.func.id)
+            for item in ast.walk(call.body)
+        ) or not all(isinstance(value, float) for value in names.values())
+
+        def evaluate(node: ast.AST) -> float:
+            return self._eval(node, context, variables)
+
+        def evaluate_chunk(indices: list[float]) -> list[float]:
+            if not by_row:
+                return evaluate_columns(
+                    call.body, {call.index: indices}, len(indices), self.dispatcher, names, context
+                )
+            values = [
+                self._eval(call.body, context, {**variables, call.index: index})
+                for index in indices
+            ]
+            if linalg_ops.contains_array(values):
+                raise InvalidExpressionError(f"The body of {call.kind}() must be a scalar.")
+            return values
+
+        return evaluate_bound(call, evaluate, evaluate_chunk)
+
+    def _eval_interval(
+        self,
+        node: ast.AST,
+        context: CalculatorContext,
+        variables: Mapping[str, Interval],
+    ) -> Interval:
+        if isinstance(node, ast.Expression):
+            return self._eval_interval(node.body, context, variables)
+
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, (int, float)):
+                return Interval.point(node.value)
+            raise InvalidExpressionError("Unsupported constant type.")
+
+        if isinstance(node, ast.Name):
+            if node.id in variables:
+                return variables[node.id]
+            if node.id in _CONSTANT_INTERVALS:
+                return _CONSTANT_INTERVALS[node.id]
+            raise InvalidExpressionError(f"Unknown identifier '{node.id}'.")
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return interval_ops.negate(self._eval_interval(node.operand, context, variables))
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+            return self._eval_interval(node.operand, context, variables)
+
+        if isinstance(node, ast.IfExp):
+            return self._eval_interval_cases(
+                [(node.test, node.body)], node.orelse, context, variables
+            )
+
+        if isinstance(node, ast.Compare):
+            left = self._eval_interval(node.left, context, variables)
+            certain = True
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._eval_interval(comparator, context, variables)
+                outcome = interval_ops.truth(interval_ops.compare(comparison(op), left, right))
+                if outcome is False:
+                    return interval_ops.FALSE
+                certain = certain and outcome is True
+                left = right
+            return interval_ops.TRUE if certain else interval_ops.UNKNOWN
+
+        if isinstance(node, ast.BoolOp):
+            stop = isinstance(node.op, ast.Or)
+            certain = True
+            for operand in node.values:
+                outcome = interval_ops.truth(self._eval_interval(operand, context, variables))
+                if outcome is stop:
+                    return interval_ops.from_truth(stop)
+                certain = certain and outcome is not None
+            return interval_ops.from_truth(not stop) if certain else interval_ops.UNKNOWN
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            outcome = interval_ops.truth(self._eval_interval(node.operand, context, variables))
+            return interval_ops.from_truth(None if outcome is None else not outcome)
+
+        if isinstance(node, ast.BinOp):
+            operation = _INTERVAL_OPERATIONS.get(type(node.op))
+            if operation is None:
+                raise InvalidExpressionError("Unsupported binary operation.")
+            left = self._eval_interval(node.left, context, variables)
+            right = self._eval_interval(node.right, context, variables)
+            return operation(left, right)
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name):
+                raise InvalidExpressionError("Unsupported function call.")
+            name = node.func.id
+            if is_piecewise(node):
+                pairs, default = split_piecewise(node.args)
+                return self._eval_interval_cases(pairs, default, context, variables)
+            if bound_call(node, variables, _ALLOWED_CONSTANTS) is not None:
+                raise InvalidExpressionError(
+                    f"{name}() over a bound variable is not supported in interval evaluation."
+                )
+            arg_nodes = node.args
+            extra_nodes: list[ast.expr] = []
+            if self.dispatcher.is_aggregate(name) and arg_nodes:
+                first = arg_nodes[0]
+                if isinstance(first, ast.List):
+                    arg_nodes, extra_nodes = first.elts, arg_nodes[1:]
+                elif isinstance(first, ast.Name) and first.id in self.datasets:
+                    raise InvalidExpressionError(
+                        "Datasets are not supported in interval evaluation."
+                    )
+            args = [self._eval_interval(arg, context, variables) for arg in arg_nodes]
+            extra = [self._eval_interval(arg, context, variables) for arg in extra_nodes]
+            return self.dispatcher.evaluate_interval(name, args, context, extra)
+
+        if isinstance(node, ast.List):
+            raise InvalidExpressionError(
+                "Vectors and matrices are not supported in interval evaluation."
+            )
+
+        raise InvalidExpressionError("Unsupported expression component.")
+
+    def _eval_interval_cases(
+        self,
+        pairs: Sequence[tuple[ast.expr, ast.expr]],
+        default: ast.expr | None,
+        context: CalculatorContext,
+        variables: Mapping[str, Interval],
+    ) -> Interval:
+        # The result is the hull of every value that may be selected. A value
+        # that cannot be evaluated anywhere on the ranges only makes the result
+        # partial, since its condition may hold exactly where it is undefined.
+        outcomes: list[Interval] = []
+        errors: list[Exception] = []
+        selected = False
+        for condition, value in [*pairs, (None, default)]:
+            if condition is None:
+                if value is None:
+                    break
+                outcome: bool | None = True
+            else:
+                outcome = interval_ops.truth(self._eval_interval(condition, context, variables))
+            if outcome is False:
+                continue
+            try:
+                outcomes.append(self._eval_interval(value, context, variables))
+            except (ValueError, ZeroDivisionError) as exc:
+                errors.append(exc)
+            if outcome:
+                selected = True
+                break
+        if not outcomes:
+            if errors:
+                raise errors[0]
+            raise InvalidExpressionError("No piecewise condition is true.")
+        result = interval_ops.hull(outcomes)
+        if errors or not selected:
+            result = Interval(result.lower, result.upper, True)
+        return result
+
+    def _eval_aggregate(
+        self,
+        name: str,
+        arg_nodes: list[ast.expr],
+        context: CalculatorContext,
+        variables: Mapping[str, float],
+    ) -> float:
+        source: DataSource | None = None
+        if arg_nodes:
+            first = arg_nodes[0]
+            if isinstance(first, ast.List):
+                elements = [self._eval(element, context, variables) for element in first.elts]
+                if linalg_ops.contains_array(elements):
+                    elements = linalg_ops.flatten(elements)
+                source = InlineData(elements)
+            elif isinstance(first, ast.Name) and first.id in self.datasets:
+                source = self.datasets[first.id]
+
+        if source is None:
+            values = [self._eval(arg, context, variables) for arg in arg_nodes]
+            if linalg_ops.contains_array(values):
+                values = linalg_ops.flatten(values)
+            return self.dispatcher.evaluate_aggregate(name, InlineData(values), (), context)
+
+        extra = [self._eval(arg, context, variables) for arg in arg_nodes[1:]]
+        return self.dispatcher.evaluate_aggregate(name, source, extra, context)
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_expression(expression: str) -> ast.Expression:
+    """Parse ``expression``; parsed trees are cached and must not be mutated."""
+
+    try:
+        return ast.parse(expression, mode="eval")
+    except SyntaxError as exc:
+        raise InvalidExpressionError(f"Unable to parse expression '{expression}'.") from exc
@@ -13,3 +13,7 @@ class InvalidExpressionError(CalculatorError):
 
 class OperationNotSupportedError(CalculatorError):
     """Raised when a requested operation has not been implemented."""
+
+
+class OverloadedError(CalculatorError):
+    """Raised when a bounded work queue cannot accept another request."""
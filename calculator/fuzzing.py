@@ -0,0 +1,787 @@
+"""Differential fuzzing of the engine's alternate evaluation paths.
+
+A grammar-based generator produces random valid and invalid expressions. Each
+one is evaluated by the reference :meth:`CalculatorEngine.evaluate` and by
+every alternate *mode* — compiled bytecode, vectorized batch evaluation and
+memoized function dispatch — and any difference in the result bits or the
+exception type is reported together with a minimized reproducer. The same
+corpus yields each mode's speed relative to the reference.
+
+The polynomial scanner in :mod:`calculator.calculus.operations` is checked the
+same way against the AST-based collector it short-circuits.
+
+Run it from the command line with::
+
+    python -m calculator.fuzzing --cases 5000 --seed 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+import random
+import struct
+import time
+import warnings
+from typing import Any, Callable, Sequence
+
+from calculator.calculus import operations as calculus_ops
+from calculator.context import CalculatorContext
+from calculator.dispatcher import FunctionDispatcher
+from calculator.engine import CalculatorEngine
+from calculator.linalg import operations as linalg_ops
+
+VARIABLE = "x"
+
+_EDGE_NUMBERS = ("0", "0.0", "1", "2", "0.5", "1e308", "1e-320", "1e16", "3.0e-5", "10")
+_UNSUPPORTED_SNIPPETS = (
+    "1 % 2",
+    "7 // 2",
+    "'text'",
+    "pi.real",
+    "[1, 2][0]",
+    "lambda: 1",
+    "abs(1)(2)",
+    "{1: 2}",
+    "1 is 2",
+    "1 in 2",
+    "~1",
+    "None",
+    "True",
+    "1j",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Outcome:
+    """Result of one evaluation: a value or the name of the raised exception."""
+
+    value: Any = None
+    error: str | None = None
+
+    def same_as(self, other: "Outcome") -> bool:
+        """Return whether both outcomes are bit-identical."""
+
+        if self.error is not None or other.error is not None:
+            return self.error == other.error
+        return _value_key(self.value) == _value_key(other.value)
+
+    def describe(self) -> str:
+        if self.error is not None:
+            return f"raises {self.error}"
+        if isinstance(self.value, float):
+            return f"{self.value!r} ({self.value.hex()})"
+        return repr(self.value)
+
+
+def _value_key(value: Any) -> object:
+    if isinstance(value, float):
+        return struct.pack("<d", value)
+    if linalg_ops.is_array(value):
+        return (value.shape, value.dtype.str, value.tobytes())
+    return value
+
+
+def _capture(compute: Callable[[], Any]) -> Outcome:
+    try:
+        return Outcome(value=compute())
+    except Exception as exc:  # noqa: BLE001 - exceptions are the observation
+        return Outcome(error=type(exc).__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class FuzzCase:
+    """One generated input: an expression, a context and an optional ``x``."""
+
+    expression: str
+    context: CalculatorContext
+    x: float | None = None
+
+    def variables(self) -> dict[str, float] | None:
+        return None if self.x is None else {VARIABLE: self.x}
+
+
+@dataclass(frozen=True, slots=True)
+class Mismatch:
+    """A difference between the reference and an alternate mode."""
+
+    mode: str
+    case: FuzzCase
+    expected: Outcome
+    observed: Outcome
+    reproducer: str
+
+    def describe(self) -> str:
+        context = self.case.context
+        binding = "" if self.case.x is None else f", {VARIABLE}={self.case.x!r}"
+        return (
+            f"[{self.mode}] {self.reproducer!r} "
+            f"({context.angle_unit}, precision {context.precision}{binding}): "
+            f"expected {self.expected.describe()}, got {self.observed.describe()}"
+        )
+
+
+@dataclass(slots=True)
+class FuzzReport:
+    """Mismatches and timings collected by :func:`fuzz_engine` or :func:`fuzz_calculus`."""
+
+    cases: int = 0
+    mismatches: list[Mismatch] = field(default_factory=list)
+    skipped: Counter[str] = field(default_factory=Counter)
+    timings: dict[str, list[float]] = field(default_factory=dict)
+
+    def record_time(self, mode: str, elapsed: float, reference: float) -> None:
+        totals = self.timings.setdefault(mode, [0.0, 0.0])
+        totals[0] += elapsed
+        totals[1] += reference
+
+    def speed_ratio(self, mode: str) -> float:
+        """Return reference time divided by ``mode`` time on the cases ``mode`` ran."""
+
+        elapsed, reference = self.timings.get(mode, (0.0, 0.0))
+        return reference / elapsed if elapsed > 0 else 0.0
+
+    def merge(self, other: "FuzzReport") -> None:
+        self.cases += other.cases
+        self.mismatches.extend(other.mismatches)
+        self.skipped.update(other.skipped)
+        for mode, (elapsed, reference) in other.timings.items():
+            self.record_time(mode, elapsed, reference)
+
+    def format(self) -> str:
+        lines = [f"cases         {self.cases}", f"mismatches    {len(self.mismatches)}"]
+        if self.timings:
+            lines.append("")
+            lines.append(f"{'mode':<12}{'speed vs reference':>20}{'skipped':>10}")
+            for mode in sorted(self.timings):
+                lines.append(
+                    f"{mode:<12}{self.speed_ratio(mode):>19.2f}x{self.skipped[mode]:>10}"
+                )
+        for mismatch in self.mismatches:
+            lines.append(mismatch.describe())
+        return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# Expression generation
+# ----------------------------------------------------------------------
+class ExpressionGenerator:
+    """Generate random expressions from the engine grammar.
+
+    ``invalid_rate`` is the probability that a case is mutated into something
+    the engine should reject: unsupported syntax, unknown names, wrong arity
+    or truncated text.
+    """
+
+    def __init__(
+        self,
+        rng: random.Random,
+        dispatcher: FunctionDispatcher | None = None,
+        *,
+        max_depth: int = 4,
+        invalid_rate: float = 0.2,
+        variable_rate: float = 0.3,
+        array_rate: float = 0.0,
+    ) -> None:
+        self.rng = rng
+        self.dispatcher = dispatcher or FunctionDispatcher()
+        self.max_depth = max_depth
+        self.invalid_rate = invalid_rate
+        self.variable_rate = variable_rate
+        self.array_rate = array_rate
+        self.functions = [
+            name
+            for name in self.dispatcher.names()
+            if not self.dispatcher.spec(name).accepts_arrays
+        ]
+        self._use_variable = False
+
+    def case(self) -> FuzzCase:
+        rng = self.rng
+        self._use_variable = rng.random() < self.variable_rate
+        if self.array_rate and rng.random() < self.array_rate:
+            expression = self.array_expression()
+        else:
+            expression = self.expression(0)
+        if rng.random() < self.invalid_rate:
+            expression = self.corrupt(expression)
+        context = CalculatorContext(
+            angle_unit=rng.choice(("radian", "degree")),
+            precision=rng.choice((1, 4, 8, 12, 15)),
+        )
+        x = None
+        if self._use_variable:
+            x = float(rng.choice(_EDGE_NUMBERS)) if rng.random() < 0.2 else rng.uniform(-10, 10)
+        return FuzzCase(expression, context, x)
+
+    def expression(self, depth: int) -> str:
+        rng = self.rng
+        if depth >= self.max_depth or rng.random() < 0.3:
+            return self.atom()
+        roll = rng.random()
+        if roll < 0.45:
+            operator = rng.choice(("+", "-", "*", "/", "**"))
+            return f"{self.operand(depth)} {operator} {self.operand(depth)}"
+        if roll < 0.6:
+            return f"{rng.choice('-+')}{self.operand(depth)}"
+        if roll < 0.7:
+            return self.conditional(depth)
+        return self.call(depth + 1)
+
+    def conditional(self, depth: int) -> str:
+        rng = self.rng
+        roll = rng.random()
+        if roll < 0.3:
+            return f"{self.operand(depth)} if {self.operand(depth)} else {self.operand(depth)}"
+        if roll < 0.6:
+            operators = rng.choices(("<", "<=", ">", ">=", "==", "!="), k=rng.randint(1, 2))
+            return self.operand(depth) + "".join(
+                f" {operator} {self.operand(depth)}" for operator in operators
+            )
+        if roll < 0.8:
+            return f"{self.operand(depth)} {rng.choice(('and', 'or'))} {self.operand(depth)}"
+        if roll < 0.9:
+            return f"not {self.operand(depth)}"
+        pairs = [f"{self.expression(depth + 1)}, {self.expression(depth + 1)}"]
+        if rng.random() < 0.5:
+            pairs.append(self.expression(depth + 1))
+        return f"piecewise({', '.join(pairs)})"
+
+    def operand(self, depth: int) -> str:
+        text = self.expression(depth + 1)
+        return f"({text})" if self.rng.random() < 0.7 else text
+
+    def atom(self) -> str:
+        rng = self.rng
+        roll = rng.random()
+        if self._use_variable and roll < 0.35:
+            return VARIABLE
+        if roll < 0.45:
+            return rng.choice(("pi", "e"))
+        if roll < 0.65:
+            return rng.choice(_EDGE_NUMBERS)
+        if roll < 0.85:
+            return str(rng.randint(0, 50))
+        return repr(round(rng.uniform(-100, 100), rng.randint(0, 6)))
+
+    def call(self, depth: int) -> str:
+        rng = self.rng
+        name = rng.choice(self.functions)
+        spec = self.dispatcher.spec(name)
+        if spec.aggregate:
+            return self.aggregate_call(name, spec.arity[0], depth)
+        low, high = spec.arity
+        count = rng.randint(low, high if high is not None else low + 3)
+        args = ", ".join(self.expression(depth) for _ in range(count))
+        return f"{name}({args})"
+
+    def aggregate_call(self, name: str, extra: int, depth: int) -> str:
+        rng = self.rng
+        values = [self.expression(depth) for _ in range(rng.randint(1, 5))]
+        extras = [self.expression(depth) for _ in range(extra)]
+        if extra or rng.random() < 0.5:
+            return f"{name}([{', '.join(values)}]{''.join(', ' + e for e in extras)})"
+        return f"{name}({', '.join(values)})"
+
+    def array_expression(self) -> str:
+        rng = self.rng
+        size = rng.randint(1, 3)
+
+        def vector() -> str:
+            return "[" + ", ".join(self.atom() for _ in range(size)) + "]"
+
+        operator = rng.choice(("+", "-", "*", "/", "**"))
+        return f"{vector()} {operator} {rng.choice((vector(), self.atom()))}"
+
+    def corrupt(self, expression: str) -> str:
+        rng = self.rng
+        kind = rng.randrange(6)
+        if kind == 0:
+            return f"{expression} + {rng.choice(_UNSUPPORTED_SNIPPETS)}"
+        if kind == 5:
+            # Mixed chains: a false supported link must stop before an
+            # unsupported one is reached.
+            links = [rng.choice(("<", ">", "==", "!=")) for _ in range(rng.randint(1, 2))]
+            links.insert(rng.randint(0, len(links)), rng.choice(("is", "in", "is not")))
+            operands = [self.atom() for _ in links]
+            return f"({expression})" + "".join(
+                f" {link} {operand}" for link, operand in zip(links, operands)
+            )
+        if kind == 1:
+            return f"{expression} * {rng.choice(('undefined', 'y', 'sinh', '_'))}"
+        if kind == 2:
+            name = rng.choice(self.functions)
+            return f"{name}({', '.join([expression] * rng.choice((0, 4)))})"
+        if kind == 3:
+            cut = rng.randint(0, len(expression))
+            return expression[:cut] + rng.choice(("(", ")", "*", ",", "", "**"))
+        return f"unknown_function({expression})"
+
+
+def generate_cases(
+    count: int,
+    *,
+    seed: int | None = None,
+    dispatcher: FunctionDispatcher | None = None,
+    **options: Any,
+) -> list[FuzzCase]:
+    """Return ``count`` cases from an :class:`ExpressionGenerator`."""
+
+    generator = ExpressionGenerator(random.Random(seed), dispatcher, **options)
+    return [generator.case() for _ in range(count)]
+
+
+# ----------------------------------------------------------------------
+# Evaluation modes
+# ----------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class Mode:
+    """An alternate evaluation path compared against the reference.
+
+    ``prepare`` performs the untimed per-expression work (parsing, compiling,
+    cache warm-up) and returns a handle passed to the timed ``run``. ``supports``
+    excludes inputs outside the mode's documented grammar.
+    """
+
+    name: str
+    run: Callable[[Any, FuzzCase], Any]
+    prepare: Callable[[FuzzCase], Any] = lambda case: case.expression
+    supports: Callable[[ast.Expression | None, FuzzCase], bool] = lambda tree, case: True
+
+
+def default_modes(engine: CalculatorEngine) -> list[Mode]:
+    """Return the compiled, batch and memoized modes for ``engine``."""
+
+    def compiled_supports(tree: ast.Expression | None, case: FuzzCase) -> bool:
+        return case.x is None and not _contains(tree, lambda node: isinstance(node, ast.List))
+
+    def batch_supports(tree: ast.Expression | None, case: FuzzCase) -> bool:
+        return not _contains(
+            tree,
+            lambda node: isinstance(node, ast.List)
+            or (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Name)
+                and engine.dispatcher.is_aggregate(node.func.id)
+            ),
+        )
+
+    def batch_run(expression: str, case: FuzzCase) -> float:
+        columns = {} if case.x is None else {VARIABLE: [case.x]}
+        return engine.evaluate_batch(expression, columns, case.context)[0]
+
+    memo_engine = CalculatorEngine(dispatcher=memoized_dispatcher(engine.dispatcher))
+
+    def memo_prepare(case: FuzzCase) -> str:
+        _capture(
+            lambda: memo_engine.evaluate(case.expression, case.context, variables=case.variables())
+        )
+        return case.expression
+
+    return [
+        Mode(
+            "compiled",
+            prepare=lambda case: _capture(lambda: engine.compile(case.expression)),
+            run=lambda prepared, case: _unwrap(prepared, engine, case),
+            supports=compiled_supports,
+        ),
+        Mode("batch", run=batch_run, supports=batch_supports),
+        Mode(
+            "memoized",
+            prepare=memo_prepare,
+            run=lambda expression, case: memo_engine.evaluate(
+                expression, case.context, variables=case.variables()
+            ),
+        ),
+    ]
+
+
+def _unwrap(prepared: Outcome, engine: CalculatorEngine, case: FuzzCase) -> float:
+    if prepared.error is not None:
+        raise _Replayed(prepared.error)
+    return engine.evaluate_compiled(prepared.value, case.context)
+
+
+class _Replayed(Exception):
+    """Carries an exception name captured during an untimed ``prepare`` step."""
+
+
+def memoized_dispatcher(source: FunctionDispatcher, cache_size: int = 1024) -> FunctionDispatcher:
+    """Return a copy of ``source`` with every memoizable function cached."""
+
+    dispatcher = FunctionDispatcher()
+    for name in source.names():
+        spec = source.spec(name)
+        if spec.aggregate:
+            continue
+        memoize = spec.pure and not spec.accepts_arrays
+        dispatcher.register(
+            name,
+            spec.handler,
+            arity=spec.arity,
+            pure=spec.pure,
+            context_dependent=spec.context_dependent,
+            expensive=spec.expensive,
+            accepts_arrays=spec.accepts_arrays,
+            cache_size=cache_size if memoize else 0,
+        )
+    return dispatcher
+
+
+def _contains(tree: ast.AST | None, predicate: Callable[[ast.AST], bool]) -> bool:
+    return tree is not None and any(predicate(node) for node in ast.walk(tree))
+
+
+# ----------------------------------------------------------------------
+# Running and minimizing
+# ----------------------------------------------------------------------
+def fuzz_engine(
+    cases: Sequence[FuzzCase],
+    engine: CalculatorEngine | None = None,
+    modes: Sequence[Mode] | None = None,
+    *,
+    minimize_failures: bool = True,
+) -> FuzzReport:
+    """Compare every mode with :meth:`CalculatorEngine.evaluate` on ``cases``."""
+
+    engine = engine or CalculatorEngine()
+    modes = default_modes(engine) if modes is None else modes
+    clock = time.perf_counter
+    report = FuzzReport(cases=len(cases))
+
+    def reference(case: FuzzCase) -> Outcome:
+        return _capture(
+            lambda: engine.evaluate(case.expression, case.context, variables=case.variables())
+        )
+
+    with warnings.catch_warnings():
+        # NumPy reports overflow in array cases as warnings; outcomes are compared.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for case in cases:
+            _fuzz_case(engine, modes, case, report, reference, clock, minimize_failures)
+    return report
+
+
+def _fuzz_case(
+    engine: CalculatorEngine,
+    modes: Sequence[Mode],
+    case: FuzzCase,
+    report: FuzzReport,
+    reference: Callable[[FuzzCase], Outcome],
+    clock: Callable[[], float],
+    minimize_failures: bool,
+) -> None:
+    try:
+        tree: ast.Expression | None = engine.parse(case.expression)
+    except Exception:  # noqa: BLE001 - unparsable input is still compared
+        tree = None
+
+    reference(case)  # Warm the parse cache so timings compare evaluation only.
+    started = clock()
+    expected = reference(case)
+    reference_time = clock() - started
+
+    for mode in modes:
+        if not mode.supports(tree, case):
+            report.skipped[mode.name] += 1
+            continue
+        observed, elapsed = _run_mode(mode, case, clock)
+        report.record_time(mode.name, elapsed, reference_time)
+        if observed.same_as(expected):
+            continue
+
+        def still_differs(expression: str, mode: Mode = mode) -> bool:
+            candidate = FuzzCase(expression, case.context, case.x)
+            try:
+                candidate_tree = engine.parse(expression)
+            except Exception:  # noqa: BLE001
+                candidate_tree = None
+            if not mode.supports(candidate_tree, candidate):
+                return False
+            return _same_failure(
+                expected,
+                observed,
+                reference(candidate),
+                _run_mode(mode, candidate, clock)[0],
+            )
+
+        reproducer = (
+            minimize(case.expression, still_differs)
+            if minimize_failures
+            else case.expression
+        )
+        report.mismatches.append(Mismatch(mode.name, case, expected, observed, reproducer))
+
+
+def _same_failure(
+    expected: Outcome, observed: Outcome, candidate_expected: Outcome, candidate_observed: Outcome
+) -> bool:
+    """Return whether a candidate reproduces the original kind of mismatch."""
+
+    return (
+        not candidate_observed.same_as(candidate_expected)
+        and candidate_expected.error == expected.error
+        and candidate_observed.error == observed.error
+    )
+
+
+def _run_mode(mode: Mode, case: FuzzCase, clock: Callable[[], float]) -> tuple[Outcome, float]:
+    try:
+        prepared = mode.prepare(case)
+    except Exception as exc:  # noqa: BLE001
+        return Outcome(error=type(exc).__name__), 0.0
+    started = clock()
+    try:
+        outcome = Outcome(value=mode.run(prepared, case))
+    except _Replayed as exc:
+        outcome = Outcome(error=str(exc))
+    except Exception as exc:  # noqa: BLE001
+        outcome = Outcome(error=type(exc).__name__)
+    return outcome, clock() - started
+
+
+def minimize(expression: str, still_fails: Callable[[str], bool]) -> str:
+    """Shrink ``expression`` while ``still_fails`` keeps returning ``True``.
+
+    Parsable input is reduced structurally by replacing subtrees with their
+    children or with ``1`` and dropping call arguments; anything else falls
+    back to deleting runs of characters.
+    """
+
+    current = expression
+    with warnings.catch_warnings():
+        # Deleting characters yields text such as ``1if`` that Python parses
+        # with an "invalid decimal literal" warning.
+        warnings.simplefilter("ignore", SyntaxWarning)
+        while True:
+            for candidate in _smaller_candidates(current):
+                if len(candidate) < len(current) and still_fails(candidate):
+                    current = candidate
+                    break
+            else:
+                return current
+
+
+def _smaller_candidates(expression: str) -> list[str]:
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except (SyntaxError, ValueError, RecursionError):
+        return _character_deletions(expression)
+
+    candidates: list[str] = []
+    nodes = [node for node in ast.walk(tree.body) if isinstance(node, ast.expr)]
+    for target in nodes:
+        replacements: list[ast.expr] = [
+            child for child in ast.iter_child_nodes(target) if isinstance(child, ast.expr)
+        ]
+        if not isinstance(target, ast.Constant):
+            replacements.append(ast.Constant(1))
+        for replacement in replacements:
+            candidates.append(_unparse_replacing(tree, target, replacement))
+        if isinstance(target, (ast.Call, ast.List)):
+            items = target.args if isinstance(target, ast.Call) else target.elts
+            for index in range(len(items)):
+                removed = items.pop(index)
+                candidates.append(ast.unparse(tree))
+                items.insert(index, removed)
+    return sorted(dict.fromkeys(candidates), key=len) + _character_deletions(expression)
+
+
+def _unparse_replacing(tree: ast.Expression, target: ast.expr, replacement: ast.expr) -> str:
+    if tree.body is target:
+        return ast.unparse(replacement)
+    for parent in ast.walk(tree):
+        for field_name, value in ast.iter_fields(parent):
+            if value is target:
+                setattr(parent, field_name, replacement)
+                try:
+                    return ast.unparse(tree)
+                finally:
+                    setattr(parent, field_name, target)
+            if isinstance(value, list) and any(item is target for item in value):
+                index = next(i for i, item in enumerate(value) if item is target)
+                value[index] = replacement
+                try:
+                    return ast.unparse(tree)
+                finally:
+                    value[index] = target
+    return ast.unparse(tree)
+
+
+def _character_deletions(expression: str) -> list[str]:
+    candidates = []
+    size = len(expression) // 2
+    while size >= 1:
+        for start in range(0, len(expression), size):
+            candidates.append(expression[:start] + expression[start + size :])
+        size //= 2
+    return candidates
+
+
+# ----------------------------------------------------------------------
+# Polynomial scanner versus AST collector
+# ----------------------------------------------------------------------
+class PolynomialGenerator:
+    """Generate polynomial text in the calculus grammar plus invalid variants."""
+
+    def __init__(self, rng: random.Random, *, invalid_rate: float = 0.2) -> None:
+        self.rng = rng
+        self.invalid_rate = invalid_rate
+
+    def polynomial(self, depth: int = 0) -> str:
+        rng = self.rng
+        parts = [self.term(depth)]
+        for _ in range(rng.randint(0, 6)):
+            parts.append(rng.choice((" + ", " - ", "+", "-")))
+            parts.append(self.term(depth))
+        text = "".join(parts)
+        if depth == 0 and rng.random() < self.invalid_rate:
+            text = self.corrupt(text)
+        return text
+
+    def term(self, depth: int) -> str:
+        rng = self.rng
+        factors = []
+        if rng.random() < 0.7:
+            factors.append(self.coefficient())
+        roll = rng.random()
+        if roll < 0.5:
+            power = rng.randint(0, 12)
+            factors.append(f"x**{power}" if rng.random() < 0.8 else f"x**{power}.0")
+        elif roll < 0.7:
+            factors.append("x")
+        elif roll < 0.8 and depth < 2:
+            factors.append(f"({self.polynomial(depth + 1)})")
+        rng.shuffle(factors)
+        text = "*".join(factors) or self.coefficient()
+        return ("-" * rng.randint(0, 2)) + text
+
+    def coefficient(self) -> str:
+        rng = self.rng
+        roll = rng.random()
+        if roll < 0.5:
+            return str(rng.randint(0, 20))
+        if roll < 0.8:
+            return repr(round(rng.uniform(0, 10), rng.randint(1, 4)))
+        return rng.choice(("1e3", "2.5E-2", ".5", "5.", "0.1", "1e308", "007", "1_000"))
+
+    def corrupt(self, text: str) -> str:
+        rng = self.rng
+        return rng.choice(
+            (
+                f"{text} + y",
+                f"{text} + x**x",
+                f"{text} + x**2.5",
+                f"{text} + 2x",
+                f"{text} +",
+                f" {text}",
+                f"{text} / 2",
+                f"({text}",
+                f"{text} + sin(x)",
+                f"(x + 1)**2 + {text}",
+            )
+        )
+
+
+def fuzz_calculus(
+    expressions: Sequence[str],
+    variable: str = "x",
+    *,
+    minimize_failures: bool = True,
+) -> FuzzReport:
+    """Compare the polynomial scanner with the AST collector on ``expressions``.
+
+    Inputs the scanner hands back to the AST path are counted as skipped.
+    Coefficients must match bit for bit and errors must have the same type.
+    """
+
+    clock = time.perf_counter
+    report = FuzzReport(cases=len(expressions))
+    context = CalculatorContext()
+
+    def scanner(expression: str) -> Outcome | None:
+        acc: defaultdict[int, float] = defaultdict(float)
+        try:
+            calculus_ops._PolynomialScanner(expression, variable).parse_into(acc)
+        except calculus_ops._ScannerFallback:
+            return None
+        except Exception as exc:  # noqa: BLE001
+            return Outcome(error=type(exc).__name__)
+        return Outcome(value=_coefficients(acc))
+
+    def collector(expression: str) -> Outcome:
+        return _capture(
+            lambda: _coefficients(calculus_ops._collect_from_ast(expression, variable))
+        )
+
+    for expression in expressions:
+        started = clock()
+        observed = scanner(expression)
+        elapsed = clock() - started
+        if observed is None:
+            report.skipped["scanner"] += 1
+            continue
+        started = clock()
+        expected = collector(expression)
+        report.record_time("scanner", elapsed, clock() - started)
+        if observed.same_as(expected):
+            continue
+
+        def still_differs(candidate: str) -> bool:
+            result = scanner(candidate)
+            return result is not None and _same_failure(
+                expected, observed, collector(candidate), result
+            )
+
+        reproducer = minimize(expression, still_differs) if minimize_failures else expression
+        report.mismatches.append(
+            Mismatch("scanner", FuzzCase(expression, context), expected, observed, reproducer)
+        )
+    return report
+
+
+def _coefficients(terms: dict[int, float]) -> tuple[tuple[int, bytes], ...]:
+    return tuple(
+        sorted((power, struct.pack("<d", value)) for power, value in terms.items() if value != 0)
+    )
+
+
+# ----------------------------------------------------------------------
+# Command line
+# ----------------------------------------------------------------------
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m calculator.fuzzing",
+        description="Differentially fuzz the engine's fast paths against the reference.",
+    )
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--calculus-cases", type=int, default=2000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--max-depth", type=int, default=4)
+    parser.add_argument("--invalid-rate", type=float, default=0.2)
+    parser.add_argument(
+        "--arrays", action="store_true", help="Include vector expressions (requires NumPy)"
+    )
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    cases = generate_cases(
+        args.cases,
+        seed=rng.random(),
+        max_depth=args.max_depth,
+        invalid_rate=args.invalid_rate,
+        array_rate=0.1 if args.arrays else 0.0,
+    )
+    report = fuzz_engine(cases)
+
+    polynomials = PolynomialGenerator(rng, invalid_rate=args.invalid_rate)
+    report.merge(fuzz_calculus([polynomials.polynomial() for _ in range(args.calculus_cases)]))
+
+    print(report.format())
+    return 1 if report.mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
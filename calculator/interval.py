@@ -0,0 +1,520 @@
+"""Interval arithmetic with outward rounding.
+
+An :class:`Interval` encloses every value an expression can take while its
+variables range over intervals. Every operation rounds its lower bound down
+and its upper bound up, so the enclosure is guaranteed despite floating-point
+rounding. Library functions such as :func:`math.sin` are not correctly
+rounded and are widened by a few units in the last place.
+
+The functions here are the interval extensions of the engine's operators and
+built-in functions; :meth:`CalculatorEngine.evaluate_interval` combines them.
+When part of an argument lies outside a function's domain, as in
+``sqrt([-1, 4])``, the result encloses the values on the rest of the domain
+and is marked :attr:`~Interval.partial`; when all of it does, the function
+raises the same error as for a single value.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fractions import Fraction
+import math
+import operator
+from typing import Callable, Sequence
+
+from calculator.context import CalculatorContext
+
+_TWO_PI = 2 * math.pi
+# Beyond this magnitude the period of sin/cos/tan cannot be located reliably.
+_MAX_PERIODIC = 2.0**40
+
+
+@dataclass(frozen=True, slots=True)
+class Interval:
+    """The closed range ``[lower, upper]``; either bound may be infinite.
+
+    ``partial`` is set when some points of the inputs that produced the
+    interval are outside the domain of an operation, so evaluating the
+    expression at those points raises instead of returning a value.
+    """
+
+    lower: float
+    upper: float
+    partial: bool = False
+
+    def __post_init__(self) -> None:
+        if not self.lower <= self.upper:
+            raise ValueError("Interval bounds must satisfy lower <= upper.")
+
+    @classmethod
+    def point(cls, value: float) -> Interval:
+        """Return the degenerate interval ``[value, value]``."""
+
+        value = float(value)
+        return cls(value, value)
+
+    def __contains__(self, value: float) -> bool:
+        return self.lower <= value <= self.upper
+
+    def __str__(self) -> str:
+        suffix = " (partial)" if self.partial else ""
+        return f"[{self.lower!r}, {self.upper!r}]{suffix}"
+
+    @property
+    def width(self) -> float:
+        return self.upper - self.lower
+
+    @property
+    def midpoint(self) -> float:
+        """Return a point inside the interval, its centre when it is bounded."""
+
+        lower, upper = self.lower, self.upper
+        if math.isinf(lower) and math.isinf(upper):
+            return 0.0
+        if math.isinf(lower):
+            return upper - max(1.0, abs(upper))
+        if math.isinf(upper):
+            return lower + max(1.0, abs(lower))
+        return lower / 2 + upper / 2
+
+    def split(self) -> tuple[Interval, Interval]:
+        """Return the two halves of the interval."""
+
+        middle = self.midpoint
+        return Interval(self.lower, middle), Interval(middle, self.upper)
+
+
+def as_interval(value: Interval | float | Sequence[float]) -> Interval:
+    """Convert a float or a ``(lower, upper)`` pair to an :class:`Interval`."""
+
+    if isinstance(value, Interval):
+        return value
+    if isinstance(value, (int, float)):
+        return Interval.point(value)
+    lower, upper = value
+    return Interval(float(lower), float(upper))
+
+
+def _down(value: float, ulps: int = 1) -> float:
+    for _ in range(ulps):
+        value = math.nextafter(value, -math.inf)
+    return value
+
+
+def _up(value: float, ulps: int = 1) -> float:
+    for _ in range(ulps):
+        value = math.nextafter(value, math.inf)
+    return value
+
+
+def _hull(values: Sequence[float], partial: bool, ulps: int = 1) -> Interval:
+    return Interval(_down(min(values), ulps), _up(max(values), ulps), partial)
+
+
+def _library_hull(values: Sequence[float], partial: bool) -> Interval:
+    # Results of library functions are widened by two ulps, except zeros:
+    # sin, tan and log only return 0.0 where the exact value is zero.
+    lower, upper = min(values), max(values)
+    return Interval(
+        lower if lower == 0 else _down(lower, 2),
+        upper if upper == 0 else _up(upper, 2),
+        partial,
+    )
+
+
+def _product(left: float, right: float) -> float:
+    # 0 * inf is taken as 0: the infinite bound is a limit, never a value.
+    if left == 0 or right == 0:
+        return 0.0
+    return left * right
+
+
+# ----------------------------------------------------------------------
+# Operators
+# ----------------------------------------------------------------------
+def negate(value: Interval) -> Interval:
+    return Interval(-value.upper, -value.lower, value.partial)
+
+
+def add(left: Interval, right: Interval) -> Interval:
+    return Interval(
+        _down(left.lower + right.lower),
+        _up(left.upper + right.upper),
+        left.partial or right.partial,
+    )
+
+
+def subtract(left: Interval, right: Interval) -> Interval:
+    return Interval(
+        _down(left.lower - right.upper),
+        _up(left.upper - right.lower),
+        left.partial or right.partial,
+    )
+
+
+def multiply(left: Interval, right: Interval) -> Interval:
+    products = [
+        _product(a, b) for a in (left.lower, left.upper) for b in (right.lower, right.upper)
+    ]
+    return _hull(products, left.partial or right.partial)
+
+
+def divide(left: Interval, right: Interval) -> Interval:
+    """Return ``left / right``; a divisor of exactly zero raises ``ZeroDivisionError``."""
+
+    partial = left.partial or right.partial
+    if right.lower > 0 or right.upper < 0:
+        quotients = [a / b for a in (left.lower, left.upper) for b in (right.lower, right.upper)]
+        return _hull([0.0 if math.isnan(q) else q for q in quotients], partial)
+    error = ZeroDivisionError("Division by zero is not defined.")
+    return multiply(left, _reciprocal(right, error))
+
+
+def _reciprocal(value: Interval, error: Exception) -> Interval:
+    lower, upper = value.lower, value.upper
+    if lower == upper == 0:
+        raise error
+    if lower > 0 or upper < 0:
+        return Interval(_down(1 / upper), _up(1 / lower), value.partial)
+    # Zero itself has no reciprocal: the result covers the rest of the range.
+    if lower == 0:
+        return Interval(_down(1 / upper), math.inf, True)
+    if upper == 0:
+        return Interval(-math.inf, _up(1 / lower), True)
+    return Interval(-math.inf, math.inf, True)
+
+
+def power(base: Interval, exponent: Interval) -> Interval:
+    """Return ``base ** exponent`` with the domain of :func:`math.pow`."""
+
+    if exponent.lower == exponent.upper and float(exponent.lower).is_integer():
+        result = _integer_power(base, int(exponent.lower))
+    else:
+        result = _real_power(base, exponent)
+    if exponent.partial and not result.partial:
+        result = Interval(result.lower, result.upper, True)
+    return result
+
+
+def _pow(base: float, exponent: float) -> float:
+    try:
+        return math.pow(base, exponent)
+    except OverflowError:
+        return math.inf if base > 0 or float(exponent / 2).is_integer() else -math.inf
+
+
+def _integer_power(base: Interval, exponent: int) -> Interval:
+    if exponent == 0:
+        return Interval(1.0, 1.0, base.partial)
+    if exponent < 0:
+        if base.lower == base.upper == 0:
+            raise ValueError("math domain error")
+        return _integer_power(_reciprocal(base, ValueError("math domain error")), -exponent)
+    lower = _pow(base.lower, exponent)
+    upper = _pow(base.upper, exponent)
+    if exponent % 2:
+        return Interval(_down(lower, 2), _up(upper, 2), base.partial)
+    if base.lower >= 0:
+        return Interval(max(0.0, _down(lower, 2)), _up(upper, 2), base.partial)
+    if base.upper <= 0:
+        return Interval(max(0.0, _down(upper, 2)), _up(lower, 2), base.partial)
+    return Interval(0.0, _up(max(lower, upper), 2), base.partial)
+
+
+def _real_power(base: Interval, exponent: Interval) -> Interval:
+    partial = base.partial or exponent.partial
+    if base.lower < 0:
+        # Negative bases only have powers at integer exponents.
+        contains_integer = math.ceil(exponent.lower) <= exponent.upper
+        if contains_integer:
+            return Interval(-math.inf, math.inf, True)
+        if base.upper < 0:
+            raise ValueError("math domain error")
+        partial = True
+    if base.upper == 0 and exponent.upper < 0:
+        raise ValueError("math domain error")
+    lower = max(base.lower, 0.0)
+    # x**y = exp(y * ln x) is monotonic in each argument, so the extremes are
+    # at the corners of the (base, exponent) rectangle.
+    values = []
+    for x in (lower, base.upper):
+        for y in (exponent.lower, exponent.upper):
+            if x == 0 and y < 0:
+                values.append(math.inf)
+                partial = True
+            else:
+                values.append(_pow(x, y))
+    result = _hull(values, partial, ulps=2)
+    return Interval(max(result.lower, 0.0), result.upper, result.partial)
+
+
+# ----------------------------------------------------------------------
+# Conditions
+# ----------------------------------------------------------------------
+FALSE = Interval(0.0, 0.0)
+TRUE = Interval(1.0, 1.0)
+UNKNOWN = Interval(0.0, 1.0)
+
+
+def truth(value: Interval) -> bool | None:
+    """Return whether ``value`` is true everywhere, false everywhere, or ``None``."""
+
+    if value.lower == value.upper == 0:
+        return False
+    if 0 not in value:
+        return True
+    return None
+
+
+def from_truth(value: bool | None) -> Interval:
+    return UNKNOWN if value is None else TRUE if value else FALSE
+
+
+def compare(function: Callable[[float, float], bool], left: Interval, right: Interval) -> Interval:
+    """Return the enclosure of the comparison ``function(left, right)``."""
+
+    # A comparison holds everywhere when it holds for the least favourable
+    # pair of points and nowhere when it fails for the most favourable one.
+    if function is operator.eq:
+        if left.lower == left.upper == right.lower == right.upper:
+            return TRUE
+        return FALSE if left.upper < right.lower or right.upper < left.lower else UNKNOWN
+    if function is operator.ne:
+        equal = truth(compare(operator.eq, left, right))
+        return from_truth(None if equal is None else not equal)
+    if function in (operator.lt, operator.le):
+        always = function(left.upper, right.lower)
+        never = not function(left.lower, right.upper)
+    else:
+        always = function(left.lower, right.upper)
+        never = not function(left.upper, right.lower)
+    return TRUE if always else FALSE if never else UNKNOWN
+
+
+def hull(values: Sequence[Interval]) -> Interval:
+    """Return the smallest interval containing all ``values``."""
+
+    return Interval(
+        min(value.lower for value in values),
+        max(value.upper for value in values),
+        any(value.partial for value in values),
+    )
+
+
+# ----------------------------------------------------------------------
+# Built-in functions
+# ----------------------------------------------------------------------
+def _to_radians(value: Interval, context: CalculatorContext) -> Interval:
+    if context.angle_unit != "degree":
+        return value
+    factor = math.pi / 180
+    return _hull([value.lower * factor, value.upper * factor], value.partial, ulps=2)
+
+
+def _contains_phase(value: Interval, offset: float, period: float) -> bool:
+    """Return whether ``value`` may contain ``offset + k * period`` for an integer ``k``.
+
+    Near misses count as hits, which only makes the enclosure wider.
+    """
+
+    slack = 8 * math.ulp(max(abs(value.lower), abs(value.upper), 1.0))
+    k = math.ceil((value.lower - slack - offset) / period)
+    return offset + k * period <= value.upper + slack
+
+
+def _periodic_unbounded(angle: Interval, period: float) -> bool:
+    return (
+        angle.width >= period
+        or abs(angle.lower) > _MAX_PERIODIC
+        or abs(angle.upper) > _MAX_PERIODIC
+    )
+
+
+def _sine_like(angle: Interval, function: Callable[[float], float], peak: float) -> Interval:
+    if _periodic_unbounded(angle, _TWO_PI):
+        return Interval(-1.0, 1.0, angle.partial)
+    result = _library_hull([function(angle.lower), function(angle.upper)], angle.partial)
+    lower, upper = max(result.lower, -1.0), min(result.upper, 1.0)
+    if _contains_phase(angle, peak, _TWO_PI):
+        upper = 1.0
+    if _contains_phase(angle, peak + math.pi, _TWO_PI):
+        lower = -1.0
+    return Interval(lower, upper, angle.partial)
+
+
+def sine(args: Sequence[Interval], context: CalculatorContext) -> Interval:
+    (value,) = args
+    return _sine_like(_to_radians(value, context), math.sin, math.pi / 2)
+
+
+def cosine(args: Sequence[Interval], context: CalculatorContext) -> Interval:
+    (value,) = args
+    return _sine_like(_to_radians(value, context), math.cos, 0.0)
+
+
+def tangent(args: Sequence[Interval], context: CalculatorContext) -> Interval:
+    """Interval tangent; an interval around a pole maps to the whole real line."""
+
+    (value,) = args
+    angle = _to_radians(value, context)
+    if _periodic_unbounded(angle, math.pi) or _contains_phase(angle, math.pi / 2, math.pi):
+        return Interval(-math.inf, math.inf, angle.partial)
+    return _library_hull([math.tan(angle.lower), math.tan(angle.upper)], angle.partial)
+
+
+def exponential(args: Sequence[Interval], _: CalculatorContext) -> Interval:
+    (value,) = args
+    result = _hull([_exp(value.lower), _exp(value.upper)], value.partial, ulps=2)
+    return Interval(max(result.lower, 0.0), result.upper, result.partial)
+
+
+def _exp(value: float) -> float:
+    try:
+        return math.exp(value)
+    except OverflowError:
+        return math.inf
+
+
+def square_root(args: Sequence[Interval], _: CalculatorContext) -> Interval:
+    (value,) = args
+    if value.upper < 0:
+        raise ValueError("Square root is only defined for non-negative values.")
+    partial = value.partial or value.lower < 0
+    lower = math.sqrt(max(value.lower, 0.0))
+    return Interval(max(_down(lower), 0.0), _up(math.sqrt(value.upper)), partial)
+
+
+def natural_log(args: Sequence[Interval], _: CalculatorContext) -> Interval:
+    (value,) = args
+    return _log(value)
+
+
+def logarithm(args: Sequence[Interval], _: CalculatorContext) -> Interval:
+    """Interval ``log(value, base)`` with the default base 10."""
+
+    value = args[0]
+    base = args[1] if len(args) > 1 else Interval.point(10.0)
+    if base.upper <= 0 or base.lower == base.upper == 1:
+        raise ValueError("Logarithm base must be positive and not equal to 1.")
+    numerator = _log(value)
+    denominator = _log(base)
+    return divide(numerator, denominator)
+
+
+def _log(value: Interval) -> Interval:
+    if value.upper <= 0:
+        raise ValueError("Logarithm is only defined for positive values.")
+    if value.lower <= 0:
+        upper = math.log(value.upper)
+        return Interval(-math.inf, upper if upper == 0 else _up(upper, 2), True)
+    return _library_hull([math.log(value.lower), math.log(value.upper)], value.partial)
+
+
+def power_function(args: Sequence[Interval], _: CalculatorContext) -> Interval:
+    base, exponent = args
+    return power(base, exponent)
+
+
+# ----------------------------------------------------------------------
+# Aggregates over inline values
+# ----------------------------------------------------------------------
+def _require_values(name: str, values: Sequence[Interval], minimum: int = 1) -> None:
+    if len(values) < minimum:
+        raise ValueError(f"{name} requires at least {minimum} value(s).")
+
+
+def minimum(values: Sequence[Interval], _: CalculatorContext) -> Interval:
+    _require_values("min", values)
+    return Interval(
+        min(value.lower for value in values),
+        min(value.upper for value in values),
+        any(value.partial for value in values),
+    )
+
+
+def maximum(values: Sequence[Interval], _: CalculatorContext) -> Interval:
+    _require_values("max", values)
+    return Interval(
+        max(value.lower for value in values),
+        max(value.upper for value in values),
+        any(value.partial for value in values),
+    )
+
+
+def total(values: Sequence[Interval], _: CalculatorContext) -> Interval:
+    # fsum is correctly rounded, so one step outwards encloses the exact sum.
+    lower = _fsum([value.lower for value in values], -math.inf)
+    upper = _fsum([value.upper for value in values], math.inf)
+    partial = any(value.partial for value in values)
+    if math.isnan(lower) or math.isnan(upper):
+        return Interval(-math.inf, math.inf, partial)
+    return Interval(_down(lower), _up(upper), partial)
+
+
+def _fsum(values: Sequence[float], overflow: float) -> float:
+    # Finite values whose partial sums leave the float range make fsum raise;
+    # ``overflow`` is the infinite bound that still encloses the exact sum.
+    try:
+        return math.fsum(values)
+    except OverflowError:
+        return overflow
+
+
+def mean(values: Sequence[Interval], context: CalculatorContext) -> Interval:
+    _require_values("mean", values)
+    return divide(total(values, context), Interval.point(len(values)))
+
+
+def stdev(values: Sequence[Interval], context: CalculatorContext) -> Interval:
+    """Interval sample standard deviation.
+
+    This is the natural extension of the two-pass formula: every value also
+    appears in the mean, so the enclosure is valid but can be wide.
+    """
+
+    _require_values("stdev", values, 2)
+    centre = mean(values, context)
+    squares = [power(subtract(value, centre), Interval.point(2)) for value in values]
+    variance = divide(total(squares, context), Interval.point(len(values) - 1))
+    return square_root([variance], context)
+
+
+def percentile(args: Sequence[Interval], _: CalculatorContext) -> Interval:
+    """Interval ``percentile(values, q)``; ``q`` is the last argument.
+
+    A percentile with linear interpolation never decreases when a value or
+    ``q`` grows, so the bounds are the percentiles of the lower bounds at
+    ``q.lower`` and of the upper bounds at ``q.upper``.
+    """
+
+    *values, q = args
+    _require_values("percentile", values)
+    if q.upper < 0 or q.lower > 100:
+        raise ValueError("Percentile must be between 0 and 100.")
+    partial = q.partial or q.lower < 0 or q.upper > 100
+    partial = partial or any(value.partial for value in values)
+    lower = _percentile([value.lower for value in values], max(q.lower, 0.0), -math.inf)
+    upper = _percentile([value.upper for value in values], min(q.upper, 100.0), math.inf)
+    return Interval(lower, upper, partial)
+
+
+def _percentile(values: list[float], q: float, overflow: float) -> float:
+    # Interpolate exactly and round towards ``overflow``, which is also the
+    # bound returned when an infinite value makes the interpolation undefined.
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * Fraction(q) / 100
+    index = math.floor(position)
+    fraction = position - index
+    low = ordered[index]
+    if fraction == 0:
+        return low
+    high = ordered[index + 1]
+    if low == high:
+        return low
+    if not (math.isfinite(low) and math.isfinite(high)):
+        return overflow
+    exact = Fraction(low) + (Fraction(high) - Fraction(low)) * fraction
+    rounded = float(exact)
+    if overflow < 0:
+        return rounded if Fraction(rounded) <= exact else _down(rounded)
+    return rounded if Fraction(rounded) >= exact else _up(rounded)
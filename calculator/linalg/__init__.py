@@ -0,0 +1,3 @@
+"""Vector and matrix helpers for the calculator (requires NumPy)."""
+
+__all__ = ["operations"]
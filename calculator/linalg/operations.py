@@ -0,0 +1,217 @@
+"""NumPy-backed vector and matrix operations for the expression engine.
+
+Vector and matrix values are plain ``float64`` :class:`numpy.ndarray` objects
+that the engine passes between nodes without copying. NumPy is optional for
+the rest of the calculator; using an array literal without it raises
+:class:`~calculator.exceptions.OperationNotSupportedError`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from calculator.context import CalculatorContext
+from calculator.exceptions import OperationNotSupportedError
+
+try:  # pragma: no cover - exercised only when NumPy is installed
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+Value = Any  # ``float`` or ``numpy.ndarray``
+
+
+def require_numpy() -> Any:
+    """Return the :mod:`numpy` module or raise if it is not installed."""
+
+    if np is None:
+        raise OperationNotSupportedError("Vector and matrix support requires NumPy.")
+    return np
+
+
+def is_array(value: object) -> bool:
+    """Return whether ``value`` is a vector or matrix value."""
+
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def contains_array(values: Sequence[object]) -> bool:
+    """Return whether any item of ``values`` is a vector or matrix value."""
+
+    if np is None:
+        return False
+    ndarray = np.ndarray
+    return any(isinstance(value, ndarray) for value in values)
+
+
+def from_elements(elements: Sequence[Value]) -> Any:
+    """Build a vector from scalars or a matrix from equally sized vectors."""
+
+    numpy = require_numpy()
+    if not elements:
+        raise ValueError("Vectors must contain at least one element.")
+
+    if all(is_array(element) for element in elements):
+        shapes = {element.shape for element in elements}
+        if len(shapes) != 1 or len(next(iter(shapes))) != 1:
+            raise ValueError("Matrix rows must be vectors of equal length.")
+        return numpy.stack(elements)
+
+    if any(is_array(element) for element in elements):
+        raise ValueError("Cannot mix scalars and vectors in one literal.")
+    return numpy.array(elements, dtype=numpy.float64)
+
+
+def flatten(values: Sequence[Value]) -> list[float]:
+    """Return the scalars and array elements of ``values`` as one flat list."""
+
+    flat: list[float] = []
+    for value in values:
+        if is_array(value):
+            flat.extend(value.ravel().tolist())
+        else:
+            flat.append(value)
+    return flat
+
+
+def add(lhs: Value, rhs: Value) -> Any:
+    """Return the elementwise sum, broadcasting scalars."""
+
+    return require_numpy().add(lhs, rhs)
+
+
+def subtract(lhs: Value, rhs: Value) -> Any:
+    """Return the elementwise difference, broadcasting scalars."""
+
+    return require_numpy().subtract(lhs, rhs)
+
+
+def multiply(lhs: Value, rhs: Value) -> Any:
+    """Return the elementwise product, broadcasting scalars."""
+
+    return require_numpy().multiply(lhs, rhs)
+
+
+def divide(lhs: Value, rhs: Value) -> Any:
+    """Return the elementwise quotient.
+
+    A :class:`ZeroDivisionError` is raised if any divisor is zero, matching
+    :func:`calculator.basic.operations.divide`.
+    """
+
+    numpy = require_numpy()
+    if numpy.any(numpy.asarray(rhs) == 0):
+        raise ZeroDivisionError("Division by zero is not defined.")
+    return numpy.divide(lhs, rhs)
+
+
+def power(base: Value, exponent: Value) -> Any:
+    """Return ``base`` raised elementwise to ``exponent``."""
+
+    numpy = require_numpy()
+    with numpy.errstate(invalid="raise", divide="raise", over="raise"):
+        try:
+            return numpy.power(numpy.asarray(base, dtype=numpy.float64), exponent)
+        except FloatingPointError as exc:
+            raise ValueError("math domain error") from exc
+
+
+def dot(lhs: Any, rhs: Any) -> Value:
+    """Return the dot product of two vectors (or matrix product)."""
+
+    return _scalar_or_array(require_numpy().dot(lhs, rhs))
+
+
+def matmul(lhs: Any, rhs: Any) -> Value:
+    """Return the matrix product ``lhs @ rhs``."""
+
+    return _scalar_or_array(require_numpy().matmul(lhs, rhs))
+
+
+def det(matrix: Any) -> float:
+    """Return the determinant of a square matrix."""
+
+    numpy = require_numpy()
+    _require_square(matrix, "det")
+    return float(numpy.linalg.det(matrix))
+
+
+def inv(matrix: Any) -> Any:
+    """Return the inverse of a square matrix."""
+
+    numpy = require_numpy()
+    _require_square(matrix, "inv")
+    try:
+        return numpy.linalg.inv(matrix)
+    except numpy.linalg.LinAlgError as exc:
+        raise ValueError("Matrix is singular.") from exc
+
+
+def solve(matrix: Any, rhs: Any) -> Any:
+    """Return ``x`` such that ``matrix @ x == rhs``."""
+
+    numpy = require_numpy()
+    _require_square(matrix, "solve")
+    try:
+        return numpy.linalg.solve(matrix, rhs)
+    except numpy.linalg.LinAlgError as exc:
+        raise ValueError("Matrix is singular.") from exc
+
+
+def norm(value: Value, order: float | None = None) -> float:
+    """Return the Euclidean (or ``order``) norm of a vector or matrix."""
+
+    numpy = require_numpy()
+    if order is not None and order == int(order):
+        order = int(order)
+    return float(numpy.linalg.norm(numpy.asarray(value, dtype=numpy.float64), order))
+
+
+def finish(value: Any, context: CalculatorContext) -> Any:
+    """Validate and round a vector or matrix result like a scalar result."""
+
+    numpy = require_numpy()
+    if not numpy.all(numpy.isfinite(value)):
+        raise ZeroDivisionError("Expression evaluates to an undefined value.")
+    return numpy.round(value, context.precision)
+
+
+def _require_square(matrix: Any, name: str) -> None:
+    if not is_array(matrix) or matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError(f"{name} expects a square matrix.")
+
+
+def _scalar_or_array(value: Any) -> Value:
+    if is_array(value) and value.ndim > 0:
+        return value
+    return float(value)
+
+
+def default_handlers() -> dict[str, tuple[Any, tuple[int, int]]]:
+    """Return the linear-algebra handlers with their arities."""
+
+    def binary(func: Any) -> Any:
+        def handler(args: Sequence[Any], _: CalculatorContext) -> Any:
+            lhs, rhs = args
+            return func(lhs, rhs)
+
+        return handler
+
+    def unary(func: Any) -> Any:
+        def handler(args: Sequence[Any], _: CalculatorContext) -> Any:
+            (value,) = args
+            return func(value)
+
+        return handler
+
+    def norm_handler(args: Sequence[Any], _: CalculatorContext) -> float:
+        return norm(*args)
+
+    return {
+        "dot": (binary(dot), (2, 2)),
+        "matmul": (binary(matmul), (2, 2)),
+        "det": (unary(det), (1, 1)),
+        "inv": (unary(inv), (1, 1)),
+        "solve": (binary(solve), (2, 2)),
+        "norm": (norm_handler, (1, 2)),
+    }
@@ -0,0 +1,530 @@
+"""Load-test harness for :class:`~calculator.engine.CalculatorEngine`.
+
+The harness synthesizes realistic expression workloads (or replays captured
+expression logs), drives a *target* at a fixed arrival rate or as fast as
+possible, and reports throughput, latency percentiles and memory high-water
+marks. Run it from the command line with::
+
+    python -m calculator.loadtest --requests 20000 --rate 5000 --concurrency 4
+
+Targets only need an ``evaluate(expression, context)`` method, so the same
+workload can drive the engine in-process or through the resident daemon of
+:mod:`calculator.daemon` (``--target daemon``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+from dataclasses import dataclass, field
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import tracemalloc
+from typing import Mapping, Protocol, Sequence
+
+try:  # pragma: no cover - ``resource`` is unavailable on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+from calculator.client import DaemonClient
+from calculator.context import CalculatorContext
+from calculator.dispatcher import FunctionDispatcher
+from calculator.engine import CalculatorEngine
+from calculator.percentiles import percentile
+from calculator.profiling import add_profile_arguments, session_from_args
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+_OPERATORS = ("+", "-", "*", "/")
+_INVALID_KINDS = ("syntax", "identifier", "division", "domain")
+
+
+@dataclass(frozen=True, slots=True)
+class WorkloadSpec:
+    """Distributions used by :func:`generate_workload`.
+
+    ``length`` bounds the number of terms joined by operators at each level,
+    ``max_depth`` limits how deeply calls and parentheses nest, and
+    ``function_weights`` maps dispatcher function names to relative weights
+    (``None`` picks every scalar built-in with equal weight). ``degree_fraction``
+    is the share of requests evaluated in degrees and ``error_rate`` the share
+    deliberately made invalid.
+    """
+
+    length: tuple[int, int] = (1, 6)
+    max_depth: int = 3
+    function_weights: Mapping[str, float] | None = None
+    call_probability: float = 0.4
+    degree_fraction: float = 0.5
+    error_rate: float = 0.0
+    precision: int = 8
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        low, high = self.length
+        if low < 1 or high < low:
+            raise ValueError("length must be a (min, max) pair with 1 <= min <= max.")
+        if self.max_depth < 0:
+            raise ValueError("max_depth must not be negative.")
+        for name in ("call_probability", "degree_fraction", "error_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1.")
+
+
+@dataclass(frozen=True, slots=True)
+class WorkloadItem:
+    """One request of a workload: an expression and the context to use."""
+
+    expression: str
+    context: CalculatorContext
+
+
+class Target(Protocol):
+    """Anything that can evaluate an expression under a context."""
+
+    def evaluate(self, expression: str, context: CalculatorContext) -> object:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class InProcessTarget:
+    """Evaluate requests directly on a :class:`CalculatorEngine`."""
+
+    def __init__(self, engine: CalculatorEngine | None = None) -> None:
+        self.engine = engine or CalculatorEngine()
+
+    def evaluate(self, expression: str, context: CalculatorContext) -> object:
+        return self.engine.evaluate(expression, context)
+
+    def close(self) -> None:
+        pass
+
+
+class DaemonTarget:
+    """Send requests to the resident daemon, starting it when needed.
+
+    Each load thread gets its own connection, and the connection's context is
+    only updated when a request uses a different one.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._clients: list[DaemonClient] = []
+        self._lock = threading.Lock()
+
+    def evaluate(self, expression: str, context: CalculatorContext) -> object:
+        local = self._local
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = DaemonClient(self.path)
+            local.context = CalculatorContext()
+            with self._lock:
+                self._clients.append(client)
+        if context != local.context:
+            client.set("angle_unit", context.angle_unit)
+            client.set("precision", context.precision)
+            local.context = context
+        return client.evaluate(expression)
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._clients:
+                client.close()
+            self._clients.clear()
+
+
+@dataclass(slots=True)
+class LoadReport:
+    """Summary of one :func:`run_load` invocation. Latencies are in seconds."""
+
+    requests: int
+    duration: float
+    latencies: list[float] = field(repr=False)
+    errors: collections.Counter[str] = field(default_factory=collections.Counter)
+    target_rate: float | None = None
+    traced_peak: int | None = None
+    max_rss: int | None = None
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Return the nearest-rank ``q``-th percentile latency."""
+
+        return percentile(self.latencies, q)
+
+    def format(self) -> str:
+        """Return a human-readable report."""
+
+        lines = [
+            f"requests      {self.requests}",
+            f"duration      {self.duration:.3f} s",
+            f"throughput    {self.throughput:.0f} req/s"
+            + (f" (target {self.target_rate:g})" if self.target_rate else ""),
+        ]
+        for q in PERCENTILES:
+            lines.append(f"p{q:<12g}{self.percentile(q) * 1e6:.1f} µs")
+        if self.errors:
+            detail = ", ".join(f"{name}={count}" for name, count in self.errors.most_common())
+            lines.append(f"errors        {sum(self.errors.values())} ({detail})")
+        if self.traced_peak is not None:
+            lines.append(f"traced peak   {self.traced_peak / 1024:.1f} KiB")
+        if self.max_rss is not None:
+            lines.append(f"max RSS       {self.max_rss / 1024:.1f} MiB")
+        return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# Workload generation and replay
+# ----------------------------------------------------------------------
+def default_function_weights(dispatcher: FunctionDispatcher | None = None) -> dict[str, float]:
+    """Return equal weights for every scalar function of ``dispatcher``."""
+
+    dispatcher = dispatcher or FunctionDispatcher()
+    weights = {}
+    for name in dispatcher.names():
+        spec = dispatcher.spec(name)
+        if spec.accepts_arrays:
+            continue
+        if spec.aggregate and spec.arity != (0, 0):
+            continue
+        weights[name] = 1.0
+    return weights
+
+
+def generate_workload(
+    spec: WorkloadSpec,
+    count: int,
+    dispatcher: FunctionDispatcher | None = None,
+) -> list[WorkloadItem]:
+    """Return ``count`` synthetic requests drawn from ``spec``."""
+
+    dispatcher = dispatcher or FunctionDispatcher()
+    weights = dict(spec.function_weights or default_function_weights(dispatcher))
+    for name in weights:
+        if name not in dispatcher.names():
+            raise ValueError(f"Unknown function '{name}'.")
+    generator = _ExpressionGenerator(spec, random.Random(spec.seed), dispatcher, weights)
+    radians = CalculatorContext("radian", spec.precision)
+    degrees = CalculatorContext("degree", spec.precision)
+
+    items = []
+    for _ in range(count):
+        rng = generator.rng
+        expression = generator.expression(0)
+        if rng.random() < spec.error_rate:
+            expression = generator.corrupt(expression)
+        context = degrees if rng.random() < spec.degree_fraction else radians
+        items.append(WorkloadItem(expression, context))
+    return items
+
+
+class _ExpressionGenerator:
+    def __init__(
+        self,
+        spec: WorkloadSpec,
+        rng: random.Random,
+        dispatcher: FunctionDispatcher,
+        weights: Mapping[str, float],
+    ) -> None:
+        self.spec = spec
+        self.rng = rng
+        self.dispatcher = dispatcher
+        self.names = list(weights)
+        self.weights = list(weights.values())
+
+    def expression(self, depth: int) -> str:
+        low, high = self.spec.length
+        count = self.rng.randint(low, high) if depth == 0 else self.rng.randint(1, min(3, high))
+        parts = [self.term(depth)]
+        for _ in range(count - 1):
+            parts.append(self.rng.choice(_OPERATORS))
+            parts.append(self.term(depth))
+        return " ".join(parts)
+
+    def term(self, depth: int) -> str:
+        rng = self.rng
+        if depth < self.spec.max_depth and self.names:
+            roll = rng.random()
+            if roll < self.spec.call_probability:
+                return self.call(depth + 1)
+            if roll < self.spec.call_probability + 0.15:
+                return f"({self.expression(depth + 1)})"
+        roll = rng.random()
+        if roll < 0.1:
+            return rng.choice(("pi", "e"))
+        if roll < 0.15:
+            return f"{self.number()} ** {rng.randint(2, 3)}"
+        return self.number()
+
+    def call(self, depth: int) -> str:
+        rng = self.rng
+        name = rng.choices(self.names, self.weights)[0]
+        spec = self.dispatcher.spec(name)
+        if spec.aggregate:
+            count = rng.randint(2, 6)
+        else:
+            low, high = spec.arity
+            count = rng.randint(low, high if high is not None else low + 2)
+        if name in ("exp", "pow"):
+            # Small literals keep overflow out of the error budget.
+            args = [str(rng.randint(1, 5)) for _ in range(count)]
+        elif name in ("log", "ln", "sqrt") or spec.aggregate:
+            # Positive literals keep domain errors down to ``error_rate``.
+            args = [self.number() for _ in range(count)]
+        else:
+            args = [self.expression(depth) for _ in range(count)]
+        return f"{name}({', '.join(args)})"
+
+    def number(self) -> str:
+        rng = self.rng
+        if rng.random() < 0.3:
+            return str(rng.randint(2, 100))
+        return f"{rng.uniform(0.1, 100.0):.3f}"
+
+    def corrupt(self, expression: str) -> str:
+        kind = self.rng.choice(_INVALID_KINDS)
+        if kind == "syntax":
+            return f"({expression} +"
+        if kind == "identifier":
+            return f"{expression} * unknown_value"
+        if kind == "division":
+            return f"({expression}) / 0"
+        return f"sqrt(-1 - {self.number()}) + {expression}"
+
+
+def load_log(
+    path: str | os.PathLike[str], context: CalculatorContext | None = None
+) -> list[WorkloadItem]:
+    """Read a captured expression log for replay.
+
+    Each non-blank line is either a bare expression or a JSON object with an
+    ``expression`` key and optional ``angle_unit`` and ``precision`` keys.
+    Bare expressions use ``context`` (default: a fresh :class:`CalculatorContext`).
+    """
+
+    default = context or CalculatorContext()
+    contexts: dict[tuple[str, int], CalculatorContext] = {}
+    items = []
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith("{"):
+                items.append(WorkloadItem(line, default))
+                continue
+            try:
+                record = json.loads(line)
+                key = (
+                    record.get("angle_unit", default.angle_unit),
+                    int(record.get("precision", default.precision)),
+                )
+                if key not in contexts:
+                    contexts[key] = CalculatorContext(*key)
+                items.append(WorkloadItem(str(record["expression"]), contexts[key]))
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f"{path}:{line_number}: invalid log record.") from exc
+    return items
+
+
+# ----------------------------------------------------------------------
+# Driving a target
+# ----------------------------------------------------------------------
+def run_load(
+    target: Target,
+    workload: Sequence[WorkloadItem],
+    *,
+    requests: int | None = None,
+    rate: float | None = None,
+    concurrency: int = 1,
+    trace_memory: bool = False,
+) -> LoadReport:
+    """Send ``requests`` items of ``workload`` (cycled) to ``target``.
+
+    With ``rate`` set the load is open-loop: request ``i`` is due at
+    ``start + i / rate`` and its latency is measured from that due time, so a
+    stalled target is charged for the queueing it causes instead of silently
+    lowering the offered load. Without ``rate`` each of the ``concurrency``
+    workers sends its next request as soon as the previous one completes.
+    ``trace_memory`` records the Python allocation peak with
+    :mod:`tracemalloc`, which slows evaluation noticeably.
+    """
+
+    if not workload:
+        raise ValueError("workload must not be empty.")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be positive.")
+    total = len(workload) if requests is None else requests
+
+    counter = itertools.count()
+    results: list[tuple[list[float], collections.Counter[str]]] = []
+    results_lock = threading.Lock()
+    clock = time.perf_counter
+
+    def worker(start: float) -> None:
+        latencies: list[float] = []
+        errors: collections.Counter[str] = collections.Counter()
+        evaluate = target.evaluate
+        size = len(workload)
+        for index in counter:
+            if index >= total:
+                break
+            item = workload[index % size]
+            if rate is None:
+                began = clock()
+            else:
+                began = start + index / rate
+                delay = began - clock()
+                if delay > 0:
+                    time.sleep(delay)
+            try:
+                evaluate(item.expression, item.context)
+            except Exception as exc:  # noqa: BLE001 - errors are part of the report
+                errors[type(exc).__name__] += 1
+            latencies.append(clock() - began)
+        with results_lock:
+            results.append((latencies, errors))
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        start = clock()
+        threads = [
+            threading.Thread(target=worker, args=(start,), name=f"load-{index}")
+            for index in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = clock() - start
+        traced_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    latencies: list[float] = []
+    errors: collections.Counter[str] = collections.Counter()
+    for worker_latencies, worker_errors in results:
+        latencies.extend(worker_latencies)
+        errors.update(worker_errors)
+    return LoadReport(
+        requests=len(latencies),
+        duration=duration,
+        latencies=latencies,
+        errors=errors,
+        target_rate=rate,
+        traced_peak=traced_peak,
+        max_rss=_max_rss(),
+    )
+
+
+def _max_rss() -> int | None:
+    """Return the process's peak resident set size in KiB when available."""
+
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux and the BSDs report kilobytes.
+    return usage // 1024 if os.uname().sysname == "Darwin" else usage
+
+
+# ----------------------------------------------------------------------
+# Command line
+# ----------------------------------------------------------------------
+TARGETS = {"inprocess": InProcessTarget, "daemon": DaemonTarget}
+
+
+def _parse_weights(text: str) -> dict[str, float]:
+    weights = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        try:
+            weights[name.strip()] = float(weight) if weight else 1.0
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(f"Invalid weight '{part}'.") from exc
+    return weights
+
+
+def _parse_range(text: str) -> tuple[int, int]:
+    low, _, high = text.partition(":")
+    try:
+        return int(low), int(high or low)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Invalid range '{text}'.") from exc
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m calculator.loadtest",
+        description="Drive the calculator engine with a synthetic or replayed workload.",
+    )
+    parser.add_argument("--target", choices=sorted(TARGETS), default="inprocess")
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate in requests/s")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--replay", metavar="LOG", help="Replay expressions from LOG")
+    parser.add_argument("--workload-size", type=int, default=1000)
+    parser.add_argument("--length", type=_parse_range, default=(1, 6), metavar="MIN:MAX")
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--functions", type=_parse_weights, metavar="NAME=W,...")
+    parser.add_argument("--degree-fraction", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--trace-memory", action="store_true")
+    add_profile_arguments(parser)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.replay:
+        workload = load_log(args.replay)
+    else:
+        spec = WorkloadSpec(
+            length=args.length,
+            max_depth=args.max_depth,
+            function_weights=args.functions,
+            degree_fraction=args.degree_fraction,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        workload = generate_workload(spec, args.workload_size)
+
+    target = TARGETS[args.target]()
+    session = session_from_args(args)
+    if session is not None:
+        session.start()
+    try:
+        report = run_load(
+            target,
+            workload,
+            requests=args.requests,
+            rate=args.rate,
+            concurrency=args.concurrency,
+            trace_memory=args.trace_memory,
+        )
+    finally:
+        target.close()
+        if session is not None:
+            for path in session.stop():
+                print(f"Profile written to {path}")
+    print(report.format())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
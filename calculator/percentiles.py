@@ -0,0 +1,22 @@
+"""Nearest-rank percentiles shared by the latency reports.
+
+Kept apart from :mod:`calculator.loadtest` so that the scheduler can report
+latency percentiles without importing the load-test harness, the daemon
+client and :mod:`tracemalloc`.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the nearest-rank ``q``-th percentile of ``values``."""
+
+    if not values:
+        return 0.0
+    if not 0.0 <= q <= 100.0:
+        raise ValueError("q must be between 0 and 100.")
+    ordered = sorted(values)
+    rank = max(1, -int(-q * len(ordered) // 100))
+    return ordered[min(rank, len(ordered)) - 1]
@@ -0,0 +1,284 @@
+"""Profiling support for the GUI and headless entry points.
+
+:class:`ProfileSession` runs code under :mod:`cProfile` or a low-overhead
+sampling profiler and, when stopped, writes:
+
+* ``<prefix>.pstats`` – :mod:`pstats` data (``cprofile`` mode only).
+* ``<prefix>.folded`` – collapsed stacks (``frame;frame;frame count``) for
+  flamegraph tools such as ``flamegraph.pl`` or speedscope.
+* ``<prefix>.txt`` – a human-readable summary of the hottest functions.
+
+With ``scope="engine"`` only calls into :class:`CalculatorEngine` and the
+calculus modules are recorded, so idle time in the Tk event loop does not
+drown the signal.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import cProfile
+import functools
+import io
+import os
+import pathlib
+import pstats
+import sys
+import threading
+from types import FrameType, ModuleType
+from typing import Any, Callable
+
+PROFILERS = ("cprofile", "sampling")
+SCOPES = ("all", "engine")
+
+_PACKAGE_DIR = str(pathlib.Path(__file__).resolve().parent)
+
+_ENGINE_METHODS = ("evaluate", "evaluate_batch", "evaluate_compiled", "evaluate_interval")
+
+
+def _scoped_targets() -> list[tuple[Any, str]]:
+    """Return ``(owner, attribute)`` pairs wrapped in engine scope."""
+
+    from calculator.calculus import autodiff, numeric, roots, taylor
+    from calculator.calculus import operations as calculus_ops
+    from calculator.engine import CalculatorEngine
+
+    targets: list[tuple[Any, str]] = [(CalculatorEngine, name) for name in _ENGINE_METHODS]
+    for module in (calculus_ops, numeric, autodiff, roots, taylor):
+        targets.extend((module, name) for name in _public_functions(module))
+    return targets
+
+
+def _public_functions(module: ModuleType) -> list[str]:
+    return [
+        name
+        for name, value in vars(module).items()
+        if not name.startswith("_")
+        and callable(value)
+        and getattr(value, "__module__", None) == module.__name__
+        and not isinstance(value, type)
+    ]
+
+
+class ProfileSession:
+    """Profile a block of code and write the results on :meth:`stop`."""
+
+    def __init__(
+        self,
+        prefix: str | os.PathLike[str],
+        *,
+        profiler: str = "cprofile",
+        scope: str = "all",
+        interval: float = 0.005,
+    ) -> None:
+        if profiler not in PROFILERS:
+            raise ValueError(f"profiler must be one of {', '.join(PROFILERS)}.")
+        if scope not in SCOPES:
+            raise ValueError(f"scope must be one of {', '.join(SCOPES)}.")
+        if interval <= 0:
+            raise ValueError("interval must be positive.")
+        self.prefix = pathlib.Path(prefix)
+        self.profiler = profiler
+        self.scope = scope
+        self.interval = interval
+        self._profile: cProfile.Profile | None = None
+        self._sampler: _Sampler | None = None
+        self._patched: list[tuple[Any, str, Any]] = []
+
+    def __enter__(self) -> "ProfileSession":
+        self.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Begin collecting profile data."""
+
+        if self.profiler == "sampling":
+            self._sampler = _Sampler(self.interval, engine_only=self.scope == "engine")
+            self._sampler.start()
+            return
+
+        self._profile = cProfile.Profile()
+        if self.scope == "all":
+            self._profile.enable()
+        else:
+            self._install_scope_wrappers(self._profile)
+
+    def stop(self) -> list[pathlib.Path]:
+        """Stop profiling, write the output files and return their paths."""
+
+        self.prefix.parent.mkdir(parents=True, exist_ok=True)
+        if self._sampler is not None:
+            self._sampler.stop()
+            written = self._write_samples(self._sampler.samples)
+            self._sampler = None
+            return written
+
+        if self._profile is None:
+            return []
+        self._profile.disable()
+        self._remove_scope_wrappers()
+        written = self._write_profile(self._profile)
+        self._profile = None
+        return written
+
+    # ------------------------------------------------------------------
+    # cProfile helpers
+    # ------------------------------------------------------------------
+    def _install_scope_wrappers(self, profile: cProfile.Profile) -> None:
+        # cProfile only observes the thread that enabled it, so calls made
+        # from other threads while the main thread is inside a scoped call
+        # are not recorded; use the sampling profiler for threaded workloads.
+        main_thread = threading.main_thread()
+        depth = 0
+
+        def wrap(func: Callable[..., Any]) -> Callable[..., Any]:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                nonlocal depth
+                if threading.current_thread() is not main_thread:
+                    return func(*args, **kwargs)
+                depth += 1
+                if depth == 1:
+                    profile.enable()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    depth -= 1
+                    if depth == 0:
+                        profile.disable()
+
+            return wrapper
+
+        for owner, name in _scoped_targets():
+            original = getattr(owner, name)
+            self._patched.append((owner, name, vars(owner)[name]))
+            setattr(owner, name, wrap(original))
+
+    def _remove_scope_wrappers(self) -> None:
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched.clear()
+
+    def _write_profile(self, profile: cProfile.Profile) -> list[pathlib.Path]:
+        pstats_path = self.prefix.with_suffix(".pstats")
+        folded_path = self.prefix.with_suffix(".folded")
+        text_path = self.prefix.with_suffix(".txt")
+
+        profile.dump_stats(str(pstats_path))
+        stats = pstats.Stats(profile)
+
+        # pstats keeps caller/callee edges rather than whole stacks, so the
+        # collapsed output has one ``caller;callee`` line per edge weighted by
+        # the time spent in the callee on behalf of that caller (µs).
+        lines = []
+        for callee, (_, _, _, _, callers) in stats.stats.items():  # type: ignore[attr-defined]
+            for caller, (_, _, inline_time, _) in callers.items():
+                weight = int(inline_time * 1_000_000)
+                if weight > 0:
+                    lines.append(f"{_label(*caller)};{_label(*callee)} {weight}")
+        folded_path.write_text("\n".join(sorted(lines)) + "\n", encoding="utf-8")
+
+        buffer = io.StringIO()
+        pstats.Stats(profile, stream=buffer).sort_stats("cumulative").print_stats(40)
+        text_path.write_text(buffer.getvalue(), encoding="utf-8")
+        return [pstats_path, folded_path, text_path]
+
+    def _write_samples(self, samples: collections.Counter[str]) -> list[pathlib.Path]:
+        folded_path = self.prefix.with_suffix(".folded")
+        text_path = self.prefix.with_suffix(".txt")
+
+        folded_path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in samples.most_common()),
+            encoding="utf-8",
+        )
+
+        self_counts: collections.Counter[str] = collections.Counter()
+        for stack, count in samples.items():
+            self_counts[stack.rsplit(";", 1)[-1]] += count
+        total = sum(samples.values())
+        lines = [f"{total} samples every {self.interval * 1000:g} ms", ""]
+        lines.append(f"{'self':>8} {'%':>6}  function")
+        for frame, count in self_counts.most_common(40):
+            lines.append(f"{count:>8} {100 * count / total:>6.1f}  {frame}")
+        text_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return [folded_path, text_path]
+
+
+def _label(filename: str, line: int, function: str) -> str:
+    if filename == "~":
+        return function
+    return f"{pathlib.Path(filename).stem}:{function}:{line}"
+
+
+class _Sampler(threading.Thread):
+    """Background thread that periodically records the stacks of all threads."""
+
+    def __init__(self, interval: float, *, engine_only: bool) -> None:
+        super().__init__(name="calculator-profiler", daemon=True)
+        self.interval = interval
+        self.engine_only = engine_only
+        self.samples: collections.Counter[str] = collections.Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._collapse(frame)
+                if stack:
+                    self.samples[stack] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        names: list[str] = []
+        in_scope = not self.engine_only
+        frames: list[FrameType] = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        for item in reversed(frames):
+            code = item.f_code
+            if not in_scope and code.co_filename.startswith(_PACKAGE_DIR):
+                in_scope = True
+            if in_scope:
+                names.append(_label(code.co_filename, code.co_firstlineno, code.co_name))
+        return ";".join(names)
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared ``--profile`` options to ``parser``."""
+
+    group = parser.add_argument_group("profiling")
+    group.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        help="Profile the session and write PREFIX.pstats/.folded/.txt on exit",
+    )
+    group.add_argument(
+        "--profiler",
+        choices=PROFILERS,
+        default="cprofile",
+        help="Use deterministic cProfile or the low-overhead sampling profiler",
+    )
+    group.add_argument(
+        "--profile-scope",
+        choices=SCOPES,
+        default="all",
+        help="Record everything or only engine and calculus calls",
+    )
+
+
+def session_from_args(args: argparse.Namespace) -> ProfileSession | None:
+    """Return a :class:`ProfileSession` configured from parsed arguments."""
+
+    if not args.profile:
+        return None
+    return ProfileSession(args.profile, profiler=args.profiler, scope=args.profile_scope)
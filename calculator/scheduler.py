@@ -0,0 +1,346 @@
+"""Cost-based scheduling of mixed-weight calculator requests.
+
+A :class:`CostModel` estimates how expensive a request is before running it,
+from the parsed expression (node count and function mix, with aggregates and
+other ``expensive`` dispatcher functions weighted heavily) or, for polynomial
+calculus requests and very long expressions, from character counts of the
+text (term count and degree). A :class:`LaneScheduler` runs requests whose cost is
+below a threshold inline on the calling thread (the *fast* lane) and hands the
+rest to a bounded pool of worker processes (the *heavy* lane), so a few huge
+polynomials cannot hold up the many tiny expressions queued behind them.
+
+Both lanes keep :class:`LaneStats` with queue depth and latency percentiles.
+"""
+
+from __future__ import annotations
+
+import ast
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import re
+import threading
+import time
+from typing import Any, Callable, Mapping, Sequence
+
+from calculator.calculus import operations as calculus_ops
+from calculator.context import CalculatorContext
+from calculator.dispatcher import FunctionDispatcher
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import OperationNotSupportedError, OverloadedError
+from calculator.percentiles import percentile
+from calculator.summation import bound_call
+
+DEFAULT_THRESHOLD = 500.0
+KINDS = ("evaluate", "differentiate", "integrate")
+
+_CALL = re.compile(r"([A-Za-z_]\w*)\s*\(")
+_EXPONENT = re.compile(r"(?:\*\*|\^) *(\d+)")
+
+
+@dataclass(frozen=True, slots=True)
+class CostEstimate:
+    """Features of one request and the cost :class:`CostModel` derived from them.
+
+    ``terms`` and ``degree`` are only estimated for polynomial calculus
+    requests and unparsed expressions, as cheap upper bounds counted from the
+    text; they are zero otherwise.
+    """
+
+    nodes: int
+    calls: int
+    expensive_calls: int
+    terms: int
+    degree: int
+    cost: float
+
+
+@dataclass(frozen=True, slots=True)
+class CostModel:
+    """Weights turning expression features into a cost in arbitrary units.
+
+    One unit is roughly one syntax node of plain arithmetic. Expressions longer
+    than ``max_parse_length`` characters are scanned instead of parsed so that
+    estimating never costs as much as running the request.
+    """
+
+    node_weight: float = 1.0
+    call_weight: float = 4.0
+    expensive_call_weight: float = 1000.0
+    term_weight: float = 3.0
+    degree_weight: float = 2.0
+    max_parse_length: int = 2000
+
+    def estimate(
+        self,
+        kind: str,
+        expression: str,
+        dispatcher: FunctionDispatcher | None = None,
+        engine: CalculatorEngine | None = None,
+    ) -> CostEstimate:
+        """Return the estimated cost of running ``kind`` on ``expression``.
+
+        ``engine`` provides the parse cache and ``dispatcher`` the ``expensive``
+        and ``aggregate`` flags of functions. Invalid expressions are cheap:
+        running them only reports the parse error.
+        """
+
+        if kind not in KINDS:
+            raise ValueError(f"Unknown request kind '{kind}'.")
+        if kind == "evaluate" and len(expression) <= self.max_parse_length:
+            engine = engine or CalculatorEngine()
+            try:
+                tree = engine.parse(expression)
+            except Exception:  # noqa: BLE001 - the request itself reports the error
+                return self._combine(1, 0, 0, 0, 0)
+            return self._from_tree(tree, dispatcher or engine.dispatcher)
+        return self._from_text(expression, dispatcher)
+
+    def _from_tree(self, tree: ast.AST, dispatcher: FunctionDispatcher) -> CostEstimate:
+        nodes = calls = expensive = 0
+        for node in ast.walk(tree):
+            nodes += 1
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+                calls += 1
+                # A bound-variable sum may fall back to evaluating millions of terms.
+                expensive += bound_call(node) is not None or _is_expensive(
+                    dispatcher, node.func.id, node.args
+                )
+        return self._combine(nodes, calls, expensive, 0, 0)
+
+    def _from_text(
+        self, expression: str, dispatcher: FunctionDispatcher | None
+    ) -> CostEstimate:
+        # Only C-level counting here: a Python loop over the tokens of a huge
+        # polynomial would take a sizeable share of the time to process it.
+        operators = sum(map(expression.count, "+-*/%^,")) - expression.count("**")
+        nodes = 2 * operators + 1
+        terms = expression.count("+") + expression.count("-") + 1
+        exponents = _EXPONENT.findall(expression)
+        degree = 0
+        if exponents:
+            digits = len(max(exponents, key=len))
+            degree = int(max(text for text in exponents if len(text) == digits))
+        names = Counter(_CALL.findall(expression))
+        calls = sum(names.values())
+        expensive = 0
+        if dispatcher is not None:
+            expensive = sum(
+                count for name, count in names.items() if _is_expensive(dispatcher, name)
+            )
+        return self._combine(nodes, calls, expensive, terms, degree)
+
+    def _combine(
+        self, nodes: int, calls: int, expensive: int, terms: int, degree: int
+    ) -> CostEstimate:
+        cost = (
+            self.node_weight * nodes
+            + self.call_weight * (calls - expensive)
+            + self.expensive_call_weight * expensive
+            + self.term_weight * terms
+            + self.degree_weight * degree
+        )
+        return CostEstimate(nodes, calls, expensive, terms, degree, cost)
+
+
+def _is_expensive(
+    dispatcher: FunctionDispatcher, name: str, args: Sequence[ast.expr] | None = None
+) -> bool:
+    try:
+        spec = dispatcher.spec(name)
+    except OperationNotSupportedError:
+        return False
+    if spec.expensive:
+        return True
+    # Aggregates over inline lists are priced by their nodes; over a named
+    # dataset (or when the arguments are unknown) they scan a whole file.
+    return spec.aggregate and (args is None or bool(args) and isinstance(args[0], ast.Name))
+
+
+@dataclass(slots=True)
+class LaneStats:
+    """Counters and recent latencies of one scheduler lane, in seconds.
+
+    ``depth`` counts requests accepted but not finished; latencies are kept
+    for the last 10,000 finished requests.
+    """
+
+    name: str
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=10000))
+
+    def percentile(self, q: float) -> float:
+        return percentile(list(self.latencies), q)
+
+    def format(self) -> str:
+        return (
+            f"{self.name:<6} submitted {self.submitted}, completed {self.completed}, "
+            f"failed {self.failed}, rejected {self.rejected}, depth {self.depth} "
+            f"(max {self.max_depth}), p50 {self.percentile(50) * 1000:.2f} ms, "
+            f"p99 {self.percentile(99) * 1000:.2f} ms"
+        )
+
+
+_worker_engine: CalculatorEngine | None = None
+
+
+def _warm_worker() -> None:
+    global _worker_engine
+    _worker_engine = CalculatorEngine()
+
+
+def _run_request(
+    kind: str,
+    expression: str,
+    context: CalculatorContext | None,
+    options: Mapping[str, Any],
+    engine: CalculatorEngine | None = None,
+) -> object:
+    if kind == "evaluate":
+        engine = engine or _worker_engine or CalculatorEngine()
+        return engine.evaluate(expression, context, variables=options.get("variables"))
+    operation = calculus_ops.differentiate if kind == "differentiate" else calculus_ops.integrate
+    return operation(expression, options.get("variable", "x"), order=options.get("order", 1))
+
+
+class LaneScheduler:
+    """Run cheap requests inline and heavy requests on a bounded worker pool.
+
+    Requests whose estimated cost is at most ``threshold`` run on the calling
+    thread. Heavier requests go to ``heavy_workers`` worker processes (or
+    threads with ``executor="thread"``, which share :attr:`engine` but also
+    the GIL); at most ``heavy_queue`` of them may wait for a worker, beyond
+    which :meth:`submit` raises :class:`OverloadedError`. Worker processes
+    use a default engine, so custom functions need ``executor="thread"``.
+    """
+
+    def __init__(
+        self,
+        engine: CalculatorEngine | None = None,
+        *,
+        model: CostModel | None = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        heavy_workers: int = 2,
+        heavy_queue: int = 32,
+        executor: str = "process",
+    ) -> None:
+        if heavy_workers < 1 or heavy_queue < 0:
+            raise ValueError("heavy_workers must be positive and heavy_queue non-negative.")
+        if executor not in ("process", "thread"):
+            raise ValueError("executor must be 'process' or 'thread'.")
+        self.engine = engine or CalculatorEngine()
+        self.model = model or CostModel()
+        self.threshold = threshold
+        self.capacity = heavy_workers + heavy_queue
+        self._executor: Executor
+        if executor == "process":
+            self._executor = ProcessPoolExecutor(heavy_workers, initializer=_warm_worker)
+            self._engine_argument = None
+        else:
+            self._executor = ThreadPoolExecutor(heavy_workers, thread_name_prefix="heavy")
+            self._engine_argument = self.engine
+        self._lock = threading.Lock()
+        self.fast = LaneStats("fast")
+        self.heavy = LaneStats("heavy")
+
+    def __enter__(self) -> LaneScheduler:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> dict[str, LaneStats]:
+        return {"fast": self.fast, "heavy": self.heavy}
+
+    def estimate(self, kind: str, expression: str) -> CostEstimate:
+        return self.model.estimate(kind, expression, self.engine.dispatcher, self.engine)
+
+    def run(
+        self,
+        kind: str,
+        expression: str,
+        context: CalculatorContext | None = None,
+        **options: Any,
+    ) -> object:
+        """Run one request and return its result, waiting for the heavy lane."""
+
+        return self.submit(kind, expression, context, **options).result()
+
+    def submit(
+        self,
+        kind: str,
+        expression: str,
+        context: CalculatorContext | None = None,
+        **options: Any,
+    ) -> Future:
+        """Schedule one request and return a future for its result.
+
+        ``kind`` is one of :data:`KINDS`. ``evaluate`` accepts a ``variables``
+        option; ``differentiate`` and ``integrate`` accept ``variable`` and
+        ``order``. Fast-lane futures are already done when returned.
+        """
+
+        started = time.perf_counter()
+        if self.estimate(kind, expression).cost <= self.threshold:
+            return self._run_fast(kind, expression, context, options, started)
+
+        lane = self.heavy
+        with self._lock:
+            if lane.depth >= self.capacity:
+                lane.rejected += 1
+                raise OverloadedError("The heavy lane is full; try again later.")
+            lane.submitted += 1
+            lane.depth += 1
+            lane.max_depth = max(lane.max_depth, lane.depth)
+        try:
+            future = self._executor.submit(
+                _run_request, kind, expression, context, options, self._engine_argument
+            )
+        except BaseException:
+            with self._lock:
+                lane.depth -= 1
+            raise
+        future.add_done_callback(self._finisher(lane, started))
+        return future
+
+    def _run_fast(
+        self,
+        kind: str,
+        expression: str,
+        context: CalculatorContext | None,
+        options: Mapping[str, Any],
+        started: float,
+    ) -> Future:
+        lane = self.fast
+        with self._lock:
+            lane.submitted += 1
+            lane.depth += 1
+            lane.max_depth = max(lane.max_depth, lane.depth)
+        future: Future = Future()
+        try:
+            future.set_result(_run_request(kind, expression, context, options, self.engine))
+        except Exception as exc:  # noqa: BLE001 - delivered through the future
+            future.set_exception(exc)
+        self._finisher(lane, started)(future)
+        return future
+
+    def _finisher(self, lane: LaneStats, started: float) -> Callable[[Future], None]:
+        def finish(future: Future) -> None:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                lane.depth -= 1
+                if future.cancelled() or future.exception() is not None:
+                    lane.failed += 1
+                else:
+                    lane.completed += 1
+                lane.latencies.append(elapsed)
+
+        return finish
@@ -0,0 +1,89 @@
+"""Vectorized scientific functions for the approximate batch mode.
+
+With the ``approximate`` option of
+:class:`~calculator.context.CalculatorContext`, batch evaluation computes a
+column of ``sin``, ``cos``, ``tan``, ``exp``, ``log`` or ``sqrt`` with one
+NumPy ufunc call instead of one :mod:`math` call per row, and validates the
+whole column with a single finiteness check. NumPy's ``float64`` kernels are
+SIMD polynomial approximations that need not match :mod:`math` bit for bit;
+:data:`MAX_RELATIVE_ERROR` is the documented bound on their relative error,
+checked against :mod:`math` by ``benchmarks/fast_math.py`` and the tests.
+
+NumPy is optional; without it :func:`evaluate` returns ``None`` and callers
+use the exact functions.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:  # pragma: no cover - exercised only when NumPy is installed
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+Array = Any  # ``numpy.ndarray`` of ``float64``
+
+MAX_RELATIVE_ERROR: dict[str, float] = {
+    "sin": 1e-15,
+    "cos": 1e-15,
+    "tan": 1e-15,
+    "exp": 1e-15,
+    "log": 1e-15,
+    "sqrt": 0.0,
+}
+
+
+def evaluate(kernel: Callable[[Array], Array], values: list[float]) -> list[float] | None:
+    """Return ``kernel`` applied to ``values``, or ``None`` to use the exact path.
+
+    ``None`` is returned when NumPy is missing or any result is not finite.
+    Every argument outside a function's domain gives a NaN or an infinity, so
+    this single check replaces the per-row validation; the exact path then
+    raises the same errors as scalar evaluation.
+    """
+
+    if np is None:
+        return None
+    array = np.fromiter(values, dtype=np.float64, count=len(values))
+    with np.errstate(all="ignore"):
+        results = kernel(array)
+    if not np.isfinite(results).all():
+        return None
+    return results.tolist()
+
+
+def sine(x: Array) -> Array:
+    """Return ``sin(x)`` for ``x`` in radians."""
+
+    return np.sin(x)
+
+
+def cosine(x: Array) -> Array:
+    """Return ``cos(x)`` for ``x`` in radians."""
+
+    return np.cos(x)
+
+
+def tangent(x: Array) -> Array:
+    """Return ``tan(x)`` for ``x`` in radians."""
+
+    return np.tan(x)
+
+
+def exponential(x: Array) -> Array:
+    """Return ``e ** x``."""
+
+    return np.exp(x)
+
+
+def logarithm(x: Array) -> Array:
+    """Return the natural logarithm of ``x``."""
+
+    return np.log(x)
+
+
+def square_root(x: Array) -> Array:
+    """Return the correctly rounded square root of ``x``."""
+
+    return np.sqrt(x)
@@ -0,0 +1,321 @@
+"""Bound-variable sums and products such as ``sum(k**2, k, 1, 1000000)``.
+
+``sum(body, k, lower, upper)`` adds ``body`` for every integer ``k`` from
+``lower`` to ``upper`` inclusive and ``prod`` multiplies the terms. A call is
+read this way when it has four arguments and the second is a plain name that
+appears in the body or is not otherwise defined; every other ``sum`` call is
+the aggregate over its arguments.
+
+When the body is a polynomial in ``k`` plus geometric terms ``c * r**k``, the
+sum is computed in O(1): polynomial parts exactly in rational arithmetic with
+Faulhaber's formula and geometric parts with the closed form of the series.
+Products of constants and of geometric terms have closed forms too. Other
+bodies are evaluated a chunk of indices at a time with
+:func:`~calculator.vectorized.evaluate_columns` and summed with
+:func:`math.fsum`.
+"""
+
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass
+from fractions import Fraction
+import functools
+import math
+from typing import Callable, Container
+
+BOUND_FUNCTIONS = ("sum", "prod")
+MAX_TERMS = 10_000_000
+CHUNK_SIZE = 4096
+MAX_CLOSED_DEGREE = 64
+
+
+@dataclass(frozen=True, slots=True)
+class BoundCall:
+    """The parts of a ``sum``/``prod`` call over a bound index variable."""
+
+    kind: str
+    body: ast.expr
+    index: str
+    lower: ast.expr
+    upper: ast.expr
+
+    def free_names(self) -> set[str]:
+        """Return the names the call reads from the enclosing scope."""
+
+        names = _names(self.body) - {self.index}
+        return names | _names(self.lower) | _names(self.upper)
+
+
+def bound_call(node: ast.Call, *scopes: Container[str]) -> BoundCall | None:
+    """Return ``node`` as a :class:`BoundCall`, or ``None`` for an ordinary call.
+
+    ``scopes`` hold the variables and constants defined where ``node`` is
+    evaluated.
+    """
+
+    if not isinstance(node.func, ast.Name) or node.keywords:
+        return None
+    kind = node.func.id.lower()
+    if kind not in BOUND_FUNCTIONS or len(node.args) != 4:
+        return None
+    body, index, lower, upper = node.args
+    if not isinstance(index, ast.Name):
+        return None
+    if index.id in _names(body) or not any(index.id in scope for scope in scopes):
+        return BoundCall(kind, body, index.id, lower, upper)
+    return None
+
+
+def evaluate_bound(
+    call: BoundCall,
+    evaluate: Callable[[ast.AST], float],
+    evaluate_chunk: Callable[[list[float]], list[float]],
+) -> float:
+    """Return the value of ``call``.
+
+    ``evaluate`` computes expressions that do not involve the index, and
+    ``evaluate_chunk`` computes the body for a list of index values.
+    """
+
+    if call.index in ("pi", "e"):
+        raise ValueError(f"Invalid index variable '{call.index}'.")
+    lower = _integer_bound(evaluate(call.lower))
+    upper = _integer_bound(evaluate(call.upper))
+    if upper < lower:
+        return 0.0 if call.kind == "sum" else 1.0
+
+    closed = _closed_form(call.body, call.index, evaluate)
+    if closed is not None:
+        try:
+            if call.kind == "sum":
+                return closed.sum(lower, upper)
+            value = closed.product(lower, upper)
+            if value is not None:
+                return value
+        except OverflowError:
+            return math.inf
+
+    count = upper - lower + 1
+    if count > MAX_TERMS:
+        raise ValueError(f"Cannot {call.kind} more than {MAX_TERMS} terms without a closed form.")
+    partials: list[float] = []
+    product = 1.0
+    for start in range(lower, upper + 1, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, upper + 1)
+        values = evaluate_chunk([float(k) for k in range(start, stop)])
+        if call.kind == "sum":
+            partials.append(math.fsum(values))
+        else:
+            product *= math.prod(values)
+    if call.kind == "sum":
+        return math.fsum(partials)
+    return product
+
+
+def _integer_bound(value: float) -> int:
+    if not math.isfinite(value) or not float(value).is_integer():
+        raise ValueError("Summation and product bounds must be integers.")
+    return int(value)
+
+
+def _names(node: ast.AST) -> set[str]:
+    functions = {id(item.func) for item in ast.walk(node) if isinstance(item, ast.Call)}
+    return {
+        item.id
+        for item in ast.walk(node)
+        if isinstance(item, ast.Name) and id(item) not in functions
+    }
+
+
+# ----------------------------------------------------------------------
+# Closed forms
+# ----------------------------------------------------------------------
+@dataclass(slots=True)
+class _Closed:
+    """``sum(poly[p] * k**p) + sum(coeff * ratio**k)`` with float coefficients."""
+
+    poly: dict[int, float]
+    geometric: dict[float, float]
+
+    def is_constant(self) -> bool:
+        return not self.geometric and all(power == 0 for power in self.poly)
+
+    def constant(self) -> float:
+        return self.poly.get(0, 0.0)
+
+    def sum(self, lower: int, upper: int) -> float:
+        exact = Fraction(0)
+        for power, coeff in self.poly.items():
+            exact += Fraction(coeff) * (_power_sum(power, upper + 1) - _power_sum(power, lower))
+        count = upper - lower + 1
+        parts = [float(exact)]
+        for ratio, coeff in self.geometric.items():
+            parts.append(coeff * _geometric_sum(ratio, lower, count))
+        return math.fsum(parts)
+
+    def product(self, lower: int, upper: int) -> float | None:
+        count = upper - lower + 1
+        if self.is_constant():
+            return self.constant() ** count
+        if not self.poly and len(self.geometric) == 1:
+            ((ratio, coeff),) = self.geometric.items()
+            # prod(c * r**k) = c**n * r**(lower + ... + upper)
+            exponent = (lower + upper) * count // 2
+            return coeff**count * ratio**exponent
+        return None
+
+
+def _closed_form(
+    node: ast.AST, index: str, evaluate: Callable[[ast.AST], float]
+) -> _Closed | None:
+    """Return ``node`` as a :class:`_Closed` in ``index``, or ``None``."""
+
+    if index not in _names(node):
+        value = evaluate(node)
+        if not isinstance(value, float):
+            return None
+        return _Closed({0: value}, {})
+
+    if isinstance(node, ast.Name):
+        return _Closed({1: 1.0}, {})
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _closed_form(node.operand, index, evaluate)
+        if operand is None or isinstance(node.op, ast.UAdd):
+            return operand
+        return _scale(operand, -1.0)
+
+    if not isinstance(node, ast.BinOp):
+        return None
+
+    if isinstance(node.op, ast.Pow):
+        return _closed_power(node, index, evaluate)
+
+    left = _closed_form(node.left, index, evaluate)
+    right = _closed_form(node.right, index, evaluate)
+    if left is None or right is None:
+        return None
+    if isinstance(node.op, (ast.Add, ast.Sub)):
+        sign = 1.0 if isinstance(node.op, ast.Add) else -1.0
+        poly = dict(left.poly)
+        for power, coeff in right.poly.items():
+            poly[power] = poly.get(power, 0.0) + sign * coeff
+        geometric = dict(left.geometric)
+        for ratio, coeff in right.geometric.items():
+            geometric[ratio] = geometric.get(ratio, 0.0) + sign * coeff
+        return _Closed(poly, geometric)
+    if isinstance(node.op, ast.Mult):
+        if right.is_constant():
+            return _scale(left, right.constant())
+        if left.is_constant():
+            return _scale(right, left.constant())
+        if left.geometric or right.geometric:
+            if left.poly or right.poly:
+                return None
+            geometric: dict[float, float] = {}
+            for ratio_a, coeff_a in left.geometric.items():
+                for ratio_b, coeff_b in right.geometric.items():
+                    ratio = ratio_a * ratio_b
+                    geometric[ratio] = geometric.get(ratio, 0.0) + coeff_a * coeff_b
+            return _Closed({}, geometric)
+        return _multiply_poly(left.poly, right.poly)
+    if isinstance(node.op, ast.Div) and right.is_constant():
+        divisor = right.constant()
+        if divisor == 0:
+            raise ZeroDivisionError("Division by zero is not defined.")
+        return _scale(left, 1.0 / divisor)
+    return None
+
+
+def _closed_power(
+    node: ast.BinOp, index: str, evaluate: Callable[[ast.AST], float]
+) -> _Closed | None:
+    if index not in _names(node.right):
+        exponent = evaluate(node.right)
+        base = _closed_form(node.left, index, evaluate)
+        if base is None or base.geometric or not isinstance(exponent, float):
+            return None
+        if not exponent.is_integer():
+            return None
+        if not 0 <= exponent <= MAX_CLOSED_DEGREE:
+            return None
+        result = _Closed({0: 1.0}, {})
+        for _ in range(int(exponent)):
+            result = _multiply_poly(result.poly, base.poly)
+            if result is None:
+                return None
+        return result
+
+    if index in _names(node.left):
+        return None
+    # r**(a*k + b) = r**b * (r**a)**k
+    ratio = evaluate(node.left)
+    if not isinstance(ratio, float):
+        return None
+    exponent = _closed_form(node.right, index, evaluate)
+    if exponent is None or exponent.geometric or any(power > 1 for power in exponent.poly):
+        return None
+    slope = exponent.poly.get(1, 0.0)
+    offset = exponent.poly.get(0, 0.0)
+    if ratio <= 0 and not (slope.is_integer() and offset.is_integer() and ratio < 0):
+        return None
+    return _Closed({}, {ratio**slope: ratio**offset})
+
+
+def _scale(value: _Closed, factor: float) -> _Closed:
+    return _Closed(
+        {power: coeff * factor for power, coeff in value.poly.items()},
+        {ratio: coeff * factor for ratio, coeff in value.geometric.items()},
+    )
+
+
+def _multiply_poly(left: dict[int, float], right: dict[int, float]) -> _Closed | None:
+    result: dict[int, float] = {}
+    for power_a, coeff_a in left.items():
+        for power_b, coeff_b in right.items():
+            power = power_a + power_b
+            if power > MAX_CLOSED_DEGREE:
+                return None
+            result[power] = result.get(power, 0.0) + coeff_a * coeff_b
+    return _Closed(result, {})
+
+
+@functools.lru_cache(maxsize=None)
+def _bernoulli(count: int) -> tuple[Fraction, ...]:
+    """Return B_0 .. B_{count-1} with the convention B_1 = -1/2."""
+
+    numbers: list[Fraction] = []
+    for m in range(count):
+        total = Fraction(0)
+        for j in range(m):
+            total += math.comb(m + 1, j) * numbers[j]
+        numbers.append(Fraction(1) if m == 0 else -total / (m + 1))
+    return tuple(numbers)
+
+
+def _power_sum(power: int, n: int) -> Fraction:
+    """Return ``sum(k**power for k in range(n))`` by Faulhaber's formula.
+
+    The formula is a polynomial identity in ``n``, so it also holds for
+    negative ``n`` and differences give sums over any integer range.
+    """
+
+    bernoulli = _bernoulli(power + 1)
+    total = Fraction(0)
+    for j in range(power + 1):
+        total += math.comb(power + 1, j) * bernoulli[j] * Fraction(n) ** (power + 1 - j)
+    return total / (power + 1)
+
+
+def _geometric_sum(ratio: float, lower: int, count: int) -> float:
+    """Return ``sum(ratio**k for k in range(lower, lower + count))``."""
+
+    if ratio == 1:
+        return float(count)
+    if ratio > 0:
+        # expm1/log1p keep ratio**count - 1 accurate for ratios near one.
+        growth = math.expm1(count * math.log1p(ratio - 1))
+    else:
+        growth = ratio**count - 1
+    return ratio**lower * growth / (ratio - 1)
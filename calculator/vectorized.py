@@ -0,0 +1,292 @@
+"""Column-wise evaluation of one expression over many variable bindings.
+
+:func:`evaluate_columns` walks the AST once per batch instead of once per
+row. Every node produces either a scalar (when it does not depend on a
+variable) or a list holding one value per row, and arithmetic runs through
+C-level ``map`` loops. Built-in functions with a column handler receive a
+whole column per call instead of one dispatch per row. Each element is
+computed with exactly the same floating-point operations as
+:meth:`CalculatorEngine.evaluate`, so batch results are bit-identical to
+evaluating the rows one at a time, unless the context is ``approximate``.
+"""
+
+from __future__ import annotations
+
+import ast
+import math
+import operator
+from typing import Callable, Mapping, Union
+
+from calculator.conditional import comparison, is_piecewise, split_piecewise
+from calculator.context import CalculatorContext
+from calculator.dispatcher import FunctionDispatcher
+from calculator.exceptions import InvalidExpressionError
+from calculator.summation import BoundCall, bound_call, evaluate_bound
+
+Column = list[float]
+Value = Union[float, Column]
+# Row indices a subexpression is evaluated on; ``None`` stands for every row.
+Rows = Union[list[int], None]
+
+_ELEMENTWISE: dict[type[ast.operator], Callable[[float, float], float]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: math.pow,
+}
+
+
+def evaluate_columns(
+    tree: ast.AST,
+    columns: Mapping[str, Column],
+    size: int,
+    dispatcher: FunctionDispatcher,
+    constants: Mapping[str, float],
+    context: CalculatorContext,
+) -> Column:
+    """Evaluate ``tree`` for ``size`` rows and return the unrounded results.
+
+    ``columns`` maps variable names to lists of ``size`` floats. An error in
+    any row aborts the whole batch with the same exception types raised by the
+    scalar engine.
+    """
+
+    def visit(node: ast.AST) -> Value:
+        if isinstance(node, ast.Expression):
+            return visit(node.body)
+
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, (int, float)):
+                return float(node.value)
+            raise InvalidExpressionError("Unsupported constant type.")
+
+        if isinstance(node, ast.Name):
+            if node.id in columns:
+                return columns[node.id]
+            if node.id in constants:
+                return float(constants[node.id])
+            raise InvalidExpressionError(f"Unknown identifier '{node.id}'.")
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            operand = visit(node.operand)
+            if isinstance(operand, list):
+                return list(map(operator.neg, operand))
+            return -operand
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+            return visit(node.operand)
+
+        if isinstance(node, ast.BinOp):
+            left = visit(node.left)
+            right = visit(node.right)
+            function = _ELEMENTWISE.get(type(node.op))
+            if function is None:
+                raise InvalidExpressionError("Unsupported binary operation.")
+            if isinstance(node.op, ast.Div) and _has_zero(right):
+                raise ZeroDivisionError("Division by zero is not defined.")
+            return _apply(function, left, right, size)
+
+        if isinstance(node, ast.IfExp):
+            test = visit(node.test)
+            if not isinstance(test, list):
+                return visit(node.body if test != 0 else node.orelse)
+            taken = [row for row, value in enumerate(test) if value != 0]
+            skipped = [row for row, value in enumerate(test) if value == 0]
+            return select([(taken, node.body), (skipped, node.orelse)])
+
+        if isinstance(node, ast.Compare):
+            return visit_compare(node)
+
+        if isinstance(node, ast.BoolOp):
+            return visit_boolean(node)
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = visit(node.operand)
+            if isinstance(operand, list):
+                return [float(value == 0) for value in operand]
+            return float(operand == 0)
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name):
+                raise InvalidExpressionError("Unsupported function call.")
+            name = node.func.id
+            if is_piecewise(node):
+                return visit_piecewise(node)
+            bound = bound_call(node, columns, constants)
+            if bound is not None:
+                return visit_bound(node, bound)
+            if dispatcher.is_aggregate(name) and any(
+                isinstance(arg, ast.List) for arg in node.args
+            ):
+                raise InvalidExpressionError(
+                    "Aggregate functions are not supported in batch evaluation."
+                )
+            args = [visit(arg) for arg in node.args]
+            if not any(isinstance(arg, list) for arg in args):
+                return dispatcher.evaluate(name, args, context)
+            return dispatcher.evaluate_columns(name, args, size, context)
+
+        raise InvalidExpressionError(
+            "Unsupported expression component for batch evaluation."
+        )
+
+    # Conditionals evaluate each branch only on the rows that select it: a
+    # branch becomes a nested batch over just those rows, so rows that take
+    # another branch can neither raise in it nor cost any work.
+    def on_rows(node: ast.AST, rows: Rows) -> Value:
+        if rows is None:
+            return visit(node)
+        used = {item.id for item in ast.walk(node) if isinstance(item, ast.Name)}
+        subset = {
+            name: [column[row] for row in rows]
+            for name, column in columns.items()
+            if name in used
+        }
+        return evaluate_columns(node, subset, len(rows), dispatcher, constants, context)
+
+    def select(branches: list[tuple[Rows, ast.AST]]) -> Value:
+        result = [0.0] * size
+        for rows, node in branches:
+            if rows is None or len(rows) == size:
+                return visit(node)
+            if not rows:
+                continue
+            values = on_rows(node, rows)
+            if not isinstance(values, list):
+                values = [values] * len(rows)
+            for row, value in zip(rows, values):
+                result[row] = value
+        return result
+
+    def truth(value: Value, rows: Rows) -> list[bool]:
+        count = size if rows is None else len(rows)
+        if isinstance(value, list):
+            return [item != 0 for item in value]
+        return [value != 0] * count
+
+    def remaining(rows: Rows, keep: list[bool]) -> list[int]:
+        if rows is None:
+            return [row for row, flag in enumerate(keep) if flag]
+        return [row for row, flag in zip(rows, keep) if flag]
+
+    def indicator(rows: list[int]) -> Column:
+        result = [0.0] * size
+        for row in rows:
+            result[row] = 1.0
+        return result
+
+    def visit_compare(node: ast.Compare) -> Value:
+        # ``a < b < c`` compares ``b`` and ``c`` only on rows where ``a < b``.
+        left = visit(node.left)
+        rows: Rows = None
+        for op, comparator in zip(node.ops, node.comparators):
+            function = comparison(op)
+            right = on_rows(comparator, rows)
+            count = size if rows is None else len(rows)
+            outcome = _apply(function, left, right, count)  # type: ignore[arg-type]
+            if not isinstance(outcome, list):
+                if not outcome:
+                    return 0.0 if rows is None else [0.0] * size
+                left = right
+                continue
+            keep = [bool(flag) for flag in outcome]
+            rows = remaining(rows, keep)
+            left = [item for item, flag in zip(right, keep) if flag] if isinstance(
+                right, list
+            ) else right
+            if not rows:
+                return [0.0] * size
+        return 1.0 if rows is None else indicator(rows)
+
+    def visit_boolean(node: ast.BoolOp) -> Value:
+        # Rows leave the undecided set at the first false operand of ``and``
+        # or the first true operand of ``or``.
+        stop = isinstance(node.op, ast.Or)
+        undecided: Rows = None
+        decided: list[int] = []
+        for operand in node.values:
+            flags = truth(on_rows(operand, undecided), undecided)
+            if undecided is None and len(set(flags)) == 1 and flags:
+                if flags[0] == stop:
+                    return float(stop)
+                continue
+            decided += remaining(undecided, [flag == stop for flag in flags])
+            undecided = remaining(undecided, [flag != stop for flag in flags])
+            if not undecided:
+                break
+        if undecided is None:
+            return float(not stop)
+        decided_value, undecided_value = float(stop), float(not stop)
+        result = [undecided_value] * size
+        for row in decided:
+            result[row] = decided_value
+        return result
+
+    def visit_piecewise(node: ast.Call) -> Value:
+        pairs, default = split_piecewise(node.args)
+        undecided: Rows = None
+        branches: list[tuple[Rows, ast.AST]] = []
+        for condition, value in pairs:
+            flags = truth(on_rows(condition, undecided), undecided)
+            branches.append((remaining(undecided, flags), value))
+            undecided = remaining(undecided, [not flag for flag in flags])
+            if not undecided:
+                break
+        else:
+            if default is None:
+                raise InvalidExpressionError("No piecewise condition is true.")
+            branches.append((undecided, default))
+        return select(branches)
+
+    def visit_bound(node: ast.Call, call: BoundCall) -> Value:
+        if call.free_names().isdisjoint(columns):
+
+            def evaluate_chunk(indices: list[float]) -> list[float]:
+                return evaluate_columns(
+                    call.body, {call.index: indices}, len(indices), dispatcher, constants, context
+                )
+
+            return evaluate_bound(call, visit, evaluate_chunk)  # type: ignore[arg-type]
+        # The index range or the body depends on the row: evaluate row by row
+        # with that row's values bound as constants.
+        used = [name for name in call.free_names() if name in columns]
+        return [
+            evaluate_columns(
+                node,
+                {},
+                1,
+                dispatcher,
+                {**constants, **{name: columns[name][row] for name in used}},
+                context,
+            )[0]
+            for row in range(size)
+        ]
+
+    result = visit(tree)
+    if isinstance(result, list):
+        return result
+    return [result] * size
+
+
+def _has_zero(value: Value) -> bool:
+    if isinstance(value, list):
+        return 0.0 in value
+    return value == 0
+
+
+def _apply(
+    function: Callable[[float, float], float],
+    left: Value,
+    right: Value,
+    size: int,
+) -> Value:
+    left_is_column = isinstance(left, list)
+    right_is_column = isinstance(right, list)
+    if not left_is_column and not right_is_column:
+        return function(left, right)  # type: ignore[arg-type]
+    if left_is_column and right_is_column:
+        return list(map(function, left, right))  # type: ignore[arg-type]
+    if left_is_column:
+        return list(map(function, left, [right] * size))  # type: ignore[list-item]
+    return list(map(function, [left] * size, right))  # type: ignore[list-item]
@@ -0,0 +1,70 @@
+"""Tests for the streaming aggregate functions."""
+
+import math
+import statistics
+
+import pytest
+
+from calculator.aggregate import operations as ops
+from calculator.aggregate.datasets import BinaryDataset, CsvDataset, InlineData
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError
+
+
+def test_running_stats_merges_chunks() -> None:
+    values = [float(index % 97) * 1.5 + 1e6 for index in range(1000)]
+    stats = ops.RunningStats()
+    for start in range(0, len(values), 37):
+        stats.update(values[start : start + 37])
+    assert stats.count == len(values)
+    assert stats.total == math.fsum(values)
+    assert stats.mean == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert math.sqrt(stats.variance) == pytest.approx(statistics.stdev(values), rel=1e-9)
+    assert (stats.minimum, stats.maximum) == (min(values), max(values))
+
+
+def test_percentile_interpolates() -> None:
+    data = InlineData([4, 1, 3, 2])
+    assert ops.percentile(data, 0) == 1
+    assert ops.percentile(data, 50) == 2.5
+    assert ops.percentile(data, 100) == 4
+    with pytest.raises(ValueError):
+        ops.percentile(data, 101)
+
+
+def test_inline_aggregates_in_expressions() -> None:
+    engine = CalculatorEngine()
+    assert engine.evaluate("mean([1, 2, 3, 4]) * 1.2") == pytest.approx(3.0)
+    assert engine.evaluate("max(1, 5, 3) - min(2, -1)") == 6
+    assert engine.evaluate("percentile([1, 2, 3, 4, 5], 90)") == pytest.approx(4.6)
+
+
+def test_aggregate_errors_are_invalid_expressions() -> None:
+    engine = CalculatorEngine()
+    with pytest.raises(InvalidExpressionError):
+        engine.evaluate("stdev([1])")
+    with pytest.raises(InvalidExpressionError):
+        engine.evaluate("percentile([1, 2])")
+
+
+def test_binary_dataset_streams_memory_mapped_file(tmp_path) -> None:
+    path = tmp_path / "prices.f64"
+    values = [float(index) for index in range(10_000)]
+    BinaryDataset.write(path, values)
+
+    engine = CalculatorEngine(datasets={"prices": BinaryDataset(path)})
+    assert engine.evaluate("mean(prices) * 2") == pytest.approx(9999.0)
+    assert engine.evaluate("max(prices) - min(prices)") == 9999
+    assert engine.evaluate("sum(prices)") == sum(values)
+
+
+def test_csv_dataset_by_column_name(tmp_path) -> None:
+    path = tmp_path / "data.csv"
+    path.write_text("name,price\na,1.5\nb,\nc,4.5\n", encoding="utf-8")
+    engine = CalculatorEngine()
+    engine.register_dataset("prices", CsvDataset(path, "price"))
+    assert engine.evaluate("mean(prices)") == 3.0
+
+    engine.register_dataset("missing", CsvDataset(path, "volume"))
+    with pytest.raises(InvalidExpressionError):
+        engine.evaluate("mean(missing)")
@@ -0,0 +1,107 @@
+"""Tests for automatic differentiation of engine expressions."""
+
+import math
+
+import pytest
+
+from calculator.aggregate.datasets import InlineData
+from calculator.calculus import autodiff
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError, OperationNotSupportedError
+
+
+def test_forward_mode_matches_analytic_derivative() -> None:
+    value = autodiff.derivative("sin(x)*exp(-x)", "x", 1.0)
+    expected = (math.cos(1.0) - math.sin(1.0)) * math.exp(-1.0)
+    assert value == pytest.approx(expected, rel=1e-15)
+
+
+@pytest.mark.parametrize(
+    ("expression", "point", "expected"),
+    [
+        ("tan(x)", 0.5, 1 / math.cos(0.5) ** 2),
+        ("log(x)", 2.0, 1 / (2.0 * math.log(10))),
+        ("log(8, x)", 2.0, -math.log(8) / (2.0 * math.log(2) ** 2)),
+        ("ln(x)", 4.0, 0.25),
+        ("sqrt(x)", 4.0, 0.25),
+        ("pow(x, 3) - x**x", 2.0, 12 - 4 * (math.log(2) + 1)),
+        ("1 / cos(x)", 0.3, math.sin(0.3) / math.cos(0.3) ** 2),
+    ],
+)
+def test_builtin_derivative_rules(expression: str, point: float, expected: float) -> None:
+    assert autodiff.derivative(expression, "x", point) == pytest.approx(expected, rel=1e-12)
+
+
+def test_degree_mode_trigonometry() -> None:
+    context = CalculatorContext(angle_unit="degree")
+    value = autodiff.derivative("sin(x)", "x", 60, context=context)
+    assert value == pytest.approx(0.5 * math.pi / 180)
+
+
+def test_derivatives_at_many_points() -> None:
+    assert autodiff.derivatives("x**3", "x", [1, 2, 3]) == [3, 12, 27]
+
+
+def test_reverse_mode_gradient() -> None:
+    grad = autodiff.gradient("x*y + exp(x*z) - y**2", {"x": 1.0, "y": 2.0, "z": 0.5})
+    assert grad["x"] == pytest.approx(2 + 0.5 * math.exp(0.5))
+    assert grad["y"] == pytest.approx(1 - 4)
+    assert grad["z"] == pytest.approx(math.exp(0.5))
+
+    many = autodiff.gradients("x*y", [{"x": 1, "y": 2}, {"x": 3, "y": 4}])
+    assert many == [{"x": 2, "y": 1}, {"x": 4, "y": 3}]
+
+
+def test_undefined_and_unsupported_derivatives() -> None:
+    with pytest.raises(ZeroDivisionError):
+        autodiff.derivative("sqrt(x)", "x", 0)
+    with pytest.raises(InvalidExpressionError):
+        autodiff.derivative("ln(x)", "x", -1)
+    with pytest.raises(OperationNotSupportedError, match="bound variable"):
+        autodiff.derivative("sum(x*k, k, 1, 3)", "x", 2)
+    with pytest.raises(ZeroDivisionError):
+        autodiff.derivative("stdev([x, 1])", "x", 1)
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [
+        ("sum(x, y, 2*x)", {"x": 3.0, "y": 1.0}),
+        ("mean([x, y, 4]) * x", {"x": 8.5 / 3 + 0.5, "y": 0.5}),
+        ("max(x, y, 1) + min([x, y])", {"x": 1.0, "y": 1.0}),
+        ("percentile([x, y, 5], 25)", {"x": 0.5, "y": 0.5}),
+        # q = 15 interpolates 30% of the way from x to y; d/dq is (y - x) * 2 / 100.
+        ("percentile([x, y, 5], 10*x)", {"x": 0.7 + 10 * 0.03, "y": 0.3}),
+    ],
+)
+def test_aggregate_derivative_rules(expression: str, expected: dict[str, float]) -> None:
+    point = {"x": 1.5, "y": 3.0}
+    grad = autodiff.gradient(expression, point)
+    assert grad == pytest.approx(expected, rel=1e-12)
+    assert autodiff.derivative(expression, "x", 1.5, variables={"y": 3.0}) == pytest.approx(
+        expected["x"], rel=1e-12
+    )
+
+
+def test_stdev_and_dataset_aggregates() -> None:
+    engine = CalculatorEngine()
+    values = [1.0, 4.0, 2.5]
+    step = 1e-6
+    numeric = (
+        engine.evaluate("stdev([x, 4, 2.5])", variables={"x": 1 + step})
+        - engine.evaluate("stdev([x, 4, 2.5])", variables={"x": 1 - step})
+    ) / (2 * step)
+    grad = autodiff.gradient("stdev([x, 4, 2.5])", {"x": values[0]}, engine=engine)
+    assert grad["x"] == pytest.approx(numeric, abs=1e-6)
+
+    engine.register_dataset("data", InlineData([3.0, 1.0, 2.0]))
+    assert autodiff.derivative("x * mean(data)", "x", 5, engine=engine) == 2.0
+    # The 50th percentile moves from 2 towards 3 at (3 - 2) * 2 / 100 per unit of q.
+    assert autodiff.derivative("percentile(data, x)", "x", 60, engine=engine) == pytest.approx(
+        0.02
+    )
+
+
+def test_inactive_operands_do_not_poison_results() -> None:
+    assert autodiff.derivative("(-2)**y + x", "x", 1, variables={"y": 2}) == 1
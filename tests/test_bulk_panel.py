@@ -0,0 +1,68 @@
+"""Tests for the background bulk evaluation job behind the GUI tab."""
+
+import csv
+import math
+
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+from ui.bulk_panel import BulkJob, FileRows, TextRows
+
+
+def test_text_rows_are_evaluated_with_per_row_errors() -> None:
+    source = TextRows("1 + 2\n\n2^3\nsqrt(-1)\n1/0\n")
+    job = BulkJob(CalculatorEngine(), source, CalculatorContext(precision=3))
+    job.run()
+
+    assert job.finished.is_set()
+    assert len(job) == 4
+    assert job.row(0) == (1, "1 + 2", "3.0")
+    assert job.row(1) == (2, "2^3", "8.0")
+    assert job.row(2)[2].startswith("Error:")
+    assert math.isnan(job.results[3])
+    assert set(job.errors) == {2, 3}
+    assert job.progress() == 1.0
+
+
+def test_file_rows_keep_offsets_and_reread_csv_column(tmp_path) -> None:
+    path = tmp_path / "input.csv"
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["id", "Expression"])
+        for index in range(2500):
+            writer.writerow([index, f"{index} * 2"])
+
+    source = FileRows(path)
+    job = BulkJob(CalculatorEngine(), source, CalculatorContext())
+    job.run()
+    try:
+        assert len(source) == len(job) == 2500
+        assert job.row(2499) == (2500, "2499 * 2", "4998.0")
+        assert source.progress() == 1.0
+    finally:
+        source.close()
+
+
+def test_cancel_stops_background_job(tmp_path) -> None:
+    path = tmp_path / "input.txt"
+    path.write_text("1 + 1\n" * 50_000, encoding="utf-8")
+    source = FileRows(path)
+    job = BulkJob(CalculatorEngine(), source, CalculatorContext())
+    job.cancel()
+    job.start()
+    assert job.finished.wait(5)
+    assert job.cancelled
+    assert len(job) < 50_000
+    source.close()
+
+
+def test_export_writes_results_and_errors(tmp_path) -> None:
+    job = BulkJob(CalculatorEngine(), TextRows("0.1 + 0.2\nfoo"), CalculatorContext(precision=15))
+    job.run()
+    output = tmp_path / "out.csv"
+
+    assert job.export(output) == 2
+    with open(output, newline="", encoding="utf-8") as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0] == ["expression", "result", "error"]
+    assert rows[1] == ["0.1 + 0.2", "0.3", ""]
+    assert rows[2][0] == "foo" and rows[2][1] == "" and rows[2][2]
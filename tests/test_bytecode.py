@@ -0,0 +1,70 @@
+"""Tests for the compact postfix bytecode."""
+
+import pickle
+
+import pytest
+
+from calculator.bytecode import CompiledExpression
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError, OperationNotSupportedError
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["2 + 3 * 4", "-(2 ** 3) / 7", "sin(pi/2) + log(100, 10)", "sqrt(exp(2)) - ln(e)"],
+)
+def test_compiled_matches_reference(expression: str) -> None:
+    engine = CalculatorEngine()
+    program = engine.compile(expression)
+    assert engine.evaluate_compiled(program) == engine.evaluate(expression)
+
+
+def test_compiled_respects_context() -> None:
+    engine = CalculatorEngine(CalculatorContext(angle_unit="degree"))
+    program = engine.compile("sin(30)")
+    assert engine.evaluate_compiled(program) == pytest.approx(0.5)
+
+
+def test_invalid_components_fail_where_evaluation_reaches_them() -> None:
+    engine = CalculatorEngine()
+    program = engine.compile("sin(x)")
+    with pytest.raises(InvalidExpressionError, match="Unknown identifier 'x'"):
+        engine.evaluate_compiled(program)
+    for expression in ("1/0 + ()", "exp(1e6) * y", "5/0 // 2", "1 or y", "2 if 1 else 'a'"):
+        try:
+            expected: object = engine.evaluate(expression)
+        except Exception as exc:  # noqa: BLE001 - the exception type is compared
+            expected = type(exc)
+        try:
+            observed: object = engine.evaluate_compiled(engine.compile(expression))
+        except Exception as exc:  # noqa: BLE001
+            observed = type(exc)
+        assert observed == expected, expression
+    with pytest.raises(InvalidExpressionError, match="cannot be compiled"):
+        engine.compile("[1, 2] + 1")
+
+
+def test_compiled_runtime_errors() -> None:
+    engine = CalculatorEngine()
+    with pytest.raises(ZeroDivisionError):
+        engine.evaluate_compiled(engine.compile("1 / 0"))
+    with pytest.raises(InvalidExpressionError):
+        engine.evaluate_compiled(engine.compile("sqrt(-1)"))
+    with pytest.raises(OperationNotSupportedError):
+        engine.evaluate_compiled(engine.compile("foo(1)"))
+
+
+def test_bytes_round_trip_and_pickle() -> None:
+    engine = CalculatorEngine()
+    program = engine.compile("pow(2, 10) - 3 * -0.0 + cos(0)")
+    restored = CompiledExpression.from_bytes(program.to_bytes())
+    assert restored == program
+    assert pickle.loads(pickle.dumps(program)) == program
+    assert engine.evaluate_compiled(restored) == engine.evaluate("pow(2, 10) + cos(0)")
+
+
+def test_truncated_bytes_rejected() -> None:
+    data = CalculatorEngine().compile("1 + 2").to_bytes()
+    with pytest.raises(InvalidExpressionError):
+        CompiledExpression.from_bytes(data[:-3])
@@ -1,5 +1,10 @@
 """Tests for calculus helper functions."""
 
+from fractions import Fraction
+import io
+import math
+import pickle
+
 import pytest
 
 from calculator.calculus import operations as ops
@@ -19,3 +24,141 @@ def test_invalid_expression() -> None:
 
     with pytest.raises(ValueError):
         ops.integrate("sin(y)", "1x")
+
+
+def test_long_polynomial_is_collected_in_one_pass() -> None:
+    expression = " + ".join(["3*x**2", "-2*x", "1"] * 20_000)
+    assert ops.differentiate(expression, "x") == "120000*x - 40000"
+
+
+def test_grouped_and_scaled_terms() -> None:
+    assert ops.differentiate("2*(x**3 - (x - 1)*3) - -x", "x") == "6*x**2 - 5"
+    assert ops.integrate("(x)*4 + x**2.0", "x") == "0.3333333333333333*x**3 + 2*x**2"
+
+
+def test_unsupported_polynomial_forms_keep_their_errors() -> None:
+    with pytest.raises(ValueError, match="constant factor"):
+        ops.differentiate("x*x", "x")
+    with pytest.raises(ValueError, match="non-negative integers"):
+        ops.differentiate("x**2.5", "x")
+    with pytest.raises(ValueError, match="Unsupported variable"):
+        ops.differentiate("x + y", "x")
+    with pytest.raises(ValueError):
+        ops.differentiate("x**07", "x")
+
+
+def test_grouped_constants_round_like_the_syntax_tree_walk() -> None:
+    # 7*.9 + 7*-3 and 7*(.9 - 3) differ in the last bit; the AST walk does the former.
+    assert ops.integrate("7*(.9-3)", "x") == f"{7 * 0.9 + 7 * -3.0}*x"
+
+
+def test_multivariate_partial_derivatives_and_gradient() -> None:
+    expression = "3*x**2*y + y**3"
+    assert ops.partial_derivative(expression, "x") == "6*x*y"
+    assert ops.partial_derivative(expression, "z") == "0"
+    assert ops.gradient(expression) == {"x": "6*x*y", "y": "3*x**2 + 3*y**2"}
+    assert ops.partial_derivative("(x + y)**3", "x") == "3*x**2 + 6*x*y + 3*y**2"
+
+
+def test_multivariate_integration_adds_missing_variables() -> None:
+    assert ops.integrate_partial("3*x**2*y + y**3", "y") == "1.5*x**2*y**2 + 0.25*y**4"
+    assert ops.integrate_partial("y", "x") == "x*y"
+    polynomial = ops.Polynomial.parse("2*x*y")
+    assert polynomial.integrate("x").partial("x") == polynomial
+
+
+def test_multivariate_evaluation_matches_direct_sums() -> None:
+    points = {"x": [1.0, 2.0, -0.5], "y": [2.0, 3.0, 0.25]}
+    assert ops.evaluate_polynomial("3*x**2*y + y**3", points) == [14.0, 63.0, 0.203125]
+
+    terms = " + ".join(
+        f"{i % 7 + 1}*x**{i % 23}*y**{i // 23 % 19}*z**{i // 437}" for i in range(12_000)
+    )
+    polynomial = ops.Polynomial.parse(terms)
+    assert len(polynomial.terms) == 12_000
+    values = polynomial.evaluate({"x": [0.5], "y": [-0.75], "z": [0.9]})
+    expected = sum(
+        coeff * 0.5**a * (-0.75) ** b * 0.9**c for (a, b, c), coeff in polynomial.terms.items()
+    )
+    assert values[0] == pytest.approx(expected, rel=1e-12)
+
+
+def test_multivariate_errors() -> None:
+    with pytest.raises(ValueError, match="Unsupported variable"):
+        ops.Polynomial.parse("x + z", ["x", "y"])
+    with pytest.raises(ValueError, match="non-negative integers"):
+        ops.Polynomial.parse("x**2.5 * y")
+    with pytest.raises(ValueError, match="Missing values"):
+        ops.evaluate_polynomial("x*y", {"x": [1.0]})
+    with pytest.raises(ValueError, match="floating-point range"):
+        ops.Polynomial.parse("2**10000*x")
+    for expression in ("(1e200*x)**2", "(1e200*x)*(1e200*y)", "1e308*x + 1e308*x"):
+        with pytest.raises(ValueError, match="floating-point range"):
+            ops.Polynomial.parse(expression)
+
+
+def test_polynomials_are_immutable_and_hashable() -> None:
+    terms = {(1, 0): 1.0, (0, 1): 1.0}
+    polynomial = ops.Polynomial(("x", "y"), terms)
+    terms[(2, 0)] = 5.0
+    assert polynomial == ops.Polynomial.parse("x + y")
+    assert len({polynomial, ops.Polynomial.parse("y + x")}) == 1
+    with pytest.raises(TypeError):
+        polynomial.terms[(1, 1)] = 2.0  # type: ignore[index]
+    assert pickle.loads(pickle.dumps(polynomial)) == polynomial
+
+
+def test_higher_order_derivatives_and_antiderivatives() -> None:
+    assert list(ops.derivatives("x**5 - 2*x**2 + 0.5*x", "x")) == [
+        "5*x**4 - 4*x + 0.5",
+        "20*x**3 - 4",
+        "60*x**2",
+        "120*x",
+        "120",
+    ]
+    assert list(ops.derivatives("x", "x", 3)) == ["1", "0", "0"]
+    assert ops.differentiate("x**20", "x", order=19) == f"{math.factorial(20)}*x"
+
+    antiderivatives = ops.antiderivatives("6*x", "x")
+    assert [next(antiderivatives) for _ in range(3)] == ["3*x**2", "x**3", "0.25*x**4"]
+    assert ops.integrate("2", "x", order=2) == "x**2"
+
+    with pytest.raises(ValueError, match="Order"):
+        ops.derivatives("x", "x", -1)
+
+
+def test_high_orders_stay_within_the_float_range() -> None:
+    # perm(400, 200) and perm(600, 200) are far beyond the largest float.
+    with pytest.raises(ValueError, match="floating-point range"):
+        ops.differentiate("x**400", "x", order=200)
+    with pytest.raises(ValueError, match="floating-point range"):
+        list(ops.derivatives("x**400", "x", 200))
+    with pytest.raises(ValueError, match="floating-point range"):
+        ops.integrate("x**400", "x", order=200)
+    assert ops.integrate("0*x**400", "x", order=200) == "0"
+    # A tiny coefficient brings a huge falling factorial back into range.
+    coefficient, power = ops.differentiate("1e-300*x**200", "x", order=180).split("*x**")
+    assert float(coefficient) == float(Fraction(1e-300) * math.perm(200, 180))
+    assert power == "20"
+
+
+def test_polynomial_result_streams_the_same_text() -> None:
+    expression = " + ".join(
+        f"{(-1) ** power * (power % 5 + 1)}*x**{power}" for power in range(3000)
+    )
+    result = ops.differentiate_result(expression, "x", order=2)
+    text = ops.differentiate(expression, "x", order=2)
+    assert str(result) == text
+    assert "".join(result.chunks(size=7)) == text
+    assert "".join(result.chunks(0, 10)) + "".join(result.chunks(10)) == text
+    assert (len(result), result.degree) == (2998, 2997)
+
+    buffer = io.StringIO()
+    assert result.write(buffer, size=100) == len(text)
+    assert buffer.getvalue() == text
+
+    assert result.summary(leading=2).startswith("Degree 2997, 2998 terms: ")
+    assert result.summary(leading=2).endswith(" + …")
+    zero = ops.integrate_result("0", "t")
+    assert (str(zero), len(zero), list(zero.chunks())) == ("0", 0, [])
+    assert zero.summary() == "Degree 0, 0 terms: 0"
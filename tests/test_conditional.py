@@ -0,0 +1,106 @@
+"""Tests for conditional and piecewise expressions."""
+
+import math
+
+import pytest
+
+from calculator.bytecode import CompiledExpression
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError
+from calculator.interval import Interval
+
+
+def test_branches_are_evaluated_lazily() -> None:
+    engine = CalculatorEngine()
+    assert engine.evaluate("sqrt(x) if x >= 0 else 0", variables={"x": -4}) == 0
+    assert engine.evaluate("sqrt(x) if x >= 0 else 0", variables={"x": 9}) == 3
+    assert engine.evaluate("x > 0 and ln(x) > 1", variables={"x": -1}) == 0
+    assert engine.evaluate("x <= 0 or ln(x) > 1", variables={"x": -1}) == 1
+    assert engine.evaluate("1 < x < 3", variables={"x": 2}) == 1
+    assert engine.evaluate("1 < x < 3", variables={"x": 3}) == 0
+    assert engine.evaluate("x == 2 and not x != 2", variables={"x": 2}) == 1
+    assert engine.evaluate("2 if 0.0 else 5") == 5
+
+    expression = "piecewise(x < 0, -x, x < 1, x**2, 1)"
+    values = [engine.evaluate(expression, variables={"x": x}) for x in (-2, 0.5, 4)]
+    assert values == [2, 0.25, 1]
+    assert engine.evaluate("piecewise(x > 0, ln(x))", variables={"x": math.e}) == 1
+    with pytest.raises(InvalidExpressionError, match="No piecewise condition"):
+        engine.evaluate("piecewise(x > 0, ln(x))", variables={"x": -1})
+
+
+def test_batches_evaluate_masked_branches() -> None:
+    engine = CalculatorEngine()
+    rows = [-4.0, -1.0, 0.0, 0.5, 2.0, 9.0]
+    expressions = [
+        "sqrt(x) if x >= 0 else -x",
+        "1/x if x != 0 else 0",
+        "x > 0 and ln(x) < 1",
+        "x <= 0 or ln(x) > 1",
+        "not (-1 <= x < 1)",
+        "piecewise(x < 0, -x, x < 1, x**2, sqrt(x))",
+        "max(x, 0) + min(x, 1)",
+        "(ln(x) if x > 0 else 0) + 1",
+    ]
+    for expression in expressions:
+        batch = engine.evaluate_batch(expression, {"x": rows})
+        assert batch == [engine.evaluate(expression, variables={"x": x}) for x in rows]
+
+    columns = {"x": [1.0, -1.0], "y": [5.0, 7.0]}
+    assert engine.evaluate_batch("ln(x) if x > 0 else y", columns) == [0, 7]
+    with pytest.raises(InvalidExpressionError, match="No piecewise condition"):
+        engine.evaluate_batch("piecewise(x > 0, x)", {"x": [1.0, -1.0]})
+
+
+def test_interval_conditionals() -> None:
+    engine = CalculatorEngine()
+
+    def bounds(expression: str, **variables) -> Interval:
+        return engine.evaluate_interval(expression, variables)
+
+    assert bounds("sqrt(x) if x >= 0 else 0", x=(-2, -1)) == Interval(0.0, 0.0)
+    guarded = bounds("sqrt(x) if x >= 0 else 0", x=(-1, 4))
+    assert guarded.partial and guarded.lower == 0 and guarded.upper >= 2
+    assert bounds("1 < x < 3", x=(1.5, 2)) == Interval(1.0, 1.0)
+    assert bounds("1 < x < 3", x=(0, 2)) == Interval(0.0, 1.0)
+    assert bounds("x > 0 and ln(x) > 1", x=(-2, -1)) == Interval(0.0, 0.0)
+    assert bounds("not x", x=0) == Interval(1.0, 1.0)
+    piecewise = bounds("piecewise(x < 0, -x, x < 1, x**2, 1)", x=(-2, 0.5))
+    assert piecewise.lower <= -0.5 and piecewise.upper >= 4 and not piecewise.partial
+    assert bounds("piecewise(x < 0, -x)", x=(-1, 2)).partial
+    with pytest.raises(InvalidExpressionError, match="No piecewise condition"):
+        bounds("piecewise(x < 0, -x)", x=(1, 2))
+
+
+def test_conditional_errors() -> None:
+    engine = CalculatorEngine()
+    with pytest.raises(InvalidExpressionError, match="Unsupported comparison"):
+        engine.evaluate("1 is 1")
+    with pytest.raises(InvalidExpressionError, match="piecewise"):
+        engine.evaluate("piecewise(1)")
+
+
+def test_compiled_conditionals_match_evaluate() -> None:
+    engine = CalculatorEngine()
+    expressions = [
+        "sqrt(-1) if 0 else 4",
+        "1 < 2 < 3",
+        "1 < 3 < 2",
+        "1 > 2 < 1/0",
+        "0 and 1/0",
+        "2 or ln(-1)",
+        "not 0 + (2 >= 2)",
+        "piecewise(1 < 0, 1, 2 == 2, 5)",
+        "piecewise(0, 1, 0, 2, 3)",
+    ]
+    for expression in expressions:
+        program = CompiledExpression.from_bytes(engine.compile(expression).to_bytes())
+        assert engine.evaluate_compiled(program) == engine.evaluate(expression)
+    with pytest.raises(InvalidExpressionError, match="No piecewise condition"):
+        engine.evaluate_compiled(engine.compile("piecewise(0, 1)"))
+    with pytest.raises(InvalidExpressionError, match="Unsupported comparison"):
+        engine.evaluate_compiled(engine.compile("1 is 1"))
+    # A false link stops the chain before an unsupported one is reached.
+    assert engine.evaluate_compiled(engine.compile("3 < 2 is 3")) == 0.0
+    with pytest.raises(InvalidExpressionError, match="Unsupported comparison"):
+        engine.evaluate_compiled(engine.compile("1 < 2 in 3 < 4"))
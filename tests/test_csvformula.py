@@ -0,0 +1,146 @@
+"""Tests for streaming formula evaluation over CSV files."""
+
+import csv
+import math
+
+import pytest
+
+from calculator.csvformula import apply_formula, formula_variables, main
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError, OperationNotSupportedError
+
+
+def _write(path, rows) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        csv.writer(handle).writerows(rows)
+
+
+def _read(path) -> list[list[str]]:
+    with open(path, newline="", encoding="utf-8") as handle:
+        return list(csv.reader(handle))
+
+
+def test_formula_variables_skip_functions_and_constants() -> None:
+    engine = CalculatorEngine()
+    assert formula_variables(engine, "price * exp(-rate * t) + pi") == ["price", "rate", "t"]
+
+
+def test_formula_variables_skip_bound_indices(tmp_path) -> None:
+    engine = CalculatorEngine()
+    assert formula_variables(engine, "sum(k, k, 1, n)") == ["n"]
+    assert formula_variables(engine, "k + prod(1 + 1/k, k, 1, k)") == ["k"]
+    assert formula_variables(engine, "sum(a, b, c, d)") == ["a", "b", "c", "d"]
+
+    source = tmp_path / "in.csv"
+    _write(source, [["n"], ["3"], ["100"]])
+    report = apply_formula(source, tmp_path / "out.csv", "sum(k, k, 1, n)")
+    assert [row[1] for row in _read(tmp_path / "out.csv")[1:]] == ["6.0", "5050.0"]
+    assert report.errors == 0
+
+
+def test_apply_formula_appends_result_column_and_reports_errors(tmp_path) -> None:
+    source = tmp_path / "in.csv"
+    rows = [["id", "price", "rate", "t"]]
+    rows += [[str(index), str(index + 1), "0.5", str(index % 4)] for index in range(100)]
+    rows[10][3] = "n/a"
+    _write(source, rows)
+
+    report = apply_formula(
+        source,
+        tmp_path / "out.csv",
+        "price * exp(-rate * t) / t",
+        result_column="value",
+        errors_path=tmp_path / "errors.csv",
+        chunk_size=16,
+    )
+
+    output = _read(tmp_path / "out.csv")
+    assert output[0] == ["id", "price", "rate", "t", "value"]
+    assert len(output) == 101
+    assert float(output[2][4]) == round(2 * math.exp(-0.5) / 1, 8)
+    assert output[1][4] == ""  # t = 0 divides by zero.
+
+    errors = _read(tmp_path / "errors.csv")
+    failed_rows = [int(row) for row, _ in errors[1:]]
+    assert failed_rows == [1, 5, 9, 10] + list(range(13, 101, 4))
+    assert report.rows == 100
+    assert report.errors == len(failed_rows)
+
+
+def test_results_match_scalar_evaluation(tmp_path) -> None:
+    source = tmp_path / "in.csv"
+    _write(source, [["a", "b"]] + [[str(i / 7), str(i % 5 - 2)] for i in range(50)])
+
+    apply_formula(source, tmp_path / "out.csv", "sqrt(a) ** b", chunk_size=7, round_results=False)
+
+    engine = CalculatorEngine()
+    for a, b, result in _read(tmp_path / "out.csv")[1:]:
+        try:
+            expected = engine.evaluate_batch(
+                "sqrt(a) ** b", {"a": [float(a)], "b": [float(b)]}, round_results=False
+            )[0]
+        except Exception:
+            assert result == ""
+        else:
+            assert float(result) == expected
+
+
+def test_aggregate_formulas_fall_back_to_scalar_evaluation(tmp_path) -> None:
+    source = tmp_path / "in.csv"
+    _write(source, [["low", "high"], ["1", "5"], ["7", "3"]])
+
+    report = apply_formula(source, tmp_path / "out.csv", "max(low, high)", columns={})
+
+    assert [row[2] for row in _read(tmp_path / "out.csv")[1:]] == ["5.0", "7.0"]
+    assert report.errors == 0
+
+
+def test_alternating_failures_are_attributed_to_their_rows(tmp_path) -> None:
+    source = tmp_path / "in.csv"
+    _write(source, [["x"]] + [[str((-1) ** index * index)] for index in range(1, 301)])
+
+    report = apply_formula(
+        source,
+        tmp_path / "out.csv",
+        "sqrt(x)",
+        errors_path=tmp_path / "errors.csv",
+        chunk_size=64,
+    )
+
+    assert report.errors == 150
+    assert [int(row) for row, _ in _read(tmp_path / "errors.csv")[1:]] == list(range(1, 301, 2))
+    assert _read(tmp_path / "out.csv")[2] == ["2", repr(round(math.sqrt(2), 8))]
+
+
+def test_row_independent_errors_fail_the_whole_run(tmp_path, capsys) -> None:
+    source = tmp_path / "in.csv"
+    _write(source, [["x"], ["1"], ["-1"]])
+
+    with pytest.raises(OperationNotSupportedError, match="foo"):
+        apply_formula(source, tmp_path / "out.csv", "piecewise((x > 0, foo(x)), 1)")
+    with pytest.raises(InvalidExpressionError, match="expects 1"):
+        apply_formula(source, tmp_path / "out.csv", "sqrt(x, 2)")
+
+    assert main([str(source), str(tmp_path / "out.csv"), "foo(x)"]) == 1
+    assert "Unsupported function 'foo'" in capsys.readouterr().err
+
+
+def test_missing_column_is_rejected(tmp_path) -> None:
+    source = tmp_path / "in.csv"
+    _write(source, [["price"], ["1"]])
+
+    with pytest.raises(ValueError, match="rate"):
+        apply_formula(source, tmp_path / "out.csv", "price * rate")
+
+
+def test_command_line_maps_columns(tmp_path, capsys) -> None:
+    source = tmp_path / "in.csv"
+    _write(source, [["Unit Price", "qty"], ["2.5", "4"]])
+
+    status = main(
+        [str(source), str(tmp_path / "out.csv"), "p * qty", "--map", "p=Unit Price"]
+    )
+
+    assert status == 0
+    assert _read(tmp_path / "out.csv")[1] == ["2.5", "4", "10.0"]
+    assert "1 rows, 0 errors" in capsys.readouterr().err
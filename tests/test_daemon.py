@@ -0,0 +1,122 @@
+"""Tests for the resident daemon and its thin client."""
+
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from calculator.client import DaemonClient, main
+from calculator.daemon import CalculatorDaemon
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError
+from calculator.loadtest import DaemonTarget, WorkloadSpec, generate_workload, run_load
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    server = CalculatorDaemon(str(tmp_path / "calc.sock"), idle_timeout=None)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+def test_requests_and_per_connection_context(daemon) -> None:
+    with DaemonClient(daemon.path, autostart=False) as first, DaemonClient(
+        daemon.path, autostart=False
+    ) as second:
+        first.set("angle_unit", "degree")
+        first.set("precision", 3)
+        assert first.evaluate("sin(30) + 1/3") == "0.833"
+        assert second.evaluate("sin(pi / 2) + 1/3") == str(CalculatorEngine().evaluate("1 + 1/3"))
+        assert second.request("diff", "x", "2", "x**3 + 2*x") == "6*x"
+        assert second.request("integrate", "t", "1", "2*t") == "t**2"
+        assert second.request("ping") == "pong"
+
+        with pytest.raises(ZeroDivisionError):
+            first.evaluate("1 / 0")
+        with pytest.raises(InvalidExpressionError):
+            first.evaluate("2 +* 3")
+        with pytest.raises(ValueError):
+            first.set("precision", "many")
+        with pytest.raises(ValueError):
+            first.request("eval")
+        with pytest.raises(OverflowError):
+            first.evaluate("exp(1000)")
+        # Failed requests leave the connection and its context usable.
+        assert first.evaluate("cos(60)") == "0.5"
+
+
+def test_client_command_line(daemon, capsys, monkeypatch) -> None:
+    assert main(["--socket", daemon.path, "--no-start", "--degrees", "sin(90)", "1/0"]) == 1
+    captured = capsys.readouterr()
+    assert captured.out == "1.0\n"
+    assert "Division by zero" in captured.err
+
+    monkeypatch.setattr("sys.stdin", iter(["1 + 1\n", "\n", "sqrt(16)\n"]))
+    assert main(["--socket", daemon.path, "--no-start"]) == 0
+    assert capsys.readouterr().out == "2.0\n4.0\n"
+
+    assert main(["--socket", daemon.path, "--integrate", "x", "--order", "2", "6*x"]) == 0
+    assert capsys.readouterr().out == "x**3\n"
+
+
+def test_client_reports_a_closed_connection(tmp_path, capsys) -> None:
+    path = str(tmp_path / "closing.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(path)
+        listener.listen()
+
+        def close_after_request() -> None:
+            connection = listener.accept()[0]
+            connection.recv(1024)
+            connection.close()
+
+        thread = threading.Thread(target=close_after_request)
+        thread.start()
+        assert main(["--socket", path, "--no-start", "1 + 1"]) == 1
+        thread.join()
+    assert "closed the connection" in capsys.readouterr().err
+
+
+def test_daemon_target_drives_load(daemon) -> None:
+    workload = generate_workload(WorkloadSpec(error_rate=0.2, seed=3), 200)
+    target = DaemonTarget(daemon.path)
+    try:
+        report = run_load(target, workload, concurrency=3)
+    finally:
+        target.close()
+
+    engine = CalculatorEngine()
+    failures = 0
+    for item in workload:
+        try:
+            engine.evaluate(item.expression, item.context)
+        except Exception:  # noqa: BLE001
+            failures += 1
+    assert report.requests == 200
+    assert sum(report.errors.values()) == failures
+
+
+def test_idle_daemon_shuts_down_and_removes_its_socket(tmp_path) -> None:
+    server = CalculatorDaemon(str(tmp_path / "idle.sock"), idle_timeout=0.3)
+    with DaemonClient(server.path, autostart=False):
+        pass
+    started = time.monotonic()
+    server.serve()
+    assert time.monotonic() - started < 5
+    assert not os.path.exists(server.path)
+
+
+def test_client_starts_a_daemon_when_none_is_running(tmp_path) -> None:
+    path = str(tmp_path / "auto.sock")
+    with DaemonClient(path, idle_timeout=30) as client:
+        assert client.evaluate("2 ** 10") == "1024.0"
+        client.request("shutdown")
+    deadline = time.monotonic() + 5
+    while os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not os.path.exists(path)
@@ -0,0 +1,162 @@
+"""Tests for the function dispatcher and its metadata registry."""
+
+from typing import Sequence
+
+import pytest
+
+from calculator.context import CalculatorContext
+from calculator.dispatcher import FunctionDispatcher
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError
+from calculator.fuzzing import memoized_dispatcher
+from calculator.scientific.approximate import MAX_RELATIVE_ERROR
+
+
+def test_builtin_metadata() -> None:
+    dispatcher = FunctionDispatcher()
+    spec = dispatcher.spec("LOG")
+    assert spec.pure
+    assert spec.arity == (1, 2)
+    assert not spec.context_dependent
+    assert dispatcher.spec("sin").context_dependent
+
+
+def test_declared_arity_is_enforced() -> None:
+    dispatcher = FunctionDispatcher()
+    dispatcher.register("twice", lambda args, _: 2 * args[0], arity=1, pure=True)
+    engine = CalculatorEngine(dispatcher=dispatcher)
+    assert engine.evaluate("twice(4)") == 8
+    with pytest.raises(InvalidExpressionError):
+        engine.evaluate("twice(1, 2)")
+    with pytest.raises(InvalidExpressionError):
+        engine.evaluate("sqrt()")
+
+
+def test_memoized_function_serves_repeated_calls_from_cache() -> None:
+    calls: list[tuple[float, ...]] = []
+
+    def slow_square(args: Sequence[float], _: CalculatorContext) -> float:
+        calls.append(tuple(args))
+        return args[0] ** 2
+
+    dispatcher = FunctionDispatcher()
+    dispatcher.register(
+        "slow_square",
+        slow_square,
+        arity=1,
+        pure=True,
+        context_dependent=False,
+        expensive=True,
+        cache_size=2,
+    )
+    engine = CalculatorEngine(dispatcher=dispatcher)
+
+    assert engine.evaluate("slow_square(3) + slow_square(3)") == 18
+    engine.evaluate("slow_square(4) + slow_square(5) + slow_square(3)")
+    assert calls == [(3.0,), (4.0,), (5.0,), (3.0,)]
+
+    stats = dispatcher.stats()["slow_square"]
+    assert stats.calls == 5
+    assert stats.cache_hits == 1
+    assert stats.cache_misses == 4
+    assert stats.cache_evictions == 2
+    assert stats.cache_size == 2
+
+
+def test_context_dependent_cache_keys_include_context() -> None:
+    dispatcher = FunctionDispatcher()
+    dispatcher.register(
+        "unit",
+        lambda _args, context: 1.0 if context.angle_unit == "degree" else 0.0,
+        arity=0,
+        pure=True,
+        cache_size=8,
+    )
+    assert dispatcher.evaluate("unit", [], CalculatorContext()) == 0.0
+    assert dispatcher.evaluate("unit", [], CalculatorContext(angle_unit="degree")) == 1.0
+
+
+def test_cache_keys_keep_the_sign_of_zero() -> None:
+    engine = CalculatorEngine(dispatcher=memoized_dispatcher(FunctionDispatcher()))
+    for expression in ("sqrt(0)", "sqrt(-0)", "sqrt(-(0))", "sin(0)", "sin(-1*0)"):
+        expected = "-0.0" if "-" in expression else "0.0"
+        assert str(engine.evaluate(expression)) == expected
+    stats = engine.dispatcher.spec("sqrt").stats
+    assert (stats.cache_misses, stats.cache_hits) == (2, 1)
+
+
+def test_impure_functions_cannot_be_memoized() -> None:
+    dispatcher = FunctionDispatcher()
+    with pytest.raises(ValueError):
+        dispatcher.register("rand", lambda _args, _ctx: 4.0, cache_size=10)
+
+
+@pytest.mark.parametrize("angle_unit", ["radian", "degree"])
+def test_column_handlers_match_row_by_row_evaluation(angle_unit: str) -> None:
+    context = CalculatorContext(angle_unit=angle_unit)
+    by_row = FunctionDispatcher()
+    for name in by_row.names():
+        by_row.spec(name).column_handler = None
+    values = [0.001 * index + 0.5 for index in range(-400, 2000, 7)]
+    positive = [abs(value) + 1e-3 for value in values]
+    for name, column, rest in [
+        ("sin", values, []),
+        ("cos", values, []),
+        ("tan", values, []),
+        ("exp", values, []),
+        ("sqrt", positive, []),
+        ("ln", positive, []),
+        ("log", positive, []),
+        ("log", positive, [2.0]),
+    ]:
+        args = [column, *rest]
+        expected = by_row.evaluate_columns(name, args, len(column), context)
+        dispatcher = FunctionDispatcher()
+        assert dispatcher.evaluate_columns(name, args, len(column), context) == expected
+        assert dispatcher.stats()[name].calls == len(column)
+
+
+def test_column_handlers_raise_row_errors() -> None:
+    engine = CalculatorEngine()
+    with pytest.raises(InvalidExpressionError, match="non-negative"):
+        engine.evaluate_batch("sqrt(x)", {"x": [1.0, -1.0]})
+    with pytest.raises(InvalidExpressionError, match="positive values"):
+        engine.evaluate_batch("ln(x)", {"x": [1.0, 0.0]})
+    with pytest.raises(InvalidExpressionError, match="base"):
+        engine.evaluate_batch("log(x, 1)", {"x": [2.0, -1.0]})
+    with pytest.raises(InvalidExpressionError, match="positive values"):
+        engine.evaluate_batch("log(x, 1)", {"x": [-2.0, 1.0]})
+
+
+@pytest.mark.parametrize("angle_unit", ["radian", "degree"])
+def test_approximate_columns_stay_within_error_bounds(angle_unit: str) -> None:
+    pytest.importorskip("numpy")
+    exact = CalculatorContext(angle_unit=angle_unit)
+    approximate = CalculatorContext(angle_unit=angle_unit, approximate=True)
+    dispatcher = FunctionDispatcher()
+    values = [0.37 * index - 300 for index in range(1700)]
+    positive = [10.0 ** (index / 10) for index in range(-3000, 3000, 7)]
+    for name, column, rest, bound in [
+        ("sin", values, [], "sin"),
+        ("cos", values, [], "cos"),
+        ("tan", values, [], "tan"),
+        ("exp", values, [], "exp"),
+        ("sqrt", positive, [], "sqrt"),
+        ("ln", positive, [], "log"),
+        ("log", positive, [2.0], "log"),
+    ]:
+        args = [column, *rest]
+        expected = dispatcher.evaluate_columns(name, args, len(column), exact)
+        results = dispatcher.evaluate_columns(name, args, len(column), approximate)
+        # Division by the logarithm of the base adds one rounding to log and ln.
+        tolerance = MAX_RELATIVE_ERROR[bound] + (2.3e-16 if bound == "log" else 0.0)
+        for result, value in zip(results, expected):
+            assert abs(result - value) <= tolerance * abs(value)
+
+    engine = CalculatorEngine(context=approximate)
+    with pytest.raises(InvalidExpressionError, match="non-negative"):
+        engine.evaluate_batch("sqrt(x)", {"x": [1.0, -1.0]})
+    with pytest.raises(InvalidExpressionError, match="positive values"):
+        engine.evaluate_batch("ln(x)", {"x": [1.0, 0.0]})
+    with pytest.raises(OverflowError):
+        engine.evaluate_batch("exp(x)", {"x": [1.0, 1000.0]})
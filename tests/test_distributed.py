@@ -0,0 +1,115 @@
+"""Tests for batch evaluation distributed over local worker processes."""
+
+import math
+import socket
+
+import pytest
+
+from calculator.context import CalculatorContext
+from calculator.distributed import (
+    Coordinator,
+    LocalWorkers,
+    ShardRequest,
+    ShardResponse,
+    decode_request,
+    decode_response,
+    encode_request,
+    encode_response,
+)
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError
+
+
+@pytest.fixture(scope="module")
+def workers():
+    with LocalWorkers(3) as local:
+        yield local
+
+
+def test_messages_round_trip() -> None:
+    request = ShardRequest(
+        7,
+        "a * sin(b)",
+        {"a": [1.0, -2.5, math.pi], "b": [0.0, 1e-300, 90.0]},
+        3,
+        CalculatorContext("degree", 4),
+        round_results=False,
+    )
+    decoded = decode_request(encode_request(request))
+    assert decoded.shard == 7
+    assert decoded.expression == "a * sin(b)"
+    assert {name: list(values) for name, values in decoded.columns.items()} == request.columns
+    assert decoded.context == request.context
+    assert decoded.round_results is False
+
+    assert decode_response(encode_response(ShardResponse(3, [0.1, 2.0]))).results == [0.1, 2.0]
+    failed = decode_response(encode_response(ShardResponse(4, error=ZeroDivisionError("nope"))))
+    assert isinstance(failed.error, ZeroDivisionError)
+    assert str(failed.error) == "nope"
+    other = decode_response(encode_response(ShardResponse(5, error=KeyError("x"))))
+    assert isinstance(other.error, RuntimeError)
+    assert str(other.error) == "KeyError: 'x'"
+
+
+def test_coordinator_matches_local_batches(workers) -> None:
+    xs = [index / 37 for index in range(20_000)]
+    ys = [math.cos(value) for value in xs]
+    engine = CalculatorEngine()
+    context = CalculatorContext("degree", 6)
+    with Coordinator(workers.addresses, shard_size=1500) as coordinator:
+        for expression in ("x * y + 1", "sin(x) * exp(-y)", "sqrt(x) + log(x + 1, 2)"):
+            expected = engine.evaluate_batch(expression, {"x": xs, "y": ys}, context)
+            assert coordinator.evaluate_batch(expression, {"x": xs, "y": ys}, context) == expected
+        assert coordinator.evaluate_batch("2 ** 10", {}) == [1024.0]
+        assert all(status.completed for status in coordinator.status())
+
+
+def test_coordinator_reports_the_first_failing_shard(workers) -> None:
+    xs = [float(index) for index in range(5000)]
+    with Coordinator(workers.addresses, shard_size=500) as coordinator:
+        with pytest.raises(ZeroDivisionError):
+            coordinator.evaluate_batch("1 / (x - 4321)", {"x": xs})
+        with pytest.raises(InvalidExpressionError):
+            coordinator.evaluate_batch("x +* 2", {"x": xs})
+        with pytest.raises(ValueError):
+            coordinator.evaluate_batch("x + y", {"x": [1.0], "y": [1.0, 2.0]})
+        with pytest.raises(OverflowError):
+            coordinator.evaluate_batch("exp(x)", {"x": [1.0, 1000.0]})
+        assert all(status.alive for status in coordinator.status())
+        assert coordinator.evaluate_batch("x + 1", {"x": [1.0]}) == [2.0]
+
+
+def test_shards_of_a_dead_worker_are_retried() -> None:
+    xs = [index / 10 for index in range(30_000)]
+    expected = CalculatorEngine().evaluate_batch("x ** 2 - sin(x)", {"x": xs})
+    with LocalWorkers(3) as local, Coordinator(local.addresses, shard_size=1000) as coordinator:
+        assert coordinator.evaluate_batch("x", {"x": [1.0]}) == [1.0]
+        local.kill(0)
+        assert coordinator.evaluate_batch("x ** 2 - sin(x)", {"x": xs}) == expected
+        alive = [status.alive for status in coordinator.status()]
+        assert alive == [False, True, True]
+
+
+def test_coordinator_without_live_workers() -> None:
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        address = unused.getsockname()
+    with Coordinator([address]) as coordinator:
+        with pytest.raises(ConnectionError):
+            coordinator.evaluate_batch("x", {"x": [1.0]})
+    with pytest.raises(ValueError):
+        Coordinator([])
+
+
+def test_large_shards_in_flight_do_not_deadlock() -> None:
+    # Two shards far larger than the socket buffers on one connection: the
+    # worker's first reply must be read while the second request is sent.
+    rows = 1_000_000
+    columns = {name: [float(index % 97) for index in range(rows)] for name in "abcd"}
+    with LocalWorkers(1) as local, Coordinator(
+        local.addresses, shard_size=rows // 2, window=2, timeout=10.0
+    ) as coordinator:
+        results = coordinator.evaluate_batch("a + b*c - d", columns)
+    assert len(results) == rows
+    assert results[:3] == [0.0, 1.0, 4.0]
+    assert coordinator.retries == 0
@@ -54,3 +54,36 @@ def test_unknown_function_raises_operation_not_supported() -> None:
     engine = CalculatorEngine()
     with pytest.raises(OperationNotSupportedError):
         engine.evaluate("foo(1)")
+
+
+def test_per_call_context_overrides_default() -> None:
+    engine = CalculatorEngine()
+    degree = CalculatorContext(angle_unit="degree")
+    assert pytest.approx(engine.evaluate("sin(30)", degree), rel=1e-8) == 0.5
+    assert engine.context.angle_unit == "radian"
+
+
+def test_context_is_immutable() -> None:
+    context = CalculatorContext()
+    with pytest.raises(AttributeError):
+        context.angle_unit = "degree"  # type: ignore[misc]
+
+
+def test_shared_engine_is_safe_across_threads() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    engine = CalculatorEngine()
+    contexts = [CalculatorContext(angle_unit="degree"), CalculatorContext(precision=2)]
+
+    def work(index: int) -> float:
+        return engine.evaluate("sin(90) + 1 / 3", contexts[index % 2])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(work, range(200)))
+
+    expected = {
+        0: engine.evaluate("sin(90) + 1 / 3", contexts[0]),
+        1: engine.evaluate("sin(90) + 1 / 3", contexts[1]),
+    }
+    for index, value in enumerate(results):
+        assert value == expected[index % 2]
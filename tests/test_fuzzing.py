@@ -0,0 +1,86 @@
+"""Tests for the differential fuzzing harness."""
+
+import random
+import warnings
+
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+from calculator.fuzzing import (
+    FuzzCase,
+    Mode,
+    PolynomialGenerator,
+    fuzz_calculus,
+    fuzz_engine,
+    generate_cases,
+    main,
+    minimize,
+)
+
+
+def test_fast_paths_match_reference_on_valid_expressions() -> None:
+    cases = generate_cases(300, seed=3, invalid_rate=0.0)
+    report = fuzz_engine(cases)
+
+    assert report.mismatches == []
+    assert set(report.timings) == {"compiled", "batch", "memoized"}
+    assert report.speed_ratio("memoized") > 0
+    assert report.skipped["compiled"] > 0  # Cases binding ``x`` cannot be compiled.
+
+
+def test_invalid_expressions_raise_the_same_exceptions_in_batch_and_memoized_modes() -> None:
+    cases = generate_cases(300, seed=5, invalid_rate=1.0)
+    report = fuzz_engine(cases)
+
+    assert report.mismatches == []
+    assert any(" is " in case.expression and " < " in case.expression for case in cases)
+
+
+def test_polynomial_scanner_matches_ast_collector_bit_for_bit() -> None:
+    generator = PolynomialGenerator(random.Random(11))
+    report = fuzz_calculus([generator.polynomial() for _ in range(2000)])
+
+    assert report.mismatches == []
+    assert report.timings["scanner"][0] > 0
+
+
+def test_broken_mode_is_reported_with_minimized_reproducer() -> None:
+    engine = CalculatorEngine()
+    broken = Mode(
+        "broken",
+        run=lambda expression, case: engine.evaluate(expression.replace("+", "-"), case.context),
+    )
+    case = FuzzCase("sqrt(16) * (1 + 2 * 3)", CalculatorContext())
+
+    report = fuzz_engine([case], engine, [broken])
+
+    assert len(report.mismatches) == 1
+    mismatch = report.mismatches[0]
+    assert mismatch.mode == "broken"
+    assert mismatch.reproducer == "+2"
+    assert "broken" in report.format()
+
+
+def test_minimize_deletes_characters_from_unparsable_input() -> None:
+    assert minimize("1 + (2 * 3", lambda text: "(" in text) == "("
+
+
+def test_minimize_does_not_emit_syntax_warnings() -> None:
+    engine = CalculatorEngine()
+
+    def still_fails(text: str) -> bool:
+        try:
+            engine.parse(text)
+        except Exception:  # noqa: BLE001 - only parsable text keeps failing
+            return False
+        return "if" in text
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        assert minimize("1 if 2 else 3", still_fails) == "1if 2else 3"
+    assert not [warning for warning in caught if warning.category is SyntaxWarning]
+
+
+def test_command_line_exits_cleanly_without_mismatches(capsys) -> None:
+    argv = ["--cases", "50", "--calculus-cases", "50", "--invalid-rate", "0", "--seed", "2"]
+    assert main(argv) == 0
+    assert "speed vs reference" in capsys.readouterr().out
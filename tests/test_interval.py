@@ -0,0 +1,128 @@
+"""Tests for interval evaluation."""
+
+import math
+import random
+
+import pytest
+
+from calculator.context import CalculatorContext
+from calculator.dispatcher import FunctionDispatcher
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError, OperationNotSupportedError
+from calculator.interval import Interval
+
+
+def test_interval_basics() -> None:
+    value = Interval(-1.0, 3.0)
+    assert 0 in value and 4 not in value
+    assert (value.width, value.midpoint) == (4.0, 1.0)
+    assert value.split() == (Interval(-1.0, 1.0), Interval(1.0, 3.0))
+    assert Interval(-math.inf, 2.0).midpoint in Interval(-math.inf, 2.0)
+    with pytest.raises(ValueError):
+        Interval(2.0, 1.0)
+
+
+def test_operators_and_functions_enclose_their_ranges() -> None:
+    engine = CalculatorEngine()
+
+    def bounds(expression: str, **variables) -> Interval:
+        return engine.evaluate_interval(expression, variables)
+
+    assert bounds("x*x", x=(-2, 3)).lower < -5
+    square = bounds("x**2", x=(-2, 3))
+    assert square.lower == 0 and 9 <= square.upper < 9.000001
+    assert bounds("sin(x)", x=(0, 3)) == Interval(0.0, 1.0)
+    assert bounds("cos(x)", x=(-1, 7)) == Interval(-1.0, 1.0)
+    pi = bounds("pi")
+    assert pi.lower < math.pi < pi.upper
+    assert bounds("x / y", x=(1, 2), y=(4, 8)).lower <= 0.125
+
+    # Poles and domains.
+    assert bounds("tan(x)", x=(1, 2)) == Interval(-math.inf, math.inf)
+    assert bounds("tan(x)", x=(0, 1)).upper < 1.56
+    assert bounds("1/x", x=(-1, 1)).partial
+    root = bounds("sqrt(x)", x=(-1, 4))
+    assert root.partial and root.lower == 0 and root.upper >= 2
+    assert bounds("ln(x)", x=(0, 1)).lower == -math.inf
+    with pytest.raises(InvalidExpressionError, match="non-negative"):
+        bounds("sqrt(x)", x=(-2, -1))
+    with pytest.raises(ZeroDivisionError):
+        bounds("1/x", x=0)
+
+    degrees = CalculatorContext(angle_unit="degree")
+    cosine = engine.evaluate_interval("cos(x)", {"x": (170, 190)}, degrees)
+    assert cosine.lower == -1 and -0.985 < cosine.upper < -0.98
+    assert engine.evaluate_interval("tan(x)", {"x": (80, 100)}, degrees).upper == math.inf
+
+
+def test_enclosures_contain_point_evaluations() -> None:
+    engine = CalculatorEngine()
+    rng = random.Random(7)
+    expressions = [
+        "sin(x)*cos(y) + x**2",
+        "exp(x/3) - tan(y)",
+        "sqrt(x*x + y) / (1 + y**2)",
+        "ln(x + 5) * log(y + 3, 2)",
+        "x**y - max(x, y)",
+        "(x - y)**3 / (1 + x**2)",
+        "stdev([x, y, 1]) - percentile([x, y, 2*y], 40 + 10*y)",
+    ]
+    for expression in expressions:
+        parsed = engine.parse(expression)
+        for _ in range(40):
+            x0, y0 = rng.uniform(-4, 4), rng.uniform(-1.5, 2)
+            box = {"x": (x0, x0 + rng.uniform(0, 2)), "y": (y0, y0 + rng.uniform(0, 1.5))}
+            try:
+                enclosure = engine.evaluate_interval(expression, box)
+            except (InvalidExpressionError, ZeroDivisionError):
+                continue
+            for _ in range(20):
+                point = {name: rng.uniform(*bounds) for name, bounds in box.items()}
+                try:
+                    value = engine._eval(parsed, engine.context, point)
+                except (ValueError, ZeroDivisionError):
+                    continue
+                assert value in enclosure, (expression, box, point)
+
+
+def test_functions_without_interval_extensions() -> None:
+    dispatcher = FunctionDispatcher()
+    dispatcher.register("double", lambda args, _: 2 * args[0], arity=1)
+    dispatcher.register(
+        "half",
+        lambda args, _: args[0] / 2,
+        arity=1,
+        interval_handler=lambda args, _: Interval(args[0].lower / 2, args[0].upper / 2),
+    )
+    engine = CalculatorEngine(dispatcher=dispatcher)
+    assert engine.evaluate_interval("half(x)", {"x": (2, 4)}) == Interval(1.0, 2.0)
+    assert engine.evaluate_interval("mean([x, 3])", {"x": (1, 3)}).upper >= 3
+    with pytest.raises(OperationNotSupportedError, match="interval"):
+        engine.evaluate_interval("double(x)", {"x": (2, 4)})
+    with pytest.raises(InvalidExpressionError, match="expects 1"):
+        engine.evaluate_interval("percentile(x, 50)", {"x": (2, 4)})
+    with pytest.raises(InvalidExpressionError, match="at least 2"):
+        engine.evaluate_interval("stdev([x])", {"x": (2, 4)})
+    with pytest.raises(InvalidExpressionError):
+        engine.evaluate_interval("sum(k, k, 1, 3)")
+
+    huge = engine.evaluate_interval("sum(x, x)", {"x": (1e308, 1.5e308)})
+    assert huge.upper == math.inf and huge.lower <= 2e308
+    assert 1.2e308 in engine.evaluate_interval("mean(x, x)", {"x": (1e308, 1.5e308)})
+
+
+def test_stdev_and_percentile_intervals() -> None:
+    engine = CalculatorEngine()
+    assert engine.evaluate_interval("percentile([1, 2, 3, 4], 50)") == Interval(2.5, 2.5)
+    tenth = engine.evaluate_interval("percentile([0, 1], 10)")
+    assert tenth.lower < 0.1 == tenth.upper  # the float 0.1 is just above 1/10
+    median = engine.evaluate_interval("percentile([x, 2, 6], q)", {"x": (1, 4), "q": (25, 50)})
+    assert (median.lower, median.upper) == (1.5, 4.0)
+    clipped = engine.evaluate_interval("percentile([1, 3], q)", {"q": (50, 150)})
+    assert clipped == Interval(2.0, 3.0, True)
+    with pytest.raises(InvalidExpressionError, match="between 0 and 100"):
+        engine.evaluate_interval("percentile([1, 3], q)", {"q": (101, 102)})
+
+    spread = engine.evaluate_interval("stdev([x, 2, 4])", {"x": 0})
+    assert spread.lower <= 2 <= spread.upper and spread.width < 1e-12
+    assert engine.evaluate_interval("stdev([x, x])", {"x": (1, 2)}).lower == 0
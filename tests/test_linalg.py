@@ -0,0 +1,51 @@
+"""Tests for vector and matrix support in the engine."""
+
+import pytest
+
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError
+
+np = pytest.importorskip("numpy")
+
+
+def test_vector_literals_and_elementwise_arithmetic() -> None:
+    engine = CalculatorEngine()
+    assert np.array_equal(engine.evaluate("[1, 2, 3] * 2 + 1"), [3, 5, 7])
+    assert np.array_equal(engine.evaluate("[1, 2] / [4, 8]"), [0.25, 0.25])
+    assert np.array_equal(engine.evaluate("-[1, 2] ** 2"), [-1, -4])
+
+
+def test_matrix_functions() -> None:
+    engine = CalculatorEngine()
+    assert engine.evaluate("det([[1, 2], [3, 4]])") == -2
+    assert engine.evaluate("dot([1, 2], [3, 4])") == 11
+    assert engine.evaluate("norm([3, 4])") == 5
+    assert np.array_equal(engine.evaluate("solve([[2, 0], [0, 4]], [2, 8])"), [1, 2])
+    assert np.allclose(
+        engine.evaluate("matmul(inv([[1, 2], [3, 4]]), [[1, 2], [3, 4]])"), np.eye(2)
+    )
+
+
+def test_array_results_are_rounded() -> None:
+    engine = CalculatorEngine()
+    assert np.array_equal(engine.evaluate("[1, 2] / 3"), np.round([1 / 3, 2 / 3], 8))
+
+
+def test_array_errors() -> None:
+    engine = CalculatorEngine()
+    with pytest.raises(InvalidExpressionError):
+        engine.evaluate("sin([1, 2])")
+    with pytest.raises(InvalidExpressionError):
+        engine.evaluate("inv([[1, 2], [2, 4]])")
+    with pytest.raises(InvalidExpressionError):
+        engine.evaluate("[[1, 2], [3]]")
+    with pytest.raises(ZeroDivisionError):
+        engine.evaluate("[1, 2] / [1, 0]")
+
+
+def test_aggregates_accept_computed_vectors() -> None:
+    engine = CalculatorEngine()
+    assert engine.evaluate("sum([1, 2] * 2)") == 6
+    assert engine.evaluate("mean([[1, 2], [3, 4]])") == 2.5
+    assert engine.evaluate("percentile([[1, 2], [3, 4]], 50)") == 2.5
+    assert engine.evaluate("max([[1, 2], 5])") == 5
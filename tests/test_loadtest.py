@@ -0,0 +1,91 @@
+"""Tests for the load-test harness."""
+
+import json
+
+import pytest
+
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+from calculator.loadtest import (
+    InProcessTarget,
+    WorkloadSpec,
+    generate_workload,
+    load_log,
+    main,
+    percentile,
+    run_load,
+)
+
+
+def test_generate_workload_is_reproducible_and_respects_distributions() -> None:
+    spec = WorkloadSpec(function_weights={"sin": 1.0}, degree_fraction=1.0, seed=7)
+    first = generate_workload(spec, 200)
+    second = generate_workload(spec, 200)
+
+    assert first == second
+    assert all(item.context.angle_unit == "degree" for item in first)
+    assert any("sin(" in item.expression for item in first)
+    assert not any("cos(" in item.expression for item in first)
+
+    engine = CalculatorEngine()
+    for item in first:
+        engine.evaluate(item.expression, item.context)
+
+
+def test_error_rate_injects_failing_requests() -> None:
+    workload = generate_workload(WorkloadSpec(error_rate=1.0, seed=1), 100)
+    report = run_load(InProcessTarget(), workload)
+
+    assert report.requests == 100
+    assert sum(report.errors.values()) == 100
+
+
+def test_unknown_function_weight_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        generate_workload(WorkloadSpec(function_weights={"nope": 1.0}), 1)
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    values = [float(index) for index in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99.9) == 100.0
+    assert percentile(values, 0) == 1.0
+    assert percentile([], 50) == 0.0
+
+
+def test_open_loop_run_reports_percentiles_and_memory() -> None:
+    workload = generate_workload(WorkloadSpec(seed=3), 50)
+    report = run_load(
+        InProcessTarget(), workload, requests=200, rate=20000, concurrency=2, trace_memory=True
+    )
+
+    assert report.requests == 200
+    assert report.target_rate == 20000
+    assert report.percentile(50) <= report.percentile(99.9)
+    assert report.traced_peak and report.traced_peak > 0
+    assert "p99.9" in report.format()
+
+
+def test_load_log_replays_bare_and_json_records(tmp_path) -> None:
+    log = tmp_path / "requests.log"
+    log.write_text(
+        "1 + 2\n\n"
+        + json.dumps({"expression": "sin(90)", "angle_unit": "degree", "precision": 3})
+        + "\n",
+        encoding="utf-8",
+    )
+
+    items = load_log(log)
+
+    assert [item.expression for item in items] == ["1 + 2", "sin(90)"]
+    assert items[0].context == CalculatorContext()
+    assert items[1].context == CalculatorContext("degree", 3)
+
+    log.write_text('{"angle_unit": "degree"}\n', encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_log(log)
+
+
+def test_command_line_prints_report(capsys) -> None:
+    assert main(["--requests", "50", "--workload-size", "10", "--seed", "5"]) == 0
+    assert "throughput" in capsys.readouterr().out
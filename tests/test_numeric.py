@@ -0,0 +1,72 @@
+"""Tests for numerical calculus helpers."""
+
+import math
+
+import pytest
+
+from calculator.calculus import numeric
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError
+
+
+def test_integrate_definite_general_expression() -> None:
+    result = numeric.integrate_definite("sin(x)*exp(-x)", "x", 0, 10)
+    expected = 0.5 * (1 - math.exp(-10) * (math.sin(10) + math.cos(10)))
+    assert result.converged
+    assert result.value == pytest.approx(expected, abs=1e-12)
+    assert result.error < 1e-9
+
+
+def test_integrate_definite_reversed_and_empty_intervals() -> None:
+    assert numeric.integrate_definite("x**2", "x", 1, 0).value == pytest.approx(-1 / 3)
+    assert numeric.integrate_definite("x**2", "x", 2, 2).value == 0
+
+
+def test_integrate_definite_refines_endpoint_singularity() -> None:
+    result = numeric.integrate_definite("1/sqrt(t)", "t", 0, 1, tol=1e-8)
+    assert result.value == pytest.approx(2, rel=1e-7)
+    assert result.evaluations > 15
+
+
+def test_integrate_definite_uses_context_angle_unit() -> None:
+    result = numeric.integrate_definite(
+        "cos(x)", "x", 0, 90, context=CalculatorContext(angle_unit="degree")
+    )
+    assert result.value == pytest.approx(180 / math.pi)
+
+
+def test_batch_reuses_integrand_values() -> None:
+    calls = []
+    engine = CalculatorEngine()
+    original = engine.evaluate_batch
+
+    def counting(*args, **kwargs):
+        calls.append(len(args[1]["x"]))
+        return original(*args, **kwargs)
+
+    engine.evaluate_batch = counting  # type: ignore[method-assign]
+    results = numeric.integrate_definite_batch(
+        "exp(x)", "x", [(0, 1), (0, 1), (1, 2)], engine=engine
+    )
+    assert [r.value for r in results] == pytest.approx(
+        [math.e - 1, math.e - 1, math.e**2 - math.e]
+    )
+    assert calls[0] == 30
+
+
+def test_evaluate_batch_matches_scalar_evaluation() -> None:
+    engine = CalculatorEngine()
+    points = [0.1 * index for index in range(1, 40)]
+    expression = "sin(x) * exp(-x) + log(x, 2) / sqrt(x) - pow(x, y)"
+    batch = engine.evaluate_batch(expression, {"x": points, "y": [2.0] * len(points)})
+    assert batch == [
+        engine.evaluate(expression, variables={"x": point, "y": 2.0}) for point in points
+    ]
+
+
+def test_integrand_errors_propagate() -> None:
+    with pytest.raises(InvalidExpressionError):
+        numeric.integrate_definite("log(x - 5)", "x", 0, 1)
+    with pytest.raises(ValueError):
+        numeric.integrate_definite("x", "x", 0, math.inf)
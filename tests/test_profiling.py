@@ -0,0 +1,110 @@
+"""Tests for the profiling session helpers."""
+
+import argparse
+import pstats
+import time
+
+import pytest
+
+from calculator.calculus import operations as calculus_ops
+from calculator.calculus import roots as roots_ops
+from calculator.calculus import taylor as taylor_ops
+from calculator.engine import CalculatorEngine
+from calculator.profiling import ProfileSession, add_profile_arguments, session_from_args
+
+
+def _busy_engine_work(engine: CalculatorEngine) -> None:
+    for index in range(200):
+        engine.evaluate(f"sin({index}) + sqrt({index})")
+    calculus_ops.differentiate("3*x**2 + 2*x + 1")
+
+
+def test_cprofile_session_writes_pstats_and_folded_stacks(tmp_path) -> None:
+    engine = CalculatorEngine()
+    with ProfileSession(tmp_path / "run") as session:
+        _busy_engine_work(engine)
+
+    assert session.prefix == tmp_path / "run"
+    stats = pstats.Stats(str(tmp_path / "run.pstats"))
+    functions = {name for _, _, name in stats.stats}  # type: ignore[attr-defined]
+    assert "evaluate" in functions
+
+    folded = (tmp_path / "run.folded").read_text(encoding="utf-8").splitlines()
+    assert folded
+    for line in folded:
+        stack, weight = line.rsplit(" ", 1)
+        assert ";" in stack
+        assert int(weight) > 0
+    assert (tmp_path / "run.txt").read_text(encoding="utf-8")
+
+
+def test_engine_scope_records_only_engine_calls_and_restores_methods(tmp_path) -> None:
+    original_evaluate = CalculatorEngine.evaluate
+    original_differentiate = calculus_ops.differentiate
+    engine = CalculatorEngine()
+
+    with ProfileSession(tmp_path / "scoped", scope="engine"):
+        assert CalculatorEngine.evaluate is not original_evaluate
+        sum(range(10000))
+        _busy_engine_work(engine)
+
+    assert CalculatorEngine.evaluate is original_evaluate
+    assert calculus_ops.differentiate is original_differentiate
+
+    stats = pstats.Stats(str(tmp_path / "scoped.pstats"))
+    functions = {name for _, _, name in stats.stats}  # type: ignore[attr-defined]
+    assert "differentiate" in functions
+    assert "_busy_engine_work" not in functions
+
+
+def test_engine_scope_covers_roots_taylor_and_intervals(tmp_path) -> None:
+    originals = (roots_ops.critical_points, taylor_ops.taylor, CalculatorEngine.evaluate_interval)
+    engine = CalculatorEngine()
+
+    with ProfileSession(tmp_path / "scoped", scope="engine"):
+        roots_ops.critical_points("x**3 - 3*x")
+        taylor_ops.taylor("exp(x)", "x", 0, 4)
+        engine.evaluate_interval("x**2", {"x": (1, 2)})
+
+    assert (roots_ops.critical_points, taylor_ops.taylor, CalculatorEngine.evaluate_interval) == (
+        originals
+    )
+    stats = pstats.Stats(str(tmp_path / "scoped.pstats"))
+    functions = {name for _, _, name in stats.stats}  # type: ignore[attr-defined]
+    assert {"critical_points", "taylor", "evaluate_interval"} <= functions
+
+
+def test_sampling_session_writes_collapsed_stacks(tmp_path) -> None:
+    engine = CalculatorEngine()
+    with ProfileSession(tmp_path / "sampled", profiler="sampling", interval=0.001):
+        deadline = time.perf_counter() + 0.2
+        while time.perf_counter() < deadline:
+            _busy_engine_work(engine)
+
+    assert not (tmp_path / "sampled.pstats").exists()
+    folded = (tmp_path / "sampled.folded").read_text(encoding="utf-8").splitlines()
+    assert folded
+    assert any("engine:evaluate" in line for line in folded)
+    assert "samples" in (tmp_path / "sampled.txt").read_text(encoding="utf-8")
+
+
+def test_invalid_profile_options_raise_value_error(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        ProfileSession(tmp_path / "x", profiler="perf")
+    with pytest.raises(ValueError):
+        ProfileSession(tmp_path / "x", scope="ui")
+
+
+def test_session_from_args_parses_command_line_options() -> None:
+    parser = argparse.ArgumentParser()
+    add_profile_arguments(parser)
+
+    assert session_from_args(parser.parse_args([])) is None
+
+    args = parser.parse_args(
+        ["--profile", "out", "--profiler", "sampling", "--profile-scope", "engine"]
+    )
+    session = session_from_args(args)
+    assert session is not None
+    assert session.profiler == "sampling"
+    assert session.scope == "engine"
@@ -0,0 +1,100 @@
+"""Tests for polynomial root finding with error bounds."""
+
+import cmath
+import math
+import random
+
+import pytest
+
+from calculator.calculus import roots as roots_module
+from calculator.calculus.roots import (
+    batch_roots,
+    critical_points,
+    polynomial_roots,
+    real_roots,
+    roots,
+)
+from calculator.exceptions import OperationNotSupportedError
+
+
+def _from_roots(values: list[complex]) -> list[float]:
+    """Return ascending real coefficients of ``prod(x - value)``."""
+
+    coefficients = [1.0 + 0j]
+    for value in values:
+        shifted = [0j] + coefficients
+        for index, coeff in enumerate(coefficients):
+            shifted[index] -= value * coeff
+        coefficients = shifted
+    return [coeff.real for coeff in coefficients]
+
+
+def _assert_enclosed(found, expected: list[complex]) -> None:
+    assert len(found) == len(expected)
+    for root in found:
+        assert min(abs(root.value - value) for value in expected) <= root.error
+    for value in expected:
+        assert min(abs(root.value - value) for root in found) < 1e-4
+
+
+def test_roots_of_simple_polynomials() -> None:
+    assert real_roots("x**2 - 2") == pytest.approx([-math.sqrt(2), math.sqrt(2)], abs=1e-14)
+    assert real_roots("x**3 - 6*x**2 + 11*x - 6") == pytest.approx([1, 2, 3])
+    assert real_roots("t**2 + 1", "t") == []
+    complex_roots = roots("x**2 + 1")
+    _assert_enclosed(complex_roots, [1j, -1j])
+    assert not any(root.is_real for root in complex_roots)
+    assert "±" in str(complex_roots[0])
+
+    # Zero roots are split off exactly; constants have no roots.
+    found = roots("x**5 - x**3")
+    assert [root.value for root in found if root.error == 0] == [0j, 0j, 0j]
+    assert roots("7") == []
+    _assert_enclosed(roots("(x - 1)**3 * (x + 2)"), [1, 1, 1, -2])
+
+
+@pytest.mark.parametrize("method", ["companion", "aberth"])
+def test_methods_agree_and_enclose_known_roots(method: str) -> None:
+    rng = random.Random(4)
+    values: list[complex] = [rng.uniform(-3, 3) for _ in range(6)]
+    for _ in range(4):
+        value = complex(rng.uniform(-2, 2), rng.uniform(0.1, 2))
+        values += [value, value.conjugate()]
+    _assert_enclosed(polynomial_roots(_from_roots(values), method=method), values)
+
+
+def test_high_degree_and_batches() -> None:
+    unity = [cmath.exp(2j * math.pi * k / 300) for k in range(300)]
+    _assert_enclosed(roots("x**300 - 1"), unity)
+
+    rng = random.Random(9)
+    sets = [[rng.uniform(-5, 5) for _ in range(rng.choice((3, 5)))] for _ in range(400)]
+    results = batch_roots([_from_roots(values) for values in sets] + ["2*x - 1"])
+    for values, found in zip(sets, results):
+        _assert_enclosed(found, values)
+    assert [root.value for root in results[-1]] == [0.5]
+    assert results[0] == polynomial_roots(_from_roots(sets[0]), method="aberth")
+
+
+def test_pure_python_fallback(monkeypatch) -> None:
+    monkeypatch.setattr(roots_module, "np", None)
+    _assert_enclosed(roots("x**4 - 5*x**2 + 4"), [-2, -1, 1, 2])
+    _assert_enclosed(roots("(x - 1)**2"), [1, 1])
+    cube_roots = [-1, cmath.exp(1j * math.pi / 3), cmath.exp(-1j * math.pi / 3)]
+    _assert_enclosed(roots("x**3 + 1"), cube_roots)
+    with pytest.raises(OperationNotSupportedError):
+        polynomial_roots([1, 0, 1], method="companion")
+
+
+def test_critical_points_and_errors() -> None:
+    assert critical_points("x**3 - 3*x") == pytest.approx([-1, 1])
+    assert critical_points("(x - 2)**2 + 1") == pytest.approx([2])
+    assert critical_points("4*x + 1") == []
+    assert polynomial_roots({2: 1.0, 0: -4.0})[1].value == pytest.approx(2)
+
+    with pytest.raises(ValueError, match="zero polynomial"):
+        roots("0*x")
+    with pytest.raises(ValueError):
+        roots("x*y")
+    with pytest.raises(ValueError):
+        polynomial_roots([1, 1], method="bisection")
@@ -0,0 +1,120 @@
+"""Tests for the cost model and the fast/heavy lane scheduler."""
+
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from calculator.calculus import operations as calculus_ops
+from calculator.dispatcher import FunctionDispatcher
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import OverloadedError
+from calculator.scheduler import DEFAULT_THRESHOLD, CostModel, LaneScheduler
+
+
+def _polynomial(terms: int) -> str:
+    return " + ".join(f"{index}*x**{index}" for index in range(terms))
+
+
+def test_cost_model_separates_small_and_heavy_requests() -> None:
+    model = CostModel()
+    engine = CalculatorEngine()
+    dispatcher = engine.dispatcher
+
+    def cost(kind: str, expression: str) -> float:
+        return model.estimate(kind, expression, dispatcher, engine).cost
+
+    assert cost("evaluate", "1 + 2 * 3") < cost("evaluate", "sin(1) + cos(2) * 3")
+    assert cost("evaluate", "sqrt(2) * ln(10)") <= DEFAULT_THRESHOLD
+    assert cost("evaluate", "mean([1, 2, 3])") <= DEFAULT_THRESHOLD
+    assert cost("evaluate", "mean(prices)") > DEFAULT_THRESHOLD
+    assert cost("evaluate", "sum(sin(k), k, 1, 1000000)") > DEFAULT_THRESHOLD
+    assert cost("evaluate", _polynomial(2000)) > DEFAULT_THRESHOLD
+    assert cost("differentiate", "3*x**2 - (x+1)*(x-1)") <= DEFAULT_THRESHOLD
+    assert cost("differentiate", "(x + 1)**400") > DEFAULT_THRESHOLD
+    assert cost("integrate", _polynomial(300)) > DEFAULT_THRESHOLD
+    # Broken expressions only cost the parse error they report.
+    assert cost("evaluate", "2 +* 3") <= DEFAULT_THRESHOLD
+
+    estimate = model.estimate("differentiate", _polynomial(50))
+    assert (estimate.terms, estimate.degree) == (50, 49)
+    with pytest.raises(ValueError):
+        model.estimate("factor", "x")
+
+
+def test_scheduler_routes_by_cost_and_keeps_lane_stats() -> None:
+    polynomial = _polynomial(400)
+    with LaneScheduler(executor="thread") as scheduler:
+        assert scheduler.run("evaluate", "x * 2", variables={"x": 4}) == 8
+        assert scheduler.run("differentiate", polynomial) == calculus_ops.differentiate(
+            polynomial
+        )
+        assert scheduler.run("integrate", "6*t", variable="t", order=2) == "t**3"
+        failed = scheduler.submit("evaluate", "1 / 0")
+        assert isinstance(failed.exception(), ZeroDivisionError)
+
+
+    # Heavy-lane counters are final once close() has waited for the workers.
+    fast, heavy = scheduler.fast, scheduler.heavy
+    assert (fast.submitted, fast.completed, fast.failed) == (3, 2, 1)
+    assert (heavy.submitted, heavy.completed, heavy.depth) == (1, 1, 0)
+    assert heavy.max_depth == 1
+    assert len(fast.latencies) == 3
+    assert "heavy" in heavy.format()
+
+
+def test_heavy_lane_is_bounded() -> None:
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking(_args, _context) -> float:
+        started.set()
+        release.wait(5)
+        return 1.0
+
+    dispatcher = FunctionDispatcher()
+    dispatcher.register("blocking", blocking, arity=0, expensive=True)
+    engine = CalculatorEngine(dispatcher=dispatcher)
+    scheduler = LaneScheduler(engine, heavy_workers=1, heavy_queue=1, executor="thread")
+    try:
+        running = scheduler.submit("evaluate", "blocking()")
+        started.wait(5)
+        queued = scheduler.submit("evaluate", "blocking() + 1")
+        with pytest.raises(OverloadedError):
+            scheduler.submit("evaluate", "blocking() + 2")
+        # Cheap requests are unaffected by the full heavy lane.
+        assert scheduler.run("evaluate", "2 + 2") == 4
+        release.set()
+        assert running.result(5) == 1.0
+        assert queued.result(5) == 2.0
+    finally:
+        release.set()
+        scheduler.close()
+    assert scheduler.heavy.rejected == 1
+    assert scheduler.heavy.completed == 2
+
+
+def test_process_lane_matches_inline_results() -> None:
+    polynomial = _polynomial(600)
+    with LaneScheduler(threshold=100) as scheduler:
+        futures = [
+            scheduler.submit("differentiate", polynomial, order=2),
+            scheduler.submit("evaluate", "sin(0.5) + " + " + ".join(["1"] * 80)),
+        ]
+        assert futures[0].result(30) == calculus_ops.differentiate(polynomial, order=2)
+        assert futures[1].result(30) == CalculatorEngine().evaluate(
+            "sin(0.5) + " + " + ".join(["1"] * 80)
+        )
+    assert scheduler.heavy.completed == 2
+
+
+def test_scheduler_does_not_import_the_load_test_harness() -> None:
+    code = (
+        "import sys, calculator.scheduler; "
+        "print(any(name in sys.modules for name in ('calculator.loadtest', 'tracemalloc')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,69 @@
+"""Tests for bound-variable sums and products."""
+
+import math
+
+import pytest
+
+from calculator.engine import CalculatorEngine
+from calculator.exceptions import InvalidExpressionError
+from calculator.summation import MAX_TERMS
+
+
+def test_closed_forms_match_exact_values() -> None:
+    engine = CalculatorEngine()
+    n = 1_000_000
+    assert engine.evaluate("sum(k**2, k, 1, 1000000)") == float(n * (n + 1) * (2 * n + 1) // 6)
+    assert engine.evaluate("sum(k, k, 1, 100)") == 5050
+    assert engine.evaluate("sum((k + 1)**3 - k**3, k, 0, 999)") == 1000**3
+    assert engine.evaluate("sum(k**2, k, -3, 3)") == 28
+    assert engine.evaluate("sum(2**k, k, 0, 10)") == 2047
+    assert engine.evaluate("sum((-2)**k, k, 0, 10)") == 683
+    assert engine.evaluate("sum(0.5**k, k, 0, 60)") == 2
+    assert engine.evaluate("prod(2, k, 1, 10)") == 1024
+    assert engine.evaluate("prod(2**k, k, 1, 4)") == 1024
+
+    expected = math.fsum(3 * (k - 2) * (k + 5) / 7 + 2 * 1.01**k for k in range(-50, 51))
+    result = engine.evaluate("sum(3*(k-2)*(k+5)/7 + 2*1.01**k, k, -50, 50)")
+    assert result == pytest.approx(expected, rel=1e-12)
+
+
+def test_fallback_sums_term_by_term() -> None:
+    engine = CalculatorEngine()
+    expected = math.fsum(math.sin(k) for k in range(1, 100_001))
+    assert engine.evaluate("sum(sin(k), k, 1, 100000)") == round(expected, 8)
+    assert engine.evaluate("prod(k, k, 1, 10)") == math.factorial(10)
+    assert engine.evaluate("sum(sum(j, j, 1, k), k, 1, 10)") == 220
+    assert engine.evaluate("sum(max([k, 3]), k, 1, 5)") == 3 + 3 + 3 + 4 + 5
+
+
+def test_outer_variables_batches_and_aggregates() -> None:
+    engine = CalculatorEngine()
+    assert engine.evaluate("sum(x*k, k, 1, 10)", variables={"x": 2}) == 110
+    # A variable named like the index is shadowed inside the body only.
+    assert engine.evaluate("sum(k, k, 1, k)", variables={"k": 4}) == 10
+
+    rows = [1.0, 2.0, 3.0, 4.0]
+    for expression in ("sum(x*k, k, 1, x)", "x + sum(cos(k), k, 1, 50)", "prod(x, k, 1, 3)"):
+        batch = engine.evaluate_batch(expression, {"x": rows})
+        assert batch == [engine.evaluate(expression, variables={"x": x}) for x in rows]
+
+    # Other sum calls are still the aggregate.
+    assert engine.evaluate("sum(1, 2, 3)") == 6
+    assert engine.evaluate("sum([1, 2, 3])") == 6
+    assert engine.evaluate("sum(x, 1, 2, 3)", variables={"x": 4}) == 10
+
+
+def test_bound_errors() -> None:
+    engine = CalculatorEngine()
+    assert engine.evaluate("sum(k, k, 5, 1)") == 0
+    assert engine.evaluate("prod(k, k, 5, 1)") == 1
+    with pytest.raises(InvalidExpressionError, match="integers"):
+        engine.evaluate("sum(k, k, 1.5, 3)")
+    with pytest.raises(InvalidExpressionError, match=str(MAX_TERMS)):
+        engine.evaluate("sum(sin(k), k, 1, 10**8)")
+    with pytest.raises(ZeroDivisionError):
+        engine.evaluate("sum(1/k, k, -2, 2)")
+    with pytest.raises(ZeroDivisionError):
+        engine.evaluate("sum(2**k, k, 1, 5000)")
+    with pytest.raises(InvalidExpressionError, match="compiled"):
+        engine.compile("sum(k, k, 1, 3)")
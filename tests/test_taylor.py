@@ -0,0 +1,56 @@
+"""Tests for Taylor series expansion of engine expressions."""
+
+import math
+
+import pytest
+
+from calculator.calculus import operations as ops
+from calculator.calculus.taylor import taylor
+from calculator.context import CalculatorContext
+from calculator.exceptions import InvalidExpressionError
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [
+        ("exp(x)", [1 / math.factorial(k) for k in range(6)]),
+        ("sin(x)", [0, 1, 0, -1 / 6, 0, 1 / 120]),
+        ("tan(x)", [0, 1, 0, 1 / 3, 0, 2 / 15]),
+        ("ln(1 + x)", [0, 1, -1 / 2, 1 / 3, -1 / 4, 1 / 5]),
+        ("sqrt(1 + x)", [1, 1 / 2, -1 / 8, 1 / 16, -5 / 128, 7 / 256]),
+        ("pow(1 - x, -1)", [1, 1, 1, 1, 1, 1]),
+        ("log(1 + x, e)", [0, 1, -1 / 2, 1 / 3, -1 / 4, 1 / 5]),
+    ],
+)
+def test_series_coefficients(expression: str, expected: list[float]) -> None:
+    assert taylor(expression, "x", 0.0, 5).coefficients == pytest.approx(expected, abs=1e-15)
+
+
+def test_expansion_around_a_center_approximates_the_engine() -> None:
+    expression = "exp(x)*cos(x)/(1 + x**2) + x**x"
+    series = taylor(expression, "x", center=0.5, order=14)
+    for point in (0.45, 0.5, 0.6):
+        exact = math.exp(point) * math.cos(point) / (1 + point**2) + point**point
+        assert series(point) == pytest.approx(exact, rel=1e-9)
+
+    context = CalculatorContext(angle_unit="degree")
+    degrees = taylor("sin(x)", "x", center=30, order=1, context=context)
+    assert degrees.coefficients[1] == pytest.approx(math.cos(math.pi / 6) * math.pi / 180)
+
+
+def test_series_converts_to_a_polynomial_for_symbolic_calculus() -> None:
+    series = taylor("(x - 2)**3 + a", "x", center=2, order=4, variables={"a": 1})
+    assert str(series) == "x**3 - 6*x**2 + 12*x - 7"
+    assert ops.differentiate(str(series), "x") == "3*x**2 - 12*x + 12"
+    assert series.polynomial().evaluate({"x": [3.0]}) == [2.0]
+
+
+def test_points_where_the_expression_is_not_analytic() -> None:
+    with pytest.raises(ZeroDivisionError):
+        taylor("sqrt(x)", "x", 0.0, 3)
+    with pytest.raises(ZeroDivisionError):
+        taylor("1 / x", "x", 0.0, 3)
+    with pytest.raises(InvalidExpressionError):
+        taylor("ln(x)", "x", -1.0, 3)
+    with pytest.raises(ValueError):
+        taylor("x", "x", 0.0, -1)
@@ -0,0 +1,413 @@
+"""Bulk evaluation tab: evaluate many expressions in the background."""
+
+from __future__ import annotations
+
+from array import array
+import csv
+import math
+import os
+import queue
+import threading
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+from typing import Callable, Iterator
+
+from calculator.context import CalculatorContext
+from calculator.engine import CalculatorEngine
+from ui.widgets import VirtualTable
+
+_CHUNK_SIZE = 1000
+_POLL_INTERVAL_MS = 100
+
+
+class TextRows:
+    """Expressions taken from pasted text, one per non-blank line."""
+
+    def __init__(self, text: str) -> None:
+        self._lines = [line.strip() for line in text.splitlines() if line.strip()]
+        self._scanned = 0
+
+    def __len__(self) -> int:
+        return self._scanned
+
+    def scan(self) -> Iterator[str]:
+        for line in self._lines:
+            self._scanned += 1
+            yield line
+
+    def expression(self, index: int) -> str:
+        return self._lines[index]
+
+    def progress(self) -> float:
+        return self._scanned / len(self._lines) if self._lines else 1.0
+
+    def close(self) -> None:
+        pass
+
+
+class FileRows:
+    """Expressions read lazily from a text or CSV file.
+
+    Only the byte offset of each row is kept in memory; rows shown in the
+    table are re-read from disk on demand. Text files hold one expression per
+    line. CSV files use the column headed ``expression`` when present and the
+    first column otherwise; records must not span several lines.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        self.is_csv = self.path.lower().endswith(".csv")
+        self._offsets = array("Q")
+        self._size = os.path.getsize(self.path)
+        self._position = 0
+        self._column = 0
+        self._lock = threading.Lock()
+        self._reader = open(self.path, "rb")
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def scan(self) -> Iterator[str]:
+        with open(self.path, "rb") as handle:
+            first = True
+            offset = 0
+            for raw in handle:
+                start = offset
+                offset += len(raw)
+                self._position = offset
+                if first and self.is_csv:
+                    first = False
+                    header = [field.strip().lower() for field in self._fields(raw)]
+                    if "expression" in header:
+                        self._column = header.index("expression")
+                        continue
+                first = False
+                expression = self._parse(raw)
+                if expression:
+                    self._offsets.append(start)
+                    yield expression
+
+    def expression(self, index: int) -> str:
+        with self._lock:
+            self._reader.seek(self._offsets[index])
+            return self._parse(self._reader.readline())
+
+    def progress(self) -> float:
+        return self._position / self._size if self._size else 1.0
+
+    def close(self) -> None:
+        self._reader.close()
+
+    def _fields(self, raw: bytes) -> list[str]:
+        return next(csv.reader([raw.decode("utf-8-sig")]), [])
+
+    def _parse(self, raw: bytes) -> str:
+        if not self.is_csv:
+            return raw.decode("utf-8-sig").strip()
+        fields = self._fields(raw)
+        return fields[self._column].strip() if self._column < len(fields) else ""
+
+
+RowSource = TextRows | FileRows
+
+
+class BulkJob:
+    """Evaluate every row of a source on a background thread.
+
+    Scalar results are stored compactly in an ``array('d')``; errors and
+    non-scalar results are kept as text in side dictionaries, so memory grows
+    by about eight bytes per successful row.
+    """
+
+    def __init__(
+        self,
+        engine: CalculatorEngine,
+        source: RowSource,
+        context: CalculatorContext,
+    ) -> None:
+        self.engine = engine
+        self.source = source
+        self.context = context
+        self.results = array("d")
+        self.errors: dict[int, str] = {}
+        self.texts: dict[int, str] = {}
+        self.finished = threading.Event()
+        self._cancelled = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def start(self, on_finish: Callable[["BulkJob"], None] | None = None) -> None:
+        def target() -> None:
+            try:
+                self.run()
+            finally:
+                if on_finish is not None:
+                    on_finish(self)
+
+        self._thread = threading.Thread(target=target, name="bulk-evaluation", daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def run(self) -> None:
+        """Evaluate all rows on the calling thread."""
+
+        evaluate = self.engine.evaluate
+        context = self.context
+        results = self.results
+        try:
+            for index, expression in enumerate(self.source.scan()):
+                if index % _CHUNK_SIZE == 0 and self._cancelled.is_set():
+                    break
+                try:
+                    value = evaluate(expression.replace("^", "**"), context)
+                except Exception as exc:  # noqa: BLE001 - reported per row
+                    self.errors[index] = str(exc) or type(exc).__name__
+                    value = math.nan
+                if not isinstance(value, float):
+                    self.texts[index] = str(value).replace("\n", " ")
+                    value = math.nan
+                results.append(value)
+        finally:
+            self.finished.set()
+
+    def progress(self) -> float:
+        return 1.0 if self.finished.is_set() else self.source.progress()
+
+    def row(self, index: int) -> tuple[int, str, str]:
+        """Return ``(row number, expression, result text)`` for ``index``."""
+
+        return index + 1, self.source.expression(index), self.result_text(index)
+
+    def result_text(self, index: int) -> str:
+        if index in self.errors:
+            return f"Error: {self.errors[index]}"
+        if index in self.texts:
+            return self.texts[index]
+        return str(self.results[index])
+
+    def export(self, path: str | os.PathLike[str]) -> int:
+        """Write evaluated rows to ``path`` as CSV and return the row count."""
+
+        count = len(self.results)
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["expression", "result", "error"])
+            for index in range(count):
+                expression = self.source.expression(index)
+                if index in self.errors:
+                    writer.writerow([expression, "", self.errors[index]])
+                elif index in self.texts:
+                    writer.writerow([expression, self.texts[index], ""])
+                else:
+                    writer.writerow([expression, repr(self.results[index]), ""])
+        return count
+
+
+class BulkPanel(ttk.Frame):
+    """Notebook tab that evaluates pasted text or a file row by row."""
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        *,
+        engine: CalculatorEngine,
+        context_provider: Callable[[], CalculatorContext | None],
+    ) -> None:
+        super().__init__(master, padding=8)
+        self.engine = engine
+        self._context_provider = context_provider
+        self._job: BulkJob | None = None
+        self._file_path: str | None = None
+        self._events: queue.Queue[tuple[str, str]] = queue.Queue()
+        self.status_var = tk.StringVar(value="Paste expressions or open a file.")
+        self.progress_var = tk.DoubleVar(value=0.0)
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(3, weight=1)
+        self._build()
+
+    def _build(self) -> None:
+        actions = ttk.Frame(self)
+        actions.grid(row=0, column=0, sticky="ew", pady=(0, 6))
+        self.open_button = ttk.Button(actions, text="Open file…", command=self.open_file)
+        self.open_button.grid(row=0, column=0, padx=2)
+        self.evaluate_button = ttk.Button(actions, text="Evaluate", command=self.start)
+        self.evaluate_button.grid(row=0, column=1, padx=2)
+        self.cancel_button = ttk.Button(
+            actions, text="Cancel", command=self.cancel, state="disabled"
+        )
+        self.cancel_button.grid(row=0, column=2, padx=2)
+        self.export_button = ttk.Button(
+            actions, text="Export CSV…", command=self.export, state="disabled"
+        )
+        self.export_button.grid(row=0, column=3, padx=2)
+        ttk.Button(actions, text="Clear", command=self.clear).grid(row=0, column=4, padx=2)
+
+        input_frame = ttk.Frame(self)
+        input_frame.grid(row=1, column=0, sticky="ew")
+        input_frame.columnconfigure(0, weight=1)
+        self.input_text = tk.Text(input_frame, height=6, wrap="none", undo=True)
+        self.input_text.grid(row=0, column=0, sticky="ew")
+        input_scroll = ttk.Scrollbar(input_frame, command=self.input_text.yview)
+        input_scroll.grid(row=0, column=1, sticky="ns")
+        self.input_text.configure(yscrollcommand=input_scroll.set)
+
+        status_frame = ttk.Frame(self)
+        status_frame.grid(row=2, column=0, sticky="ew", pady=6)
+        status_frame.columnconfigure(1, weight=1)
+        ttk.Progressbar(status_frame, variable=self.progress_var, maximum=1.0, length=160).grid(
+            row=0, column=0, sticky="w"
+        )
+        ttk.Label(status_frame, textvariable=self.status_var, anchor="w").grid(
+            row=0, column=1, sticky="ew", padx=(8, 0)
+        )
+
+        self.table = VirtualTable(
+            self,
+            columns=[
+                ("row", "#", 60),
+                ("expression", "Expression", 220),
+                ("result", "Result", 160),
+            ],
+            row_getter=self._row,
+        )
+        self.table.grid(row=3, column=0, sticky="nsew")
+
+    # ------------------------------------------------------------------
+    # Actions
+    # ------------------------------------------------------------------
+    def open_file(self) -> None:
+        path = filedialog.askopenfilename(
+            title="Open expressions",
+            filetypes=[("Expression files", "*.txt *.csv"), ("All files", "*")],
+        )
+        if not path:
+            return
+        self._file_path = path
+        self.input_text.delete("1.0", "end")
+        self.input_text.configure(state="disabled")
+        self.status_var.set(f"Source: {os.path.basename(path)}")
+
+    def clear(self) -> None:
+        if self._job is not None and not self._job.finished.is_set():
+            return
+        self._discard_job()
+        self._file_path = None
+        self.input_text.configure(state="normal")
+        self.input_text.delete("1.0", "end")
+        self.progress_var.set(0.0)
+        self.export_button.configure(state="disabled")
+        self.status_var.set("Paste expressions or open a file.")
+
+    def start(self) -> None:
+        if self._job is not None and not self._job.finished.is_set():
+            return
+        context = self._context_provider()
+        if context is None:
+            return
+
+        try:
+            if self._file_path is not None:
+                source: RowSource = FileRows(self._file_path)
+            else:
+                source = TextRows(self.input_text.get("1.0", "end"))
+        except OSError as exc:
+            messagebox.showerror("Bulk evaluation", str(exc))
+            return
+
+        self._discard_job()
+        self._job = BulkJob(self.engine, source, context)
+        self.evaluate_button.configure(state="disabled")
+        self.cancel_button.configure(state="normal")
+        self.export_button.configure(state="disabled")
+        self.status_var.set("Evaluating…")
+        self._job.start(lambda job: self._events.put(("finished", "")))
+        self.after(_POLL_INTERVAL_MS, self._poll)
+
+    def cancel(self) -> None:
+        if self._job is not None:
+            self._job.cancel()
+            self.status_var.set("Cancelling…")
+
+    def export(self) -> None:
+        job = self._job
+        if job is None or not job.finished.is_set():
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export results",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")],
+        )
+        if not path:
+            return
+
+        def target() -> None:
+            try:
+                count = job.export(path)
+            except OSError as exc:
+                self._events.put(("failed", str(exc)))
+            else:
+                self._events.put(("exported", f"Exported {count:,} rows to {path}"))
+
+        self.export_button.configure(state="disabled")
+        self.status_var.set("Exporting…")
+        threading.Thread(target=target, name="bulk-export", daemon=True).start()
+        self.after(_POLL_INTERVAL_MS, self._poll)
+
+    # ------------------------------------------------------------------
+    # Background job plumbing
+    # ------------------------------------------------------------------
+    def _poll(self) -> None:
+        job = self._job
+        if job is not None:
+            self.progress_var.set(job.progress())
+            self.table.set_row_count(len(job))
+            if not job.finished.is_set():
+                self.status_var.set(f"Evaluated {len(job):,} rows…")
+
+        keep_polling = True
+        while True:
+            try:
+                event, message = self._events.get_nowait()
+            except queue.Empty:
+                break
+            keep_polling = False
+            if event == "finished" and job is not None:
+                self._on_finished(job)
+            elif event == "exported":
+                self.status_var.set(message)
+                self.export_button.configure(state="normal")
+            elif event == "failed":
+                self.export_button.configure(state="normal")
+                messagebox.showerror("Export failed", message)
+
+        if keep_polling:
+            self.after(_POLL_INTERVAL_MS, self._poll)
+
+    def _on_finished(self, job: BulkJob) -> None:
+        self.table.set_row_count(len(job))
+        self.table.refresh()
+        self.evaluate_button.configure(state="normal")
+        self.cancel_button.configure(state="disabled")
+        self.export_button.configure(state="normal" if len(job) else "disabled")
+        outcome = "Cancelled after" if job.cancelled else "Finished"
+        self.status_var.set(f"{outcome} {len(job):,} rows, {len(job.errors):,} errors.")
+
+    def _discard_job(self) -> None:
+        if self._job is not None:
+            self._job.source.close()
+        self._job = None
+        self.table.set_row_count(0)
+
+    def _row(self, index: int) -> tuple[int, str, str]:
+        if self._job is None:
+            return index + 1, "", ""
+        return self._job.row(index)
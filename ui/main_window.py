@@ -7,10 +7,17 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 from typing import Callable
 
+from calculator.calculus import numeric as numeric_ops
 from calculator.calculus import operations as calculus_ops
+from calculator.calculus import roots as roots_ops
 from calculator.context import CalculatorContext
 from calculator.engine import CalculatorEngine
-from ui.widgets import ButtonPad
+from ui.bulk_panel import BulkPanel
+from ui.widgets import ButtonPad, PolynomialView
+
+# Polynomial results with more terms are summarized and paged instead of
+# being rendered in full by the result label.
+_INLINE_TERMS = 200
 
 
 class MainWindow(ttk.Frame):
@@ -37,18 +44,37 @@ class MainWindow(ttk.Frame):
         self.precision_var = tk.StringVar(value=str(self.engine.context.precision))
         self.calculus_expression_var = tk.StringVar()
         self.calculus_variable_var = tk.StringVar(value="x")
+        self.calculus_order_var = tk.StringVar(value="1")
+        self.calculus_lower_var = tk.StringVar(value="0")
+        self.calculus_upper_var = tk.StringVar(value="1")
         self.calculus_result_var = tk.StringVar(value="")
 
-        self._build_calculator_panel()
-        self._build_calculus_panel()
+        notebook = ttk.Notebook(self)
+        notebook.grid(row=0, column=0, sticky="nsew")
+        self._notebook = notebook
+
+        calculator_tab = ttk.Frame(notebook, padding=4)
+        self._calculator_tab = calculator_tab
+        calculator_tab.rowconfigure(0, weight=1)
+        calculator_tab.columnconfigure(0, weight=1)
+        notebook.add(calculator_tab, text="Calculator")
+        self._build_calculator_panel(calculator_tab)
+        self._build_calculus_panel(calculator_tab)
+
+        self.bulk_panel = BulkPanel(
+            notebook,
+            engine=self.engine,
+            context_provider=self._current_context,
+        )
+        notebook.add(self.bulk_panel, text="Bulk")
 
         self._root.bind("<Return>", self._handle_return)
 
     # ------------------------------------------------------------------
     # Layout builders
     # ------------------------------------------------------------------
-    def _build_calculator_panel(self) -> None:
-        calc_frame = ttk.LabelFrame(self, text="Calculator")
+    def _build_calculator_panel(self, parent: ttk.Frame) -> None:
+        calc_frame = ttk.LabelFrame(parent, text="Calculator")
         calc_frame.grid(row=0, column=0, sticky="nsew")
         calc_frame.columnconfigure(0, weight=3)
         calc_frame.columnconfigure(1, weight=2)
@@ -85,7 +111,6 @@ class MainWindow(ttk.Frame):
             self.angle_unit_var.get(),
             "radian",
             "degree",
-            command=self._on_angle_unit_change,
         )
         angle_menu.grid(row=0, column=1, sticky="w", padx=(6, 12))
 
@@ -159,8 +184,8 @@ class MainWindow(ttk.Frame):
             button = ttk.Button(functions_frame, text=label, command=command)
             button.grid(row=index, column=0, sticky="nsew", padx=2, pady=2)
 
-    def _build_calculus_panel(self) -> None:
-        calculus_frame = ttk.LabelFrame(self, text="Polynomial calculus")
+    def _build_calculus_panel(self, parent: ttk.Frame) -> None:
+        calculus_frame = ttk.LabelFrame(parent, text="Calculus")
         calculus_frame.grid(row=1, column=0, sticky="ew", pady=(12, 0))
         calculus_frame.columnconfigure(1, weight=1)
         calculus_frame.columnconfigure(2, weight=1)
@@ -185,12 +210,23 @@ class MainWindow(ttk.Frame):
             padx=6,
             pady=(0, 6),
         )
+        variable_frame = ttk.Frame(calculus_frame)
+        variable_frame.grid(row=1, column=1, sticky="w", padx=(6, 0), pady=(0, 6))
         variable_entry = ttk.Entry(
-            calculus_frame,
+            variable_frame,
             textvariable=self.calculus_variable_var,
             width=6,
         )
-        variable_entry.grid(row=1, column=1, sticky="w", padx=(6, 0), pady=(0, 6))
+        variable_entry.grid(row=0, column=0)
+        ttk.Label(variable_frame, text="Order:").grid(row=0, column=1, padx=(8, 4))
+        order_spinbox = ttk.Spinbox(
+            variable_frame,
+            textvariable=self.calculus_order_var,
+            from_=1,
+            to=99,
+            width=4,
+        )
+        order_spinbox.grid(row=0, column=2)
 
         actions_frame = ttk.Frame(calculus_frame)
         actions_frame.grid(row=1, column=2, sticky="e", padx=6, pady=(0, 6))
@@ -209,13 +245,57 @@ class MainWindow(ttk.Frame):
         )
         integrate_button.grid(row=0, column=1, padx=2)
 
+        roots_button = ttk.Button(
+            actions_frame,
+            text="Roots",
+            command=self.find_roots,
+        )
+        roots_button.grid(row=0, column=2, padx=2)
+
+        critical_button = ttk.Button(
+            actions_frame,
+            text="Critical points",
+            command=self.find_critical_points,
+        )
+        critical_button.grid(row=0, column=3, padx=2)
+
+        ttk.Label(calculus_frame, text="Bounds:").grid(
+            row=2,
+            column=0,
+            sticky="w",
+            padx=6,
+            pady=(0, 6),
+        )
+        bounds_frame = ttk.Frame(calculus_frame)
+        bounds_frame.grid(row=2, column=1, sticky="w", padx=(6, 0), pady=(0, 6))
+        ttk.Entry(bounds_frame, textvariable=self.calculus_lower_var, width=8).grid(
+            row=0, column=0
+        )
+        ttk.Label(bounds_frame, text="to").grid(row=0, column=1, padx=4)
+        ttk.Entry(bounds_frame, textvariable=self.calculus_upper_var, width=8).grid(
+            row=0, column=2
+        )
+
+        definite_button = ttk.Button(
+            calculus_frame,
+            text="Definite integral",
+            command=self.integrate_definite_expression,
+        )
+        definite_button.grid(row=2, column=2, sticky="e", padx=8, pady=(0, 6))
+
         calculus_result = ttk.Label(
             calculus_frame,
             textvariable=self.calculus_result_var,
             wraplength=360,
             justify="left",
         )
-        calculus_result.grid(row=2, column=1, columnspan=2, sticky="ew", padx=6, pady=(0, 8))
+        calculus_result.grid(row=3, column=1, columnspan=2, sticky="ew", padx=6, pady=(0, 8))
+
+        self.polynomial_view = PolynomialView(calculus_frame)
+        self.polynomial_view.grid(
+            row=4, column=0, columnspan=3, sticky="nsew", padx=6, pady=(0, 8)
+        )
+        self.polynomial_view.grid_remove()
 
     # ------------------------------------------------------------------
     # Calculator actions
@@ -246,29 +326,12 @@ class MainWindow(ttk.Frame):
 
         normalized_expression = expression.replace("^", "**")
 
-        try:
-            precision = int(self.precision_var.get())
-        except (tk.TclError, ValueError):
-            self._show_error("Precision must be a positive integer.")
-            return
-
-        if precision <= 0:
-            self._show_error("Precision must be a positive integer.")
+        context = self._current_context()
+        if context is None:
             return
 
         try:
-            context = CalculatorContext(
-                angle_unit=self.angle_unit_var.get(),
-                precision=precision,
-            )
-        except ValueError as exc:
-            self._show_error(str(exc))
-            return
-
-        self.engine.context = context
-
-        try:
-            result = self.engine.evaluate(normalized_expression)
+            result = self.engine.evaluate(normalized_expression, context)
         except Exception as exc:  # pragma: no cover - GUI error feedback
             self._show_error(str(exc))
             return
@@ -280,14 +343,14 @@ class MainWindow(ttk.Frame):
     # Calculus actions
     # ------------------------------------------------------------------
     def differentiate_expression(self) -> None:
-        self._run_calculus_operation(calculus_ops.differentiate, "Differentiation error")
+        self._run_calculus_operation(calculus_ops.differentiate_result, "Differentiation error")
 
     def integrate_expression(self) -> None:
-        self._run_calculus_operation(calculus_ops.integrate, "Integration error")
+        self._run_calculus_operation(calculus_ops.integrate_result, "Integration error")
 
     def _run_calculus_operation(
         self,
-        operation: Callable[[str, str], str],
+        operation: Callable[..., calculus_ops.PolynomialResult],
         title: str,
     ) -> None:
         expression = self.calculus_expression_var.get().strip()
@@ -298,22 +361,126 @@ class MainWindow(ttk.Frame):
             return
 
         try:
-            result = operation(expression, variable)
+            order = int(self.calculus_order_var.get().strip() or "1")
+        except ValueError:
+            self._show_error("Order must be a whole number.", title=title)
+            return
+
+        try:
+            result = operation(expression, variable, order=order)
         except ValueError as exc:
             self._show_error(str(exc), title=title)
-            self.calculus_result_var.set("")
+            self._set_calculus_result("")
             return
 
-        self.calculus_result_var.set(result)
+        if len(result) <= _INLINE_TERMS:
+            self._set_calculus_result(str(result))
+            return
+        self._set_calculus_result(result.summary())
+        self.polynomial_view.show(result)
+        self.polynomial_view.grid()
+
+    def find_roots(self) -> None:
+        self._run_roots_operation(
+            lambda expression, variable: [
+                str(root) for root in roots_ops.roots(expression, variable)
+            ]
+        )
+
+    def find_critical_points(self) -> None:
+        self._run_roots_operation(
+            lambda expression, variable: [
+                f"{point:.12g}" for point in roots_ops.critical_points(expression, variable)
+            ]
+        )
+
+    def _run_roots_operation(self, operation: Callable[[str, str], list[str]]) -> None:
+        title = "Root finding error"
+        expression = self.calculus_expression_var.get().strip().replace("^", "**")
+        variable = self.calculus_variable_var.get().strip() or "x"
+
+        if not expression:
+            self._show_error("Please provide a polynomial expression to solve.", title=title)
+            return
+
+        try:
+            found = operation(expression, variable)
+        except ValueError as exc:
+            self._show_error(str(exc), title=title)
+            self._set_calculus_result("")
+            return
+
+        self._set_calculus_result("; ".join(found) if found else "None")
+
+    def integrate_definite_expression(self) -> None:
+        title = "Integration error"
+        expression = self.calculus_expression_var.get().strip().replace("^", "**")
+        variable = self.calculus_variable_var.get().strip() or "x"
+
+        if not expression:
+            self._show_error("Please provide an expression to integrate.", title=title)
+            return
+
+        try:
+            lower = float(self.calculus_lower_var.get())
+            upper = float(self.calculus_upper_var.get())
+        except ValueError:
+            self._show_error("Integration bounds must be numbers.", title=title)
+            return
+
+        context = self._current_context()
+        if context is None:
+            return
+
+        try:
+            result = numeric_ops.integrate_definite(
+                expression,
+                variable,
+                lower,
+                upper,
+                engine=self.engine,
+                context=context,
+            )
+        except Exception as exc:  # pragma: no cover - GUI error feedback
+            self._show_error(str(exc), title=title)
+            self._set_calculus_result("")
+            return
+
+        text = f"{context.round(result.value)} (error ≤ {result.error:.2g})"
+        if not result.converged:
+            text += " – tolerance not reached"
+        self._set_calculus_result(text)
 
     # ------------------------------------------------------------------
     # Event handlers and helpers
     # ------------------------------------------------------------------
-    def _handle_return(self, _event: tk.Event[tk.Misc]) -> None:
-        self.evaluate_expression()
+    def _current_context(self) -> CalculatorContext | None:
+        try:
+            precision = int(self.precision_var.get())
+        except (tk.TclError, ValueError):
+            self._show_error("Precision must be a positive integer.")
+            return None
 
-    def _on_angle_unit_change(self, _value: str) -> None:
-        self.engine.context.angle_unit = self.angle_unit_var.get()
+        if precision <= 0:
+            self._show_error("Precision must be a positive integer.")
+            return None
+
+        try:
+            return CalculatorContext(
+                angle_unit=self.angle_unit_var.get(),
+                precision=precision,
+            )
+        except ValueError as exc:
+            self._show_error(str(exc))
+            return None
+
+    def _set_calculus_result(self, text: str) -> None:
+        self.calculus_result_var.set(text)
+        self.polynomial_view.grid_remove()
+
+    def _handle_return(self, _event: tk.Event[tk.Misc]) -> None:
+        if self._notebook.select() == str(self._calculator_tab):
+            self.evaluate_expression()
 
     def _show_error(self, message: str, *, title: str = "Calculation error") -> None:
         messagebox.showerror(title, message)
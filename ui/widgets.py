@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, messagebox, ttk
 from typing import Callable, Sequence
 
+from calculator.calculus.operations import PolynomialResult
+
 
 ButtonSpec = tuple[str, Callable[[], None]]
 
@@ -44,3 +46,215 @@ class ButtonPad(ttk.Frame):
 
         for column_index in range(max_columns):
             self.columnconfigure(column_index, weight=1)
+
+
+ColumnSpec = tuple[str, str, int]
+
+
+class VirtualTable(ttk.Frame):
+    """Scrollable table that only creates ``Treeview`` items for visible rows.
+
+    Rows are fetched on demand from ``row_getter(index)``, so the table can
+    present millions of rows while holding a screenful of items. Call
+    :meth:`set_row_count` as rows become available and :meth:`refresh` when
+    the data behind visible rows changes.
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        *,
+        columns: Sequence[ColumnSpec],
+        row_getter: Callable[[int], Sequence[object]],
+        height: int = 15,
+    ) -> None:
+        super().__init__(master)
+        self._row_getter = row_getter
+        self._row_count = 0
+        self._first = 0
+        self._visible = height
+
+        identifiers = [identifier for identifier, _, _ in columns]
+        self.tree = ttk.Treeview(
+            self,
+            columns=identifiers,
+            show="headings",
+            height=height,
+            selectmode="browse",
+        )
+        for identifier, heading, width in columns:
+            self.tree.heading(identifier, text=heading)
+            self.tree.column(identifier, width=width, stretch=identifier == identifiers[-1])
+        self.tree.grid(row=0, column=0, sticky="nsew")
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.bind("<Configure>", self._on_configure)
+        for widget in (self.tree, self.scrollbar):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda _event: self.scroll_rows(-3))
+            widget.bind("<Button-5>", lambda _event: self.scroll_rows(3))
+        self.tree.bind("<Up>", lambda _event: self.scroll_rows(-1))
+        self.tree.bind("<Down>", lambda _event: self.scroll_rows(1))
+        self.tree.bind("<Prior>", lambda _event: self.scroll_rows(-self._visible))
+        self.tree.bind("<Next>", lambda _event: self.scroll_rows(self._visible))
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    def set_row_count(self, count: int) -> None:
+        """Update the number of available rows and redraw if needed."""
+
+        previous = self._row_count
+        self._row_count = count
+        self._first = min(self._first, self._max_first())
+        if previous < self._first + self._visible or count < previous:
+            self.refresh()
+        else:
+            self._update_scrollbar()
+
+    def scroll_rows(self, delta: int) -> str:
+        self.scroll_to(self._first + delta)
+        return "break"
+
+    def scroll_to(self, index: int) -> None:
+        """Show rows starting at ``index``."""
+
+        first = max(0, min(index, self._max_first()))
+        if first != self._first:
+            self._first = first
+            self.refresh()
+
+    def refresh(self) -> None:
+        """Redraw the visible rows from ``row_getter``."""
+
+        self.tree.delete(*self.tree.get_children())
+        last = min(self._first + self._visible, self._row_count)
+        for index in range(self._first, last):
+            self.tree.insert("", "end", iid=str(index), values=tuple(self._row_getter(index)))
+        self._update_scrollbar()
+
+    def _max_first(self) -> int:
+        return max(0, self._row_count - self._visible)
+
+    def _update_scrollbar(self) -> None:
+        if self._row_count <= self._visible:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        start = self._first / self._row_count
+        self.scrollbar.set(start, min(1.0, (self._first + self._visible) / self._row_count))
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str | None = None) -> None:
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self._row_count))
+        elif action == "scroll":
+            step = self._visible if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def _on_mousewheel(self, event: tk.Event[tk.Misc]) -> str:
+        # Windows reports multiples of 120 per notch; macOS reports small deltas.
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll_rows(-3 * steps if steps else 0)
+
+    def _on_configure(self, event: tk.Event[tk.Misc]) -> None:
+        row_height = int(ttk.Style(self).lookup("Treeview", "rowheight") or 20)
+        visible = max(1, (event.height - row_height) // row_height)
+        if visible != self._visible:
+            self._visible = visible
+            self.tree.configure(height=visible)
+            self._first = min(self._first, self._max_first())
+            self.refresh()
+
+
+class PolynomialView(ttk.Frame):
+    """Pager for polynomial results too long to show in a label.
+
+    Only one page of ``page_terms`` terms is formatted and inserted into the
+    text widget at a time; :meth:`save` streams the whole result to a file.
+    """
+
+    def __init__(self, master: tk.Misc, *, page_terms: int = 200) -> None:
+        super().__init__(master)
+        self._page_terms = page_terms
+        self._result: PolynomialResult | None = None
+        self._first = 0
+        self.position_var = tk.StringVar(value="")
+
+        self.text = tk.Text(self, height=6, wrap="word", state="disabled")
+        self.text.grid(row=0, column=0, sticky="nsew")
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.text.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.text.configure(yscrollcommand=scrollbar.set)
+
+        controls = ttk.Frame(self)
+        controls.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(4, 0))
+        controls.columnconfigure(2, weight=1)
+        ttk.Button(controls, text="◀", width=3, command=lambda: self.turn(-1)).grid(
+            row=0, column=0
+        )
+        ttk.Button(controls, text="▶", width=3, command=lambda: self.turn(1)).grid(
+            row=0, column=1, padx=(2, 0)
+        )
+        ttk.Label(controls, textvariable=self.position_var).grid(
+            row=0, column=2, sticky="w", padx=6
+        )
+        ttk.Button(controls, text="Save…", command=self.save).grid(row=0, column=3)
+
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+    def show(self, result: PolynomialResult) -> None:
+        """Display the first page of ``result``."""
+
+        self._result = result
+        self._first = 0
+        self._render()
+
+    def turn(self, pages: int) -> None:
+        """Move forwards or backwards by ``pages`` pages."""
+
+        if self._result is None:
+            return
+        last = max(0, (len(self._result) - 1) // self._page_terms * self._page_terms)
+        first = max(0, min(self._first + pages * self._page_terms, last))
+        if first != self._first:
+            self._first = first
+            self._render()
+
+    def save(self) -> None:
+        """Ask for a file name and write the complete result to it."""
+
+        if self._result is None:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save result",
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*")],
+        )
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as handle:
+                self._result.write(handle)
+                handle.write("\n")
+        except OSError as exc:
+            messagebox.showerror("Save error", str(exc))
+
+    def _render(self) -> None:
+        assert self._result is not None
+        total = len(self._result)
+        last = min(self._first + self._page_terms, total)
+        text = "".join(self._result.chunks(self._first, last))
+        if self._first:
+            text = "…" + text
+        if last < total:
+            text += " …"
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", text)
+        self.text.configure(state="disabled")
+        self.position_var.set(f"Terms {self._first + 1}–{last} of {total}")